@@ -7,6 +7,9 @@ __version__ = '3.0.22'
 # -----------------------------------------------------------------------------
 
 import asyncio
+import functools
+import math
+import random
 import concurrent.futures
 import socket
 import certifi
@@ -18,19 +21,25 @@ import yarl
 # -----------------------------------------------------------------------------
 
 from ccxt.async_support.base.throttler import Throttler
+from ccxt.base.market_store import market_store
 
 # -----------------------------------------------------------------------------
 
 from ccxt.base.errors import AuthenticationError
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import ExchangeNotAvailable
+from ccxt.base.errors import NetworkError
+from ccxt.base.errors import RateLimitExceeded
+from ccxt.base.errors import BadRequest
 from ccxt.base.errors import RequestTimeout
 
 from ccxt.base.errors import NotSupported
 from ccxt.base.errors import BadSymbol
 from ccxt.base.errors import NullResponse
 from ccxt.base.errors import InvalidOrder
+from ccxt.base.errors import InvalidNonce
 from ccxt.base.decimal_to_precision import TRUNCATE, ROUND, TICK_SIZE, DECIMAL_PLACES
+from ccxt.base.json_decoder import json_decoder
 
 # -----------------------------------------------------------------------------
 
@@ -43,6 +52,10 @@ from ccxt.async_support.base.ws.functions import inflate, inflate64, gunzip
 from ccxt.async_support.base.ws.fast_client import FastClient
 from ccxt.async_support.base.ws.future import Future
 from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook
+from ccxt.async_support.base.ws.cache import ArrayCacheByTimestamp, ArrayCacheBySymbolByIdPerSymbol
+from ccxt.base.columnar import OHLCV
+from ccxt.async_support.base.ws.router import MessageRouter
+from ccxt.async_support.base.ws.shards import ShardManager
 
 # -----------------------------------------------------------------------------
 
@@ -63,6 +76,8 @@ class Exchange(BaseExchange):
     ping = None
     newUpdates = True
     clients = {}
+    message_routers = None
+    shard_managers = None
 
     def __init__(self, config={}):
         if 'asyncio_loop' in config:
@@ -75,10 +90,51 @@ class Exchange(BaseExchange):
         self.throttle = None
         self.init_rest_rate_limiter()
         self.markets_loading = None
+        self.markets_refreshing = None
         self.reloading_markets = False
 
     def init_rest_rate_limiter(self):
         self.throttle = Throttler(self.tokenBucket, self.asyncio_loop)
+        self.throttles = {}
+        for name, bucket in self.rateLimitBuckets.items():
+            self.throttles[name] = Throttler(self.rate_limit_bucket(bucket), self.asyncio_loop)
+
+    async def throttle_request(self, cost, buckets={}):
+        # waits for the rateLimit bucket and every named bucket of the endpoint at once
+        if not buckets:
+            return await self.throttle(cost)
+        futures = [self.throttle(cost)]
+        for name, bucket_cost in buckets.items():
+            if name not in self.throttles:
+                raise NotSupported(self.id + ' rate limit bucket ' + name + ' is not defined in rateLimitBuckets')
+            futures.append(self.throttles[name](bucket_cost))
+        await asyncio.gather(*futures)
+
+    def calibrate_rate_limiter(self, headers, url, method):
+        usage = self.parse_rate_limit_headers(headers, url, method)
+        if not usage:
+            return
+        now = self.milliseconds()
+        for name, limits in usage.items():
+            throttle = self.throttle if name == 'rateLimit' else self.throttles.get(name)
+            if throttle is None:
+                continue
+            remaining = self.safe_float(limits, 'remaining')
+            if remaining is None:
+                limit = self.safe_float(limits, 'limit', throttle.config['capacity'])
+                remaining = limit - limits['used']
+            interval = limits['interval']
+            reset = self.safe_integer(limits, 'reset')
+            window = interval - now % interval if reset is None else reset - now
+            throttle.calibrate(remaining, min(max(window, 0), interval))
+
+    def rate_limiter_stats(self):
+        result = {
+            'rateLimit': self.throttle.stats(),
+        }
+        for name, throttle in self.throttles.items():
+            result[name] = throttle.stats()
+        return result
 
     def get_event_loop(self):
         return self.asyncio_loop
@@ -105,6 +161,8 @@ class Exchange(BaseExchange):
             else:
                 self.asyncio_loop = asyncio.get_event_loop()
             self.throttle.loop = self.asyncio_loop
+            for throttle in self.throttles.values():
+                throttle.loop = self.asyncio_loop
         if self.own_session and self.session is None:
             # Create our SSL context object with our CA cert file
             context = ssl.create_default_context(cafile=self.cafile) if self.verify else self.verify
@@ -113,6 +171,11 @@ class Exchange(BaseExchange):
             self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env)
 
     async def close(self):
+        # the websocket clients are closed first, a dropped connection is not reconnected after this
+        await self.ws_close()
+        if self.markets_refreshing is not None:
+            self.markets_refreshing.cancel()
+            self.markets_refreshing = None
         if self.session is not None:
             if self.own_session:
                 await self.session.close()
@@ -153,6 +216,8 @@ class Exchange(BaseExchange):
                         headers[header] = raw_headers[header]
                 http_status_code = response.status
                 http_status_text = response.reason
+                if self.enableRateLimit and self.calibrateRateLimit:
+                    self.calibrate_rate_limiter(raw_headers, url, method)
                 http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_response, request_headers, request_body)
                 json_response = self.parse_json(http_response)
                 if self.enableLastHttpResponse:
@@ -195,11 +260,53 @@ class Exchange(BaseExchange):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+            if self.shareMarkets:
+                key = self.market_store_key()
+                loading = market_store.loading.get(key)
+                if loading is not None and loading.get_loop() is asyncio.get_event_loop():
+                    try:
+                        await asyncio.shield(loading)
+                    except asyncio.CancelledError:
+                        if not loading.cancelled():
+                            raise
+                    except Exception:
+                        # the other instance failed, this one tries on its own
+                        pass
+                table = market_store.get(key)
+                if table is not None:
+                    return self.use_market_table(table)
+            cache = self.read_markets_cache()
+            if cache is not None:
+                result = self.set_shared_markets(cache['markets'], cache['currencies'])
+                if cache['age'] > self.marketsCacheTTL and self.markets_refreshing is None:
+                    self.markets_refreshing = asyncio.ensure_future(self.refresh_markets(params))
+                return result
+        if not self.shareMarkets:
+            return await self.fetch_and_set_markets(params)
+        key = self.market_store_key()
+        market_store.loading[key] = self.markets_loading
+        try:
+            return await self.fetch_and_set_markets(params)
+        finally:
+            if market_store.loading.get(key) is self.markets_loading:
+                del market_store.loading[key]
+
+    async def fetch_and_set_markets(self, params={}):
         currencies = None
         if self.has['fetchCurrencies'] is True:
             currencies = await self.fetch_currencies()
         markets = await self.fetch_markets(params)
-        return self.set_markets(markets, currencies)
+        self.write_markets_cache(markets, currencies)
+        return self.set_shared_markets(markets, currencies)
+
+    async def refresh_markets(self, params={}):
+        # revalidates the cached markets in the background, they stay in use if that fails
+        try:
+            await self.fetch_and_set_markets(params)
+        except Exception as e:
+            self.logger.warning('%s could not refresh the cached markets: %s', self.id, e)
+        finally:
+            self.markets_refreshing = None
 
     async def load_markets(self, reload=False, params={}):
         if (reload and not self.reloading_markets) or not self.markets_loading:
@@ -301,13 +408,36 @@ class Exchange(BaseExchange):
         return gunzip(data)
 
     def order_book(self, snapshot={}, depth=None):
-        return OrderBook(snapshot, depth)
+        return self.order_book_views(OrderBook(snapshot, depth))
 
     def indexed_order_book(self, snapshot={}, depth=None):
-        return IndexedOrderBook(snapshot, depth)
+        return self.order_book_views(IndexedOrderBook(snapshot, depth))
 
     def counted_order_book(self, snapshot={}, depth=None):
-        return CountedOrderBook(snapshot, depth)
+        return self.order_book_views(CountedOrderBook(snapshot, depth))
+
+    def order_book_views(self, orderbook):
+        # with options['watchOrderBook']['view'] the watchers return a read-only view() from orderbook.limit()
+        orderbook.views = self.handle_option('watchOrderBook', 'view', False)
+        return orderbook
+
+    def ohlcv_cache(self, limit=None):
+        # the candles of a market and timeframe, kept in typed arrays with options['watchOHLCV']['columnar']
+        if self.handle_option('watchOHLCV', 'columnar', False):
+            return OHLCV(None, limit)
+        return ArrayCacheByTimestamp(limit)
+
+    def orders_cache(self, limit=None):
+        # up to limit orders of each symbol, the open orders are never evicted
+        return ArrayCacheBySymbolByIdPerSymbol(limit, self.is_open_order)
+
+    def my_trades_cache(self, limit=None):
+        # up to limit trades of each symbol
+        return ArrayCacheBySymbolByIdPerSymbol(limit)
+
+    def is_open_order(self, order):
+        # an order without a terminal status may still fill
+        return self.safe_string(order, 'status') not in ['closed', 'canceled', 'expired', 'rejected']
 
     def client(self, url):
         self.clients = self.clients or {}
@@ -323,6 +453,7 @@ class Exchange(BaseExchange):
                 'ping': getattr(self, 'ping', None),
                 'verbose': self.verbose,
                 'throttle': Throttler(self.tokenBucket, self.asyncio_loop),
+                'decode_json': json_decoder(self.jsonDecoder),
                 'asyncio_loop': self.asyncio_loop,
             }, ws_options)
             self.clients[url] = FastClient(url, on_message, on_error, on_close, on_connected, options)
@@ -337,10 +468,35 @@ class Exchange(BaseExchange):
             raise NotSupported(self.id + '.handle_message() not implemented yet')
         return {}
 
+    def message_routes(self):
+        # {name: {'exact': {...}, 'prefix': {...}, 'contains': {...}, 'extractor': callable}}
+        # exchanges declare the routes of handle_message here, they are compiled on first use
+        return {}
+
+    def route_message(self, client, message, key=None, name='channel'):
+        # returns a (routed, result) pair, see MessageRouter.dispatch()
+        routers = self.message_routers
+        if routers is None:
+            routers = self.message_routers = {}
+        router = routers.get(name)
+        if router is None:
+            routes = self.safe_value(self.message_routes(), name, {})
+            router = routers[name] = MessageRouter(**routes)
+        return router.dispatch(client, message, key)
+
+    def message_router_stats(self):
+        # hits per route of every router used so far
+        routers = self.message_routers or {}
+        return dict((name, dict(router.hits)) for name, router in routers.items())
+
     def watch(self, url, message_hash, message=None, subscribe_hash=None, subscription=None):
         backoff_delay = 0
+        shard = self.shard_url(url, subscribe_hash)
+        shards = self.shard_managers.get(url) if self.shard_managers else None
+        url = shard
         client = self.client(url)
         future = client.future(message_hash)
+        self.add_message_hash(client, subscribe_hash, message_hash)
 
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
@@ -348,35 +504,256 @@ class Exchange(BaseExchange):
             else asyncio.ensure_future(client.connect(self.session, backoff_delay))
 
         def after(fut):
+            if (shards is not None) and (subscribe_hash in shards.assignments) and (shards.shard_url(shards.assignments[subscribe_hash]) != url):
+                # moved to another connection in the meantime
+                return
             if subscribe_hash not in client.subscriptions:
                 client.subscriptions[subscribe_hash] = subscription or True
-                # todo: decouple signing from subscriptions
-                options = self.safe_value(self.options, 'ws')
-                cost = self.safe_value(options, 'cost', 1)
                 if message:
-                    async def send_message():
-                        if self.enableRateLimit:
-                            await client.throttle(cost)
-                        try:
-                            await client.send(message)
-                        except ConnectionError as e:
-                            future.reject(e)
-                    asyncio.ensure_future(send_message())
+                    client.subscribe_messages[subscribe_hash] = message
+                    # todo: decouple signing from subscriptions
+                    self.send_subscribe_message(client, message, future)
 
         connected.add_done_callback(after)
 
         return future
 
+    def watch_multiple(self, url, message_hashes, messages, subscribe_hashes=None, subscriptions=None, keys=None):
+        # watch() for several subscriptions at once, like the topics of the watch_*_for_symbols() methods
+        # the future resolves with whichever message hash is resolved first, with keys as its [key, result] pair
+        # the subscribe messages of one connection are sent packed, see pack_subscribe_messages()
+        # and recorded one by one, a reconnect or a move to another shard handles each subscription
+        subscribe_hashes = message_hashes if subscribe_hashes is None else subscribe_hashes
+        self.open()
+        futures = []
+        shards = {}
+        for i in range(0, len(message_hashes)):
+            shard = self.shard_url(url, subscribe_hashes[i])
+            client = self.client(shard)
+            futures.append(client.future(message_hashes[i]))
+            self.add_message_hash(client, subscribe_hashes[i], message_hashes[i])
+            if shard not in shards:
+                shards[shard] = []
+            shards[shard].append(i)
+        future = Future.race(futures, keys)
+        managers = self.shard_managers.get(url) if self.shard_managers else None
+        for shard, indices in shards.items():
+            client = self.clients[shard]
+            connected = client.connected if client.connected.done() \
+                else asyncio.ensure_future(client.connect(self.session, 0))
+
+            def after(fut, client=client, shard=shard, indices=indices):
+                missing = []
+                for i in indices:
+                    subscribe_hash = subscribe_hashes[i]
+                    if (managers is not None) and (subscribe_hash in managers.assignments) and (managers.shard_url(managers.assignments[subscribe_hash]) != shard):
+                        # moved to another connection in the meantime
+                        continue
+                    if subscribe_hash not in client.subscriptions:
+                        client.subscriptions[subscribe_hash] = (subscriptions[i] if subscriptions else None) or True
+                        if messages[i]:
+                            client.subscribe_messages[subscribe_hash] = messages[i]
+                            missing.append(messages[i])
+                if missing:
+                    asyncio.ensure_future(self.send_subscribe_messages(client, self.pack_subscribe_messages(client, missing), [future]))
+
+            connected.add_done_callback(after)
+        return future
+
+    def add_message_hash(self, client, subscribe_hash, message_hash):
+        # the message hashes of a subscription are measured and moved with it, see rebalance_shards()
+        if subscribe_hash is None:
+            return
+        hashes = client.message_hashes.get(subscribe_hash)
+        if hashes is None:
+            hashes = client.message_hashes[subscribe_hash] = []
+        if message_hash not in hashes:
+            hashes.append(message_hash)
+
+    def market_symbols_for_watch(self, symbols, method):
+        # the unified symbols of a watch_*_for_symbols() call, the markets of one call share a url
+        if not symbols:
+            raise ArgumentsRequired(self.id + ' ' + method + '() requires a non-empty array of symbols')
+        symbols = self.market_symbols(symbols)
+        first = self.market(symbols[0])
+        for i in range(1, len(symbols)):
+            market = self.market(symbols[i])
+            if (market['type'] != first['type']) or (market['linear'] != first['linear']):
+                raise BadRequest(self.id + ' ' + method + '() requires symbols of one market type')
+        return symbols
+
+    def create_ohlcv_object(self, symbol, timeframe, data):
+        # the result of watch_ohlcv_for_symbols(), the candles of the market that updated
+        result = {}
+        result[symbol] = {}
+        result[symbol][timeframe] = data
+        return result
+
+    def symbols_of_pairs(self, symbolsAndTimeframes):
+        # the symbols of the [symbol, timeframe] pairs of watch_ohlcv_for_symbols()
+        symbols = []
+        for i in range(0, len(symbolsAndTimeframes)):
+            symbols.append(symbolsAndTimeframes[i][0])
+        return symbols
+
+    def send_subscribe_message(self, client, message, future):
+        # with options['ws']['packSubscriptions'] the messages of one loop iteration are sent packed
+        options = self.safe_value(self.options, 'ws', {})
+        if not self.safe_value(options, 'packSubscriptions', False):
+            asyncio.ensure_future(self.send_subscribe_messages(client, [message], [future]))
+            return
+        client.pending_subscribe_messages.append((message, future))
+        if len(client.pending_subscribe_messages) == 1:
+            asyncio.ensure_future(self.flush_subscribe_messages(client))
+
+    async def flush_subscribe_messages(self, client):
+        pending = client.pending_subscribe_messages
+        client.pending_subscribe_messages = []
+        messages = self.pack_subscribe_messages(client, [message for message, future in pending])
+        await self.send_subscribe_messages(client, messages, [future for message, future in pending])
+
+    async def send_subscribe_messages(self, client, messages, futures):
+        options = self.safe_value(self.options, 'ws')
+        cost = self.safe_value(options, 'cost', 1)
+        for message in messages:
+            if self.enableRateLimit:
+                await client.throttle(cost)
+            try:
+                await client.send(message)
+            except ConnectionError as e:
+                # a resumable connection replays the subscriptions once it is back
+                if not client.resumable():
+                    for future in futures:
+                        future.reject(e)
+                return
+
+    def shard_manager(self, url):
+        # None unless options['ws'] limits the topics or the message rate of a connection
+        options = self.safe_value(self.options, 'ws', {})
+        maxTopics = self.safe_integer(options, 'maxTopicsPerConnection')
+        maxRate = self.safe_number(options, 'maxMessagesPerSecond')
+        if (maxTopics is None) and (maxRate is None):
+            return None
+        managers = self.shard_managers
+        if managers is None:
+            managers = self.shard_managers = {}
+        manager = managers.get(url)
+        if manager is None:
+            maxConnections = self.safe_integer(options, 'maxConnections', 8)
+            manager = managers[url] = ShardManager(url, maxTopics, maxRate, maxConnections, self.milliseconds())
+        return manager
+
+    def shard_url(self, url, subscribe_hash):
+        # the url of the connection that carries the subscription, see ShardManager
+        # the logins and the subscriptions made on a logged in connection stay on the url itself
+        if (subscribe_hash is None) or (subscribe_hash in FastClient.authenticationHashes):
+            return url
+        manager = self.shard_manager(url)
+        if manager is None:
+            return url
+        if subscribe_hash not in manager.assignments:
+            client = self.clients.get(url) if self.clients else None
+            if (client is not None) and client.logged_in():
+                return url
+        index = manager.assign(subscribe_hash)
+        if (manager.max_rate is not None) and not manager.rebalancing:
+            interval = self.safe_integer(self.options['ws'], 'rebalanceInterval', 10000)
+            if self.milliseconds() - manager.measured >= interval:
+                manager.rebalancing = True
+                self.spawn(self.rebalance_shards, manager)
+        return manager.shard_url(index)
+
+    async def rebalance_shards(self, manager):
+        # the subscriptions of the connections above options['ws']['maxMessagesPerSecond'] move to quieter ones
+        try:
+            now = self.milliseconds()
+            elapsed = max(now - manager.measured, 1) / 1000
+            manager.measured = now
+            rates = {}
+            for index in range(0, len(manager.shards)):
+                client = self.clients.get(manager.shard_url(index))
+                if client is None:
+                    continue
+                for subscribe_hash in manager.shards[index]:
+                    hashes = client.message_hashes.get(subscribe_hash, [subscribe_hash])
+                    rates[subscribe_hash] = sum(client.resolutions.get(message_hash, 0) for message_hash in hashes) / elapsed
+                client.resolutions = {}
+
+            def movable(subscribe_hash, index):
+                return self.unsubscribe_message(self.clients.get(manager.shard_url(index)), subscribe_hash) is not None
+
+            for subscribe_hash, source, target in manager.rebalance(rates, movable):
+                await self.move_subscription(manager.shard_url(source), manager.shard_url(target), subscribe_hash)
+        finally:
+            manager.rebalancing = False
+
+    async def move_subscription(self, source_url, target_url, subscribe_hash):
+        # unsubscribes on the old connection first, the new subscription starts from a fresh snapshot
+        source = self.clients[source_url]
+        unsubscribe = self.unsubscribe_message(source, subscribe_hash)
+        message = source.subscribe_messages.pop(subscribe_hash)
+        subscription = source.subscriptions.pop(subscribe_hash, True)
+        target = self.client(target_url)
+        # the pending watch() calls resolve from the new connection, the message hashes that
+        # other subscriptions of the old connection still deliver stay there
+        hashes = source.message_hashes.pop(subscribe_hash, [subscribe_hash])
+        remaining = set(message_hash for others in source.message_hashes.values() for message_hash in others)
+        futures = []
+        for message_hash in hashes:
+            future = None if message_hash in remaining else source.futures.pop(message_hash, None)
+            if future is None:
+                continue
+            futures.append(future)
+            if message_hash in target.futures:
+                target.futures[message_hash].add_done_callback(functools.partial(self.settle_moved_future, future))
+            else:
+                target.futures[message_hash] = future
+        for message_hash in hashes:
+            self.add_message_hash(target, subscribe_hash, message_hash)
+        await self.send_subscribe_messages(source, [unsubscribe], [])
+        target.subscriptions[subscribe_hash] = subscription
+        target.subscribe_messages[subscribe_hash] = message
+        self.open()
+        if not target.connected.done():
+            await target.connect(self.session)
+        await self.send_subscribe_messages(target, [message], futures)
+        self.resync_subscription(target, subscribe_hash, subscription)
+
+    def settle_moved_future(self, future, done):
+        # a moved future settles with the one the new connection already had for its message hash
+        if done.cancelled():
+            future.cancel()
+        elif done.exception() is not None:
+            future.reject(done.exception())
+        else:
+            future.resolve(done.result())
+
+    def unsubscribe_message(self, client, subscribe_hash):
+        # the message that undoes a recorded subscribe message, {'op': 'subscribe'} becomes {'op': 'unsubscribe'}
+        # None when it cannot be derived, such a subscription is never moved to another connection
+        message = None if client is None else client.subscribe_messages.get(subscribe_hash)
+        if not isinstance(message, dict):
+            return None
+        for key in ['op', 'method', 'event']:
+            value = message.get(key)
+            if isinstance(value, str) and (value.lower() == 'subscribe'):
+                return self.extend(message, {key: 'UNSUBSCRIBE' if value.isupper() else 'unsubscribe'})
+        return None
+
     def on_connected(self, client, message=None):
         # for user hooks
         # print('Connected to', client.url)
         pass
 
     def on_error(self, client, error):
+        if self.resume_client(client):
+            return
         if client.url in self.clients and self.clients[client.url].error:
             del self.clients[client.url]
 
     def on_close(self, client, error):
+        if self.resume_client(client):
+            return
         if client.error:
             # connection closed due to an error
             pass
@@ -385,12 +762,106 @@ class Exchange(BaseExchange):
             if client.url in self.clients:
                 del self.clients[client.url]
 
+    def resume_client(self, client):
+        # a dropped connection with options['ws']['reconnect'] is reopened by reconnect_client()
+        # the client stays in self.clients and the futures wait for the new connection
+        if not client.resumable() or self.clients.get(client.url) is not client:
+            return False
+        if not client.reconnecting:
+            client.reconnecting = True
+            # the watch() calls made in the meantime wait for the new connection too
+            client.connected = Future()
+            client.connecting = True
+            self.spawn(self.reconnect_client, client)
+        return True
+
+    def reconnect_delay(self, client, attempt):
+        # exponential backoff with jitter, the clients dropped at once do not reconnect at once
+        delay = min(client.maxReconnectDelay, client.reconnectDelay * (2 ** attempt))
+        return delay / 2 + random.random() * delay / 2
+
+    async def reconnect_client(self, client):
+        attempt = 0
+        try:
+            while True:
+                await client.close()
+                await asyncio.sleep(self.reconnect_delay(client, attempt) / 1000)
+                if self.clients.get(client.url) is not client:
+                    # closed in the meantime
+                    client.reject(NetworkError(self.id + ' connection to ' + client.url + ' closed while reconnecting'))
+                    return
+                client.connection = None
+                client.error = None
+                client.isConnected = False
+                client.lastPong = None
+                client.connecting = True
+                self.open()
+                await client.open(self.session)
+                if client.isConnected and not client.closed():
+                    break
+                attempt += 1
+                if (client.maxReconnectAttempts is not None) and (attempt >= client.maxReconnectAttempts):
+                    error = client.error or NetworkError(self.id + ' could not reconnect to ' + client.url)
+                    client.reconnect = False
+                    client.reject(error)
+                    client.connected.reject(error)
+                    if self.clients.get(client.url) is client:
+                        del self.clients[client.url]
+                    return
+        finally:
+            client.reconnecting = False
+        await self.resubscribe(client)
+
+    async def resubscribe(self, client):
+        # the subscriptions of the old connection are replayed in as few messages as possible
+        await self.send_subscribe_messages(client, self.pack_subscribe_messages(client, self.subscribed_messages(client)), [])
+        for hash in list(client.subscriptions.keys()):
+            self.resync_subscription(client, hash, client.subscriptions[hash])
+
+    def subscribed_messages(self, client):
+        # the subscribe messages of the subscriptions of a connection, in the order they were made
+        return [client.subscribe_messages[hash] for hash in client.subscriptions if hash in client.subscribe_messages]
+
+    def pack_subscribe_messages(self, client, messages):
+        # the messages that differ only in their list of topics, like {'op': 'subscribe', 'args': [...]},
+        # are merged, up to options['ws']['maxTopicsPerMessage'] topics per message, the first id is kept
+        options = self.safe_value(self.options, 'ws', {})
+        maxTopics = self.safe_integer(options, 'maxTopicsPerMessage', 10)
+        packed = []
+        groups = {}
+        for message in messages:
+            topicsKey = None
+            if isinstance(message, dict):
+                lists = [key for key, value in message.items() if isinstance(value, list)]
+                if len(lists) == 1:
+                    topicsKey = lists[0]
+            if topicsKey is None:
+                packed.append(message)
+                continue
+            rest = dict((key, value) for key, value in message.items() if key != topicsKey and key not in ['id', 'req_id', 'reqId'])
+            groupKey = (topicsKey, self.json(rest))
+            group = groups.get(groupKey)
+            if group is None or len(group[topicsKey]) + len(message[topicsKey]) > maxTopics:
+                group = groups[groupKey] = self.extend(message, {topicsKey: []})
+                packed.append(group)
+            for topic in message[topicsKey]:
+                if topic not in group[topicsKey]:
+                    group[topicsKey].append(topic)
+        return packed
+
+    def resync_subscription(self, client, subscribe_hash, subscription):
+        # called for every subscription after a reconnect, the exchanges that get a snapshot on subscribe have
+        # nothing to do, the exchanges that build the order books from a rest snapshot fetch it again here
+        pass
+
     async def ws_close(self):
         if self.clients:
+            for client in self.clients.values():
+                client.reconnect = False
             await asyncio.wait([asyncio.create_task(client.close()) for client in self.clients.values()], return_when=asyncio.ALL_COMPLETED)
             for url in self.clients.copy():
                 del self.clients[url]
-        await super(Exchange, self).close()
+        self.shard_managers = None
 
     async def load_order_book(self, client, messageHash, symbol, limit=None, params={}):
         if symbol not in self.orderbooks:
@@ -424,6 +895,29 @@ class Exchange(BaseExchange):
     def handle_delta(self, orderbook, delta):
         raise NotSupported(self.id + ' handleDelta() is not supported')
 
+    def verify_order_book_checksum(self, client, orderbook, checksum, messageHash, depth=25):
+        # compares every options['checksumInterval']-th message with the checksum sent by the exchange
+        if checksum is None:
+            return True
+        interval = self.safe_integer(self.options, 'checksumInterval', 1)
+        if not orderbook.checksum_due(interval) or orderbook.checksum(depth) == checksum:
+            return True
+        self.resnapshot_order_book(client, orderbook['symbol'], messageHash)
+        return False
+
+    def resnapshot_order_book(self, client, symbol, messageHash):
+        # the local book is out of sync, it is dropped and rebuilt from the next snapshot
+        if symbol in self.orderbooks:
+            del self.orderbooks[symbol]
+        client.reject(InvalidNonce(self.id + ' invalid checksum'), messageHash)
+        self.spawn(self.resubscribe_order_book, client, symbol, messageHash)
+
+    async def resubscribe_order_book(self, client, symbol, messageHash):
+        # the next watch_order_book() call subscribes again
+        # exchanges that can resend a snapshot on the open connection override this
+        if messageHash in client.subscriptions:
+            del client.subscriptions[messageHash]
+
     def find_timeframe(self, timeframe, timeframes=None):
         timeframes = timeframes if timeframes else self.timeframes
         for key, value in timeframes.items():
@@ -612,27 +1106,65 @@ class Exchange(BaseExchange):
         }
 
     def set_markets(self, markets, currencies=None):
-        values = []
-        self.markets_by_id = {}
+        # the symbol and id indexes are built in one pass over the markets
+        # the symbols resolved by market() are dropped with the markets they point to
+        self.resolvedMarkets = None
         # handle marketId conflicts
         # we insert spot markets first
         marketValues = self.sort_by(self.to_array(markets), 'spot', True)
+        # the defaults are merged once, each market is merged into them
+        defaults = self.deep_extend(self.safe_market(), {
+            'precision': self.precision,
+            'limits': self.limits,
+        }, self.fees['trading'])
+        values = []
+        marketsBySymbol = {}
+        idsInOrder = {}
+        # TEALSTREET markets_by_id does not list the spot markets
+        marketsByIdNoSpot = {}
         for i in range(0, len(marketValues)):
             value = marketValues[i]
-            if value['id'] in self.markets_by_id:
-                self.markets_by_id[value['id']].append(value)
-            else:
-                self.markets_by_id[value['id']] = [value]
-            market = self.deep_extend(self.safe_market(), {
-                'precision': self.precision,
-                'limits': self.limits,
-            }, self.fees['trading'], value)
+            id = value['id']
+            idsInOrder[id] = True
+            if value['type'] != 'spot':
+                if id in marketsByIdNoSpot:
+                    marketsByIdNoSpot[id].append(value)
+                else:
+                    marketsByIdNoSpot[id] = [value]
+            market = self.deep_extend(defaults, value)
             values.append(market)
-        self.markets = self.index_by(values, 'symbol')
-        marketsSortedBySymbol = self.keysort(self.markets)
-        marketsSortedById = self.keysort(self.markets_by_id)
-        self.symbols = list(marketsSortedBySymbol.keys())
-        self.ids = list(marketsSortedById.keys())
+            symbol = self.safe_string(market, 'symbol')
+            if symbol is not None:
+                marketsBySymbol[symbol] = market
+        self.markets = marketsBySymbol
+        # in the order the ids were first seen, spot markets included
+        ids = list(idsInOrder.keys())
+        self.markets_by_id = {}
+        for i in range(0, len(ids)):
+            id = ids[i]
+            if id in marketsByIdNoSpot:
+                self.markets_by_id[id] = marketsByIdNoSpot[id]
+        # resolved the way safeMarket() does, an id with one market is indexed by itself as the default
+        # and an id shared by several markets by each market type
+        self.markets_by_id_and_type = {}
+        marketTypes = ['spot', 'margin', 'swap', 'future', 'option', 'contract', 'linear', 'inverse']
+        marketIds = list(self.markets_by_id.keys())
+        for i in range(0, len(marketIds)):
+            marketId = marketIds[i]
+            marketsWithId = self.markets_by_id[marketId]
+            marketsByType = {}
+            if len(marketsWithId) == 1:
+                marketsByType['default'] = marketsWithId[0]
+            else:
+                for j in range(0, len(marketTypes)):
+                    marketType = marketTypes[j]
+                    for k in range(0, len(marketsWithId)):
+                        if self.safe_value(marketsWithId[k], marketType):
+                            marketsByType[marketType] = marketsWithId[k]
+                            break
+            self.markets_by_id_and_type[marketId] = marketsByType
+        self.symbols = list(self.keysort(marketsBySymbol).keys())
+        self.ids = list(self.keysort(idsInOrder).keys())
         if currencies is not None:
             self.currencies = self.deep_extend(self.currencies, currencies)
         else:
@@ -684,18 +1216,6 @@ class Exchange(BaseExchange):
         self.currencies_by_id = self.index_by(self.currencies, 'id')
         currenciesSortedByCode = self.keysort(self.currencies)
         self.codes = list(currenciesSortedByCode.keys())
-        # TEALSTREET
-        markets_by_id_no_spot = {}
-        market_symbols = list(self.markets_by_id.keys())
-        for i in range(0, len(market_symbols)):
-            for j in range(0, len(self.markets_by_id[market_symbols[i]])):
-                if self.markets_by_id[market_symbols[i]][j]['type'] != 'spot':
-                    if market_symbols[i] in markets_by_id_no_spot:
-                        markets_by_id_no_spot[market_symbols[i]].append(self.markets_by_id[market_symbols[i]][j])
-                    else:
-                        markets_by_id_no_spot[market_symbols[i]] = [self.markets_by_id[market_symbols[i]][j]]
-        self.markets_by_id = markets_by_id_no_spot
-        # TEALSTREET
         return self.markets
 
     def safe_balance(self, balance):
@@ -1601,7 +2121,8 @@ class Exchange(BaseExchange):
     async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}, context={}):
         if self.enableRateLimit:
             cost = self.calculate_rate_limiter_cost(api, method, path, params, config, context)
-            await self.throttle(cost)
+            buckets = self.calculate_rate_limiter_buckets(api, method, path, params, config, context)
+            await self.throttle_request(cost, buckets)
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
         return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
@@ -1751,6 +2272,18 @@ class Exchange(BaseExchange):
             return market
         return result
 
+    def safe_market_by_id(self, marketId, marketType=None):
+        # the per-message market lookup of the websocket handlers
+        # only an unknown id or type falls back to safeMarket()
+        marketsByType = self.safe_value(self.markets_by_id_and_type, marketId)
+        if marketsByType is not None:
+            market = self.safe_value(marketsByType, 'default')
+            if market is None:
+                market = self.safe_value(marketsByType, marketType)
+            if market is not None:
+                return market
+        return self.safe_market(marketId, None, None, marketType)
+
     def check_required_credentials(self, error=True):
         keys = list(self.requiredCredentials.keys())
         for i in range(0, len(keys)):
@@ -1867,6 +2400,97 @@ class Exchange(BaseExchange):
         result, empty = self.handleOptionAndParams({}, methodName, optionName, defaultValue)
         return result
 
+    def handle_max_entries_per_request_and_params(self, method, maxEntriesPerRequest=None, params={}):
+        newMaxEntriesPerRequest = None
+        newMaxEntriesPerRequest, params = self.handle_option_and_params(params, method, 'maxEntriesPerRequest')
+        if newMaxEntriesPerRequest is not None:
+            maxEntriesPerRequest = newMaxEntriesPerRequest
+        if maxEntriesPerRequest is None:
+            maxEntriesPerRequest = 1000  # default to 1000
+        return [maxEntriesPerRequest, params]
+
+    async def safe_deterministic_call(self, method, symbol=None, since=None, limit=None, timeframe=None, params={}):
+        # one page of a paginated call, retried on network errors, a rate limit error is raised right away
+        maxRetries = None
+        maxRetries, params = self.handle_option_and_params(params, method, 'maxRetries', 3)
+        errors = 0
+        while True:
+            try:
+                if (timeframe is not None) and (method != 'fetchFundingRateHistory'):
+                    return await getattr(self, method)(symbol, timeframe, since, limit, params)
+                else:
+                    return await getattr(self, method)(symbol, since, limit, params)
+            except Exception as e:
+                if isinstance(e, RateLimitExceeded) or not isinstance(e, NetworkError):
+                    raise e
+                errors += 1
+                if errors > maxRetries:
+                    raise e
+
+    async def fetch_paginated_call_deterministic(self, method, symbol=None, since=None, limit=None, timeframe=None, params={}, maxEntriesPerRequest=None):
+        # the range from since to until(or now) is split in windows of maxEntriesPerRequest entries of the timeframe
+        # and the windows are fetched at once, the rate limiter spaces the requests
+        maxCalls = None
+        maxCalls, params = self.handle_option_and_params(params, method, 'paginationCalls', 10)
+        maxEntriesPerRequest, params = self.handle_max_entries_per_request_and_params(method, maxEntriesPerRequest, params)
+        params = self.extend(params, {'paginate': False})
+        step = self.parse_timeframe(timeframe) * 1000 * maxEntriesPerRequest
+        until = self.safe_integer_2(params, 'until', 'till')  # do not omit it from params here, the last window ends there
+        end = self.milliseconds() if (until is None) else until
+        calls = maxCalls
+        if since is not None:
+            duration = end - since
+            calls = int(math.ceil(duration / step))
+            if limit is not None:
+                # the first limit entries from since, the windows after them are not fetched
+                calls = min(calls, int(math.ceil(limit / maxEntriesPerRequest)))
+            if calls > maxCalls:
+                raise BadRequest(self.id + ' ' + method + '() requires ' + str(calls) + ' calls from since to until, more than the paginationCalls option allows(' + str(maxCalls) + '), increase paginationCalls or reduce the range')
+        elif limit is not None:
+            calls = min(maxCalls, int(math.ceil(limit / maxEntriesPerRequest)))
+        start = (end - calls * step) if (since is None) else since
+        tasks = []
+        for i in range(0, calls):
+            tasks.append(self.safe_deterministic_call(method, symbol, self.sum(start, i * step), maxEntriesPerRequest, timeframe, params))
+        pages = await asyncio.gather(*tasks)
+        return self.merge_paginated_results(method, pages, since, limit)
+
+    async def fetch_paginated_call_cursor(self, method, symbol=None, since=None, limit=None, params={}, cursorReceived=None, cursorSent=None, cursorIncrement=None, maxEntriesPerRequest=None):
+        # the pages are fetched one after another, the cursor of the next page is the cursorReceived field of an entry
+        # with cursorIncrement the cursor is an id and the next page starts after the last entry,
+        # otherwise the next page goes back in time from the first entry, the way okx after= works
+        maxCalls = None
+        maxCalls, params = self.handle_option_and_params(params, method, 'paginationCalls', 10)
+        maxEntriesPerRequest, params = self.handle_max_entries_per_request_and_params(method, maxEntriesPerRequest, params)
+        params = self.extend(params, {'paginate': False})
+        cursorValue = None
+        pages = []
+        for i in range(0, maxCalls):
+            pageSince = since
+            pageParams = params
+            if cursorValue is not None:
+                if cursorIncrement is not None:
+                    # the since of the first page would conflict with the id
+                    cursorValue = self.sum(self.parse_to_int(cursorValue), cursorIncrement)
+                    pageSince = None
+                cursorParams = {}
+                cursorParams[cursorSent] = cursorValue
+                pageParams = self.extend(params, cursorParams)
+            response = await self.safe_deterministic_call(method, symbol, pageSince, maxEntriesPerRequest, None, pageParams)
+            responseLength = len(response)
+            if responseLength == 0:
+                break
+            pages.append(response)
+            # the parsed page is in ascending order
+            cursorEntry = response[responseLength - 1] if (cursorIncrement is not None) else response[0]
+            cursorValue = self.safe_value(cursorEntry['info'], cursorReceived)
+            if (cursorValue is None) or (responseLength < maxEntriesPerRequest):
+                break
+            cursorTimestamp = self.safe_integer(cursorEntry, 'timestamp')
+            if (cursorIncrement is None) and (since is not None) and (cursorTimestamp is not None) and (cursorTimestamp <= since):
+                break
+        return self.merge_paginated_results(method, pages, since, limit)
+
     def handle_market_type_and_params(self, methodName, market=None, params={}):
         defaultType = self.safe_string_2(self.options, 'defaultType', 'type', 'spot')
         methodOptions = self.safe_value(self.options, methodName)
@@ -2055,12 +2679,8 @@ class Exchange(BaseExchange):
                         return market
                 return markets[0]
 
-    def market(self, symbol):
+    def resolve_market(self, symbol):
         # symbol = symbol + ':USDT'
-        if self.markets is None:
-            raise ExchangeError(self.id + ' markets not loaded')
-        if self.markets_by_id is None:
-            raise ExchangeError(self.id + ' markets not loaded')
         # TEALSTREET patch for backwards compatability
         # self.marketHelper(symbol.split(':')[0])
         foundMarket = self.marketHelper(symbol)
@@ -2075,11 +2695,40 @@ class Exchange(BaseExchange):
         foundMarket = self.marketHelper(marketStem + ':USDT') or self.marketHelper(marketStem + ':BTC') or self.marketHelper(marketStem)
         if foundMarket:
             return foundMarket
-        # eslint-disable-next-line no-console
-        # print(symbol)
-        # eslint-disable-next-line no-console
-        # print(self.markets)
-        raise BadSymbol(self.id + ' does not have market symbol ' + symbol)
+        return None
+
+    def market(self, symbol):
+        if self.markets is None:
+            raise ExchangeError(self.id + ' markets not loaded')
+        if self.markets_by_id is None:
+            raise ExchangeError(self.id + ' markets not loaded')
+        foundMarket = None
+        if not isinstance(symbol, str):
+            foundMarket = self.resolve_market(symbol)
+        else:
+            # every symbol, legacy symbol or id seen is resolved once, unknown ones included
+            # the resolutions hold until setMarkets() or the default type change
+            defaultType = self.safe_string(self.options, 'defaultType')
+            defaultSubType = self.safe_string(self.options, 'defaultSubType')
+            resolved = self.resolvedMarkets
+            if (resolved is None) or (resolved['defaultType'] != defaultType) or (resolved['defaultSubType'] != defaultSubType) or (resolved['count'] >= self.resolvedMarketsLimit):
+                resolved = {
+                    'defaultType': defaultType,
+                    'defaultSubType': defaultSubType,
+                    'symbols': {},
+                    'count': 0,
+                }
+                self.resolvedMarkets = resolved
+            symbols = resolved['symbols']
+            if symbol in symbols:
+                foundMarket = symbols[symbol]
+            else:
+                foundMarket = self.resolve_market(symbol)
+                symbols[symbol] = foundMarket
+                resolved['count'] = resolved['count'] + 1
+        if foundMarket is None:
+            raise BadSymbol(self.id + ' does not have market symbol ' + symbol)
+        return foundMarket
 
     def handle_withdraw_tag_and_params(self, tag, params):
         if isinstance(tag, dict):
@@ -1,50 +1,111 @@
 import asyncio
 import collections
-from time import time
+
+# a debt below this is rounding left over from the exact wake-up time
+EPSILON = 1e-9
 
 
 class Throttler:
+    # a token bucket that wakes up once per queued request
+    # when the bucket is in debt the next wake-up is scheduled exactly when it is paid back
+    # time is taken from the event loop, so a loop with a virtual clock runs it deterministically
     def __init__(self, config, loop=None):
         self.loop = loop
         self.config = {
             'refillRate': 1.0,
-            'delay': 0.001,
+            'delay': 0.001,  # unused, kept for configs that still set it
             'cost': 1.0,
             'tokens': 0,
             'maxCapacity': 2000,
             'capacity': 1.0,
+            'borrow': True,  # whether a request can overdraw the bucket and make the next ones wait
         }
         self.config.update(config)
         self.queue = collections.deque()
         self.running = False
+        self.timer = None
+        self.last_timestamp = None
+        self.requests = 0
+        self.spent = 0
+        self.waited = 0
+        self.calibrated = 0
+
+    def get_loop(self):
+        return self.loop or asyncio.get_event_loop()
 
-    async def looper(self):
-        last_timestamp = time() * 1000
-        while self.running:
-            future, cost = self.queue[0]
+    def refill(self, now):
+        if self.last_timestamp is not None:
+            elapsed = now - self.last_timestamp
+            tokens = self.config['tokens']
+            capacity = self.config['capacity']
+            if elapsed > 0 and tokens < capacity:
+                # tokens above the capacity are only given in the config and spent first
+                self.config['tokens'] = min(tokens + elapsed * self.config['refillRate'], capacity)
+        self.last_timestamp = now
+
+    def wake(self):
+        self.timer = None
+        loop = self.get_loop()
+        now = loop.time() * 1000
+        self.refill(now)
+        queue = self.queue
+        borrow = self.config['borrow']
+        while queue:
+            future, cost, timestamp = queue[0]
+            if future.done():
+                # cancelled while waiting, nothing to spend
+                queue.popleft()
+                continue
             cost = self.config['cost'] if cost is None else cost
-            if self.config['tokens'] >= 0:
-                self.config['tokens'] -= cost
-                if not future.done():
-                    future.set_result(None)
-                self.queue.popleft()
-                # context switch
-                await asyncio.sleep(0)
-                if len(self.queue) == 0:
-                    self.running = False
-            else:
-                await asyncio.sleep(self.config['delay'])
-                now = time() * 1000
-                elapsed = now - last_timestamp
-                last_timestamp = now
-                self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
+            # without borrowing the tokens must cover the cost, a cost above the capacity waits for a full bucket
+            required = 0 if borrow else min(cost, self.config['capacity'])
+            tokens = self.config['tokens']
+            if tokens < required - EPSILON:
+                delay = (required - tokens) / self.config['refillRate']
+                self.timer = loop.call_later(delay / 1000, self.wake)
+                return
+            queue.popleft()
+            self.config['tokens'] -= cost
+            self.requests += 1
+            self.spent += cost
+            self.waited += now - timestamp
+            future.set_result(None)
+        self.running = False
+
+    def calibrate(self, remaining, window):
+        # the server accepts `remaining` more cost until its window resets in `window` milliseconds
+        # a borrowing bucket paces the requests, it is held to what it can spend by the reset
+        # a bucket that does not borrow keeps its burst until the server has nothing left
+        # the tokens are only ever lowered, the requests in flight are not counted by the server yet
+        self.refill(self.get_loop().time() * 1000)
+        if self.config['borrow'] or remaining <= 0:
+            limit = remaining - window * self.config['refillRate']
+        else:
+            limit = remaining
+        if limit < self.config['tokens']:
+            # a pending wake-up finds the bucket short and schedules the next one
+            self.config['tokens'] = limit
+            self.calibrated += 1
+
+    def stats(self):
+        return {
+            'tokens': self.config['tokens'],
+            'capacity': self.config['capacity'],
+            'queued': len(self.queue),
+            'requests': self.requests,
+            'cost': self.spent,
+            'waited': self.waited,  # total milliseconds spent in the queue
+            'calibrated': self.calibrated,  # times the tokens were lowered to the usage reported by the server
+        }
 
     def __call__(self, cost=None):
-        future = asyncio.Future()
+        loop = self.get_loop()
+        future = loop.create_future()
         if len(self.queue) > self.config['maxCapacity']:
             raise RuntimeError('throttle queue is over maxCapacity (' + str(int(self.config['maxCapacity'])) + '), see https://github.com/ccxt/ccxt/issues/11645#issuecomment-1195695526')
-        self.queue.append((future, cost))
+        self.queue.append((future, cost, loop.time() * 1000))
         if not self.running:
+            # requests are granted in order, a request only waits for the ones queued before it
             self.running = True
-            asyncio.ensure_future(self.looper(), loop=self.loop)
+            self.wake()
         return future
@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import json
+import zlib
 from asyncio import sleep, ensure_future
 from aiohttp import WSMsgType
 from .functions import milliseconds, iso8601, is_json_encoded_object
 from ccxt.async_support.base.ws.client import Client
-from ccxt.async_support.base.ws.functions import gunzip, inflate
+from ccxt.async_support.base.ws.functions import gunzip_bytes, inflate_bytes
 from ccxt import NetworkError, RequestTimeout
 
 
@@ -14,6 +15,9 @@ class AiohttpClient(Client):
     def closed(self):
         return (self.connection is None) or self.connection.closed
 
+    decode_json = None  # set by the exchange, see ccxt.base.json_decoder
+    decompressor = None  # the zlib stream of an inflateStream connection
+
     def receive(self):
         return self.connection.receive()
 
@@ -21,11 +25,21 @@ class AiohttpClient(Client):
     def handle_text_or_binary_message(self, data):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'message', data)
-        if isinstance(data, bytes):
-            data = data.decode()
-        decoded = json.loads(data) if is_json_encoded_object(data) else data
+        if is_json_encoded_object(data):
+            # the decoders read bytes directly, binary frames are not decoded to str first
+            decoded = (self.decode_json or json.loads)(data)
+        elif isinstance(data, bytes):
+            decoded = data.decode()
+        else:
+            decoded = data
         self.on_message_callback(self, decoded)
 
+    def inflate_stream(self, data):
+        # one decompressor per connection keeps the window of the previous frames
+        if self.decompressor is None:
+            self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self.decompressor.decompress(data)
+
     def handle_message(self, message):
         # self.log(iso8601(milliseconds()), message)
         if message.type == WSMsgType.TEXT:
@@ -33,9 +47,11 @@ class AiohttpClient(Client):
         elif message.type == WSMsgType.BINARY:
             data = message.data
             if self.gunzip:
-                data = gunzip(data)
+                data = gunzip_bytes(data)
+            elif self.inflateStream:
+                data = self.inflate_stream(data)
             elif self.inflate:
-                data = inflate(data)
+                data = inflate_bytes(data)
             self.handle_text_or_binary_message(data)
         # autoping is responsible for automatically replying with pong
         # to a ping incoming from a server, we have to disable autoping
@@ -71,6 +87,7 @@ class AiohttpClient(Client):
         # otherwise aiohttp's websockets client won't trigger WSMsgType.PONG
         # call aenter here to simulate async with otherwise we get the error "await not called with future"
         # if connecting to a non-existent endpoint
+        self.decompressor = None
         return session.ws_connect(self.url, autoping=False, autoclose=False, headers=self.options.get('headers')).__aenter__()
 
     def send(self, message):
@@ -1,3 +1,4 @@
+import itertools
 import collections
 
 
@@ -120,12 +121,69 @@ class ArrayCacheByTimestamp(BaseCache):
         self._new_updates = len(self._size_tracker)
 
 
+class ItemsBySymbolById(object):
+    # the deque of an ArrayCacheBySymbolById, the items in the order of their last update
+    # keyed by (symbol, id) to update, move to the back and evict an item in constant time
+
+    def __init__(self, maxlen=None):
+        self.maxlen = maxlen
+        self._items = collections.OrderedDict()
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __reversed__(self):
+        return reversed(self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items.values()
+
+    def _key(self, index):
+        # walks from the nearest end, constant time for the first and the last items
+        length = len(self._items)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError('deque index out of range')
+        if index < length // 2:
+            return next(itertools.islice(iter(self._items), index, None))
+        return next(itertools.islice(reversed(self._items), length - 1 - index, None))
+
+    def __getitem__(self, index):
+        return self._items[self._key(index)]
+
+    def __setitem__(self, index, item):
+        self._items[self._key(index)] = item
+
+    def __delitem__(self, index):
+        del self._items[self._key(index)]
+
+    def append(self, key, item):
+        self._items[key] = item
+
+    def move_to_end(self, key, item):
+        self._items.pop(key, None)
+        self._items[key] = item
+
+    def popleft(self):
+        return self._items.popitem(last=False)[1]
+
+    def remove(self, key):
+        self._items.pop(key, None)
+
+    def clear(self):
+        self._items.clear()
+
+
 class ArrayCacheBySymbolById(ArrayCache):
     def __init__(self, max_size=None):
         super(ArrayCacheBySymbolById, self).__init__(max_size)
         self._nested_new_updates_by_symbol = True
         self.hashmap = {}
-        self._index = collections.deque([], max_size)
+        self._deque = ItemsBySymbolById(max_size)
 
     def append(self, item):
         by_id = self.hashmap.setdefault(item['symbol'], {})
@@ -134,17 +192,13 @@ class ArrayCacheBySymbolById(ArrayCache):
             if reference != item:
                 reference.update(item)
             item = reference
-            index = self._index.index(item['id'])
-            del self._deque[index]
-            del self._index[index]
+            self._deque.move_to_end((item['symbol'], item['id']), item)
         else:
             by_id[item['id']] = item
-        if len(self._deque) == self._deque.maxlen:
-            delete_item = self._deque.popleft()
-            self._index.popleft()
-            del self.hashmap[delete_item['symbol']][delete_item['id']]
-        self._deque.append(item)
-        self._index.append(item['id'])
+            if len(self._deque) == self._deque.maxlen:
+                delete_item = self._deque.popleft()
+                del self.hashmap[delete_item['symbol']][delete_item['id']]
+            self._deque.append((item['symbol'], item['id']), item)
         if self._clear_all_updates:
             self._clear_all_updates = False
             self._clear_updates_by_symbol.clear()
@@ -160,3 +214,42 @@ class ArrayCacheBySymbolById(ArrayCache):
         id_set.add(item['id'])
         after_length = len(id_set)
         self._all_new_updates = (self._all_new_updates or 0) + (after_length - before_length)
+
+
+class ArrayCacheBySymbolByIdPerSymbol(ArrayCacheBySymbolById):
+    # up to max_size items of each symbol instead of in total
+    # the items retain() returns True for are never evicted, the oldest of the others are
+    # the orders are indexed by clientOrderId as well
+    def __init__(self, max_size=None, retain=None):
+        super(ArrayCacheBySymbolByIdPerSymbol, self).__init__()
+        self.max_size = max_size
+        self.retain = retain
+        self.hashmap_by_client_order_id = {}
+        self._evictable = {}  # the ids that can be evicted by symbol, the oldest update first
+
+    def append(self, item):
+        super(ArrayCacheBySymbolByIdPerSymbol, self).append(item)
+        symbol = item['symbol']
+        by_id = self.hashmap[symbol]
+        item = by_id[item['id']]
+        evictable = self._evictable.get(symbol)
+        if evictable is None:
+            evictable = self._evictable[symbol] = collections.OrderedDict()
+        evictable.pop(item['id'], None)
+        if self.max_size is not None:
+            # the item itself is kept, it is the latest update of the symbol
+            while len(by_id) > self.max_size and evictable:
+                delete_id = evictable.popitem(last=False)[0]
+                delete_item = by_id.pop(delete_id)
+                self._deque.remove((symbol, delete_id))
+                delete_client_order_id = delete_item.get('clientOrderId')
+                if self.hashmap_by_client_order_id.get(delete_client_order_id) is delete_item:
+                    del self.hashmap_by_client_order_id[delete_client_order_id]
+        if self.retain is None or not self.retain(item):
+            evictable[item['id']] = True
+        client_order_id = item.get('clientOrderId')
+        if client_order_id is not None:
+            self.hashmap_by_client_order_id[client_order_id] = item
+
+    def get_by_client_order_id(self, client_order_id):
+        return self.hashmap_by_client_order_id.get(client_order_id)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from asyncio import sleep, ensure_future, wait_for, TimeoutError
+from asyncio import Future as AsyncioFuture
 from .functions import milliseconds, iso8601, deep_extend
 from ccxt import NetworkError, RequestTimeout, NotSupported
 from ccxt.async_support.base.ws.future import Future
@@ -13,6 +14,10 @@ class Client(object):
     futures = {}
     options = {}  # ws-specific options
     subscriptions = {}
+    subscribe_messages = {}  # the message sent for each subscription, replayed after a reconnect
+    pending_subscribe_messages = []  # the (message, future) pairs sent packed in the next loop iteration
+    resolutions = {}  # the resolve() calls per message hash since the last rebalance of the shards
+    message_hashes = {}  # the message hashes watched through each subscription, they differ from its subscribe hash on some exchanges
     rejections = {}
     on_message_callback = None
     on_error_callback = None
@@ -33,17 +38,30 @@ class Client(object):
     verbose = False  # verbose output
     gunzip = False
     inflate = False
+    # binary frames continue one raw deflate stream for the lifetime of the connection, set with options['ws']['inflateStream']
+    # opt-in, the exchanges of this tree send text frames (bingx subscribes with binary: 'false')
+    inflateStream = False
     throttle = None
     connecting = False
     asyncio_loop = None
     ping_looper = None
     receive_looper = None
+    reconnect = False  # reopen the connection and replay the subscriptions instead of rejecting the futures
+    reconnectDelay = 1000  # ms, the first backoff, doubled after every failed attempt
+    maxReconnectDelay = 30000  # ms
+    maxReconnectAttempts = None  # the futures are rejected after that many failed attempts, None to retry forever
+    reconnecting = False
+    authenticationHashes = [None, 'auth', 'authenticated', 'login']  # the subscriptions that log a connection in
 
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         defaults = {
             'url': url,
             'futures': {},
             'subscriptions': {},
+            'subscribe_messages': {},
+            'pending_subscribe_messages': [],
+            'resolutions': {},
+            'message_hashes': {},
             'rejections': {},
             'on_message_callback': on_message_callback,
             'on_error_callback': on_error_callback,
@@ -73,6 +91,7 @@ class Client(object):
     def resolve(self, result, message_hash):
         if self.verbose and message_hash is None:
             self.log(iso8601(milliseconds()), 'resolve received None messageHash')
+        self.resolutions[message_hash] = self.resolutions.get(message_hash, 0) + 1
         if message_hash in self.futures:
             future = self.futures[message_hash]
             future.resolve(result)
@@ -165,7 +184,19 @@ class Client(object):
             ensure_future(self.close(code), loop=self.asyncio_loop)
 
     def reset(self, error):
-        self.reject(error)
+        if not self.resumable():
+            self.reject(error)
+
+    def resumable(self):
+        # the futures of a resumable connection are kept for the reconnect, see Exchange.reconnect_client()
+        # a connection that is logged in is not, the login of the old connection cannot be replayed
+        return self.reconnect and not self.logged_in()
+
+    def logged_in(self):
+        for message_hash, subscription in self.subscriptions.items():
+            if message_hash in self.authenticationHashes or isinstance(subscription, AsyncioFuture):
+                return True
+        return False
 
     async def ping_loop(self):
         if self.verbose:
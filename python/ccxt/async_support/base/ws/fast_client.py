@@ -17,6 +17,8 @@ class FastClient(AiohttpClient):
         self.callback_scheduled = False
 
     def receive_loop(self):
+        current = self.connection
+
         def handler():
             if not self.stack:
                 self.callback_scheduled = False
@@ -26,13 +28,17 @@ class FastClient(AiohttpClient):
             self.asyncio_loop.call_soon(handler)
 
         def feed_data(message, size):
+            if self.connection is not current:
+                # the rest of a connection replaced by a reconnect
+                return
             if not self.callback_scheduled:
                 self.callback_scheduled = True
                 self.asyncio_loop.call_soon(handler)
             self.stack.append(message)
 
         def feed_eof():
-            self.on_error(NetworkError(1006))
+            if self.connection is current:
+                self.on_error(NetworkError(1006))
 
         def wrapper(func):
             def parse_frame(buf):
@@ -68,6 +74,9 @@ class FastClient(AiohttpClient):
             return
         self.transport = connection.transport
         ws_reader = connection.protocol._payload_parser
+        if not hasattr(ws_reader, 'parse_frame'):
+            # the reader of aiohttp >= 3.11 has no parse_frame to hook, the messages are read with receive()
+            return super(FastClient, self).receive_loop()
         ws_reader.parse_frame = wrapper(ws_reader.parse_frame)
         ws_reader.queue.feed_data = feed_data
         ws_reader.queue.feed_eof = feed_eof
@@ -1,15 +1,32 @@
 # -*- coding: utf-8 -*-
 
-from zlib import decompress, MAX_WBITS
+from zlib import decompress, decompressobj, MAX_WBITS
 from base64 import b64decode
-from gzip import GzipFile
-from io import BytesIO
 import time
 import datetime
 
 
+# the *_bytes variants skip the str round trip, the json decoders read bytes directly
+
+def inflate_bytes(data):
+    return decompress(data, -MAX_WBITS)
+
+
+def gunzip_bytes(data):
+    # zlib with a gzip header, no GzipFile and BytesIO per frame
+    # reads every member like GzipFile, members are concatenated and may be padded with zeroes
+    decompressor = decompressobj(16 + MAX_WBITS)
+    result = decompressor.decompress(data)
+    rest = decompressor.unused_data.lstrip(b'\x00')
+    while rest:
+        decompressor = decompressobj(16 + MAX_WBITS)
+        result += decompressor.decompress(rest)
+        rest = decompressor.unused_data.lstrip(b'\x00')
+    return result
+
+
 def inflate(data):
-    return decompress(data, -MAX_WBITS).decode('utf-8')
+    return inflate_bytes(data).decode('utf-8')
 
 
 def inflate64(data):
@@ -17,7 +34,7 @@ def inflate64(data):
 
 
 def gunzip(data):
-    return GzipFile('', 'rb', 9, BytesIO(data)).read().decode('utf-8')
+    return gunzip_bytes(data).decode('utf-8')
 
 
 #  Tmp : added methods below to avoid circular imports between exchange.py and aiohttp.py
@@ -41,6 +58,8 @@ def iso8601(timestamp=None):
 
 
 def is_json_encoded_object(input):
+    if isinstance(input, (bytes, bytearray)):
+        return (len(input) >= 2) and ((input[0] == 123) or (input[0] == 91))  # { or [
     return (isinstance(input, str) and
             (len(input) >= 2) and
             ((input[0] == '{') or (input[0] == '[')))
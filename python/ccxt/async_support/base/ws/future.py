@@ -1,4 +1,5 @@
 import asyncio
+import functools
 
 
 class Future(asyncio.Future):
@@ -10,3 +11,29 @@ class Future(asyncio.Future):
     def reject(self, error=None):
         if not self.done():
             self.set_exception(error)
+
+    @classmethod
+    def race(cls, futures, keys=None):
+        # settles with the first of the futures that is done, see Exchange.watch_multiple()
+        # with keys it resolves with the [key, result] pair of that future
+        future = cls()
+        callbacks = []
+
+        def settle(done, key=None):
+            if future.done():
+                return
+            # the futures still pending do not hold on to this race
+            for pending, callback in callbacks:
+                pending.remove_done_callback(callback)
+            if done.cancelled():
+                future.cancel()
+            elif done.exception() is not None:
+                future.reject(done.exception())
+            else:
+                future.resolve(done.result() if keys is None else [key, done.result()])
+
+        for i in range(0, len(futures)):
+            callback = functools.partial(settle, key=None if keys is None else keys[i])
+            callbacks.append((futures[i], callback))
+            futures[i].add_done_callback(callback)
+        return future
@@ -6,6 +6,8 @@ import sys
 
 
 class OrderBook(dict):
+    views = False  # limit() returns a view() instead of the book, see Exchange.order_book_views()
+
     def __init__(self, snapshot={}, depth=None):
         self.cache = []
         depth = depth or sys.maxsize
@@ -30,17 +32,51 @@ class OrderBook(dict):
     def limit(self):
         self['asks'].limit()
         self['bids'].limit()
+        return self.view() if self.views else self
+
+    def view(self):
+        return OrderBookView(self)
+
+    # -------------------------------------------------------------------------
+    # okx, bitget and blofin send a signed crc32 of the top levels interleaved as
+    # bidPrice:bidSize:askPrice:askSize:... built from the strings they publish
+
+    def retain_raw(self):
+        self['asks'].retain_raw()
+        self['bids'].retain_raw()
         return self
 
+    def retainRaw(self):
+        # the name the transpiled exchanges call
+        return self.retain_raw()
+
+    def checksum(self, depth=25):
+        bids = self['bids'].checksum_levels(depth)
+        asks = self['asks'].checksum_levels(depth)
+        cached = getattr(self, '_checksum', None)
+        if cached is not None and cached[0] is bids and cached[1] is asks:
+            # neither side changed within the top levels
+            return cached[2]
+        payload = []
+        for i in range(max(len(bids), len(asks))):
+            if i < len(bids):
+                payload.append(bids[i])
+            if i < len(asks):
+                payload.append(asks[i])
+        value = Exchange.crc32(':'.join(payload), True)
+        self._checksum = (bids, asks, value)
+        return value
+
+    def checksum_due(self, interval=1):
+        # counts the messages, a checksum is verified on every interval-th one
+        self._checksum_count = getattr(self, '_checksum_count', 0) + 1
+        return interval <= 1 or self._checksum_count % interval == 0
+
     def reset(self, snapshot={}):
-        self['asks']._index.clear()
         self['asks'].clear()
-        for ask in snapshot.get('asks', []):
-            self['asks'].storeArray(ask)
-        self['bids']._index.clear()
+        self['asks'].apply_levels(snapshot.get('asks', []))
         self['bids'].clear()
-        for bid in snapshot.get('bids', []):
-            self['bids'].storeArray(bid)
+        self['bids'].apply_levels(snapshot.get('bids', []))
         self['nonce'] = snapshot.get('nonce')
         self['timestamp'] = snapshot.get('timestamp')
         self['datetime'] = Exchange.iso8601(self['timestamp'])
@@ -52,6 +88,55 @@ class OrderBook(dict):
             return self
         self.reset(snapshot)
 
+# -----------------------------------------------------------------------------
+# a read-only snapshot of an order book that does not trim or copy the book
+# the sides share their chunks with the book until the next delta touches them
+
+
+class OrderBookView(dict):
+    def __init__(self, orderbook):
+        super(OrderBookView, self).__init__({
+            'bids': orderbook['bids'].view(),
+            'asks': orderbook['asks'].view(),
+            'timestamp': orderbook['timestamp'],
+            'datetime': orderbook['datetime'],
+            'nonce': orderbook['nonce'],
+            'symbol': orderbook['symbol'],
+        })
+
+    def top(self, limit=None):
+        return {
+            'bids': self['bids'].top(limit),
+            'asks': self['asks'].top(limit),
+        }
+
+    def best_bid(self):
+        return self['bids'].best()
+
+    def best_ask(self):
+        return self['asks'].best()
+
+    def depth(self, side, price):
+        return self[side].depth(price)
+
+    def mid(self):
+        bid = self.best_bid()
+        ask = self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def microprice(self):
+        # the mid weighted by the size on the opposite side of the top of the book
+        bid = self.best_bid()
+        ask = self.best_ask()
+        if bid is None or ask is None:
+            return None
+        size = bid[1] + ask[1]
+        if not size:
+            return None
+        return (bid[0] * ask[1] + ask[0] * bid[1]) / size
+
 # -----------------------------------------------------------------------------
 # overwrites absolute volumes at price levels
 # or deletes price levels based on order counts (3rd value in a bidask delta)
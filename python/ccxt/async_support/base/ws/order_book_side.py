@@ -2,70 +2,515 @@
 
 import sys
 import bisect
+import itertools
+from ccxt.base.decimal_to_precision import number_to_string
+from ccxt.base.errors import NotSupported
 
 """Author: Carlo Revelli"""
 """Fast bisect bindings"""
 """https://github.com/python/cpython/blob/master/Modules/_bisectmodule.c"""
 """Performs a binary search when inserting keys in sorted order"""
 
+# -----------------------------------------------------------------------------
+# price levels are stored in sorted chunks of at most 2 * LOAD levels
+# an insert or a delete bisects the chunk maxima, then the chunk itself
+# and only shifts the entries of that one chunk, so deep books (thousands
+# of levels) no longer memmove the whole side on every delta
+
+LOAD = 256
+
+# a batch of at least len(side) / MERGE_RATIO levels is sort-merged in one pass
+# smaller batches are bisected level by level
+
+MERGE_RATIO = 16
+
+TOUCHED_NONE = float('inf')
+
+
+def to_number(value):
+    # exchanges send raw levels as strings, the order book stores floats
+    return float(value) if isinstance(value, str) else value
+
+
+class ChunkedRows(object):
+    # read access shared by the order book sides and their views
+    # subclasses provide self._rows (a list of row chunks) and self._length
+
+    _offsets = None  # chunk start positions, rebuilt on demand
+
+    def _position(self, index):
+        # translates a flat index into a (chunk, position) pair
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError('order book side index out of range')
+        first = len(self._rows[0])
+        if index < first:
+            return 0, index
+        if self._offsets is None:
+            self._offsets = list(itertools.accumulate(len(rows) for rows in self._rows))
+        i = bisect.bisect_right(self._offsets, index)
+        return i, index - self._offsets[i - 1]
+
+    def _slice(self, start, stop):
+        if start >= stop:
+            return []
+        i, j = self._position(start)
+        result = []
+        remaining = stop - start
+        rows = self._rows
+        while remaining > 0:
+            chunk = rows[i][j:j + remaining]
+            result.extend(chunk)
+            remaining -= len(chunk)
+            i += 1
+            j = 0
+        return result
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return itertools.islice(itertools.chain.from_iterable(self._rows), self._length)
+
+    def __reversed__(self):
+        return reversed(self._slice(0, self._length))
+
+    def __contains__(self, item):
+        return any(row == item for row in self)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._length)
+            if step == 1:
+                return self._slice(start, stop)
+            return [self[i] for i in range(start, stop, step)]
+        else:
+            i, j = self._position(item)
+            return self._rows[i][j]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __add__(self, other):
+        return list(self) + list(other)
 
-class OrderBookSide(list):
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __mul__(self, count):
+        return list(self) * count
+
+    __rmul__ = __mul__
+
+    def __lt__(self, other):
+        return list(self) < list(other)
+
+    def __le__(self, other):
+        return list(self) <= list(other)
+
+    def __gt__(self, other):
+        return list(self) > list(other)
+
+    def __ge__(self, other):
+        return list(self) >= list(other)
+
+    def copy(self):
+        return list(self)
+
+    def to_list(self):
+        return list(self)
+
+    def count(self, item):
+        return sum(1 for row in self if row == item)
+
+    def index(self, item, start=0, stop=sys.maxsize):
+        start, stop, _ = slice(start, stop).indices(self._length)
+        for index, row in enumerate(itertools.islice(self, start, stop), start):
+            if row == item:
+                return index
+        raise ValueError('level is not in the order book side')
+
+    def __repr__(self):
+        return str(list(self))
+
+
+class OrderBookSideView(ChunkedRows, tuple):
+    # a read-only snapshot of an order book side
+    # it holds the chunks of the side at the moment it was taken, the side copies
+    # a chunk before changing it again, so the view is not affected by later deltas
+    # the inherited tuple storage is empty, json and pprint read the rows through __iter__ and __repr__
+    __hash__ = None
+
+    def __new__(cls, rows, length, side):
+        return super(OrderBookSideView, cls).__new__(cls)
+
+    def __init__(self, rows, length, side):
+        self._rows = rows
+        self._length = length
+        self.side = side
+
+    def __reduce__(self):
+        return self.__class__, (self._rows, self._length, self.side)
+
+    def top(self, limit=None):
+        return self._slice(0, self._length if limit is None else min(limit, self._length))
+
+    def best(self):
+        return self._rows[0][0] if self._length else None
+
+    def depth(self, price):
+        # cumulative size of the levels at the given price or better
+        total = 0
+        for row in self:
+            if (row[0] < price) if self.side else (row[0] > price):
+                break
+            total += row[1]
+        return total
+
+
+class OrderBookSide(ChunkedRows, list):
     side = None  # set to True for bids and False for asks
 
     def __init__(self, deltas=[], depth=None):
         super(OrderBookSide, self).__init__()
         self._depth = depth or sys.maxsize
-        self._n = sys.maxsize
-        # parallel to self
-        self._index = []
-        for delta in deltas:
-            self.storeArray(list(delta))
+        self._keys = []  # sorted chunks of index prices
+        self._rows = []  # chunks of price levels, parallel to self._keys
+        self._maxes = []  # the last index price of every chunk
+        self._shared = []  # whether a chunk is referenced by a view
+        self._length = 0
+        self._raw = None  # index price -> 'price:size' as sent by the exchange, see retain_raw()
+        self._touched = TOUCHED_NONE  # the best index price changed since checksum_levels() was last built
+        self._checksum_levels = None
+        self._checksum_depth = 0
+        self._checksum_cutoff = TOUCHED_NONE
+        self.apply_levels(deltas)
+
+    # -------------------------------------------------------------------------
+    # chunked storage
+
+    def _bisect(self, index_price):
+        # returns the chunk and the position inside the chunk where index_price is or would be inserted
+        maxes = self._maxes
+        i = bisect.bisect_left(maxes, index_price)
+        if i == len(maxes):
+            return i, 0
+        return i, bisect.bisect_left(self._keys[i], index_price)
+
+    def _find(self, index_price):
+        i, j = self._bisect(index_price)
+        found = i < len(self._maxes) and self._keys[i][j] == index_price
+        return i, j, found
+
+    def _own(self, i):
+        # copy-on-write, views keep the previous chunk and its rows
+        self._rows[i] = [list(row) for row in self._rows[i]]
+        self._shared[i] = False
+
+    def _insert(self, i, j, index_price, delta):
+        if index_price < self._touched:
+            self._touched = index_price
+        if self._raw is not None:
+            self._raw.pop(index_price, None)
+        if not self._maxes:
+            self._keys.append([index_price])
+            self._rows.append([delta])
+            self._maxes.append(index_price)
+            self._shared.append(False)
+        else:
+            if i == len(self._maxes):
+                i -= 1
+                j = len(self._keys[i])
+            if self._shared[i]:
+                self._own(i)
+            keys = self._keys[i]
+            rows = self._rows[i]
+            keys.insert(j, index_price)
+            rows.insert(j, delta)
+            self._maxes[i] = keys[-1]
+            if len(keys) > 2 * LOAD:
+                self._keys.insert(i + 1, keys[LOAD:])
+                self._rows.insert(i + 1, rows[LOAD:])
+                del keys[LOAD:]
+                del rows[LOAD:]
+                self._maxes.insert(i + 1, self._keys[i + 1][-1])
+                self._maxes[i] = keys[-1]
+                self._shared.insert(i + 1, False)
+        self._length += 1
+        self._offsets = None
+
+    def _delete(self, i, j):
+        if self._shared[i]:
+            self._own(i)
+        keys = self._keys[i]
+        if keys[j] < self._touched:
+            self._touched = keys[j]
+        if self._raw is not None:
+            self._raw.pop(keys[j], None)
+        del keys[j]
+        del self._rows[i][j]
+        if keys:
+            self._maxes[i] = keys[-1]
+        else:
+            del self._keys[i]
+            del self._rows[i]
+            del self._maxes[i]
+            del self._shared[i]
+        self._length -= 1
+        self._offsets = None
+
+    def _merge(self, prices, sizes):
+        side = self.side
+        # the last update of a price level wins, same as applying them one by one
+        updates = {}
+        for price, size in zip(prices, sizes):
+            price = to_number(price)
+            updates[-price if side else price] = to_number(size)
+        incoming = sorted(updates)
+        count = len(incoming)
+        if count and incoming[0] < self._touched:
+            self._touched = incoming[0]
+        u = 0
+        keys = []
+        rows = []
+        for chunk_keys, chunk_rows, shared in zip(self._keys, self._rows, self._shared):
+            for key, row in zip(chunk_keys, chunk_rows):
+                while u < count and incoming[u] < key:
+                    index_price = incoming[u]
+                    size = updates[index_price]
+                    if size:
+                        keys.append(index_price)
+                        rows.append([-index_price if side else index_price, size])
+                    u += 1
+                if shared:
+                    row = list(row)
+                if u < count and incoming[u] == key:
+                    size = updates[key]
+                    u += 1
+                    if not size:
+                        continue
+                    row[1] = size
+                keys.append(key)
+                rows.append(row)
+        for index_price in incoming[u:]:
+            size = updates[index_price]
+            if size:
+                keys.append(index_price)
+                rows.append([-index_price if side else index_price, size])
+        self._keys = [keys[i:i + LOAD] for i in range(0, len(keys), LOAD)]
+        self._rows = [rows[i:i + LOAD] for i in range(0, len(rows), LOAD)]
+        self._maxes = [chunk[-1] for chunk in self._keys]
+        self._shared = [False] * len(self._keys)
+        self._offsets = None
+        self._length = len(keys)
+
+    # -------------------------------------------------------------------------
+
+    def _merges(self, count):
+        return count > MERGE_RATIO and count * MERGE_RATIO >= self._length
+
+    def apply_deltas(self, prices, sizes):
+        # applies a batch of absolute [price, size] levels given as parallel arrays of strings or numbers
+        if self._merges(len(prices)):
+            self._merge(prices, sizes)
+        else:
+            store = self.storeArray
+            for price, size in zip(prices, sizes):
+                store([to_number(price), to_number(size)])
+        if self._raw is not None:
+            self._retain(prices, sizes)
+
+    def apply_levels(self, levels, price_key=0, size_key=1):
+        # same as apply_deltas() for a list of levels as sent by the exchange
+        if self._merges(len(levels)):
+            self._merge([level[price_key] for level in levels], [level[size_key] for level in levels])
+        else:
+            store = self.storeArray
+            for level in levels:
+                store([to_number(level[price_key]), to_number(level[size_key])])
+        if self._raw is not None:
+            self._retain([level[price_key] for level in levels], [level[size_key] for level in levels])
+
+    # -------------------------------------------------------------------------
+    # checksums are computed over the strings the exchange sent, '0.10' is not '0.1'
+    # so the raw levels are kept next to the parsed ones once retain_raw() is called
+
+    def retain_raw(self):
+        # the strings of the levels fed through apply_levels() or apply_deltas(), any other write drops them
+        if self._raw is None:
+            self._raw = {}
+            self._checksum_levels = None
+
+    def _retain(self, prices, sizes):
+        # a level given as numbers has no raw string, checksum_levels() formats the stored numbers instead
+        raw = self._raw
+        side = self.side
+        for price, size in zip(prices, sizes):
+            index_price = to_number(price)
+            if side:
+                index_price = -index_price
+            if isinstance(price, str) and isinstance(size, str) and float(size):
+                raw[index_price] = price + ':' + size
+            else:
+                raw.pop(index_price, None)
+
+    def checksum_levels(self, depth):
+        # the top depth levels formatted as 'price:size', rebuilt only when a delta touched them
+        levels = self._checksum_levels
+        touched = self._touched
+        if levels is not None and depth == self._checksum_depth and (touched == TOUCHED_NONE or touched > self._checksum_cutoff):
+            return levels
+        raw = self._raw or {}
+        side = self.side
+        levels = []
+        cutoff = TOUCHED_NONE
+        for row in itertools.islice(self, depth):
+            index_price = -row[0] if side else row[0]
+            level = raw.get(index_price)
+            if level is None:
+                level = number_to_string(row[0]) + ':' + number_to_string(row[1])
+            levels.append(level)
+            cutoff = index_price
+        if len(levels) < depth:
+            # a thin side changes with any new level
+            cutoff = TOUCHED_NONE
+        self._checksum_levels = levels
+        self._checksum_depth = depth
+        self._checksum_cutoff = cutoff
+        self._touched = TOUCHED_NONE
+        return levels
 
     def storeArray(self, delta):
         price = delta[0]
         size = delta[1]
         index_price = -price if self.side else price
-        index = bisect.bisect_left(self._index, index_price)
+        # inlined self._find() on the hot path
+        maxes = self._maxes
+        i = bisect.bisect_left(maxes, index_price)
+        j = 0
+        found = False
+        if i < len(maxes):
+            keys = self._keys[i]
+            j = bisect.bisect_left(keys, index_price)
+            found = keys[j] == index_price
         if size:
-            if index < len(self._index) and self._index[index] == index_price:
-                self[index][1] = size
+            if found:
+                if self._shared[i]:
+                    self._own(i)
+                if index_price < self._touched:
+                    self._touched = index_price
+                if self._raw is not None:
+                    self._raw.pop(index_price, None)
+                self._rows[i][j][1] = size
             else:
-                self._index.insert(index, index_price)
-                self.insert(index, delta)
-        elif index < len(self._index) and self._index[index] == index_price:
-            del self._index[index]
-            del self[index]
+                self._insert(i, j, index_price, delta)
+        elif found:
+            self._delete(i, j)
 
     def store(self, price, size):
         self.storeArray([price, size])
 
+    def applyLevels(self, levels, *keys):
+        # the name the transpiled exchanges call, like storeArray()
+        return self.apply_levels(levels, *keys)
+
     def limit(self):
         difference = len(self) - self._depth
         for _ in range(difference):
             self.remove_index(self.pop())
-            self._index.pop()
 
     def remove_index(self, order):
         pass
 
-    def __len__(self):
-        length = super(OrderBookSide, self).__len__()
-        return min(length, self._n)
+    def view(self):
+        # constant memory snapshot of the side up to its depth, no rows are copied here
+        self._shared = [True] * len(self._rows)
+        return OrderBookSideView(tuple(self._rows), min(self._length, self._depth), self.side)
 
-    def __getitem__(self, item):
+    def pop(self, index=-1):
+        i, j = self._position(index)
+        order = self._rows[i][j]
+        self._delete(i, j)
+        return order
+
+    def clear(self):
+        self._keys = []
+        self._rows = []
+        self._maxes = []
+        self._shared = []
+        self._offsets = None
+        self._length = 0
+        if self._raw is not None:
+            self._raw = {}
+        self._touched = TOUCHED_NONE
+        self._checksum_levels = None
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._rows)
+
+    def __reversed__(self):
+        return itertools.chain.from_iterable(reversed(rows) for rows in reversed(self._rows))
+
+    def __reduce__(self):
+        # the inherited list storage is unused, so copies are rebuilt from the instance state
+        return self.__class__, ((), self._depth), self.__dict__
+
+    # -------------------------------------------------------------------------
+    # the inherited list storage is unused, the list methods that change it are
+    # routed to the chunks, a level always goes to the position of its price
+
+    def append(self, delta):
+        self.storeArray(list(delta))
+
+    def extend(self, deltas):
+        for delta in deltas:
+            self.storeArray(list(delta))
+
+    def insert(self, index, delta):
+        self.storeArray(list(delta))
+
+    def __iadd__(self, deltas):
+        self.extend(deltas)
+        return self
+
+    def __imul__(self, count):
+        # storing the same levels again changes nothing
+        if count <= 0:
+            self.clear()
+        return self
+
+    def __setitem__(self, item, value):
+        del self[item]
         if isinstance(item, slice):
-            start, stop, step = item.indices(len(self))
-            return [self[i] for i in range(start, stop, step)]
+            self.extend(value)
         else:
-            return super(OrderBookSide, self).__getitem__(item)
+            self.append(value)
 
-    def __eq__(self, other):
-        if isinstance(other, list):
-            return list(self) == other
-        return super(OrderBookSide, self).__eq__(other)
+    def remove(self, item):
+        self.pop(self.index(item))
 
-    def __repr__(self):
-        return str(list(self))
+    def __delitem__(self, item):
+        if isinstance(item, slice):
+            for index in sorted(range(*item.indices(self._length)), reverse=True):
+                self.pop(index)
+        else:
+            self.pop(item)
+
+    def sort(self, key=None, reverse=False):
+        # the levels are kept best price first, another order is not a valid side
+        if key is not None or reverse:
+            raise ValueError(type(self).__name__ + ' is sorted by price, it cannot be sorted by another key')
+
+    def reverse(self):
+        if self._length > 1:
+            raise ValueError(type(self).__name__ + ' is sorted by price, it cannot be reversed')
 
 # -----------------------------------------------------------------------------
 # overwrites absolute volumes at price levels
@@ -82,21 +527,40 @@ class CountedOrderBookSide(OrderBookSide):
         size = delta[1]
         count = delta[2]
         index_price = -price if self.side else price
-        index = bisect.bisect_left(self._index, index_price)
+        i, j, found = self._find(index_price)
         if size and count:
-            if index < len(self._index) and self._index[index] == index_price:
-                self[index][1] = size
-                self[index][2] = count
+            if found:
+                if self._shared[i]:
+                    self._own(i)
+                if index_price < self._touched:
+                    self._touched = index_price
+                if self._raw is not None:
+                    self._raw.pop(index_price, None)
+                row = self._rows[i][j]
+                row[1] = size
+                row[2] = count
             else:
-                self._index.insert(index, index_price)
-                self.insert(index, delta)
-        elif index < len(self._index) and self._index[index] == index_price:
-            del self._index[index]
-            del self[index]
+                self._insert(i, j, index_price, delta)
+        elif found:
+            self._delete(i, j)
 
     def store(self, price, size, count):
         self.storeArray([price, size, count])
 
+    def apply_deltas(self, prices, sizes, counts=None):
+        # the counts of the levels come as a third parallel array, they are stored one by one
+        if counts is None:
+            raise NotSupported(type(self).__name__ + ' apply_deltas() requires the counts of the levels')
+        store = self.storeArray
+        for price, size, count in zip(prices, sizes, counts):
+            store([to_number(price), to_number(size), to_number(count)])
+        if self._raw is not None:
+            self._retain(prices, sizes)
+
+    def apply_levels(self, levels, price_key=0, size_key=1, count_key=2):
+        # levels carry a count, they are stored one by one
+        self.apply_deltas([level[price_key] for level in levels], [level[size_key] for level in levels], [level[count_key] for level in levels])
+
 # -----------------------------------------------------------------------------
 # indexed by order ids (3rd value in a bidask delta)
 
@@ -106,6 +570,22 @@ class IndexedOrderBookSide(OrderBookSide):
         self._hashmap = {}
         super(IndexedOrderBookSide, self).__init__(deltas, depth)
 
+    def _find_order(self, index_price, order_id):
+        # several orders can rest at the same price, scan the run of equal keys
+        i, j = self._bisect(index_price)
+        while i < len(self._keys):
+            keys = self._keys[i]
+            rows = self._rows[i]
+            while j < len(keys):
+                if keys[j] != index_price:
+                    return None
+                if rows[j][2] == order_id:
+                    return i, j
+                j += 1
+            i += 1
+            j = 0
+        return None
+
     def storeArray(self, delta):
         price = delta[0]
         if price is not None:
@@ -120,38 +600,61 @@ class IndexedOrderBookSide(OrderBookSide):
                 index_price = index_price or old_price
                 # in case the price is not defined
                 delta[0] = abs(index_price)
+                location = self._find_order(old_price, order_id)
                 # matches if price is not defined or if price matches
                 if index_price == old_price:
-                    # just overwrite the old index
-                    index = bisect.bisect_left(self._index, index_price)
-                    self._index[index] = index_price
-                    self[index] = delta
-                    return
-                else:
+                    # just overwrite the old level
+                    if location is not None:
+                        i, j = location
+                        if self._shared[i]:
+                            self._own(i)
+                        if index_price < self._touched:
+                            self._touched = index_price
+                        if self._raw is not None:
+                            self._raw.pop(index_price, None)
+                        self._rows[i][j] = delta
+                        return
+                elif location is not None:
                     # remove old price level
-                    old_index = bisect.bisect_left(self._index, old_price)
-                    del self._index[old_index]
-                    del self[old_index]
+                    self._delete(*location)
             # insert new price level
             self._hashmap[order_id] = index_price
-            index = bisect.bisect_left(self._index, index_price)
-            self._index.insert(index, index_price)
-            self.insert(index, delta)
+            i, j = self._bisect(index_price)
+            self._insert(i, j, index_price, delta)
         elif order_id in self._hashmap:
             old_price = self._hashmap[order_id]
-            index = bisect.bisect_left(self._index, old_price)
-            del self._index[index]
-            del self[index]
+            location = self._find_order(old_price, order_id)
+            if location is not None:
+                self._delete(*location)
             del self._hashmap[order_id]
 
     def remove_index(self, order):
+        super(IndexedOrderBookSide, self).remove_index(order)
         order_id = order[2]
         if order_id in self._hashmap:
             del self._hashmap[order_id]
 
+    def clear(self):
+        super(IndexedOrderBookSide, self).clear()
+        self._hashmap = {}
+
     def store(self, price, size, order_id):
         self.storeArray([price, size, order_id])
 
+    def apply_deltas(self, prices, sizes, order_ids=None):
+        # the order ids come as a third parallel array, they are stored one by one as they are
+        if order_ids is None:
+            raise NotSupported(type(self).__name__ + ' apply_deltas() requires the order ids of the levels')
+        store = self.storeArray
+        for price, size, order_id in zip(prices, sizes, order_ids):
+            store([to_number(price), to_number(size), order_id])
+        if self._raw is not None:
+            self._retain(prices, sizes)
+
+    def apply_levels(self, levels, price_key=0, size_key=1, id_key=2):
+        # levels carry an order id, they are stored one by one
+        self.apply_deltas([level[price_key] for level in levels], [level[size_key] for level in levels], [level[id_key] for level in levels])
+
 # -----------------------------------------------------------------------------
 # a more elegant syntax is possible here, but native inheritance is portable
 
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+# routes incoming websocket messages to their handlers by a channel or topic key
+#
+#     exact     {'tickers': handler}               the key equals the route
+#     prefix    {'candle': handler}                the key starts with the route
+#     contains  {'orderbook': handler}             the key contains the route, checked in order
+#
+# the routes are declared once per exchange instance, every key seen on the wire
+# is resolved once and then served from a dict, unknown keys are cached as misses
+# hits are counted per route, see Exchange.message_router_stats()
+
+MAX_RESOLVED = 4096
+
+
+class MessageRouter(object):
+    def __init__(self, exact=None, prefix=None, contains=None, extractor=None):
+        self.exact = dict(exact or {})
+        # the longest prefix wins
+        self.prefix = sorted((prefix or {}).items(), key=lambda route: len(route[0]), reverse=True)
+        self.contains = list((contains or {}).items())
+        self.extractor = extractor
+        self.hits = {}
+        self._resolved = {}
+
+    def _lookup(self, key):
+        if key in self.exact:
+            return key, self.exact[key]
+        for route, handler in self.prefix:
+            if key.startswith(route):
+                return route, handler
+        for route, handler in self.contains:
+            if key.find(route) >= 0:
+                return route, handler
+        return None
+
+    def resolve(self, key):
+        # returns the (route, handler) pair for a key or None
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable keys are never routed
+            return None
+        if not isinstance(key, str):
+            return None
+        if len(self._resolved) >= MAX_RESOLVED:
+            # keys carry symbols and intervals, bound the cache if they are unbounded
+            self._resolved.clear()
+        resolved = self._resolved[key] = self._lookup(key)
+        return resolved
+
+    def dispatch(self, client, message, key=None):
+        # calls the handler for the key, or for the key returned by the extractor
+        # returns a (routed, result) pair so that the caller can fall through
+        if key is None and self.extractor is not None:
+            key = self.extractor(message)
+        resolved = self.resolve(key)
+        if resolved is None:
+            return False, None
+        route, handler = resolved
+        self.hits[route] = self.hits.get(route, 0) + 1
+        return True, handler(client, message)
+
+    def reset_hits(self):
+        self.hits = {}
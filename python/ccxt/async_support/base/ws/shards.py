@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+# spreads the subscriptions of one websocket url over several connections, see Exchange.shard_url()
+#
+#     max_topics        the subscriptions one connection takes, the venue limit of topics per connection
+#     max_rate          the messages per second one connection should stay under, measured per subscription
+#     max_connections   the connections opened for the url
+#
+# shard 0 is the url itself, shard n connects to the same url as url#n, the fragment is not sent
+# a new subscription goes to the first shard with room, a new shard is opened when none has room
+# rebalance() moves the busiest subscriptions off the shards above max_rate
+
+
+class ShardManager(object):
+    def __init__(self, url, max_topics=None, max_rate=None, max_connections=8, measured=0):
+        self.url = url
+        self.max_topics = max_topics
+        self.max_rate = max_rate
+        self.max_connections = max_connections
+        self.shards = [set()]  # the subscribe hashes of each shard
+        self.rates = [0]  # the messages per second of each shard at the last rebalance()
+        self.assignments = {}  # subscribe hash -> shard index
+        self.measured = measured  # the timestamp of the last rebalance()
+        self.rebalancing = False
+
+    def shard_url(self, index):
+        return self.url if index == 0 else self.url + '#' + str(index)
+
+    def assign(self, subscribe_hash):
+        index = self.assignments.get(subscribe_hash)
+        if index is None:
+            index = self.pick()
+            self.add(subscribe_hash, index)
+        return index
+
+    def add(self, subscribe_hash, index):
+        if index == len(self.shards):
+            self.shards.append(set())
+            self.rates.append(0)
+        self.shards[index].add(subscribe_hash)
+        self.assignments[subscribe_hash] = index
+
+    def release(self, subscribe_hash):
+        index = self.assignments.pop(subscribe_hash, None)
+        if index is not None:
+            self.shards[index].discard(subscribe_hash)
+        return index
+
+    def has_room(self, index, rate=0):
+        if (self.max_topics is not None) and (len(self.shards[index]) >= self.max_topics):
+            return False
+        if (self.max_rate is not None) and (rate > 0) and (self.rates[index] + rate > self.max_rate):
+            return False
+        return True
+
+    def pick(self, rate=0, exclude=None):
+        # the first shard with room, a new shard when none has room and the connections allow it,
+        # the least busy shard otherwise
+        indices = [index for index in range(0, len(self.shards)) if index != exclude]
+        for index in indices:
+            if self.has_room(index, rate):
+                return index
+        if len(self.shards) < self.max_connections:
+            return len(self.shards)
+        if not indices:
+            return exclude
+        return min(indices, key=lambda index: (self.rates[index], len(self.shards[index])))
+
+    def rebalance(self, rates, movable=None):
+        # rates is the messages per second of every subscribe hash
+        # returns the (subscribe hash, source, target) moves, the assignments are updated already
+        self.rates = [sum(rates.get(subscribe_hash, 0) for subscribe_hash in shard) for shard in self.shards]
+        moves = []
+        if self.max_rate is None:
+            return moves
+        for source in range(0, len(self.shards)):
+            busiest = sorted(self.shards[source], key=lambda subscribe_hash: rates.get(subscribe_hash, 0), reverse=True)
+            for subscribe_hash in busiest:
+                if (self.rates[source] <= self.max_rate) or (len(self.shards[source]) < 2):
+                    break
+                rate = rates.get(subscribe_hash, 0)
+                target = self.pick(rate, source)
+                targetRate = self.rates[target] if target < len(self.shards) else 0
+                if (target == source) or (targetRate + rate >= self.rates[source]):
+                    # no quieter shard
+                    continue
+                if (movable is not None) and not movable(subscribe_hash, source):
+                    continue
+                self.release(subscribe_hash)
+                self.add(subscribe_hash, target)
+                self.rates[source] -= rate
+                self.rates[target] += rate
+                moves.append((subscribe_hash, source, target))
+        return moves
@@ -40,6 +40,19 @@ class binance(Exchange):
             'name': 'Binance',
             'countries': ['JP', 'MT'],  # Japan, Malta
             'rateLimit': 50,
+            # order counts are limited separately from the request weight
+            # https://binance-docs.github.io/apidocs/spot/en/#limits
+            'rateLimitBuckets': {
+                # the request weight per minute of each api, see options['rateLimitWeights']
+                'weight': {'capacity': 1200, 'interval': 60000},
+                'fapiWeight': {'capacity': 2400, 'interval': 60000},
+                'dapiWeight': {'capacity': 2400, 'interval': 60000},
+                'orders10s': {'capacity': 50, 'interval': 10000},
+                'ordersDay': {'capacity': 160000, 'interval': 86400000},
+                'fapiOrders10s': {'capacity': 300, 'interval': 10000},
+                'fapiOrders1m': {'capacity': 1200, 'interval': 60000},
+                'dapiOrders1m': {'capacity': 1200, 'interval': 60000},
+            },
             'certified': True,
             'pro': True,
             # new metainfo interface
@@ -606,8 +619,8 @@ class binance(Exchange):
                     },
                     'post': {
                         'positionSide/dual': 1,
-                        'order': 4,
-                        'batchOrders': 5,
+                        'order': {'cost': 4, 'buckets': {'dapiOrders1m': 1}},
+                        'batchOrders': {'cost': 5, 'buckets': {'dapiOrders1m': 5}},
                         'countdownCancelAll': 10,
                         'leverage': 1,
                         'marginType': 1,
@@ -616,8 +629,8 @@ class binance(Exchange):
                     },
                     'put': {
                         'listenKey': 1,
-                        'order': 1,
-                        'batchOrders': 5,
+                        'order': {'cost': 1, 'buckets': {'dapiOrders1m': 1}},
+                        'batchOrders': {'cost': 5, 'buckets': {'dapiOrders1m': 5}},
                     },
                     'delete': {
                         'order': 1,
@@ -696,11 +709,11 @@ class binance(Exchange):
                         'pmAccountInfo': 5,
                     },
                     'post': {
-                        'batchOrders': 5,
+                        'batchOrders': {'cost': 5, 'buckets': {'fapiOrders10s': 5, 'fapiOrders1m': 5}},
                         'positionSide/dual': 1,
                         'positionMargin': 1,
                         'marginType': 1,
-                        'order': 4,
+                        'order': {'cost': 4, 'buckets': {'fapiOrders10s': 1, 'fapiOrders1m': 1}},
                         'leverage': 1,
                         'listenKey': 1,
                         'countdownCancelAll': 10,
@@ -814,9 +827,9 @@ class binance(Exchange):
                         'myPreventedMatches': 1,
                     },
                     'post': {
-                        'order/oco': 1,
-                        'order': 1,
-                        'order/cancelReplace': 1,
+                        'order/oco': {'cost': 1, 'buckets': {'orders10s': 2, 'ordersDay': 2}},
+                        'order': {'cost': 1, 'buckets': {'orders10s': 1, 'ordersDay': 1}},
+                        'order/cancelReplace': {'cost': 1, 'buckets': {'orders10s': 1, 'ordersDay': 1}},
                         'order/test': 1,
                     },
                     'delete': {
@@ -914,6 +927,24 @@ class binance(Exchange):
             # exchange-specific options
             'options': {
                 'sandboxMode': False,
+                # the usage headers are matched to the buckets by the api in the url
+                # the order counts are keyed by the interval in the header name
+                'rateLimitHeaders': {
+                    'api': {'weight': 'weight', 'orders': {'10S': 'orders10s', '1D': 'ordersDay'}},
+                    'fapi': {'weight': 'fapiWeight', 'orders': {'10S': 'fapiOrders10s', '1M': 'fapiOrders1m'}},
+                    'dapi': {'weight': 'dapiWeight', 'orders': {'1M': 'dapiOrders1m'}},
+                },
+                # the endpoint cost is the request weight, it is drawn from the weight bucket of its api
+                'rateLimitWeights': {
+                    'public': 'weight',
+                    'private': 'weight',
+                    'fapiPublic': 'fapiWeight',
+                    'fapiPrivate': 'fapiWeight',
+                    'fapiPrivateV2': 'fapiWeight',
+                    'dapiPublic': 'dapiWeight',
+                    'dapiPrivate': 'dapiWeight',
+                    'dapiPrivateV2': 'dapiWeight',
+                },
                 'fetchMarkets': [
                     'spot',  # allows CORS in browsers
                     'linear',  # allows CORS in browsers
@@ -2531,10 +2562,13 @@ class binance(Exchange):
         :param str symbol: unified symbol of the market to fetch the order book for
         :param int|None limit: the maximum amount of order book entries to return
         :param dict params: extra parameters specific to the binance api endpoint
+        :param bool|None params['columnar']: python only, True to return the prices and amounts of each side as columns
         :returns dict: A dictionary of `order book structures <https://docs.ccxt.com/#/?id=order-book-structure>` indexed by market symbols
         """
         await self.load_markets()
         market = self.market(symbol)
+        columnar = False
+        columnar, params = self.handle_option_and_params(params, 'fetchOrderBook', 'columnar', False)
         request = {
             'symbol': market['id'],
         }
@@ -2585,7 +2619,7 @@ class binance(Exchange):
         #     }
         #
         timestamp = self.safe_integer(response, 'T')
-        orderbook = self.parse_order_book(response, symbol, timestamp)
+        orderbook = self.bulk_parse_order_book(response, symbol, timestamp, 'bids', 'asks', 0, 1, columnar)
         orderbook['nonce'] = self.safe_integer_2(response, 'lastUpdateId', 'u')
         return orderbook
 
@@ -2963,12 +2997,20 @@ class binance(Exchange):
         :param int|None since: timestamp in ms of the earliest candle to fetch
         :param int|None limit: the maximum amount of candles to fetch
         :param dict params: extra parameters specific to the binance api endpoint
+        :param bool|None params['columnar']: python only, True to return the candles in an OHLCV, a typed array per column, see columnar.py
         :param str|None params['price']: "mark" or "index" for mark price and index price candles
         :param int|None params['until']: timestamp in ms of the latest candle to fetch
+        :param bool|None params['paginate']: True to fetch the candles from since to until in windows of 1000 at once, see Exchange.fetchPaginatedCallDeterministic()
         :returns [[int]]: A list of candles ordered, open, high, low, close, volume
         """
         await self.load_markets()
+        paginate = False
+        paginate, params = self.handle_option_and_params(params, 'fetchOHLCV', 'paginate')
+        if paginate:
+            return await self.fetch_paginated_call_deterministic('fetchOHLCV', symbol, since, limit, timeframe, params, 1000)
         market = self.market(symbol)
+        columnar = False
+        columnar, params = self.handle_option_and_params(params, 'fetchOHLCV', 'columnar', False)
         # binance docs say that the default limit 500, max 1500 for futures, max 1000 for spot markets
         # the reality is that the time range wider than 500 candles won't work right
         defaultLimit = 500
@@ -3044,7 +3086,7 @@ class binance(Exchange):
         #         }
         #     ]
         #
-        return self.parse_ohlcvs(response, market, timeframe, since, limit)
+        return self.bulk_parse_ohlcvs(response, market, timeframe, since, limit, [0, 1, 2, 3, 4, 5], columnar)
 
     def parse_trade(self, trade, market=None):
         if 'isDustTrade' in trade:
@@ -3245,10 +3287,13 @@ class binance(Exchange):
         :param int|None since: timestamp in ms of the earliest trade to fetch
         :param int|None limit: the maximum amount of trades to fetch
         :param dict params: extra parameters specific to the binance api endpoint
+        :param bool|None params['columnar']: python only, True to return the timestamps, prices, amounts, ids and sides of the trades as columns
         :returns [dict]: a list of `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>`
         """
         await self.load_markets()
         market = self.market(symbol)
+        columnar = False
+        columnar, params = self.handle_option_and_params(params, 'fetchTrades', 'columnar', False)
         request = {
             'symbol': market['id'],
             # 'fromId': 123,    # ID to get aggregate trades from INCLUSIVE.
@@ -3327,6 +3372,16 @@ class binance(Exchange):
         #         },
         #     ]
         #
+        if columnar:
+            # the buyer is the maker of a sell
+            keys = {'timestamp': 'time', 'price': 'price', 'amount': 'qty', 'id': 'id', 'side': 'isBuyerMaker'}
+            sides = {'true': 'sell', 'false': 'buy'}
+            if method.find('AggTrades') >= 0:
+                keys = {'timestamp': 'T', 'price': 'p', 'amount': 'q', 'id': 'a', 'side': 'm'}
+            elif market['option']:
+                keys = {'timestamp': 'time', 'price': 'price', 'amount': 'qty', 'id': 'id', 'side': 'side'}
+                sides = {'1': 'buy', '-1': 'sell'}
+            return self.bulk_parse_trades(response, market, since, limit, {}, keys, sides, columnar)
         return self.parse_trades(response, market, since, limit)
 
     async def edit_order(self, id, symbol, type, side, amount, price=None, params={}):
@@ -3947,10 +4002,15 @@ class binance(Exchange):
         :param int|None limit: the maximum number of  orde structures to retrieve
         :param dict params: extra parameters specific to the binance api endpoint
         :param str|None params['marginMode']: 'cross' or 'isolated', for spot margin trading
+        :param bool|None params['paginate']: True to fetch the orders from since page by page by orderId, see Exchange.fetchPaginatedCallCursor()
         :returns [dict]: a list of `order structures <https://docs.ccxt.com/#/?id=order-structure>`
         """
         self.check_required_symbol('fetchOrders', symbol)
         await self.load_markets()
+        paginate = False
+        paginate, params = self.handle_option_and_params(params, 'fetchOrders', 'paginate')
+        if paginate:
+            return await self.fetch_paginated_call_cursor('fetchOrders', symbol, since, limit, params, 'orderId', 'orderId', 1, 1000)
         market = self.market(symbol)
         defaultType = self.safe_string_2(self.options, 'fetchOrders', 'defaultType', 'spot')
         type = self.safe_string(params, 'type', defaultType)
@@ -4222,9 +4282,14 @@ class binance(Exchange):
         :param int|None since: the earliest time in ms to fetch trades for
         :param int|None limit: the maximum number of trades structures to retrieve
         :param dict params: extra parameters specific to the binance api endpoint
+        :param bool|None params['paginate']: True to fetch the trades from since page by page by fromId, see Exchange.fetchPaginatedCallCursor()
         :returns [dict]: a list of `trade structures <https://docs.ccxt.com/#/?id=trade-structure>`
         """
         await self.load_markets()
+        paginate = False
+        paginate, params = self.handle_option_and_params(params, 'fetchMyTrades', 'paginate')
+        if paginate:
+            return await self.fetch_paginated_call_cursor('fetchMyTrades', symbol, since, limit, params, 'id', 'fromId', 1, 1000)
         request = {}
         market = None
         type = None
@@ -5639,9 +5704,14 @@ class binance(Exchange):
         :param int|None limit: the maximum amount of `funding rate structures <https://docs.ccxt.com/en/latest/manual.html?#funding-rate-history-structure>` to fetch
         :param dict params: extra parameters specific to the binance api endpoint
         :param int|None params['until']: timestamp in ms of the latest funding rate
+        :param bool|None params['paginate']: True to fetch the funding rates from since to until in windows of 1000 at once, see Exchange.fetchPaginatedCallDeterministic()
         :returns [dict]: a list of `funding rate structures <https://docs.ccxt.com/en/latest/manual.html?#funding-rate-history-structure>`
         """
         await self.load_markets()
+        paginate = False
+        paginate, params = self.handle_option_and_params(params, 'fetchFundingRateHistory', 'paginate')
+        if paginate:
+            return await self.fetch_paginated_call_deterministic('fetchFundingRateHistory', symbol, since, limit, '8h', params, 1000)
         request = {}
         method = None
         defaultType = self.safe_string_2(self.options, 'fetchFundingRateHistory', 'defaultType', 'future')
@@ -6769,6 +6839,40 @@ class binance(Exchange):
         }
         return self.safe_string(ledgerType, type, type)
 
+    def parse_rate_limit_headers(self, headers, url, method):
+        #
+        #     X-MBX-USED-WEIGHT-1M: 420
+        #     X-MBX-ORDER-COUNT-10S: 3
+        #     X-MBX-ORDER-COUNT-1D: 17
+        #
+        rateLimitHeaders = self.safe_value(self.options, 'rateLimitHeaders', {})
+        apis = list(rateLimitHeaders.keys())
+        limits = None
+        for i in range(0, len(apis)):
+            if url.find('/' + apis[i] + '/') >= 0:
+                limits = rateLimitHeaders[apis[i]]
+                break
+        if limits is None:
+            return None
+        orders = self.safe_value(limits, 'orders', {})
+        keys = list(headers.keys())
+        result = {}
+        for i in range(0, len(keys)):
+            header = keys[i]
+            name = header.upper()
+            bucket = None
+            if name == 'X-MBX-USED-WEIGHT-1M':
+                bucket = limits['weight']
+            elif name.find('X-MBX-ORDER-COUNT-') == 0:
+                # the interval follows the prefix, 10S, 1M or 1D
+                bucket = self.safe_string(orders, name[18:])
+            if bucket is not None:
+                result[bucket] = {
+                    'used': self.safe_float(headers, header),
+                    'interval': self.rateLimitBuckets[bucket]['interval'],
+                }
+        return result
+
     def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
         if not (api in self.urls['api']):
             raise NotSupported(self.id + ' does not have a testnet/sandbox URL for ' + api + ' endpoints')
@@ -6890,6 +6994,17 @@ class binance(Exchange):
         if not success:
             raise ExchangeError(self.id + ' ' + body)
 
+    def calculate_rate_limiter_buckets(self, api, method, path, params, config={}, context={}):
+        # the weight of the endpoint is drawn from the bucket of its api as well as from the rateLimit one
+        buckets = self.safe_value(config, 'buckets', {})
+        rateLimitWeights = self.safe_value(self.options, 'rateLimitWeights', {})
+        bucket = self.safe_string(rateLimitWeights, api)
+        if bucket is None:
+            return buckets
+        weight = {}
+        weight[bucket] = self.calculate_rate_limiter_cost(api, method, path, params, config, context)
+        return self.extend(buckets, weight)
+
     def calculate_rate_limiter_cost(self, api, method, path, params, config={}, context={}):
         if ('noCoin' in config) and not ('coin' in params):
             return config['noCoin']
@@ -826,6 +826,8 @@ class bitget(Exchange):
         })
 
     def set_sandbox_mode(self, enabled):
+        # the base market store key tells the sandbox markets apart by the sandboxMode option
+        self.options['sandboxMode'] = enabled
         currSubTypes = self.get_sub_types()
         if enabled:
             self.options['subTypesBackup'] = currSubTypes
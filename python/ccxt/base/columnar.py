@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+import math
+import bisect
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'OHLCV',
+    'OHLCVC',
+    'float_or_nan',
+    'integer_array',
+    'number_array',
+    'parse_integer_column',
+    'parse_number_column',
+    'since_limit_range',
+    'sorted_order',
+]
+
+# -----------------------------------------------------------------------------
+# a response of rows parsed one column at a time, see Exchange.bulk_parse_ohlcvs()
+#
+# a column is parsed with float() in one pass, the way safe_number() parses one value
+# when the numbers are floats, a missing or malformed value raises and the caller
+# parses the response row by row instead
+#
+# the columnar results are numpy arrays when numpy is installed, array.array otherwise
+# the candles are kept in an OHLCV, one typed array per column instead of a list per candle
+
+
+def parse_number_column(rows, key):
+    return [float(row[key]) for row in rows]
+
+
+def parse_integer_column(rows, key):
+    # the way safe_integer() handles "100.0"
+    return [int(float(row[key])) for row in rows]
+
+
+def number_array(values):
+    if numpy is not None:
+        return numpy.array(values, dtype=numpy.float64)
+    return array('d', values)
+
+
+def float_or_nan(value):
+    return math.nan if value is None else float(value)
+
+
+def integer_array(values):
+    if numpy is not None:
+        return numpy.array(values, dtype=numpy.int64)
+    return array('q', values)
+
+
+def sorted_order(keys, descending=False):
+    # the positions in the stable order of keys, None when the keys are in that order already
+    length = len(keys)
+    if descending:
+        if all(keys[i] >= keys[i + 1] for i in range(length - 1)):
+            return None
+    elif all(keys[i] <= keys[i + 1] for i in range(length - 1)):
+        return None
+    if descending:
+        # reversed twice to keep the equal keys in their order
+        order = sorted(range(length - 1, -1, -1), key=keys.__getitem__)
+        order.reverse()
+        return order
+    return sorted(range(length), key=keys.__getitem__)
+
+
+def since_limit_range(timestamps, since=None, limit=None, tail=False, start=0):
+    # the positions filter_by_since_limit() keeps of the sorted timestamps from start
+    positions = range(start, len(timestamps))
+    if since is not None:
+        positions = range(bisect.bisect_left(timestamps, since, start), len(timestamps))
+    if limit is not None:
+        positions = positions[-limit:] if tail else positions[:limit]
+    return slice(positions.start, positions.stop)
+
+
+class OHLCV(object):
+    # the candles in the order of their timestamps, a typed array per column
+    # with max_size the oldest candles are dropped the way ArrayCacheByTimestamp drops them
+    # a candle reads as the usual list, the missing numbers are nan
+
+    names = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+    typecodes = ['q', 'd', 'd', 'd', 'd', 'd']
+
+    def __init__(self, ohlcvs=None, max_size=None):
+        self.max_size = max_size
+        self._columns = [array(typecode) for typecode in self.typecodes]
+        self._start = 0  # the dropped candles are deleted from the arrays in batches
+        self._size_tracker = set()
+        self._new_updates = 0
+        self._clear_updates = False
+        if ohlcvs is not None:
+            for ohlcv in ohlcvs:
+                self._store(ohlcv)
+
+    @classmethod
+    def from_columns(cls, columns):
+        # the columns of sorted candles, as lists of numbers without None
+        result = cls()
+        result._columns = [array(typecode, column) for typecode, column in zip(cls.typecodes, columns)]
+        return result
+
+    def _value(self, i, value):
+        if self.typecodes[i] == 'q':
+            return 0 if value is None else int(value)
+        return float_or_nan(value)
+
+    def append(self, ohlcv):
+        timestamp = ohlcv[0]
+        if timestamp is None:
+            return
+        self._store(ohlcv)
+        if self._clear_updates:
+            self._clear_updates = False
+            self._size_tracker.clear()
+        self._size_tracker.add(timestamp)
+        self._new_updates = len(self._size_tracker)
+
+    def _store(self, ohlcv):
+        timestamp = ohlcv[0]
+        if timestamp is None:
+            return
+        columns = self._columns
+        timestamps = columns[0]
+        length = len(timestamps)
+        width = min(len(ohlcv), len(columns))
+        if length > self._start and timestamp <= timestamps[-1]:
+            index = length - 1
+            if timestamp != timestamps[index]:
+                index = bisect.bisect_left(timestamps, timestamp, self._start)
+            if timestamps[index] == timestamp:
+                # an update of a candle, usually the last one
+                for i in range(1, width):
+                    columns[i][index] = self._value(i, ohlcv[i])
+            else:
+                for i in range(0, len(columns)):
+                    columns[i].insert(index, self._value(i, ohlcv[i] if i < width else None))
+        else:
+            for i in range(0, len(columns)):
+                columns[i].append(self._value(i, ohlcv[i] if i < width else None))
+        if self.max_size is not None:
+            excess = len(timestamps) - self._start - self.max_size
+            if excess > 0:
+                self._start += excess
+                if self._start >= self.max_size:
+                    for column in columns:
+                        del column[0:self._start]
+                    self._start = 0
+
+    def extend(self, ohlcvs):
+        for ohlcv in ohlcvs:
+            self.append(ohlcv)
+
+    def getLimit(self, symbol, limit):
+        self._clear_updates = True
+        if limit is None:
+            return self._new_updates
+        return min(self._new_updates, limit)
+
+    def _copy(self, start, stop):
+        result = type(self)()
+        result._columns = [column[start:stop] for column in self._columns]
+        return result
+
+    def filter_by_since_limit(self, since=None, limit=None, tail=False):
+        kept = since_limit_range(self._columns[0], since, limit, tail, self._start)
+        return self._copy(kept.start, kept.stop)
+
+    def column(self, name):
+        column = self._columns[self.names.index(name)][self._start:]
+        if self.typecodes[self.names.index(name)] == 'q':
+            return integer_array(column)
+        return number_array(column)
+
+    def columns(self):
+        return dict((name, self.column(name)) for name in self.names)
+
+    def to_list(self):
+        return [list(ohlcv) for ohlcv in zip(*[column[self._start:].tolist() for column in self._columns])]
+
+    def __len__(self):
+        return len(self._columns[0]) - self._start
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __getitem__(self, item):
+        length = len(self)
+        if isinstance(item, slice):
+            start, stop, step = item.indices(length)
+            if step != 1:
+                return self.to_list()[item]
+            return self._copy(self._start + start, self._start + max(start, stop))
+        if item < 0:
+            item += length
+        if item < 0 or item >= length:
+            raise IndexError('OHLCV index out of range')
+        return [column[self._start + item] for column in self._columns]
+
+    def __eq__(self, other):
+        return self.to_list() == (other.to_list() if isinstance(other, OHLCV) else other)
+
+    def __repr__(self):
+        return str(self.to_list())
+
+
+class OHLCVC(OHLCV):
+    # the candles built from trades, with the number of trades of each candle
+    names = OHLCV.names + ['count']
+    typecodes = OHLCV.typecodes + ['q']
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+from types import MappingProxyType
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'DescribedAttribute',
+    'freeze',
+    'thaw',
+]
+
+# -----------------------------------------------------------------------------
+# describe() merged with the class attributes is computed once per exchange class
+# and kept read-only, each instance copies a section the first time it is used
+# an instance that never touches its api or exceptions never copies them
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    # tuples only come from frozen lists, describe() does not use them
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class DescribedAttribute(object):
+    # a non-data descriptor, once the copy is stored in the instance dict it is no longer called
+    def __init__(self, name, default):
+        self.name = name
+        self.default = default  # what the class had before, returned for the class itself
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.default
+        described = owner.__dict__.get('described')
+        if described is None or self.name not in described:
+            # a subclass that has not been described yet
+            return self.default
+        value = instance.__dict__[self.name] = thaw(described[self.name])
+        return value
@@ -22,12 +22,18 @@ from ccxt.base.errors import ArgumentsRequired
 from ccxt.base.errors import BadSymbol
 from ccxt.base.errors import NullResponse
 from ccxt.base.errors import RateLimitExceeded
+from ccxt.base.errors import BadRequest
 
 # -----------------------------------------------------------------------------
 
 from ccxt.base.decimal_to_precision import decimal_to_precision
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE, NO_PADDING, TRUNCATE, ROUND, ROUND_UP, ROUND_DOWN
 from ccxt.base.decimal_to_precision import number_to_string
+from ccxt.base.describe_cache import DescribedAttribute, freeze
+from ccxt.base.market_store import MARKET_TABLE, market_store
+from ccxt.base.market_cache import market_cache_schema, read_market_cache, write_market_cache
+from ccxt.base.columnar import OHLCV, OHLCVC, float_or_nan, integer_array, number_array, parse_integer_column, parse_number_column, since_limit_range, sorted_order
+from ccxt.base.json_decoder import json_decoder
 from ccxt.base.precise import Precise
 
 # -----------------------------------------------------------------------------
@@ -64,18 +70,22 @@ import base64
 import binascii
 import calendar
 import collections
+import copy
 import datetime
 from email.utils import parsedate
 import functools
 import gzip
 import hashlib
 import hmac
+import inspect
 import io
 import json
 import math
+import os
 import random
 from numbers import Number
 import re
+import threading
 from requests import Session
 from requests.utils import default_user_agent
 from requests.exceptions import HTTPError, Timeout, TooManyRedirects, RequestException, ConnectionError as requestsConnectionError
@@ -161,6 +171,9 @@ class Exchange(object):
     token = ''  # reserved for HTTP auth in some cases
     twofa = None
     markets_by_id = None
+    markets_by_id_and_type = None  # see safe_market_by_id()
+    resolvedMarkets = None  # memoized by market(), see resolve_market()
+    resolvedMarketsLimit = 100000  # the resolutions kept before they are dropped
     currencies_by_id = None
     precision = None
     exceptions = None
@@ -339,6 +352,7 @@ class Exchange(object):
     minFundingAddressLength = 1  # used in check_address
     substituteCommonCurrencyCodes = True
     quoteJsonNumbers = True
+    jsonDecoder = None  # 'orjson', 'simdjson', 'ujson' or 'json', the fastest installed one by default, REST uses it with quoteJsonNumbers = False only
     number = float  # or str (a pointer to a class)
     handleContentTypeApplicationZip = False
     # whether fees should be summed by currency code
@@ -348,8 +362,20 @@ class Exchange(object):
     restRequestQueue = None
     restPollerLoopIsRunning = False
     rateLimitTokens = 16
+    # named buckets on top of rateLimit, endpoints consume them with {'buckets': {'orders10s': 1}} in their config
+    # {'orders10s': {'capacity': 50, 'interval': 10000}} allows 50 units every 10 seconds
+    rateLimitBuckets = {}
+    # whether the async buckets are lowered to the usage reported in the response headers, see parse_rate_limit_headers()
+    calibrateRateLimit = True
     rateLimitMaxTokens = 16
     rateLimitUpdateTime = 0
+    # whether the instances with the same id share one market table, see market_store.py
+    shareMarkets = False
+    # a directory to keep the markets in between restarts, see market_cache.py
+    marketsCache = None
+    marketsCacheTTL = 3600000  # milliseconds, older markets are refreshed in the background
+    markets_refreshing = None  # the thread of the background refresh of the sync instances
+    markets_refreshed = None  # its result, applied by the next load_markets() on the calling thread
     enableLastHttpResponse = True
     enableLastJsonResponse = True
     enableLastResponseHeaders = True
@@ -376,19 +402,6 @@ class Exchange(object):
         self.aiohttp_trust_env = self.aiohttp_trust_env or self.trust_env
         self.requests_trust_env = self.requests_trust_env or self.trust_env
 
-        self.precision = dict() if self.precision is None else self.precision
-        self.limits = dict() if self.limits is None else self.limits
-        self.exceptions = dict() if self.exceptions is None else self.exceptions
-        self.headers = dict() if self.headers is None else self.headers
-        self.balance = dict() if self.balance is None else self.balance
-        self.orderbooks = dict() if self.orderbooks is None else self.orderbooks
-        self.tickers = dict() if self.tickers is None else self.tickers
-        self.trades = dict() if self.trades is None else self.trades
-        self.transactions = dict() if self.transactions is None else self.transactions
-        self.positions = dict() if self.positions is None else self.positions
-        self.ohlcvs = dict() if self.ohlcvs is None else self.ohlcvs
-        self.currencies = dict() if self.currencies is None else self.currencies
-        self.options = self.get_default_options() if self.options is None else self.options  # Python does not allow to define properties in run-time with setattr
         self.decimal_to_precision = decimal_to_precision
         self.number_to_string = number_to_string
 
@@ -400,33 +413,32 @@ class Exchange(object):
         self.origin = self.uuid()
         self.userAgent = default_user_agent()
 
-        settings = self.deep_extend(self.describe(), config)
-
-        for key in settings:
-            if hasattr(self, key) and isinstance(getattr(self, key), dict):
-                setattr(self, key, self.deep_extend(getattr(self, key), settings[key]))
-            else:
-                setattr(self, key, settings[key])
-
-        if self.api:
-            self.define_rest_api(self.api, 'request')
+        # describe() is merged with the class attributes once per class, see describe_class()
+        # the instance copies a section from cls.described when it is first used
+        cls = type(self)
+        if 'described' not in cls.__dict__:
+            self.describe_class()
+        for key in [key for key in self.__dict__ if key in cls.described]:
+            # set above, describe() takes precedence
+            del self.__dict__[key]
+
+        for key in config:
+            setattr(self, key, self.deep_extend(getattr(self, key, None), config[key]))
+
+        # the endpoint methods are set on the class, they are generated by its first instance
+        # an instance with its own api in the config generates them again for the whole class
+        if 'api' in config or not cls.__dict__.get('rest_api_defined', False):
+            if self.api:
+                self.define_rest_api(self.api, 'request')
+                cls.rest_api_defined = 'api' not in config
 
         if self.markets:
             self.set_markets(self.markets)
 
         # convert all properties from underscore notation foo_bar to camelcase notation fooBar
-        cls = type(self)
-        for name in dir(self):
-            if name[0] != '_' and name[-1] != '_' and '_' in name:
-                parts = name.split('_')
-                # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
-                exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
-                camelcase = parts[0] + ''.join(exceptions.get(i, self.capitalize(i)) for i in parts[1:])
-                attr = getattr(self, name)
-                if isinstance(attr, types.MethodType):
-                    setattr(cls, camelcase, getattr(cls, name))
-                else:
-                    setattr(self, camelcase, attr)
+        # the aliases are set on the class by its first instance
+        if not type(self).__dict__.get('camelcase_defined', False):
+            self.define_camelcase_aliases()
 
         self.tokenBucket = self.extend({
             'refillRate': 1.0 / self.rateLimit if self.rateLimit > 0 else float('inf'),
@@ -456,6 +468,24 @@ class Exchange(object):
     def describe(self):
         return {}
 
+    def describe_class(self):
+        cls = type(self)
+        described = {}
+        # these are None on the class, every instance gets its own dict
+        for key in ['precision', 'limits', 'exceptions', 'headers', 'balance', 'orderbooks', 'tickers', 'trades', 'transactions', 'positions', 'ohlcvs', 'currencies']:
+            value = getattr(self, key)
+            described[key] = dict() if value is None else value
+        described['options'] = self.get_default_options() if self.options is None else self.options  # Python does not allow to define properties in run-time with setattr
+        for key, value in self.describe().items():
+            current = described[key] if key in described else getattr(self, key, None)
+            described[key] = self.deep_extend(current, value) if isinstance(current, dict) else value
+        cls.described = types.MappingProxyType({key: freeze(value) for key, value in described.items()})
+        for key in described:
+            default = inspect.getattr_static(cls, key, None)
+            if isinstance(default, DescribedAttribute):
+                default = default.default
+            setattr(cls, key, DescribedAttribute(key, default))
+
     def set_sandbox_mode(self, enabled):
         if enabled:
             if 'test' in self.urls:
@@ -467,6 +497,31 @@ class Exchange(object):
             self.urls['api'] = self.urls['apiBackup']
             del self.urls['apiBackup']
 
+    @staticmethod
+    def camelcase_alias(name):
+        # reads and writes the underscore attribute, the camelcase one is never out of date
+        return property(lambda self: getattr(self, name), lambda self, value: setattr(self, name, value))
+
+    def define_camelcase_aliases(self):
+        cls = type(self)
+        for name in dir(self):
+            if name[0] != '_' and name[-1] != '_' and '_' in name:
+                parts = name.split('_')
+                # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
+                exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
+                camelcase = parts[0] + ''.join(exceptions.get(i, self.capitalize(i)) for i in parts[1:])
+                attr = inspect.getattr_static(cls, name, None)
+                if isinstance(getattr(self, name), types.MethodType):
+                    setattr(cls, camelcase, getattr(cls, name))
+                elif isinstance(attr, staticmethod):
+                    setattr(cls, camelcase, attr)
+                else:
+                    setattr(cls, camelcase, Exchange.camelcase_alias(name))
+                    if camelcase in self.__dict__:
+                        # set before the alias existed, the property would hide it
+                        setattr(self, name, self.__dict__.pop(camelcase))
+        cls.camelcase_defined = True
+
     def define_rest_api_endpoint(self, method_name, uppercase_method, lowercase_method, camelcase_method, path, paths, config={}):
         cls = type(self)
         entry = getattr(cls, method_name)  # returns a function (instead of a bound method)
@@ -503,7 +558,7 @@ class Exchange(object):
                 if params is not None:
                     inner_kwargs['params'] = params
                 if context is not None:
-                    inner_kwargs['context'] = params
+                    inner_kwargs['context'] = context
                 return entry(_self, **inner_kwargs)
             return inner
         to_bind = partialer()
@@ -532,6 +587,29 @@ class Exchange(object):
             else:
                 self.define_rest_api(value, method_name, paths + [key])
 
+    def rate_limit_bucket(self, bucket):
+        # a named bucket starts full and cannot be overdrawn, unlike the rateLimit one
+        capacity = bucket['capacity']
+        config = {
+            'capacity': capacity,
+            'tokens': capacity,
+            'borrow': False,
+        }
+        if 'interval' in bucket:
+            config['refillRate'] = capacity / bucket['interval']
+        return self.extend(config, self.omit(bucket, 'interval'))
+
+    def calculate_rate_limiter_buckets(self, api, method, path, params, config={}, context={}):
+        # the named buckets consumed by an endpoint on top of calculate_rate_limiter_cost()
+        return self.safe_value(config, 'buckets', {})
+
+    def parse_rate_limit_headers(self, headers, url, method):
+        # returns the usage reported by the exchange per bucket, 'rateLimit' or a name from rateLimitBuckets
+        # {'rateLimit': {'used': 420, 'limit': 1200, 'interval': 60000}, 'orders10s': {'remaining': 12, 'interval': 10000, 'reset': 1672515790000}}
+        # counts are in cost units, the limit defaults to the capacity of a named bucket
+        # the window resets at 'reset' or at the next multiple of 'interval' milliseconds
+        return None
+
     def throttle(self, cost=None):
         now = float(self.milliseconds())
         elapsed = now - self.lastRestRequestTimestamp
@@ -573,10 +651,8 @@ class Exchange(object):
         return response_body.strip()
 
     def on_json_response(self, response_body):
-        if self.quoteJsonNumbers:
-            return json.loads(response_body, parse_float=str, parse_int=str)
-        else:
-            return json.loads(response_body)
+        # quoted numbers are always decoded by the stdlib, see ccxt.base.json_decoder
+        return json_decoder(self.jsonDecoder, self.quoteJsonNumbers)(response_body)
 
     def fetch(self, url, method='GET', headers=None, body=None):
         """Perform a HTTP request and return decoded JSON data"""
@@ -961,8 +1037,9 @@ class Exchange(object):
             if isinstance(arg, dict):
                 if not isinstance(result, dict):
                     result = {}
-                for key in arg:
-                    result[key] = Exchange.deep_extend(result[key] if key in result else None, arg[key])
+                for key, value in arg.items():
+                    # only dicts are merged, anything else replaces the previous value
+                    result[key] = Exchange.deep_extend(result.get(key), value) if isinstance(value, dict) else value
             else:
                 result = arg
         return result
@@ -1392,6 +1469,8 @@ class Exchange(object):
 
     @staticmethod
     def is_json_encoded_object(input):
+        if isinstance(input, (bytes, bytearray)):
+            return (len(input) >= 2) and ((input[0] == 123) or (input[0] == 91))  # { or [
         return (isinstance(input, str) and
                 (len(input) >= 2) and
                 ((input[0] == '{') or (input[0] == '[')))
@@ -1453,17 +1532,104 @@ class Exchange(object):
         parts = re.sub(r'0+$', '', str).split('.')
         return len(parts[1]) if len(parts) > 1 else 0
 
+    def market_store_key(self):
+        # the sandbox lists other markets than production, the options that shape the markets are in the schema
+        sandbox = 'apiBackup' in self.urls or self.safe_value(self.options, 'sandboxMode', False)
+        return (self.id, bool(sandbox), self.markets_cache_schema())
+
+    def market_table(self):
+        return dict((key, getattr(self, key)) for key in MARKET_TABLE)
+
+    def use_market_table(self, table):
+        for key in MARKET_TABLE:
+            setattr(self, key, table[key])
+        # the resolutions point into the previous table
+        self.resolvedMarkets = None
+        return self.markets
+
+    def markets_cache_schema(self):
+        # what the parsed markets depend on besides the exchange id
+        options = [self.safe_value(self.options, key) for key in ['fetchMarkets', 'defaultType', 'defaultSubType']]
+        return market_cache_schema(__version__, self.id, sorted(self.safe_market().keys()), options)
+
+    def markets_cache_path(self):
+        key = self.market_store_key()
+        return os.path.join(self.marketsCache, key[0] + ('-sandbox' if key[1] else '') + '-' + key[2] + '.json.gz')
+
+    def read_markets_cache(self):
+        # returns the cached markets with their age in milliseconds, or None
+        if self.marketsCache is None:
+            return None
+        cache = read_market_cache(self.markets_cache_path(), self.markets_cache_schema())
+        if cache is None:
+            return None
+        cache['age'] = self.milliseconds() - cache['timestamp']
+        return cache
+
+    def write_markets_cache(self, markets, currencies=None):
+        if self.marketsCache is None:
+            return
+        try:
+            write_market_cache(self.markets_cache_path(), self.markets_cache_schema(), self.milliseconds(), markets, currencies)
+        except (OSError, TypeError, ValueError) as e:
+            # the markets are loaded, the next start fetches them again
+            self.logger.warning('%s could not write the markets cache: %s', self.id, e)
+
+    def set_shared_markets(self, markets, currencies=None):
+        result = self.set_markets(markets, currencies)
+        if self.shareMarkets:
+            market_store.put(self.market_store_key(), self.market_table())
+        return result
+
     def load_markets(self, reload=False, params={}):
         if not reload:
+            refreshed = self.markets_refreshed
+            if refreshed is not None:
+                self.markets_refreshed = None
+                return self.set_shared_markets(refreshed['markets'], refreshed['currencies'])
             if self.markets:
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+            if self.shareMarkets:
+                table = market_store.get(self.market_store_key())
+                if table is not None:
+                    return self.use_market_table(table)
+            cache = self.read_markets_cache()
+            if cache is not None:
+                result = self.set_shared_markets(cache['markets'], cache['currencies'])
+                refreshing = self.markets_refreshing
+                if cache['age'] > self.marketsCacheTTL and (refreshing is None or not refreshing.is_alive()):
+                    self.markets_refreshing = threading.Thread(target=self.refresh_markets, args=(params,), daemon=True)
+                    self.markets_refreshing.start()
+                return result
+        return self.fetch_and_set_markets(params)
+
+    def fetch_and_set_markets(self, params={}):
         currencies = None
         if self.has['fetchCurrencies'] is True:
             currencies = self.fetch_currencies()
         markets = self.fetch_markets(params)
-        return self.set_markets(markets, currencies)
+        self.write_markets_cache(markets, currencies)
+        return self.set_shared_markets(markets, currencies)
+
+    def refresh_markets(self, params={}):
+        # revalidates the cached markets on a daemon thread, they stay in use if that fails
+        # the sync instance is not thread-safe, the markets are fetched by a copy with its own session and options
+        # and handed over in markets_refreshed, the calling thread sets them on its next load_markets()
+        refresher = copy.copy(self)
+        refresher.session = Session()
+        refresher.session.trust_env = self.requests_trust_env
+        refresher.options = self.deep_extend({}, self.options)
+        try:
+            currencies = None
+            if refresher.has['fetchCurrencies'] is True:
+                currencies = refresher.fetch_currencies()
+            markets = refresher.fetch_markets(params)
+            refresher.write_markets_cache(markets, currencies)
+            self.markets_refreshed = {'markets': markets, 'currencies': currencies}
+        except Exception as e:
+            self.logger.warning('%s could not refresh the cached markets: %s', self.id, e)
 
     def load_fees(self, reload=False):
         if not reload:
@@ -1501,7 +1667,7 @@ class Exchange(object):
     def fetch_order_trades(self, id, symbol=None, params={}):
         raise NotSupported(self.id + ' fetch_order_trades() is not supported yet')
 
-    def build_ohlcvc(self, trades, timeframe='1m', since=None, limit=None):
+    def build_ohlcvc(self, trades, timeframe='1m', since=None, limit=None, columnar=False):
         ms = self.parse_timeframe(timeframe) * 1000
         ohlcvs = []
         (timestamp, open, high, low, close, volume, count) = (0, 1, 2, 3, 4, 5, 6)
@@ -1534,7 +1700,7 @@ class Exchange(object):
                 ohlcvs[candle][close] = trade['price']
                 ohlcvs[candle][volume] += trade['amount']
                 ohlcvs[candle][count] += 1
-        return ohlcvs
+        return OHLCVC(ohlcvs) if columnar else ohlcvs
 
     @staticmethod
     def parse_timeframe(timeframe):
@@ -1576,6 +1742,8 @@ class Exchange(object):
         return array
 
     def filter_by_since_limit(self, array, since=None, limit=None, key='timestamp', tail=False):
+        if isinstance(array, OHLCV):
+            return array.filter_by_since_limit(since, limit, tail)
         array = self.to_array(array)
         if since is not None:
             array = [entry for entry in array if entry[key] >= since]
@@ -1583,6 +1751,42 @@ class Exchange(object):
             array = array[-limit:] if tail else array[:limit]
         return array
 
+    def remove_repeated_elements_from_array(self, array):
+        # the entries with the same id, or timestamp when they have none, are kept once in their first position
+        # with the values of the last of them, the same order can come in a later page with a newer status
+        result = {}
+        for i in range(0, len(array)):
+            entry = array[i]
+            if isinstance(entry, list):
+                key = entry[0]
+            else:
+                id = self.safe_string(entry, 'id')
+                timestamp = self.safe_integer(entry, 'timestamp')
+                if id is not None:
+                    key = ('id', id)
+                elif timestamp is not None:
+                    key = ('timestamp', timestamp, self.safe_string(entry, 'symbol'))
+                else:
+                    key = ('index', i)
+            result[key] = entry
+        return list(result.values())
+
+    def merge_paginated_results(self, method, pages, since=None, limit=None):
+        # the pages of a paginated call deduplicated and in the order of their timestamps
+        # without since the latest limit entries are kept
+        key = 0 if (method == 'fetchOHLCV') else 'timestamp'
+        if pages and isinstance(pages[0], OHLCV):
+            merged = type(pages[0])()
+            for page in pages:
+                merged.extend(page)
+            return merged.filter_by_since_limit(since, limit, since is None)
+        result = []
+        for page in pages:
+            result.extend(page)
+        result = self.remove_repeated_elements_from_array(result)
+        result.sort(key=lambda entry: entry[key] if (entry[key] is not None) else 0)
+        return self.filter_by_since_limit(result, since, limit, key, since is None)
+
     def vwap(self, baseVolume, quoteVolume):
         return (quoteVolume / baseVolume) if (quoteVolume is not None) and (baseVolume is not None) and (baseVolume > 0) else None
 
@@ -1774,6 +1978,107 @@ class Exchange(object):
             return '0e-00'
         return format(n, 'g')
 
+    # the bulk parsers read a whole response one column at a time, see columnar.py
+    # they return what the row by row parsers return, or the columns with columnar=True
+
+    def parse_columns(self, rows, integerKeys=[], numberKeys=[]):
+        # None if a value is missing or not a number, or the numbers are not floats
+        if self.number is not float:
+            return None
+        try:
+            return [parse_integer_column(rows, key) for key in integerKeys] + [parse_number_column(rows, key) for key in numberKeys]
+        except (TypeError, ValueError, KeyError, IndexError, OverflowError):
+            return None
+
+    def bulk_parse_ohlcvs(self, ohlcvs, market=None, timeframe='1m', since=None, limit=None, keys=[0, 1, 2, 3, 4, 5], columnar=False):
+        # parse_ohlcvs() for an exchange that reads a candle with safe_integer() and safe_number() at keys
+        columns = self.parse_columns(ohlcvs, keys[0:1], keys[1:6])
+        if columns is None:
+            result = self.parse_ohlcvs(ohlcvs, market, timeframe, since, limit)
+            return OHLCV(result) if columnar else result
+        order = sorted_order(columns[0])
+        if order is not None:
+            columns = [[column[i] for i in order] for column in columns]
+        kept = since_limit_range(columns[0], since, limit, since is None)
+        columns = [column[kept] for column in columns]
+        if columnar:
+            return OHLCV.from_columns(columns)
+        return [list(ohlcv) for ohlcv in zip(*columns)]
+
+    def bulk_parse_bids_asks(self, bidasks, priceKey=0, amountKey=1, descending=False, columnar=False):
+        # parse_bids_asks() sorted the way parse_order_book() sorts a side
+        bidasks = self.to_array(bidasks)
+        columns = self.parse_columns(bidasks, [], [priceKey, amountKey])
+        if columns is None:
+            result = self.sort_by(self.parse_bids_asks(bidasks, priceKey, amountKey), 0, descending)
+            if columnar:
+                return {
+                    'price': number_array([float_or_nan(bidask[0]) for bidask in result]),
+                    'amount': number_array([float_or_nan(bidask[1]) for bidask in result]),
+                }
+            return result
+        prices, amounts = columns
+        order = sorted_order(prices, descending)
+        if order is not None:
+            prices = [prices[i] for i in order]
+            amounts = [amounts[i] for i in order]
+        if columnar:
+            return {
+                'price': number_array(prices),
+                'amount': number_array(amounts),
+            }
+        return [[price, amount] for price, amount in zip(prices, amounts)]
+
+    def bulk_parse_order_book(self, orderbook, symbol, timestamp=None, bidsKey='bids', asksKey='asks', priceKey=0, amountKey=1, columnar=False):
+        return {
+            'symbol': symbol,
+            'bids': self.bulk_parse_bids_asks(self.safe_value(orderbook, bidsKey, []), priceKey, amountKey, True, columnar),
+            'asks': self.bulk_parse_bids_asks(self.safe_value(orderbook, asksKey, []), priceKey, amountKey, False, columnar),
+            'timestamp': timestamp,
+            'datetime': self.iso8601(timestamp),
+            'nonce': None,
+        }
+
+    def bulk_parse_trades(self, trades, market=None, since=None, limit=None, params={}, keys={}, sides=None, columnar=False):
+        # the unified trades are parsed with parse_trades(), each exchange builds its own trade structure
+        # the columns hold the timestamp, price and amount of the trades at keys, with their ids and sides
+        if not columnar:
+            return self.parse_trades(trades, market, since, limit, params)
+        trades = self.to_array(trades)
+        columns = self.parse_columns(trades, [keys['timestamp']], [keys['price'], keys['amount']])
+        if columns is None:
+            return self.trade_columns(self.parse_trades(trades, market, since, limit, params), market)
+        idKey = self.safe_value(keys, 'id')
+        sideKey = self.safe_value(keys, 'side')
+        columns.append([self.safe_string(trade, idKey) for trade in trades])
+        # the sides are mapped by their lowercase string, 'true' and 'false' for the booleans
+        lowerSides = [self.safe_string_lower(trade, sideKey) for trade in trades]
+        columns.append(lowerSides if (sides is None) else [self.safe_string(sides, side) for side in lowerSides])
+        order = sorted_order(columns[0])
+        if order is not None:
+            columns = [[column[i] for i in order] for column in columns]
+        kept = since_limit_range(columns[0], since, limit, since is None)
+        timestamps, prices, amounts, ids, sides = [column[kept] for column in columns]
+        return {
+            'symbol': market['symbol'] if (market is not None) else None,
+            'timestamp': integer_array(timestamps),
+            'price': number_array(prices),
+            'amount': number_array(amounts),
+            'id': ids,
+            'side': sides,
+        }
+
+    def trade_columns(self, trades, market=None):
+        trades = [trade for trade in trades if trade['timestamp'] is not None]
+        return {
+            'symbol': market['symbol'] if (market is not None) else None,
+            'timestamp': integer_array([trade['timestamp'] for trade in trades]),
+            'price': number_array([float_or_nan(trade['price']) for trade in trades]),
+            'amount': number_array([float_or_nan(trade['amount']) for trade in trades]),
+            'id': [trade['id'] for trade in trades],
+            'side': [trade['side'] for trade in trades],
+        }
+
     # ########################################################################
     # ########################################################################
     # ########################################################################
@@ -1950,27 +2255,65 @@ class Exchange(object):
         }
 
     def set_markets(self, markets, currencies=None):
-        values = []
-        self.markets_by_id = {}
+        # the symbol and id indexes are built in one pass over the markets
+        # the symbols resolved by market() are dropped with the markets they point to
+        self.resolvedMarkets = None
         # handle marketId conflicts
         # we insert spot markets first
         marketValues = self.sort_by(self.to_array(markets), 'spot', True)
+        # the defaults are merged once, each market is merged into them
+        defaults = self.deep_extend(self.safe_market(), {
+            'precision': self.precision,
+            'limits': self.limits,
+        }, self.fees['trading'])
+        values = []
+        marketsBySymbol = {}
+        idsInOrder = {}
+        # TEALSTREET markets_by_id does not list the spot markets
+        marketsByIdNoSpot = {}
         for i in range(0, len(marketValues)):
             value = marketValues[i]
-            if value['id'] in self.markets_by_id:
-                self.markets_by_id[value['id']].append(value)
-            else:
-                self.markets_by_id[value['id']] = [value]
-            market = self.deep_extend(self.safe_market(), {
-                'precision': self.precision,
-                'limits': self.limits,
-            }, self.fees['trading'], value)
+            id = value['id']
+            idsInOrder[id] = True
+            if value['type'] != 'spot':
+                if id in marketsByIdNoSpot:
+                    marketsByIdNoSpot[id].append(value)
+                else:
+                    marketsByIdNoSpot[id] = [value]
+            market = self.deep_extend(defaults, value)
             values.append(market)
-        self.markets = self.index_by(values, 'symbol')
-        marketsSortedBySymbol = self.keysort(self.markets)
-        marketsSortedById = self.keysort(self.markets_by_id)
-        self.symbols = list(marketsSortedBySymbol.keys())
-        self.ids = list(marketsSortedById.keys())
+            symbol = self.safe_string(market, 'symbol')
+            if symbol is not None:
+                marketsBySymbol[symbol] = market
+        self.markets = marketsBySymbol
+        # in the order the ids were first seen, spot markets included
+        ids = list(idsInOrder.keys())
+        self.markets_by_id = {}
+        for i in range(0, len(ids)):
+            id = ids[i]
+            if id in marketsByIdNoSpot:
+                self.markets_by_id[id] = marketsByIdNoSpot[id]
+        # resolved the way safeMarket() does, an id with one market is indexed by itself as the default
+        # and an id shared by several markets by each market type
+        self.markets_by_id_and_type = {}
+        marketTypes = ['spot', 'margin', 'swap', 'future', 'option', 'contract', 'linear', 'inverse']
+        marketIds = list(self.markets_by_id.keys())
+        for i in range(0, len(marketIds)):
+            marketId = marketIds[i]
+            marketsWithId = self.markets_by_id[marketId]
+            marketsByType = {}
+            if len(marketsWithId) == 1:
+                marketsByType['default'] = marketsWithId[0]
+            else:
+                for j in range(0, len(marketTypes)):
+                    marketType = marketTypes[j]
+                    for k in range(0, len(marketsWithId)):
+                        if self.safe_value(marketsWithId[k], marketType):
+                            marketsByType[marketType] = marketsWithId[k]
+                            break
+            self.markets_by_id_and_type[marketId] = marketsByType
+        self.symbols = list(self.keysort(marketsBySymbol).keys())
+        self.ids = list(self.keysort(idsInOrder).keys())
         if currencies is not None:
             self.currencies = self.deep_extend(self.currencies, currencies)
         else:
@@ -2022,18 +2365,6 @@ class Exchange(object):
         self.currencies_by_id = self.index_by(self.currencies, 'id')
         currenciesSortedByCode = self.keysort(self.currencies)
         self.codes = list(currenciesSortedByCode.keys())
-        # TEALSTREET
-        markets_by_id_no_spot = {}
-        market_symbols = list(self.markets_by_id.keys())
-        for i in range(0, len(market_symbols)):
-            for j in range(0, len(self.markets_by_id[market_symbols[i]])):
-                if self.markets_by_id[market_symbols[i]][j]['type'] != 'spot':
-                    if market_symbols[i] in markets_by_id_no_spot:
-                        markets_by_id_no_spot[market_symbols[i]].append(self.markets_by_id[market_symbols[i]][j])
-                    else:
-                        markets_by_id_no_spot[market_symbols[i]] = [self.markets_by_id[market_symbols[i]][j]]
-        self.markets_by_id = markets_by_id_no_spot
-        # TEALSTREET
         return self.markets
 
     def safe_balance(self, balance):
@@ -3089,6 +3420,18 @@ class Exchange(object):
             return market
         return result
 
+    def safe_market_by_id(self, marketId, marketType=None):
+        # the per-message market lookup of the websocket handlers
+        # only an unknown id or type falls back to safeMarket()
+        marketsByType = self.safe_value(self.markets_by_id_and_type, marketId)
+        if marketsByType is not None:
+            market = self.safe_value(marketsByType, 'default')
+            if market is None:
+                market = self.safe_value(marketsByType, marketType)
+            if market is not None:
+                return market
+        return self.safe_market(marketId, None, None, marketType)
+
     def check_required_credentials(self, error=True):
         keys = list(self.requiredCredentials.keys())
         for i in range(0, len(keys)):
@@ -3205,6 +3548,97 @@ class Exchange(object):
         result, empty = self.handleOptionAndParams({}, methodName, optionName, defaultValue)
         return result
 
+    def handle_max_entries_per_request_and_params(self, method, maxEntriesPerRequest=None, params={}):
+        newMaxEntriesPerRequest = None
+        newMaxEntriesPerRequest, params = self.handle_option_and_params(params, method, 'maxEntriesPerRequest')
+        if newMaxEntriesPerRequest is not None:
+            maxEntriesPerRequest = newMaxEntriesPerRequest
+        if maxEntriesPerRequest is None:
+            maxEntriesPerRequest = 1000  # default to 1000
+        return [maxEntriesPerRequest, params]
+
+    def safe_deterministic_call(self, method, symbol=None, since=None, limit=None, timeframe=None, params={}):
+        # one page of a paginated call, retried on network errors, a rate limit error is raised right away
+        maxRetries = None
+        maxRetries, params = self.handle_option_and_params(params, method, 'maxRetries', 3)
+        errors = 0
+        while True:
+            try:
+                if (timeframe is not None) and (method != 'fetchFundingRateHistory'):
+                    return getattr(self, method)(symbol, timeframe, since, limit, params)
+                else:
+                    return getattr(self, method)(symbol, since, limit, params)
+            except Exception as e:
+                if isinstance(e, RateLimitExceeded) or not isinstance(e, NetworkError):
+                    raise e
+                errors += 1
+                if errors > maxRetries:
+                    raise e
+
+    def fetch_paginated_call_deterministic(self, method, symbol=None, since=None, limit=None, timeframe=None, params={}, maxEntriesPerRequest=None):
+        # the range from since to until(or now) is split in windows of maxEntriesPerRequest entries of the timeframe
+        # and the windows are fetched at once, the rate limiter spaces the requests
+        maxCalls = None
+        maxCalls, params = self.handle_option_and_params(params, method, 'paginationCalls', 10)
+        maxEntriesPerRequest, params = self.handle_max_entries_per_request_and_params(method, maxEntriesPerRequest, params)
+        params = self.extend(params, {'paginate': False})
+        step = self.parse_timeframe(timeframe) * 1000 * maxEntriesPerRequest
+        until = self.safe_integer_2(params, 'until', 'till')  # do not omit it from params here, the last window ends there
+        end = self.milliseconds() if (until is None) else until
+        calls = maxCalls
+        if since is not None:
+            duration = end - since
+            calls = int(math.ceil(duration / step))
+            if limit is not None:
+                # the first limit entries from since, the windows after them are not fetched
+                calls = min(calls, int(math.ceil(limit / maxEntriesPerRequest)))
+            if calls > maxCalls:
+                raise BadRequest(self.id + ' ' + method + '() requires ' + str(calls) + ' calls from since to until, more than the paginationCalls option allows(' + str(maxCalls) + '), increase paginationCalls or reduce the range')
+        elif limit is not None:
+            calls = min(maxCalls, int(math.ceil(limit / maxEntriesPerRequest)))
+        start = (end - calls * step) if (since is None) else since
+        tasks = []
+        for i in range(0, calls):
+            tasks.append(self.safe_deterministic_call(method, symbol, self.sum(start, i * step), maxEntriesPerRequest, timeframe, params))
+        pages = tasks
+        return self.merge_paginated_results(method, pages, since, limit)
+
+    def fetch_paginated_call_cursor(self, method, symbol=None, since=None, limit=None, params={}, cursorReceived=None, cursorSent=None, cursorIncrement=None, maxEntriesPerRequest=None):
+        # the pages are fetched one after another, the cursor of the next page is the cursorReceived field of an entry
+        # with cursorIncrement the cursor is an id and the next page starts after the last entry,
+        # otherwise the next page goes back in time from the first entry, the way okx after= works
+        maxCalls = None
+        maxCalls, params = self.handle_option_and_params(params, method, 'paginationCalls', 10)
+        maxEntriesPerRequest, params = self.handle_max_entries_per_request_and_params(method, maxEntriesPerRequest, params)
+        params = self.extend(params, {'paginate': False})
+        cursorValue = None
+        pages = []
+        for i in range(0, maxCalls):
+            pageSince = since
+            pageParams = params
+            if cursorValue is not None:
+                if cursorIncrement is not None:
+                    # the since of the first page would conflict with the id
+                    cursorValue = self.sum(self.parse_to_int(cursorValue), cursorIncrement)
+                    pageSince = None
+                cursorParams = {}
+                cursorParams[cursorSent] = cursorValue
+                pageParams = self.extend(params, cursorParams)
+            response = self.safe_deterministic_call(method, symbol, pageSince, maxEntriesPerRequest, None, pageParams)
+            responseLength = len(response)
+            if responseLength == 0:
+                break
+            pages.append(response)
+            # the parsed page is in ascending order
+            cursorEntry = response[responseLength - 1] if (cursorIncrement is not None) else response[0]
+            cursorValue = self.safe_value(cursorEntry['info'], cursorReceived)
+            if (cursorValue is None) or (responseLength < maxEntriesPerRequest):
+                break
+            cursorTimestamp = self.safe_integer(cursorEntry, 'timestamp')
+            if (cursorIncrement is None) and (since is not None) and (cursorTimestamp is not None) and (cursorTimestamp <= since):
+                break
+        return self.merge_paginated_results(method, pages, since, limit)
+
     def handle_market_type_and_params(self, methodName, market=None, params={}):
         defaultType = self.safe_string_2(self.options, 'defaultType', 'type', 'spot')
         methodOptions = self.safe_value(self.options, methodName)
@@ -3393,12 +3827,8 @@ class Exchange(object):
                         return market
                 return markets[0]
 
-    def market(self, symbol):
+    def resolve_market(self, symbol):
         # symbol = symbol + ':USDT'
-        if self.markets is None:
-            raise ExchangeError(self.id + ' markets not loaded')
-        if self.markets_by_id is None:
-            raise ExchangeError(self.id + ' markets not loaded')
         # TEALSTREET patch for backwards compatability
         # self.marketHelper(symbol.split(':')[0])
         foundMarket = self.marketHelper(symbol)
@@ -3413,11 +3843,40 @@ class Exchange(object):
         foundMarket = self.marketHelper(marketStem + ':USDT') or self.marketHelper(marketStem + ':BTC') or self.marketHelper(marketStem)
         if foundMarket:
             return foundMarket
-        # eslint-disable-next-line no-console
-        # print(symbol)
-        # eslint-disable-next-line no-console
-        # print(self.markets)
-        raise BadSymbol(self.id + ' does not have market symbol ' + symbol)
+        return None
+
+    def market(self, symbol):
+        if self.markets is None:
+            raise ExchangeError(self.id + ' markets not loaded')
+        if self.markets_by_id is None:
+            raise ExchangeError(self.id + ' markets not loaded')
+        foundMarket = None
+        if not isinstance(symbol, str):
+            foundMarket = self.resolve_market(symbol)
+        else:
+            # every symbol, legacy symbol or id seen is resolved once, unknown ones included
+            # the resolutions hold until setMarkets() or the default type change
+            defaultType = self.safe_string(self.options, 'defaultType')
+            defaultSubType = self.safe_string(self.options, 'defaultSubType')
+            resolved = self.resolvedMarkets
+            if (resolved is None) or (resolved['defaultType'] != defaultType) or (resolved['defaultSubType'] != defaultSubType) or (resolved['count'] >= self.resolvedMarketsLimit):
+                resolved = {
+                    'defaultType': defaultType,
+                    'defaultSubType': defaultSubType,
+                    'symbols': {},
+                    'count': 0,
+                }
+                self.resolvedMarkets = resolved
+            symbols = resolved['symbols']
+            if symbol in symbols:
+                foundMarket = symbols[symbol]
+            else:
+                foundMarket = self.resolve_market(symbol)
+                symbols[symbol] = foundMarket
+                resolved['count'] = resolved['count'] + 1
+        if foundMarket is None:
+            raise BadSymbol(self.id + ' does not have market symbol ' + symbol)
+        return foundMarket
 
     def handle_withdraw_tag_and_params(self, tag, params):
         if isinstance(tag, dict):
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from ccxt.base.errors import NotSupported
+
+# -----------------------------------------------------------------------------
+# faster json decoders are optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'JSON_DECODERS',
+    'json_decoder',
+]
+
+# -----------------------------------------------------------------------------
+# when no decoder is configured the first installed one is used
+
+JSON_DECODERS = ['orjson', 'simdjson', 'ujson', 'json']
+
+modules = {
+    'orjson': orjson,
+    'simdjson': simdjson,
+    'ujson': ujson,
+    'json': json,
+}
+
+decoders = {}
+
+
+def quoted_loads(data):
+    # only the stdlib can return the numbers exactly as they were sent, '0.10' stays '0.10'
+    return json.loads(data, parse_float=str, parse_int=str)
+
+
+def strict(loads):
+    # the fast decoders reject NaN and Infinity, such documents are retried with the stdlib
+    def decode(data):
+        try:
+            return loads(data)
+        except ValueError:
+            return json.loads(data)
+    return decode
+
+
+def load_decoder(name):
+    if name not in modules:
+        raise NotSupported('unknown json decoder ' + str(name) + ', use one of ' + ', '.join(JSON_DECODERS))
+    module = modules[name]
+    if module is None:
+        raise NotSupported(name + ' json decoder is not installed')
+    if module is json:
+        return json.loads
+    return strict(module.loads)
+
+
+def json_decoder(name=None, quote_numbers=False):
+    """returns a function decoding json from str or bytes
+
+    with quote_numbers the numbers are returned as the strings they were sent as and the stdlib
+    decodes them whatever the name, this is what REST responses get with Exchange.quoteJsonNumbers,
+    the default, so the faster decoders apply to REST with quoteJsonNumbers = False and to websockets,
+    quoting the numbers in the bytes before a faster decoder is slower than the stdlib, see bench_json_decoder.py
+    """
+    if quote_numbers:
+        return quoted_loads
+    if name not in decoders:
+        if name is None:
+            fastest = next(decoder for decoder in JSON_DECODERS if modules[decoder] is not None)
+            decoders[name] = load_decoder(fastest)
+        else:
+            decoders[name] = load_decoder(name)
+    return decoders[name]
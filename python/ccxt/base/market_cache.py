@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+
+from ccxt.base.json_decoder import json_decoder
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'MARKET_CACHE_VERSION',
+    'read_market_cache',
+    'write_market_cache',
+    'market_cache_schema',
+]
+
+# -----------------------------------------------------------------------------
+# the fetched markets and currencies of an exchange kept on disk between restarts
+#
+#     exchange = ccxt.bybit({'marketsCache': '/var/cache/ccxt', 'marketsCacheTTL': 3600000})
+#
+# one gzipped json file per exchange id, sandbox mode and schema, written atomically
+# a file is ignored when its version or schema differs, the schema hashes the ccxt
+# version and everything the parsed markets depend on, see Exchange.markets_cache_schema()
+
+MARKET_CACHE_VERSION = 1
+
+
+def market_cache_schema(*parts):
+    text = json.dumps([MARKET_CACHE_VERSION] + list(parts), sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[0:16]
+
+
+def read_market_cache(path, schema):
+    # returns {'timestamp', 'markets', 'currencies'} or None
+    try:
+        with gzip.open(path, 'rb') as f:
+            cache = json_decoder()(f.read())
+    except (OSError, EOFError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get('version') != MARKET_CACHE_VERSION or cache.get('schema') != schema:
+        return None
+    return cache
+
+
+def write_market_cache(path, schema, timestamp, markets, currencies=None):
+    cache = {
+        'version': MARKET_CACHE_VERSION,
+        'schema': schema,
+        'timestamp': timestamp,
+        'markets': markets,
+        'currencies': currencies,
+    }
+    data = json.dumps(cache, separators=(',', ':'), default=str).encode()
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # readers never see a partial file
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(gzip.compress(data, 6))
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
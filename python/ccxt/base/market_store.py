@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'MARKET_TABLE',
+    'MarketStore',
+    'market_store',
+]
+
+# -----------------------------------------------------------------------------
+# the market tables loaded in this process, shared by the instances of an exchange
+# with shareMarkets enabled, one instance per sub-account loads the markets once
+#
+# a table is keyed by the exchange id, whether the sandbox is enabled and the schema of the markets cache,
+# the instances that differ in the options that shape the markets get their own, see Exchange.market_store_key()
+# a table is replaced when the markets are reloaded and never modified in place,
+# the instances that use it treat the markets as read-only
+
+# the attributes set by Exchange.set_markets()
+MARKET_TABLE = [
+    'markets',
+    'markets_by_id',
+    'markets_by_id_and_type',
+    'symbols',
+    'ids',
+    'currencies',
+    'currencies_by_id',
+    'codes',
+    'baseCurrencies',
+    'quoteCurrencies',
+]
+
+
+class MarketStore(object):
+    def __init__(self):
+        self.tables = {}
+        self.loading = {}  # the async loads in progress by key, the other instances wait for them
+
+    def get(self, key):
+        return self.tables.get(key)
+
+    def put(self, key, table):
+        self.tables[key] = table
+        return table
+
+    def clear(self, key=None):
+        if key is None:
+            self.tables = {}
+            self.loading = {}
+        else:
+            self.tables.pop(key, None)
+            self.loading.pop(key, None)
+
+
+market_store = MarketStore()
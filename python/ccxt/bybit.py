@@ -31,6 +31,14 @@ class bybit(Exchange):
             'version': 'v5',
             'userAgent': None,
             'rateLimit': 20,
+            # order placement is limited per endpoint group on top of the ip limit
+            # https://bybit-exchange.github.io/docs/v5/rate-limit
+            'rateLimitBuckets': {
+                # each order endpoint has its own limit
+                'v5OrderCreate': {'capacity': 10, 'interval': 1000},
+                'v5OrderAmend': {'capacity': 10, 'interval': 1000},
+                'v5OrderCancel': {'capacity': 10, 'interval': 1000},
+            },
             'hostname': 'bybit.com',  # bybit.com, bytick.com
             'refCode': 'Tealstreet',
             'pro': True,
@@ -437,9 +445,9 @@ class bybit(Exchange):
                         'fht/compliance/tax/v3/private/status': 50,
                         'fht/compliance/tax/v3/private/url': 50,
                         # v5
-                        'v5/order/create': 2.5,
-                        'v5/order/amend': 2.5,
-                        'v5/order/cancel': 2.5,
+                        'v5/order/create': {'cost': 2.5, 'buckets': {'v5OrderCreate': 1}},
+                        'v5/order/amend': {'cost': 2.5, 'buckets': {'v5OrderAmend': 1}},
+                        'v5/order/cancel': {'cost': 2.5, 'buckets': {'v5OrderCancel': 1}},
                         'v5/order/cancel-all': 2.5,
                         'v5/order/create-batch': 2.5,
                         'v5/order/amend-batch': 2.5,
@@ -929,6 +937,12 @@ class bybit(Exchange):
             },
             'precisionMode': TICK_SIZE,
             'options': {
+                # the usage headers are reported per endpoint, these are matched to the buckets they consume
+                'rateLimitHeaders': {
+                    'v5/order/create': 'v5OrderCreate',
+                    'v5/order/amend': 'v5OrderAmend',
+                    'v5/order/cancel': 'v5OrderCancel',
+                },
                 'enableUnifiedMargin': None,
                 'enableUnifiedAccount': None,
                 'enableUta2': None,
@@ -1727,11 +1741,19 @@ class bybit(Exchange):
         :param int|None since: timestamp in ms of the earliest candle to fetch
         :param int|None limit: the maximum amount of candles to fetch
         :param dict params: extra parameters specific to the bybit api endpoint
+        :param bool|None params['columnar']: python only, True to return the candles in an OHLCV, a typed array per column, see columnar.py
+        :param bool|None params['paginate']: True to fetch the candles from since to until in windows of 1000 at once, see Exchange.fetchPaginatedCallDeterministic()
         :returns [[int]]: A list of candles ordered, open, high, low, close, volume
         """
         self.check_required_symbol('fetchOHLCV', symbol)
         self.load_markets()
+        paginate = False
+        paginate, params = self.handle_option_and_params(params, 'fetchOHLCV', 'paginate')
+        if paginate:
+            return self.fetch_paginated_call_deterministic('fetchOHLCV', symbol, since, limit, timeframe, params, 1000)
         market = self.market(symbol)
+        columnar = False
+        columnar, params = self.handle_option_and_params(params, 'fetchOHLCV', 'columnar', False)
         request = {
             'symbol': market['id'],
         }
@@ -1805,7 +1827,7 @@ class bybit(Exchange):
         #
         result = self.safe_value(response, 'result', {})
         ohlcvs = self.safe_value(result, 'list', [])
-        return self.parse_ohlcvs(ohlcvs, market, timeframe, since, limit)
+        return self.bulk_parse_ohlcvs(ohlcvs, market, timeframe, since, limit, [0, 1, 2, 3, 4, 5], columnar)
 
     def parse_funding_rate(self, ticker, market=None):
         #     {
@@ -1942,10 +1964,15 @@ class bybit(Exchange):
         :param int|None limit: the maximum amount of `funding rate structures <https://docs.ccxt.com/en/latest/manual.html?#funding-rate-history-structure>` to fetch
         :param dict params: extra parameters specific to the bybit api endpoint
         :param int|None params['until']: timestamp in ms of the latest funding rate
+        :param bool|None params['paginate']: True to fetch the funding rates from since to until in windows of 200 at once, see Exchange.fetchPaginatedCallDeterministic()
         :returns [dict]: a list of `funding rate structures <https://docs.ccxt.com/en/latest/manual.html?#funding-rate-history-structure>`
         """
         self.check_required_symbol('fetchFundingRateHistory', symbol)
         self.load_markets()
+        paginate = False
+        paginate, params = self.handle_option_and_params(params, 'fetchFundingRateHistory', 'paginate')
+        if paginate:
+            return self.fetch_paginated_call_deterministic('fetchFundingRateHistory', symbol, since, limit, '8h', params, 200)
         request = {
             # 'category': '',  # Product type. linear,inverse
             # 'symbol': '',  # Symbol name
@@ -2160,11 +2187,14 @@ class bybit(Exchange):
         :param int|None since: timestamp in ms of the earliest trade to fetch
         :param int|None limit: the maximum amount of trades to fetch
         :param dict params: extra parameters specific to the bybit api endpoint
+        :param bool|None params['columnar']: python only, True to return the timestamps, prices, amounts, ids and sides of the trades as columns
         :returns [dict]: a list of `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>`
         """
         self.check_required_symbol('fetchTrades', symbol)
         self.load_markets()
         market = self.market(symbol)
+        columnar = False
+        columnar, params = self.handle_option_and_params(params, 'fetchTrades', 'columnar', False)
         request = {
             'symbol': market['id'],
             # 'baseCoin': '',  # Base coin. For option only. If not passed, return BTC data by default
@@ -2208,7 +2238,8 @@ class bybit(Exchange):
         #
         result = self.safe_value(response, 'result', {})
         trades = self.safe_value(result, 'list', [])
-        return self.parse_trades(trades, market, since, limit)
+        keys = {'timestamp': 'time', 'price': 'price', 'amount': 'size', 'id': 'execId', 'side': 'side'}
+        return self.bulk_parse_trades(trades, market, since, limit, {}, keys, None, columnar)
 
     def fetch_order_book(self, symbol, limit=None, params={}):
         """
@@ -2217,11 +2248,14 @@ class bybit(Exchange):
         :param str symbol: unified symbol of the market to fetch the order book for
         :param int|None limit: the maximum amount of order book entries to return
         :param dict params: extra parameters specific to the bybit api endpoint
+        :param bool|None params['columnar']: python only, True to return the prices and amounts of each side as columns
         :returns dict: A dictionary of `order book structures <https://docs.ccxt.com/#/?id=order-book-structure>` indexed by market symbols
         """
         self.check_required_symbol('fetchOrderBook', symbol)
         self.load_markets()
         market = self.market(symbol)
+        columnar = False
+        columnar, params = self.handle_option_and_params(params, 'fetchOrderBook', 'columnar', False)
         request = {
             'symbol': market['id'],
         }
@@ -2269,7 +2303,7 @@ class bybit(Exchange):
         #
         result = self.safe_value(response, 'result', [])
         timestamp = self.safe_integer(result, 'ts')
-        return self.parse_order_book(result, symbol, timestamp, 'b', 'a')
+        return self.bulk_parse_order_book(result, symbol, timestamp, 'b', 'a', 0, 1, columnar)
 
     def parse_balance(self, response):
         #
@@ -5052,6 +5086,32 @@ class bybit(Exchange):
             result[symbol] = fee
         return result
 
+    def parse_rate_limit_headers(self, headers, url, method):
+        #
+        #     X-Bapi-Limit-Status: 9
+        #     X-Bapi-Limit: 10
+        #     X-Bapi-Limit-Reset-Timestamp: 1672515790000
+        #
+        remaining = self.safe_float(headers, 'X-Bapi-Limit-Status')
+        if remaining is None:
+            return None
+        rateLimitHeaders = self.safe_value(self.options, 'rateLimitHeaders', {})
+        parts = url.split('?')
+        path = parts[0]
+        index = path.find('/v5/')
+        if index < 0:
+            return None
+        bucket = self.safe_string(rateLimitHeaders, path[index + 1:])
+        if bucket is None:
+            return None
+        result = {}
+        result[bucket] = {
+            'remaining': remaining,
+            'interval': 1000,  # the order endpoints are limited per second
+            'reset': self.safe_integer(headers, 'X-Bapi-Limit-Reset-Timestamp'),
+        }
+        return result
+
     def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
         url = self.implode_hostname(self.urls['api'][api]) + '/' + path
         if api == 'public':
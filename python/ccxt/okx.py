@@ -1328,10 +1328,13 @@ class okx(Exchange):
         :param str symbol: unified symbol of the market to fetch the order book for
         :param int|None limit: the maximum amount of order book entries to return
         :param dict params: extra parameters specific to the okx api endpoint
+        :param bool|None params['columnar']: python only, True to return the prices and amounts of each side as columns
         :returns dict: A dictionary of `order book structures <https://docs.ccxt.com/#/?id=order-book-structure>` indexed by market symbols
         """
         self.load_markets()
         market = self.market(symbol)
+        columnar = False
+        columnar, params = self.handle_option_and_params(params, 'fetchOrderBook', 'columnar', False)
         request = {
             'instId': market['id'],
         }
@@ -1363,7 +1366,7 @@ class okx(Exchange):
         data = self.safe_value(response, 'data', [])
         first = self.safe_value(data, 0, {})
         timestamp = self.safe_integer(first, 'ts')
-        return self.parse_order_book(first, symbol, timestamp)
+        return self.bulk_parse_order_book(first, symbol, timestamp, 'bids', 'asks', 0, 1, columnar)
 
     def parse_ticker(self, ticker, market=None):
         #
@@ -1601,10 +1604,13 @@ class okx(Exchange):
         :param int|None since: timestamp in ms of the earliest trade to fetch
         :param int|None limit: the maximum amount of trades to fetch
         :param dict params: extra parameters specific to the okx api endpoint
+        :param bool|None params['columnar']: python only, True to return the timestamps, prices, amounts, ids and sides of the trades as columns
         :returns [dict]: a list of `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>`
         """
         self.load_markets()
         market = self.market(symbol)
+        columnar = False
+        columnar, params = self.handle_option_and_params(params, 'fetchTrades', 'columnar', False)
         request = {
             'instId': market['id'],
         }
@@ -1623,7 +1629,8 @@ class okx(Exchange):
         #     }
         #
         data = self.safe_value(response, 'data', [])
-        return self.parse_trades(data, market, since, limit)
+        keys = {'timestamp': 'ts', 'price': 'px', 'amount': 'sz', 'id': 'tradeId', 'side': 'side'}
+        return self.bulk_parse_trades(data, market, since, limit, {}, keys, None, columnar)
 
     def parse_ohlcv(self, ohlcv, market=None):
         #
@@ -1665,12 +1672,20 @@ class okx(Exchange):
         :param int|None since: timestamp in ms of the earliest candle to fetch
         :param int|None limit: the maximum amount of candles to fetch
         :param dict params: extra parameters specific to the okx api endpoint
+        :param bool|None params['columnar']: python only, True to return the candles in an OHLCV, a typed array per column, see columnar.py
         :param str|None params['price']: "mark" or "index" for mark price and index price candles
         :param int|None params['until']: timestamp in ms of the latest candle to fetch
+        :param bool|None params['paginate']: True to fetch the candles from since to until in windows of 100 at once, see Exchange.fetchPaginatedCallDeterministic()
         :returns [[int]]: A list of candles ordered, open, high, low, close, volume
         """
         self.load_markets()
+        paginate = False
+        paginate, params = self.handle_option_and_params(params, 'fetchOHLCV', 'paginate')
+        if paginate:
+            return self.fetch_paginated_call_deterministic('fetchOHLCV', symbol, since, limit, timeframe, params, 100)
         market = self.market(symbol)
+        columnar = False
+        columnar, params = self.handle_option_and_params(params, 'fetchOHLCV', 'columnar', False)
         price = self.safe_string(params, 'price')
         params = self.omit(params, 'price')
         options = self.safe_value(self.options, 'fetchOHLCV', {})
@@ -1723,7 +1738,10 @@ class okx(Exchange):
         #     }
         #
         data = self.safe_value(response, 'data', [])
-        return self.parse_ohlcvs(data, market, timeframe, since, limit)
+        # the volume index of parseOHLCV()
+        res = self.handle_market_type_and_params('fetchOHLCV', market, None)
+        volumeIndex = 5 if (res[0] == 'spot') else 6
+        return self.bulk_parse_ohlcvs(data, market, timeframe, since, limit, [0, 1, 2, 3, 4, volumeIndex], columnar)
 
     def fetch_funding_rate_history(self, symbol=None, since=None, limit=None, params={}):
         """
@@ -3101,9 +3119,14 @@ class okx(Exchange):
         :param int|None since: the earliest time in ms to fetch trades for
         :param int|None limit: the maximum number of trades structures to retrieve
         :param dict params: extra parameters specific to the okx api endpoint
+        :param bool|None params['paginate']: True to fetch the trades back to since page by page by billId, see Exchange.fetchPaginatedCallCursor()
         :returns [dict]: a list of `trade structures <https://docs.ccxt.com/#/?id=trade-structure>`
         """
         self.load_markets()
+        paginate = False
+        paginate, params = self.handle_option_and_params(params, 'fetchMyTrades', 'paginate')
+        if paginate:
+            return self.fetch_paginated_call_cursor('fetchMyTrades', symbol, since, limit, params, 'billId', 'after', None, 100)
         request = {
             # 'instType': 'SPOT',  # SPOT, MARGIN, SWAP, FUTURES, OPTION
             # 'uly': currency['id'],
@@ -4,7 +4,7 @@
 # https://github.com/ccxt/ccxt/blob/master/CONTRIBUTING.md#how-to-contribute-code
 
 import ccxt.async_support
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.cache import ArrayCache
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import ArgumentsRequired
 from ccxt.base.precise import Precise
@@ -20,10 +20,13 @@ class binance(ccxt.async_support.binance):
                 'watchMyTrades': True,
                 'watchOHLCV': True,
                 'watchOrderBook': True,
+                'watchOrderBookForSymbols': True,
+                'watchOHLCVForSymbols': True,
                 'watchOrders': True,
                 'watchTicker': True,
                 'watchTickers': True,
                 'watchTrades': True,
+                'watchTradesForSymbols': True,
             },
             'urls': {
                 'test': {
@@ -83,6 +86,7 @@ class binance(ccxt.async_support.binance):
                 'listenKeyRefreshRate': 1200000,  # 20 mins
                 'ws': {
                     'cost': 5,
+                    'maxTopicsPerMessage': 200,
                 },
             },
         })
@@ -189,6 +193,43 @@ class binance(ccxt.async_support.binance):
         orderbook = await self.watch(url, messageHash, message, messageHash, subscription)
         return orderbook.limit()
 
+    async def watch_order_book_for_symbols(self, symbols, limit=None, params={}):
+        """
+        watches the order books of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch the order books for
+        :param int|None limit: the maximum amount of order book entries to return
+        :param dict params: extra parameters specific to the binance api endpoint
+        :returns dict: the `order book structure <https://docs.ccxt.com/#/?id=order-book-structure>` of the market that updated
+        """
+        if limit is not None:
+            if (limit != 5) and (limit != 10) and (limit != 20) and (limit != 50) and (limit != 100) and (limit != 500) and (limit != 1000):
+                raise ExchangeError(self.id + ' watchOrderBookForSymbols limit argument must be None, 5, 10, 20, 50, 100, 500 or 1000')
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchOrderBookForSymbols')
+        type = self.market_type_for_watch(symbols[0])
+        name = 'depth'
+        watchOrderBookRate = self.safe_string(self.options, 'watchOrderBookRate', '100')
+        messageHashes = []
+        topics = []
+        subscriptions = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHash = market['lowercaseId'] + '@' + name
+            messageHashes.append(messageHash)
+            topics.append(messageHash + '@' + watchOrderBookRate + 'ms')
+            subscriptions.append({
+                'messageHash': messageHash,
+                'name': name,
+                'symbol': market['symbol'],
+                'method': self.handle_order_book_subscription,
+                'limit': limit,
+                'type': type,
+                'params': params,
+            })
+        # every order book is loaded from its own snapshot once the packed request is confirmed
+        orderbook = await self.watch_multiple_streams(type, messageHashes, topics, params, subscriptions)
+        return orderbook.limit()
+
     async def fetch_order_book_snapshot(self, client, message, subscription):
         messageHash = self.safe_string(subscription, 'messageHash')
         symbol = self.safe_string(subscription, 'symbol')
@@ -239,8 +280,7 @@ class binance(ccxt.async_support.binance):
         bookside.store(price, amount)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        bookside.applyLevels(deltas)
 
     def handle_order_book_message(self, client, message, orderbook):
         u = self.safe_integer(message, 'u')
@@ -274,7 +314,7 @@ class binance(ccxt.async_support.binance):
         index = client.url.find('/stream')
         marketType = 'spot' if (index >= 0) else 'contract'
         marketId = self.safe_string(message, 's')
-        market = self.safe_market(marketId, None, None, marketType)
+        market = self.safe_market_by_id(marketId, marketType)
         symbol = market['symbol']
         name = 'depth'
         messageHash = market['lowercaseId'] + '@' + name
@@ -353,13 +393,70 @@ class binance(ccxt.async_support.binance):
         #     }
         #
         id = self.safe_string(message, 'id')
-        subscriptionsById = self.index_by(client.subscriptions, 'id')
-        subscription = self.safe_value(subscriptionsById, id, {})
-        method = self.safe_value(subscription, 'method')
-        if method is not None:
-            method(client, message, subscription)
+        # the subscriptions of a watch*ForSymbols() call share the id of their packed request
+        subscriptions = list(client.subscriptions.values())
+        for i in range(0, len(subscriptions)):
+            subscription = subscriptions[i]
+            if isinstance(subscription, dict) and (self.safe_string(subscription, 'id') == id):
+                method = self.safe_value(subscription, 'method')
+                if method is not None:
+                    method(client, message, subscription)
         return message
 
+    def watch_multiple_streams(self, type, messageHashes, topics, params={}, subscriptions=None, keys=None):
+        # one subscription per topic on one stream, the requests share an id and are packed
+        # up to options['ws']['maxTopicsPerMessage'] params
+        url = self.urls['api']['ws'][type] + '/' + self.stream(type, ','.join(messageHashes))
+        requestId = self.request_id(url)
+        messages = []
+        for i in range(0, len(topics)):
+            request = {
+                'method': 'SUBSCRIBE',
+                'params': [
+                    topics[i],
+                ],
+                'id': requestId,
+            }
+            messages.append(self.extend(request, params))
+        if subscriptions is None:
+            subscriptions = []
+            for i in range(0, len(topics)):
+                subscriptions.append({
+                    'id': requestId,
+                })
+        else:
+            for i in range(0, len(subscriptions)):
+                subscriptions[i]['id'] = str(requestId)
+        return self.watch_multiple(url, messageHashes, messages, messageHashes, subscriptions, keys)
+
+    def market_type_for_watch(self, symbol):
+        market = self.market(symbol)
+        type = market['type']
+        if market['contract']:
+            type = 'future' if market['linear'] else 'delivery'
+        return type
+
+    async def resubscribe(self, client):
+        # the replayed requests get ids of their own, their responses match no subscription,
+        # so every order book is reloaded once, by resyncSubscription() and not again by the response
+        hashes = list(client.subscriptions.keys())
+        packed = self.pack_subscribe_messages(client, self.subscribed_messages(client))
+        replayed = []
+        for i in range(0, len(packed)):
+            replayed.append(self.extend(packed[i], {'id': self.request_id(client.url)}))
+        await self.send_subscribe_messages(client, replayed, [])
+        for i in range(0, len(hashes)):
+            subscription = self.safe_value(client.subscriptions, hashes[i])
+            if subscription is not None:
+                self.resync_subscription(client, hashes[i], subscription)
+
+    def resync_subscription(self, client, subscribeHash, subscription):
+        # after a reconnect the order books are rebuilt from a new snapshot, the way the subscription response does it
+        if isinstance(subscription, dict):
+            method = self.safe_value(subscription, 'method')
+            if method is not None:
+                method(client, None, subscription)
+
     async def watch_trades(self, symbol, since=None, limit=None, params={}):
         """
         get the list of most recent trades for a particular symbol
@@ -395,6 +492,31 @@ class binance(ccxt.async_support.binance):
             limit = trades.getLimit(market['symbol'], limit)
         return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
 
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        """
+        get the list of most recent trades of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch trades for
+        :param int|None since: timestamp in ms of the earliest trade to fetch
+        :param int|None limit: the maximum amount of trades to fetch
+        :param dict params: extra parameters specific to the binance api endpoint
+        :returns [dict]: a list of `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTradesForSymbols')
+        options = self.safe_value(self.options, 'watchTrades', {})
+        name = self.safe_string(options, 'name', 'trade')
+        type = self.market_type_for_watch(symbols[0])
+        query = self.omit(params, 'type')
+        messageHashes = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append(market['lowercaseId'] + '@' + name)
+        trades = await self.watch_multiple_streams(type, messageHashes, messageHashes, query)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(self.safe_string(first, 'symbol'), limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
     def parse_trade(self, trade, market=None):
         #
         # public watchTrades
@@ -556,7 +678,7 @@ class binance(ccxt.async_support.binance):
         index = client.url.find('/stream')
         marketType = 'spot' if (index >= 0) else 'contract'
         marketId = self.safe_string(message, 's')
-        market = self.safe_market(marketId, None, None, marketType)
+        market = self.safe_market_by_id(marketId, marketType)
         symbol = market['symbol']
         lowerCaseId = self.safe_string_lower(message, 's')
         event = self.safe_string(message, 'e')
@@ -612,6 +734,39 @@ class binance(ccxt.async_support.binance):
             limit = ohlcv.getLimit(symbol, limit)
         return self.filter_by_since_limit(ohlcv, since, limit, 0, True)
 
+    async def watch_ohlcv_for_symbols(self, symbolsAndTimeframes, since=None, limit=None, params={}):
+        """
+        watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+        :param [[str]] symbolsAndTimeframes: the [symbol, timeframe] pairs to watch
+        :param int|None since: timestamp in ms of the earliest candle to fetch
+        :param int|None limit: the maximum amount of candles to fetch
+        :param dict params: extra parameters specific to the binance api endpoint
+        :returns dict: the candles of the market and timeframe that updated, indexed by symbol and timeframe
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(self.symbols_of_pairs(symbolsAndTimeframes), 'watchOHLCVForSymbols')
+        options = self.safe_value(self.options, 'watchOHLCV', {})
+        nameOption = self.safe_string(options, 'name', 'kline')
+        name = self.safe_string(params, 'name', nameOption)
+        params = self.omit(params, 'name')
+        type = self.market_type_for_watch(symbols[0])
+        messageHashes = []
+        keys = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            marketId = market['lowercaseId']
+            if name == 'indexPriceKline':
+                marketId = marketId.replace('_perp', '')
+            timeframe = symbolsAndTimeframes[i][1]
+            interval = self.safe_string(self.timeframes, timeframe, timeframe)
+            messageHashes.append(marketId + '@' + name + '_' + interval)
+            keys.append([symbols[i], timeframe])
+        key, ohlcv = await self.watch_multiple_streams(type, messageHashes, messageHashes, params, None, keys)
+        if self.newUpdates:
+            limit = ohlcv.getLimit(key[0], limit)
+        filtered = self.filter_by_since_limit(ohlcv, since, limit, 0, True)
+        return self.create_ohlcv_object(key[0], key[1], filtered)
+
     def handle_ohlcv(self, client, message):
         #
         #     {
@@ -670,7 +825,7 @@ class binance(ccxt.async_support.binance):
         stored = self.safe_value(self.ohlcvs[symbol], timeframe)
         if stored is None:
             limit = self.safe_integer(self.options, 'OHLCVLimit', 1000)
-            stored = ArrayCacheByTimestamp(limit)
+            stored = self.ohlcv_cache(limit)
             self.ohlcvs[symbol][timeframe] = stored
         stored.append(parsed)
         client.resolve(stored, messageHash)
@@ -722,7 +877,7 @@ class binance(ccxt.async_support.binance):
         type = None
         type, params = self.handle_market_type_and_params('watchTickers', market, params)
         if marketIds is not None:
-            market = self.safe_market(marketIds[0], None, None, type)
+            market = self.safe_market_by_id(marketIds[0], type)
         subType = None
         subType, params = self.handle_sub_type_and_params('watchTickers', market, params)
         if self.isLinear(type, subType):
@@ -1508,7 +1663,7 @@ class binance(ccxt.async_support.binance):
                         # self order already exists in the cache
             if self.myTrades is None:
                 limit = self.safe_integer(self.options, 'tradesLimit', 1000)
-                self.myTrades = ArrayCacheBySymbolById(limit)
+                self.myTrades = self.my_trades_cache(limit)
             myTrades = self.myTrades
             myTrades.append(trade)
             client.resolve(self.myTrades, messageHash)
@@ -1523,7 +1678,7 @@ class binance(ccxt.async_support.binance):
         if symbol is not None:
             if self.orders is None:
                 limit = self.safe_integer(self.options, 'ordersLimit', 1000)
-                self.orders = ArrayCacheBySymbolById(limit)
+                self.orders = self.orders_cache(limit)
             cachedOrders = self.orders
             orders = self.safe_value(cachedOrders.hashmap, symbol, {})
             order = self.safe_value(orders, orderId)
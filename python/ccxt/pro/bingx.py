@@ -4,7 +4,7 @@
 # https://github.com/ccxt/ccxt/blob/master/CONTRIBUTING.md#how-to-contribute-code
 
 import ccxt.async_support
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import BadRequest
 from ccxt.base.errors import AuthenticationError
@@ -20,10 +20,12 @@ class bingx(ccxt.async_support.bingx):
                 'watchMyTrades': False,
                 'watchOHLCV': False,
                 'watchOrderBook': True,
+                'watchOrderBookForSymbols': True,
                 'watchOrders': True,
                 'watchTicker': True,
                 'watchTickers': False,  # for now
                 'watchTrades': True,
+                'watchTradesForSymbols': True,
                 'watchPosition': None,
             },
             'urls': {
@@ -33,6 +35,9 @@ class bingx(ccxt.async_support.bingx):
                 },
             },
             'options': {
+                'ws': {
+                    'maxTopicsPerConnection': 200,  # a connection takes up to 200 subscriptions
+                },
                 'wsTimeFrames': {
                     '1m': '1min',
                     '3m': '3min',
@@ -129,6 +134,31 @@ class bingx(ccxt.async_support.bingx):
         # return orderbook.limit()
         return orderbook
 
+    async def watch_order_book_for_symbols(self, symbols, limit=None, params={}):
+        """
+        watches the order books of several markets
+        :param [str] symbols: unified symbols of the markets to fetch the order books for
+        :param int|None limit: the maximum amount of order book entries to return.
+        :param dict params: extra parameters specific to the bingx api endpoint
+        :returns dict: the `order book structure <https://docs.ccxt.com/#/?id=order-book-structure>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchOrderBookForSymbols')
+        url = self.urls['api']['ws']
+        params = self.clean_params(params)
+        if limit is None:
+            limit = 100
+        else:
+            if (limit != 5) and (limit != 10) and (limit != 20) and (limit != 50) and (limit != 100):
+                raise BadRequest(self.id + ' watchOrderBookForSymbols() can only use limit 5, 10, 20, 50 and 100.')
+        messageHashes = []
+        topics = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append('orderbook' + ':' + market['symbol'])
+            topics.append('market.depth.' + market['id'] + '.step0.level' + str(limit))
+        return await self.watch_topics_multiple(url, messageHashes, topics, params)
+
     def handle_order_book(self, client, message):
         data = self.safe_value(message, 'data', {})
         dataType = self.safe_value(message, 'dataType', '')
@@ -147,6 +177,7 @@ class bingx(ccxt.async_support.bingx):
         bids = self.safe_value(data, 'bids', [])
         self.handle_deltas(orderbook['asks'], asks)
         self.handle_deltas(orderbook['bids'], bids)
+        orderbook['symbol'] = symbol
         orderbook['timestamp'] = timestamp
         orderbook['datetime'] = self.iso8601(timestamp)
         messageHash = 'orderbook' + ':' + symbol
@@ -158,8 +189,7 @@ class bingx(ccxt.async_support.bingx):
         bookside.storeArray(bidAsk)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        bookside.applyLevels(deltas, 'price', 'volume')
 
     def handle_ohlcv(self, client, message):
         # {
@@ -256,6 +286,35 @@ class bingx(ccxt.async_support.bingx):
         self.options = self.extend(self.options, {'tradesSince': self.milliseconds() - 0})
         return newTrades
 
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        """
+        watches the trades of several markets
+        :param [str] symbols: unified symbols of the markets the trades were made in
+        :param int|None since: the earliest time in ms to fetch trades for
+        :param int|None limit: the maximum number of trade structures to retrieve
+        :param dict params: extra parameters specific to the bingx api endpoint
+        :returns [dict]: a list of `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTradesForSymbols')
+        url = self.urls['api']['ws']
+        params = self.clean_params(params)
+        messageHashes = []
+        topics = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append('trade:' + market['symbol'])
+            topics.append('market.trade.detail.' + market['id'])
+        trades = await self.watch_topics_multiple(url, messageHashes, topics, params)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(self.safe_string(first, 'symbol'), limit)
+        # the trades are sent again with every update, see watchTrades()
+        tradesSince = self.safe_integer(self.options, 'tradesSince', since)
+        newTrades = self.filter_by_since_limit(trades, tradesSince, limit, 'timestamp', True)
+        self.options = self.extend(self.options, {'tradesSince': self.milliseconds() - 0})
+        return newTrades
+
     def handle_trades(self, client, message):
         #
         #     {
@@ -455,7 +514,7 @@ class bingx(ccxt.async_support.bingx):
         #
         if self.orders is None:
             limit = self.safe_integer(self.options, 'ordersLimit', 1000)
-            self.orders = ArrayCacheBySymbolById(limit)
+            self.orders = self.orders_cache(limit)
         orders = self.orders
         rawOrders = []
         parser = None
@@ -484,6 +543,18 @@ class bingx(ccxt.async_support.bingx):
         message = self.extend(request, params)
         return await self.watch(url, messageHash, message, messageHash, shouldThrottle)
 
+    async def watch_topics_multiple(self, url, messageHashes, topics=[], params={}, keys=None):
+        # a request per topic, the protocol takes one dataType, sent together on one connection
+        messages = []
+        for i in range(0, len(topics)):
+            request = {
+                'id': '' + str(self.request_id()),
+                'reqType': 'sub',
+                'dataType': topics[i],
+            }
+            messages.append(self.extend(request, params))
+        return await self.watch_multiple(url, messageHashes, messages, messageHashes, None, keys)
+
     async def authenticate(self, params={}):
         # self.check_required_credentials()
         # messageHash = 'authenticated'
@@ -646,15 +717,16 @@ class bingx(ccxt.async_support.bingx):
         # }
 
     def ping(self, client):
-        self.client(self.urls['api']['ws']).send('Ping')
+        # every connection of a sharded url pings on its own
+        client.send('Ping')
         return {
             'ping': self.uuid(),
             'time': self.iso8601(self.milliseconds()),
         }  # XD
 
     def send_pong(self, client, message):
-        self.client(self.urls['api']['ws']).send('Pong')
-        self.client(self.urls['api']['ws']).send(self.json({
+        client.send('Pong')
+        client.send(self.json({
             'ping': self.uuid(),
             'time': self.iso8601(self.milliseconds()),
         }))
@@ -4,12 +4,11 @@
 # https://github.com/ccxt/ccxt/blob/master/CONTRIBUTING.md#how-to-contribute-code
 
 import ccxt.async_support
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp
 import hashlib
 from ccxt.base.errors import ArgumentsRequired
 from ccxt.base.errors import BadRequest
 from ccxt.base.errors import NotSupported
-from ccxt.base.errors import InvalidNonce
 from ccxt.base.errors import AuthenticationError
 from ccxt.base.precise import Precise
 
@@ -26,8 +25,11 @@ class bitget(ccxt.async_support.bitget):
                 'watchOrderBook': True,
                 'watchOrders': True,
                 'watchTicker': True,
-                'watchTickers': False,
+                'watchTickers': True,
                 'watchTrades': True,
+                'watchOrderBookForSymbols': True,
+                'watchTradesForSymbols': True,
+                'watchOHLCVForSymbols': True,
             },
             'urls': {
                 'api': {
@@ -37,6 +39,10 @@ class bitget(ccxt.async_support.bitget):
             'options': {
                 'tradesLimit': 1000,
                 'OHLCVLimit': 1000,
+                'ws': {
+                    'packSubscriptions': True,  # the args of one loop iteration go in one subscribe request
+                    'maxTopicsPerConnection': 50,  # bitget recommends less than 50 channels per connection
+                },
                 # WS timeframes differ from REST timeframes
                 'timeframes': {
                     '1m': '1m',
@@ -118,6 +124,32 @@ class bitget(ccxt.async_support.bitget):
         }
         return await self.watch_public(messageHash, args, params)
 
+    async def watch_tickers(self, symbols=None, params={}):
+        """
+        watches the price tickers of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch the tickers for
+        :param dict params: extra parameters specific to the bitget api endpoint
+        :returns dict: the `ticker structure <https://docs.ccxt.com/en/latest/manual.html#ticker-structure>` of the market that updated, indexed by its symbol
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTickers')
+        messageHashes = []
+        argsList = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append('ticker:' + market['symbol'])
+            argsList.append({
+                'instType': 'sp' if market['spot'] else 'mc',
+                'channel': 'ticker',
+                'instId': self.get_ws_market_id(market),
+            })
+        ticker = await self.watch_public_multiple(messageHashes, argsList, params)
+        if self.newUpdates:
+            result = {}
+            result[ticker['symbol']] = ticker
+            return result
+        return self.filter_by_array(self.tickers, 'symbol', symbols)
+
     def handle_ticker(self, client, message):
         #
         #   {
@@ -266,6 +298,38 @@ class bitget(ccxt.async_support.bitget):
             limit = ohlcv.getLimit(symbol, limit)
         return self.filter_by_since_limit(ohlcv, since, limit, 0, True)
 
+    async def watch_ohlcv_for_symbols(self, symbolsAndTimeframes, since=None, limit=None, params={}):
+        """
+        watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+        :param [[str]] symbolsAndTimeframes: the [symbol, timeframe] pairs to watch
+        :param int|None since: timestamp in ms of the earliest candle to fetch
+        :param int|None limit: the maximum amount of candles to fetch
+        :param dict params: extra parameters specific to the bitget api endpoint
+        :returns dict: the candles of the market and timeframe that updated, indexed by symbol and timeframe
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(self.symbols_of_pairs(symbolsAndTimeframes), 'watchOHLCVForSymbols')
+        timeframes = self.safe_value(self.options, 'timeframes')
+        messageHashes = []
+        argsList = []
+        keys = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            timeframe = symbolsAndTimeframes[i][1]
+            interval = self.safe_string(timeframes, timeframe)
+            messageHashes.append('candles:' + timeframe + ':' + market['symbol'])
+            argsList.append({
+                'instType': 'sp' if market['spot'] else 'mc',
+                'channel': 'candle' + interval,
+                'instId': self.get_ws_market_id(market),
+            })
+            keys.append([market['symbol'], timeframe])
+        key, ohlcv = await self.watch_public_multiple(messageHashes, argsList, params, keys)
+        if self.newUpdates:
+            limit = ohlcv.getLimit(key[0], limit)
+        filtered = self.filter_by_since_limit(ohlcv, since, limit, 0, True)
+        return self.create_ohlcv_object(key[0], key[1], filtered)
+
     def handle_ohlcv(self, client, message):
         #
         #   {
@@ -365,6 +429,37 @@ class bitget(ccxt.async_support.bitget):
         else:
             return orderbook
 
+    async def watch_order_book_for_symbols(self, symbols, limit=None, params={}):
+        """
+        watches the order books of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch the order books for
+        :param int|None limit: the maximum amount of order book entries to return
+        :param dict params: extra parameters specific to the bitget api endpoint
+        :returns dict: the `order book structure <https://docs.ccxt.com/en/latest/manual.html#order-book-structure>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchOrderBookForSymbols')
+        channel = 'books'
+        incrementalFeed = True
+        if (limit == 5) or (limit == 15):
+            channel += str(limit)
+            incrementalFeed = False
+        messageHashes = []
+        argsList = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append('orderbook' + ':' + market['symbol'])
+            argsList.append({
+                'instType': 'sp' if market['spot'] else 'mc',
+                'channel': channel,
+                'instId': self.get_ws_market_id(market),
+            })
+        orderbook = await self.watch_public_multiple(messageHashes, argsList, params)
+        if incrementalFeed:
+            return orderbook.limit()
+        else:
+            return orderbook
+
     def handle_order_book(self, client, message):
         #
         #   {
@@ -409,7 +504,13 @@ class bitget(ccxt.async_support.bitget):
         if incrementalBook:
             storedOrderBook = self.safe_value(self.orderbooks, symbol)
             if storedOrderBook is None:
-                storedOrderBook = self.counted_order_book({})
+                action = self.safe_string(message, 'action')
+                if action != 'snapshot':
+                    # dropped after a checksum mismatch, waiting for the next snapshot
+                    return
+                storedOrderBook = self.order_book({})
+                storedOrderBook.retainRaw()
+                storedOrderBook['symbol'] = symbol
             asks = self.safe_value(rawOrderBook, 'asks', [])
             bids = self.safe_value(rawOrderBook, 'bids', [])
             self.handle_deltas(storedOrderBook['asks'], asks)
@@ -418,24 +519,9 @@ class bitget(ccxt.async_support.bitget):
             storedOrderBook['datetime'] = self.iso8601(timestamp)
             checksum = self.safe_value(self.options, 'checksum', True)
             if checksum:
-                storedAsks = storedOrderBook['asks']
-                storedBids = storedOrderBook['bids']
-                asksLength = len(storedAsks)
-                bidsLength = len(storedBids)
-                payloadArray = []
-                for i in range(0, 25):
-                    if i < bidsLength:
-                        payloadArray.append(storedBids[i][2][0])
-                        payloadArray.append(storedBids[i][2][1])
-                    if i < asksLength:
-                        payloadArray.append(storedAsks[i][2][0])
-                        payloadArray.append(storedAsks[i][2][1])
-                payload = ':'.join(payloadArray)
-                calculatedChecksum = self.crc32(payload, True)
                 responseChecksum = self.safe_integer(rawOrderBook, 'checksum')
-                if calculatedChecksum != responseChecksum:
-                    error = InvalidNonce(self.id + ' invalid checksum')
-                    client.reject(error, messageHash)
+                if not self.verify_order_book_checksum(client, storedOrderBook, responseChecksum, messageHash):
+                    return
         else:
             storedOrderBook = self.parse_order_book(rawOrderBook, symbol, timestamp)
         self.orderbooks[symbol] = storedOrderBook
@@ -443,14 +529,24 @@ class bitget(ccxt.async_support.bitget):
 
     def handle_delta(self, bookside, delta):
         bidAsk = self.parse_bid_ask(delta, 0, 1)
-        # we store the string representations in the orderbook for checksum calculation
-        # self simplifies the code for generating checksums do not need to do any complex number transformations
-        bidAsk.append(delta)
         bookside.storeArray(bidAsk)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        # the raw strings are kept by the book for checksum calculation
+        bookside.applyLevels(deltas)
+
+    async def resubscribe_order_book(self, client, symbol, messageHash):
+        # bitget pushes a new snapshot once the channel is subscribed again
+        market = self.market(symbol)
+        args = [
+            {
+                'instType': 'sp' if market['spot'] else 'mc',
+                'channel': 'books',
+                'instId': self.get_ws_market_id(market),
+            },
+        ]
+        await client.send({'op': 'unsubscribe', 'args': args})
+        await client.send({'op': 'subscribe', 'args': args})
 
     async def watch_trades(self, symbol, since=None, limit=None, params={}):
         """
@@ -476,6 +572,33 @@ class bitget(ccxt.async_support.bitget):
             limit = trades.getLimit(symbol, limit)
         return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
 
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        """
+        get the list of most recent trades of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch trades for
+        :param int|None since: timestamp in ms of the earliest trade to fetch
+        :param int|None limit: the maximum amount of trades to fetch
+        :param dict params: extra parameters specific to the bitget api endpoint
+        :returns [dict]: a list of the `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTradesForSymbols')
+        messageHashes = []
+        argsList = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append('trade:' + market['symbol'])
+            argsList.append({
+                'instType': 'sp' if market['spot'] else 'mc',
+                'channel': 'trade',
+                'instId': self.get_ws_market_id(market),
+            })
+        trades = await self.watch_public_multiple(messageHashes, argsList, params)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(self.safe_string(first, 'symbol'), limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
     def handle_trades(self, client, message):
         #
         #    {
@@ -611,7 +734,7 @@ class bitget(ccxt.async_support.bitget):
         data = self.safe_value(message, 'data', [])
         if self.orders is None:
             limit = self.safe_integer(self.options, 'ordersLimit', 1000)
-            self.orders = ArrayCacheBySymbolById(limit)
+            self.orders = self.orders_cache(limit)
         stored = self.orders
         marketSymbols = {}
         for i in range(0, len(data)):
@@ -962,6 +1085,18 @@ class bitget(ccxt.async_support.bitget):
         message = self.extend(request, params)
         return await self.watch(url, messageHash, message, messageHash, shouldThrottle)
 
+    async def watch_public_multiple(self, messageHashes, argsList, params={}, keys=None):
+        # a subscription per args, the requests are packed up to options['ws']['maxTopicsPerMessage'] args
+        url = self.urls['api']['ws']
+        messages = []
+        for i in range(0, len(argsList)):
+            request = {
+                'op': 'subscribe',
+                'args': [argsList[i]],
+            }
+            messages.append(self.extend(request, params))
+        return await self.watch_multiple(url, messageHashes, messages, messageHashes, None, keys)
+
     async def authenticate(self, params={}):
         self.check_required_credentials()
         url = self.urls['api']['ws']
@@ -1021,6 +1156,22 @@ class bitget(ccxt.async_support.bitget):
                 return False
         return message
 
+    def message_routes(self):
+        return {
+            'channel': {
+                'exact': {
+                    'ticker': self.handle_ticker,
+                    'trade': self.handle_trades,
+                    'orders': self.handle_order,
+                    'account': self.handle_balance,
+                },
+                'contains': {
+                    'candle': self.handle_ohlcv,
+                    'books': self.handle_order_book,
+                },
+            },
+        }
+
     def handle_message(self, client, message):
         #
         #   {
@@ -1072,21 +1223,9 @@ class bitget(ccxt.async_support.bitget):
         if event == 'subscribe':
             self.handle_subscription_status(client, message)
             return
-        methods = {
-            'ticker': self.handle_ticker,
-            'trade': self.handle_trades,
-            'orders': self.handle_order,
-            'account': self.handle_balance,
-        }
         arg = self.safe_value(message, 'arg', {})
         topic = self.safe_value(arg, 'channel', '')
-        method = self.safe_value(methods, topic)
-        if method is not None:
-            method(client, message)
-        if topic.find('candle') >= 0:
-            self.handle_ohlcv(client, message)
-        if topic.find('books') >= 0:
-            self.handle_order_book(client, message)
+        self.route_message(client, message, topic)
 
     def ping(self, client):
         return 'ping'
@@ -4,7 +4,7 @@
 # https://github.com/ccxt/ccxt/blob/master/CONTRIBUTING.md#how-to-contribute-code
 
 import ccxt.async_support
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import RateLimitExceeded
 from ccxt.base.errors import AuthenticationError
@@ -22,8 +22,11 @@ class bitmex(ccxt.async_support.bitmex):
                 'watchOrderBook': True,
                 'watchOrders': True,
                 'watchTicker': True,
-                'watchTickers': False,
+                'watchTickers': True,
                 'watchTrades': True,
+                'watchOrderBookForSymbols': True,
+                'watchTradesForSymbols': True,
+                'watchOHLCVForSymbols': True,
             },
             'urls': {
                 'test': {
@@ -37,6 +40,10 @@ class bitmex(ccxt.async_support.bitmex):
             #     'ws': '0.2.0',
             # },
             'options': {
+                'ws': {
+                    'packSubscriptions': True,  # the args of one loop iteration go in one subscribe request
+                    'maxTopicsPerMessage': 100,
+                },
                 'watchOrderBookLevel': 'orderBookL2',  # 'orderBookL2' = L2 full order book, 'orderBookL2_25' = L2 top 25, 'orderBook10' L3 top 10
                 'tradesLimit': 1000,
                 'OHLCVLimit': 1000,
@@ -72,6 +79,40 @@ class bitmex(ccxt.async_support.bitmex):
         }
         return await self.watch(url, messageHash, self.extend(request, params), messageHash)
 
+    async def watch_tickers(self, symbols=None, params={}):
+        """
+        watches the price tickers of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch the tickers for
+        :param dict params: extra parameters specific to the bitmex api endpoint
+        :returns dict: the `ticker structure <https://docs.ccxt.com/#/?id=ticker-structure>` of the market that updated, indexed by its symbol
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTickers')
+        messageHashes = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append('instrument:' + market['id'])
+        ticker = await self.watch_tables(messageHashes, params)
+        if self.newUpdates:
+            result = {}
+            result[ticker['symbol']] = ticker
+            return result
+        return self.filter_by_array(self.tickers, 'symbol', symbols)
+
+    async def watch_tables(self, messageHashes, params={}, keys=None):
+        # a subscription per table:symbol topic, the requests are packed up to options['ws']['maxTopicsPerMessage'] topics
+        url = self.urls['api']['ws']
+        messages = []
+        for i in range(0, len(messageHashes)):
+            request = {
+                'op': 'subscribe',
+                'args': [
+                    messageHashes[i],
+                ],
+            }
+            messages.append(self.extend(request, params))
+        return await self.watch_multiple(url, messageHashes, messages, messageHashes, None, keys)
+
     def handle_ticker(self, client, message):
         #
         #     {
@@ -304,7 +345,7 @@ class bitmex(ccxt.async_support.bitmex):
         for i in range(0, len(data)):
             update = data[i]
             marketId = self.safe_value(update, 'symbol')
-            market = self.safe_market(marketId)
+            market = self.safe_market_by_id(marketId)
             symbol = market['symbol']
             messageHash = table + ':' + marketId
             ticker = self.safe_value(self.tickers, symbol, {})
@@ -503,7 +544,7 @@ class bitmex(ccxt.async_support.bitmex):
         marketIds = list(dataByMarketIds.keys())
         for i in range(0, len(marketIds)):
             marketId = marketIds[i]
-            market = self.safe_market(marketId)
+            market = self.safe_market_by_id(marketId)
             messageHash = table + ':' + marketId
             symbol = market['symbol']
             trades = self.parse_trades(dataByMarketIds[marketId], market)
@@ -542,6 +583,27 @@ class bitmex(ccxt.async_support.bitmex):
             limit = trades.getLimit(symbol, limit)
         return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
 
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        """
+        get the list of most recent trades of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch trades for
+        :param int|None since: timestamp in ms of the earliest trade to fetch
+        :param int|None limit: the maximum amount of trades to fetch
+        :param dict params: extra parameters specific to the bitmex api endpoint
+        :returns [dict]: a list of the `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTradesForSymbols')
+        messageHashes = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append('trade:' + market['id'])
+        trades = await self.watch_tables(messageHashes, params)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(self.safe_string(first, 'symbol'), limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
     async def authenticate(self, params={}):
         url = self.urls['api']['ws']
         client = self.client(url)
@@ -768,7 +830,7 @@ class bitmex(ccxt.async_support.bitmex):
         if dataLength > 0:
             if self.orders is None:
                 limit = self.safe_integer(self.options, 'ordersLimit', 1000)
-                self.orders = ArrayCacheBySymbolById(limit)
+                self.orders = self.orders_cache(limit)
             stored = self.orders
             symbols = {}
             for i in range(0, dataLength):
@@ -882,7 +944,7 @@ class bitmex(ccxt.async_support.bitmex):
         trades = self.parse_trades(rawTrades)
         if self.myTrades is None:
             limit = self.safe_integer(self.options, 'tradesLimit', 1000)
-            self.myTrades = ArrayCacheBySymbolById(limit)
+            self.myTrades = self.my_trades_cache(limit)
         stored = self.myTrades
         symbols = {}
         for j in range(0, len(trades)):
@@ -905,15 +967,7 @@ class bitmex(ccxt.async_support.bitmex):
         :param dict params: extra parameters specific to the bitmex api endpoint
         :returns dict: A dictionary of `order book structures <https://docs.ccxt.com/#/?id=order-book-structure>` indexed by market symbols
         """
-        table = None
-        if limit is None:
-            table = self.safe_string(self.options, 'watchOrderBookLevel', 'orderBookL2')
-        elif limit == 25:
-            table = 'orderBookL2_25'
-        elif limit == 10:
-            table = 'orderBookL10'
-        else:
-            raise ExchangeError(self.id + ' watchOrderBook limit argument must be None(L2), 25(L2) or 10(L3)')
+        table = self.order_book_table(limit)
         await self.load_markets()
         market = self.market(symbol)
         messageHash = table + ':' + market['id']
@@ -927,6 +981,34 @@ class bitmex(ccxt.async_support.bitmex):
         orderbook = await self.watch(url, messageHash, self.deep_extend(request, params), messageHash, False)
         return orderbook.limit()
 
+    async def watch_order_book_for_symbols(self, symbols, limit=None, params={}):
+        """
+        watches the order books of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch the order books for
+        :param int|None limit: the maximum amount of order book entries to return
+        :param dict params: extra parameters specific to the bitmex api endpoint
+        :returns dict: the `order book structure <https://docs.ccxt.com/#/?id=order-book-structure>` of the market that updated
+        """
+        table = self.order_book_table(limit)
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchOrderBookForSymbols')
+        messageHashes = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append(table + ':' + market['id'])
+        orderbook = await self.watch_tables(messageHashes, params)
+        return orderbook.limit()
+
+    def order_book_table(self, limit=None):
+        if limit is None:
+            return self.safe_string(self.options, 'watchOrderBookLevel', 'orderBookL2')
+        elif limit == 25:
+            return 'orderBookL2_25'
+        elif limit == 10:
+            return 'orderBookL10'
+        else:
+            raise ExchangeError(self.id + ' watchOrderBook limit argument must be None(L2), 25(L2) or 10(L3)')
+
     async def watch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
         """
         watches historical candlestick data containing the open, high, low, and close price, and the volume of a market
@@ -954,6 +1036,31 @@ class bitmex(ccxt.async_support.bitmex):
             limit = ohlcv.getLimit(symbol, limit)
         return self.filter_by_since_limit(ohlcv, since, limit, 0, True)
 
+    async def watch_ohlcv_for_symbols(self, symbolsAndTimeframes, since=None, limit=None, params={}):
+        """
+        watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+        :param [[str]] symbolsAndTimeframes: the [symbol, timeframe] pairs to watch
+        :param int|None since: timestamp in ms of the earliest candle to fetch
+        :param int|None limit: the maximum amount of candles to fetch
+        :param dict params: extra parameters specific to the bitmex api endpoint
+        :returns dict: the candles of the market and timeframe that updated, indexed by symbol and timeframe
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(self.symbols_of_pairs(symbolsAndTimeframes), 'watchOHLCVForSymbols')
+        messageHashes = []
+        keys = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            timeframe = symbolsAndTimeframes[i][1]
+            table = 'tradeBin' + self.safe_string(self.timeframes, timeframe, timeframe)
+            messageHashes.append(table + ':' + market['id'])
+            keys.append([market['symbol'], timeframe])
+        key, ohlcv = await self.watch_tables(messageHashes, params, keys)
+        if self.newUpdates:
+            limit = ohlcv.getLimit(key[0], limit)
+        filtered = self.filter_by_since_limit(ohlcv, since, limit, 0, True)
+        return self.create_ohlcv_object(key[0], key[1], filtered)
+
     def handle_ohlcv(self, client, message):
         #
         #     {
@@ -1029,7 +1136,7 @@ class bitmex(ccxt.async_support.bitmex):
         for i in range(0, len(candles)):
             candle = candles[i]
             marketId = self.safe_string(candle, 'symbol')
-            market = self.safe_market(marketId)
+            market = self.safe_market_by_id(marketId)
             symbol = market['symbol']
             messageHash = table + ':' + market['id']
             result = [
@@ -1105,7 +1212,7 @@ class bitmex(ccxt.async_support.bitmex):
         if action == 'partial':
             filter = self.safe_value(message, 'filter', {})
             marketId = self.safe_value(filter, 'symbol')
-            market = self.safe_market(marketId)
+            market = self.safe_market_by_id(marketId)
             symbol = market['symbol']
             if table == 'orderBookL2':
                 self.orderbooks[symbol] = self.indexed_order_book()
@@ -1131,7 +1238,7 @@ class bitmex(ccxt.async_support.bitmex):
                 if not (marketId in numUpdatesByMarketId):
                     numUpdatesByMarketId[marketId] = 0
                 numUpdatesByMarketId[marketId] = self.sum(numUpdatesByMarketId, 1)
-                market = self.safe_market(marketId)
+                market = self.safe_market_by_id(marketId)
                 symbol = market['symbol']
                 orderbook = self.orderbooks[symbol]
                 price = self.safe_float(data[i], 'price')
@@ -1145,7 +1252,7 @@ class bitmex(ccxt.async_support.bitmex):
             for i in range(0, len(marketIds)):
                 marketId = marketIds[i]
                 messageHash = table + ':' + marketId
-                market = self.safe_market(marketId)
+                market = self.safe_market_by_id(marketId)
                 symbol = market['symbol']
                 orderbook = self.orderbooks[symbol]
                 client.resolve(orderbook, messageHash)
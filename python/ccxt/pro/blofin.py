@@ -4,9 +4,8 @@
 # https://github.com/ccxt/ccxt/blob/master/CONTRIBUTING.md#how-to-contribute-code
 
 import ccxt.async_support
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp
 import hashlib
-from ccxt.base.errors import InvalidNonce
 from ccxt.base.errors import AuthenticationError
 
 
@@ -24,6 +23,9 @@ class blofin(ccxt.async_support.blofin):
                 'watchTicker': True,
                 'watchTickers': True,
                 'watchTrades': True,
+                'watchOrderBookForSymbols': True,
+                'watchTradesForSymbols': True,
+                'watchOHLCVForSymbols': True,
             },
             'urls': {
                 'api': {
@@ -48,6 +50,9 @@ class blofin(ccxt.async_support.blofin):
                 'watchOrderBook': {
                     'depth': 'books',
                 },
+                'ws': {
+                    'packSubscriptions': True,  # the args of one loop iteration go in one subscribe request
+                },
                 'tradesLimit': 1000,
                 'ordersLimit': 1000,
                 'requestId': {},
@@ -82,6 +87,26 @@ class blofin(ccxt.async_support.blofin):
         }
         return await self.watch(url, messageHash, self.deep_extend(request, params), messageHash, shouldThrottle)
 
+    async def subscribe_multiple(self, access, channels, symbols, params={}, keys=None):
+        # a subscription per channel and symbol, the requests are packed up to options['ws']['maxTopicsPerMessage'] args
+        url = self.urls['api']['ws'][access]
+        messageHashes = []
+        messages = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append(channels[i] + ':' + market['id'])
+            request = {
+                'op': 'subscribe',
+                'args': [
+                    {
+                        'channel': channels[i],
+                        'instId': market['id'],
+                    },
+                ],
+            }
+            messages.append(self.deep_extend(request, params))
+        return await self.watch_multiple(url, messageHashes, messages, messageHashes, None, keys)
+
     async def watch_trades(self, symbol, since=None, limit=None, params={}):
         await self.load_markets()
         symbol = self.symbol(symbol)
@@ -90,6 +115,26 @@ class blofin(ccxt.async_support.blofin):
             limit = trades.getLimit(symbol, limit)
         return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
 
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        """
+        get the list of most recent trades of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch trades for
+        :param int|None since: timestamp in ms of the earliest trade to fetch
+        :param int|None limit: the maximum amount of trades to fetch
+        :param dict params: extra parameters specific to the blofin api endpoint
+        :returns [dict]: a list of the `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTradesForSymbols')
+        channels = []
+        for i in range(0, len(symbols)):
+            channels.append('trades')
+        trades = await self.subscribe_multiple('public', channels, symbols, params)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(self.safe_string(first, 'symbol'), limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
     def handle_trades(self, client, message):
         arg = self.safe_value(message, 'arg', {})
         channel = self.safe_string(arg, 'channel')
@@ -117,6 +162,25 @@ class blofin(ccxt.async_support.blofin):
         """
         return await self.subscribe('public', 'tickers', symbol, params)
 
+    async def watch_tickers(self, symbols=None, params={}):
+        """
+        watches the price tickers of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch the tickers for
+        :param dict params: extra parameters specific to the blofin api endpoint
+        :returns dict: the `ticker structure <https://docs.ccxt.com/#/?id=ticker-structure>` of the market that updated, indexed by its symbol
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTickers')
+        channels = []
+        for i in range(0, len(symbols)):
+            channels.append('tickers')
+        ticker = await self.subscribe_multiple('public', channels, symbols, params)
+        if self.newUpdates:
+            result = {}
+            result[ticker['symbol']] = ticker
+            return result
+        return self.filter_by_array(self.tickers, 'symbol', symbols)
+
     def handle_ticker(self, client, message):
         arg = self.safe_value(message, 'arg', {})
         channel = self.safe_string(arg, 'channel')
@@ -140,6 +204,30 @@ class blofin(ccxt.async_support.blofin):
             limit = ohlcv.getLimit(symbol, limit)
         return self.filter_by_since_limit(ohlcv, since, limit, 0, True)
 
+    async def watch_ohlcv_for_symbols(self, symbolsAndTimeframes, since=None, limit=None, params={}):
+        """
+        watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+        :param [[str]] symbolsAndTimeframes: the [symbol, timeframe] pairs to watch
+        :param int|None since: timestamp in ms of the earliest candle to fetch
+        :param int|None limit: the maximum amount of candles to fetch
+        :param dict params: extra parameters specific to the blofin api endpoint
+        :returns dict: the candles of the market and timeframe that updated, indexed by symbol and timeframe
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(self.symbols_of_pairs(symbolsAndTimeframes), 'watchOHLCVForSymbols')
+        channels = []
+        keys = []
+        for i in range(0, len(symbols)):
+            timeframe = symbolsAndTimeframes[i][1]
+            interval = self.safe_string(self.timeframes, timeframe, timeframe)
+            channels.append('candle' + interval)
+            keys.append([symbols[i], timeframe])
+        key, ohlcv = await self.subscribe_multiple('public', channels, symbols, params, keys)
+        if self.newUpdates:
+            limit = ohlcv.getLimit(key[0], limit)
+        filtered = self.filter_by_since_limit(ohlcv, since, limit, 0, True)
+        return self.create_ohlcv_object(key[0], key[1], filtered)
+
     def handle_ohlcv(self, client, message):
         arg = self.safe_value(message, 'arg', {})
         channel = self.safe_string(arg, 'channel')
@@ -172,14 +260,31 @@ class blofin(ccxt.async_support.blofin):
         orderbook = await self.subscribe('public', depth, symbol, params, False)
         return orderbook.limit(limit)
 
+    async def watch_order_book_for_symbols(self, symbols, limit=None, params={}):
+        """
+        watches the order books of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch the order books for
+        :param int|None limit: the maximum amount of order book entries to return
+        :param dict params: extra parameters specific to the blofin api endpoint
+        :returns dict: the `order book structure <https://docs.ccxt.com/#/?id=order-book-structure>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchOrderBookForSymbols')
+        options = self.safe_value(self.options, 'watchOrderBook', {})
+        depth = self.safe_string(options, 'depth', 'books-l2-tbt')
+        channels = []
+        for i in range(0, len(symbols)):
+            channels.append(depth)
+        orderbook = await self.subscribe_multiple('public', channels, symbols, params)
+        return orderbook.limit(limit)
+
     def handle_delta(self, bookside, delta):
         price = self.safe_float(delta, 0)
         amount = self.safe_float(delta, 1)
         bookside.store(price, amount)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        bookside.applyLevels(deltas)
 
     def handle_order_book_message(self, client, message, orderbook, messageHash):
         asks = self.safe_value(message, 'asks', [])
@@ -188,25 +293,12 @@ class blofin(ccxt.async_support.blofin):
         storedBids = orderbook['bids']
         self.handle_deltas(storedAsks, asks)
         self.handle_deltas(storedBids, bids)
-        checksum = self.safe_value(self.options, 'checksum', True)
+        # verification is opt-in until the blofin checksum is confirmed to follow the okx layout
+        checksum = self.safe_value(self.options, 'checksum', False)
         if checksum:
-            asksLength = len(storedAsks)
-            bidsLength = len(storedBids)
-            payloadArray = []
-            for i in range(0, 25):
-                if i < bidsLength:
-                    payloadArray.append(self.number_to_string(storedBids[i][0]))
-                    payloadArray.append(self.number_to_string(storedBids[i][1]))
-                if i < asksLength:
-                    payloadArray.append(self.number_to_string(storedAsks[i][0]))
-                    payloadArray.append(self.number_to_string(storedAsks[i][1]))
-            # payload = ':'.join(payloadArray)
-            # responseChecksum = self.safe_integer(message, 'checksum')
-            # localChecksum = self.crc32(payload, True)
-            # if responseChecksum != localChecksum:
-            #     error = InvalidNonce(self.id + ' invalid checksum')
-            #     client.reject(error, messageHash)
-            # }
+            responseChecksum = self.safe_integer(message, 'checksum')
+            if not self.verify_order_book_checksum(client, orderbook, responseChecksum, messageHash):
+                return orderbook
         timestamp = self.safe_integer(message, 'ts')
         orderbook['timestamp'] = timestamp
         orderbook['datetime'] = self.iso8601(timestamp)
@@ -232,16 +324,19 @@ class blofin(ccxt.async_support.blofin):
         if action == 'snapshot':
             update = data
             orderbook = self.order_book({}, limit)
+            orderbook.retainRaw()
             self.orderbooks[symbol] = orderbook
             orderbook['symbol'] = symbol
             self.handle_order_book_message(client, update, orderbook, messageHash)
-            client.resolve(orderbook, messageHash)
+            if symbol in self.orderbooks:
+                client.resolve(orderbook, messageHash)
         elif action == 'update':
             if symbol in self.orderbooks:
                 orderbook = self.orderbooks[symbol]
                 update = data
                 self.handle_order_book_message(client, update, orderbook, messageHash)
-                client.resolve(orderbook, messageHash)
+                if symbol in self.orderbooks:
+                    client.resolve(orderbook, messageHash)
         #  elif (channel == 'books5') or (channel == 'bbo-tbt'):
         #     orderbook = self.safe_value(self.orderbooks, symbol)
         #     if orderbook is None:
@@ -258,6 +353,18 @@ class blofin(ccxt.async_support.blofin):
         # }
         return message
 
+    async def resubscribe_order_book(self, client, symbol, messageHash):
+        # blofin pushes a new snapshot once the channel is subscribed again
+        parts = messageHash.split(':')
+        args = [
+            {
+                'channel': parts[0],
+                'instId': parts[1],
+            },
+        ]
+        await client.send({'op': 'unsubscribe', 'args': args})
+        await client.send({'op': 'subscribe', 'args': args})
+
     def check_required_uid(self):
         # checkRequiredUid(error = True) {
         return True
@@ -366,7 +473,7 @@ class blofin(ccxt.async_support.blofin):
         if symbol is not None:
             if self.orders is None:
                 limit = self.safe_integer(self.options, 'ordersLimit', 1000)
-                self.orders = ArrayCacheBySymbolById(limit)
+                self.orders = self.orders_cache(limit)
             cachedOrders = self.orders
             orders = self.safe_value(cachedOrders.hashmap, symbol, {})
             order = self.safe_value(orders, orderId)
@@ -444,7 +551,7 @@ class blofin(ccxt.async_support.blofin):
         }
         method = self.safe_value(methods, channel)
         if method is None:
-            if channel?.find('candle') == 0:
+            if (channel is not None) and (channel.find('candle') == 0):
                 self.handle_ohlcv(client, message)
             else:
                 return message
@@ -4,7 +4,7 @@
 # https://github.com/ccxt/ccxt/blob/master/CONTRIBUTING.md#how-to-contribute-code
 
 import ccxt.async_support
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.cache import ArrayCache
 import hashlib
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import BadRequest
@@ -23,8 +23,11 @@ class bybit(ccxt.async_support.bybit):
                 'watchOrderBook': True,
                 'watchOrders': True,
                 'watchTicker': True,
-                'watchTickers': False,  # for now
+                'watchTickers': True,
                 'watchTrades': True,
+                'watchOrderBookForSymbols': True,
+                'watchTradesForSymbols': True,
+                'watchOHLCVForSymbols': True,
                 'watchPosition': None,
             },
             'urls': {
@@ -69,6 +72,10 @@ class bybit(ccxt.async_support.bybit):
                 'watchTicker': {
                     'name': 'tickers',  # 'tickers' for 24hr statistical ticker or 'tickers_lt' for leverage token ticker
                 },
+                'ws': {
+                    'packSubscriptions': True,  # the args of one loop iteration go in one subscribe request
+                    'maxTopicsPerMessage': 10,  # spot takes up to 10 args per request
+                },
                 'spot': {
                     'timeframes': {
                         '1m': '1m',
@@ -179,6 +186,35 @@ class bybit(ccxt.async_support.bybit):
         topics = [topic]
         return await self.watch_topics(url, messageHash, topics, params)
 
+    async def watch_tickers(self, symbols=None, params={}):
+        """
+        watches the price tickers of several markets, subscribed in as few requests as possible
+        see https://bybit-exchange.github.io/docs/v5/websocket/public/ticker
+        :param [str] symbols: unified symbols of the markets to fetch the tickers for, of one market type
+        :param dict params: extra parameters specific to the bybit api endpoint
+        :returns dict: the `ticker structure <https://docs.ccxt.com/#/?id=ticker-structure>` of the market that updated, indexed by its symbol
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTickers')
+        url = self.get_url_by_market_type(symbols[0], False, params)
+        params = self.clean_params(params)
+        options = self.safe_value(self.options, 'watchTicker', {})
+        name = self.safe_string(options, 'name', 'tickers')
+        messageHashes = []
+        topics = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            if not market['spot'] and name != 'tickers':
+                raise BadRequest(self.id + ' watchTickers() only supports name tickers for contract markets')
+            messageHashes.append('ticker:' + market['symbol'])
+            topics.append(name + '.' + market['id'])
+        ticker = await self.watch_multiple_topics(url, messageHashes, topics, params)
+        if self.newUpdates:
+            result = {}
+            result[ticker['symbol']] = ticker
+            return result
+        return self.filter_by_array(self.tickers, 'symbol', symbols)
+
     def handle_ticker(self, client, message):
         #
         # linear
@@ -333,6 +369,36 @@ class bybit(ccxt.async_support.bybit):
             limit = ohlcv.getLimit(symbol, limit)
         return self.filter_by_since_limit(ohlcv, since, limit, 0, True)
 
+    async def watch_ohlcv_for_symbols(self, symbolsAndTimeframes, since=None, limit=None, params={}):
+        """
+        watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+        see https://bybit-exchange.github.io/docs/v5/websocket/public/kline
+        :param [[str]] symbolsAndTimeframes: the [symbol, timeframe] pairs to watch, of one market type
+        :param int|None since: timestamp in ms of the earliest candle to fetch
+        :param int|None limit: the maximum amount of candles to fetch
+        :param dict params: extra parameters specific to the bybit api endpoint
+        :returns dict: the candles of the market and timeframe that updated, indexed by symbol and timeframe
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(self.symbols_of_pairs(symbolsAndTimeframes), 'watchOHLCVForSymbols')
+        url = self.get_url_by_market_type(symbols[0], False, params)
+        params = self.clean_params(params)
+        messageHashes = []
+        topics = []
+        keys = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            timeframe = symbolsAndTimeframes[i][1]
+            timeframeId = self.safe_string(self.timeframes, timeframe, timeframe)
+            messageHashes.append('kline' + ':' + timeframeId + ':' + market['symbol'])
+            topics.append('kline.' + timeframeId + '.' + market['id'])
+            keys.append([market['symbol'], timeframe])
+        key, ohlcv = await self.watch_multiple_topics(url, messageHashes, topics, params, keys)
+        if self.newUpdates:
+            limit = ohlcv.getLimit(key[0], limit)
+        filtered = self.filter_by_since_limit(ohlcv, since, limit, 0, True)
+        return self.create_ohlcv_object(key[0], key[1], filtered)
+
     def handle_ohlcv(self, client, message):
         #
         #     {
@@ -364,7 +430,7 @@ class bybit(ccxt.async_support.bybit):
         marketId = self.safe_string(topicParts, topicLength - 1)
         isSpot = client.url.find('spot') > -1
         marketType = 'spot' if isSpot else 'contract'
-        market = self.safe_market(marketId, None, None, marketType)
+        market = self.safe_market_by_id(marketId, marketType)
         symbol = market['symbol']
         ohlcvsByTimeframe = self.safe_value(self.ohlcvs, symbol)
         if ohlcvsByTimeframe is None:
@@ -372,7 +438,7 @@ class bybit(ccxt.async_support.bybit):
         stored = self.safe_value(ohlcvsByTimeframe, timeframeId)
         if stored is None:
             limit = self.safe_integer(self.options, 'OHLCVLimit', 1000)
-            stored = ArrayCacheByTimestamp(limit)
+            stored = self.ohlcv_cache(limit)
             self.ohlcvs[symbol][timeframeId] = stored
         for i in range(0, len(data)):
             parsed = self.parse_ws_ohlcv(data[i])
@@ -420,6 +486,35 @@ class bybit(ccxt.async_support.bybit):
         url = self.get_url_by_market_type(symbol, False, params)
         params = self.clean_params(params)
         messageHash = 'orderbook' + ':' + symbol
+        limit = self.order_book_topic_limit(market, limit)
+        topics = ['orderbook.' + str(limit) + '.' + market['id']]
+        orderbook = await self.watch_topics(url, messageHash, topics, params)
+        return orderbook.limit()
+
+    async def watch_order_book_for_symbols(self, symbols, limit=None, params={}):
+        """
+        watches the order books of several markets, subscribed in as few requests as possible
+        see https://bybit-exchange.github.io/docs/v5/websocket/public/orderbook
+        :param [str] symbols: unified symbols of the markets to fetch the order books for, of one market type
+        :param int|None limit: the maximum amount of order book entries to return.
+        :param dict params: extra parameters specific to the bybit api endpoint
+        :returns dict: the `order book structure <https://docs.ccxt.com/#/?id=order-book-structure>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchOrderBookForSymbols')
+        url = self.get_url_by_market_type(symbols[0], False, params)
+        params = self.clean_params(params)
+        limit = self.order_book_topic_limit(self.market(symbols[0]), limit)
+        messageHashes = []
+        topics = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append('orderbook' + ':' + market['symbol'])
+            topics.append('orderbook.' + str(limit) + '.' + market['id'])
+        orderbook = await self.watch_multiple_topics(url, messageHashes, topics, params)
+        return orderbook.limit()
+
+    def order_book_topic_limit(self, market, limit=None):
         if limit is None:
             if market['spot']:
                 limit = 50
@@ -430,9 +525,7 @@ class bybit(ccxt.async_support.bybit):
                 # bybit only support limit 1, 50, 200, 500 for contract
                 if (limit != 1) and (limit != 50) and (limit != 200) and (limit != 500):
                     raise BadRequest(self.id + ' watchOrderBook() can only use limit 1, 50, 200 and 500.')
-        topics = ['orderbook.' + str(limit) + '.' + market['id']]
-        orderbook = await self.watch_topics(url, messageHash, topics, params)
-        return orderbook.limit()
+        return limit
 
     def handle_order_book(self, client, message):
         #
@@ -474,7 +567,7 @@ class bybit(ccxt.async_support.bybit):
         data = self.safe_value(message, 'data', {})
         marketId = self.safe_string(data, 's')
         marketType = 'spot' if isSpot else 'contract'
-        market = self.safe_market(marketId, None, None, marketType)
+        market = self.safe_market_by_id(marketId, marketType)
         symbol = market['symbol']
         timestamp = self.safe_integer(message, 'ts')
         orderbook = self.safe_value(self.orderbooks, symbol)
@@ -499,8 +592,7 @@ class bybit(ccxt.async_support.bybit):
         bookside.storeArray(bidAsk)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        bookside.applyLevels(deltas)
 
     async def watch_trades(self, symbol, since=None, limit=None, params={}):
         """
@@ -524,6 +616,32 @@ class bybit(ccxt.async_support.bybit):
             limit = trades.getLimit(symbol, limit)
         return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
 
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        """
+        watches the trades of several markets, subscribed in as few requests as possible
+        see https://bybit-exchange.github.io/docs/v5/websocket/public/trade
+        :param [str] symbols: unified symbols of the markets to fetch trades for, of one market type
+        :param int|None since: the earliest time in ms to fetch trades for
+        :param int|None limit: the maximum number of trade structures to retrieve
+        :param dict params: extra parameters specific to the bybit api endpoint
+        :returns [dict]: a list of the `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTradesForSymbols')
+        url = self.get_url_by_market_type(symbols[0], False, params)
+        params = self.clean_params(params)
+        messageHashes = []
+        topics = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append('trade:' + market['symbol'])
+            topics.append('publicTrade.' + market['id'])
+        trades = await self.watch_multiple_topics(url, messageHashes, topics, params)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(self.safe_string(first, 'symbol'), limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
     def handle_trades(self, client, message):
         #
         #     {
@@ -551,7 +669,7 @@ class bybit(ccxt.async_support.bybit):
         isSpot = client.url.find('spot') >= 0
         marketType = 'spot' if (isSpot) else 'contract'
         marketId = self.safe_string(parts, 1)
-        market = self.safe_market(marketId, None, None, marketType)
+        market = self.safe_market_by_id(marketId, marketType)
         symbol = market['symbol']
         stored = self.safe_value(self.trades, symbol)
         if stored is None:
@@ -740,7 +858,7 @@ class bybit(ccxt.async_support.bybit):
             data = self.safe_value(data, 'result', [])
         if self.myTrades is None:
             limit = self.safe_integer(self.options, 'tradesLimit', 1000)
-            self.myTrades = ArrayCacheBySymbolById(limit)
+            self.myTrades = self.my_trades_cache(limit)
         trades = self.myTrades
         symbols = {}
         method = 'parseWsTrade' if spot else 'parseTrade'
@@ -874,7 +992,7 @@ class bybit(ccxt.async_support.bybit):
         type = self.safe_string(message, 'type', '')
         if self.orders is None:
             limit = self.safe_integer(self.options, 'ordersLimit', 1000)
-            self.orders = ArrayCacheBySymbolById(limit)
+            self.orders = self.orders_cache(limit)
         orders = self.orders
         rawOrders = []
         parser = None
@@ -1264,6 +1382,19 @@ class bybit(ccxt.async_support.bybit):
         message = self.extend(request, params)
         return await self.watch(url, messageHash, message, messageHash)
 
+    async def watch_multiple_topics(self, url, messageHashes, topics, params={}, keys=None):
+        # a subscription per topic, the requests are packed up to options['ws']['maxTopicsPerMessage'] topics
+        requestId = self.request_id()
+        messages = []
+        for i in range(0, len(topics)):
+            request = {
+                'op': 'subscribe',
+                'req_id': requestId,
+                'args': [topics[i]],
+            }
+            messages.append(self.extend(request, params))
+        return await self.watch_multiple(url, messageHashes, messages, messageHashes, None, keys)
+
     def authenticate(self, url, params={}):
         self.check_required_credentials()
         messageHash = 'authenticated'
@@ -1360,6 +1491,15 @@ class bybit(ccxt.async_support.bybit):
             self.handle_subscription_status(client, message)
             return
         topic = self.safe_string(message, 'topic', '')
+        routed, result = self.route_message(client, message, topic, 'topic')
+        if routed:
+            return
+        # unified auth acknowledgement
+        type = self.safe_string(message, 'type')
+        if (op == 'auth') or (type == 'AUTH_RESP'):
+            self.handle_authenticate(client, message)
+
+    def message_routes(self):
         methods = {
             'orderbook': self.handle_order_book,
             'kline': self.handle_ohlcv,
@@ -1375,21 +1515,13 @@ class bybit(ccxt.async_support.bybit):
             'ticketInfo': self.handle_my_trades,
             'user.openapi.perp.trade': self.handle_my_trades,
         }
-        exacMethod = self.safe_value(methods, topic)
-        if exacMethod is not None:
-            exacMethod(client, message)
-            return
-        keys = list(methods.keys())
-        for i in range(0, len(keys)):
-            key = keys[i]
-            if topic.find(keys[i]) >= 0:
-                method = methods[key]
-                method(client, message)
-                return
-        # unified auth acknowledgement
-        type = self.safe_string(message, 'type')
-        if (op == 'auth') or (type == 'AUTH_RESP'):
-            self.handle_authenticate(client, message)
+        return {
+            # an exact topic first, then the first method key found in the topic
+            'topic': {
+                'exact': methods,
+                'contains': methods,
+            },
+        }
 
     def ping(self, client):
         return {
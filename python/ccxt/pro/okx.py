@@ -4,9 +4,8 @@
 # https://github.com/ccxt/ccxt/blob/master/CONTRIBUTING.md#how-to-contribute-code
 
 import ccxt.async_support
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.cache import ArrayCache
 import hashlib
-from ccxt.base.errors import InvalidNonce
 from ccxt.base.errors import AuthenticationError
 
 
@@ -17,9 +16,12 @@ class okx(ccxt.async_support.okx):
             'has': {
                 'ws': True,
                 'watchTicker': True,
-                # 'watchTickers': False,  # for now
+                'watchTickers': True,
                 'watchOrderBook': True,
                 'watchTrades': True,
+                'watchOrderBookForSymbols': True,
+                'watchTradesForSymbols': True,
+                'watchOHLCVForSymbols': True,
                 'watchBalance': True,
                 'watchOHLCV': True,
                 'watchOrders': True,
@@ -68,6 +70,8 @@ class okx(ccxt.async_support.okx):
                 'watchBalance': 'spot',  # margin, futures, swap
                 'ws': {
                     # 'inflate': True,
+                    'packSubscriptions': True,  # the args of one loop iteration go in one subscribe request
+                    'maxTopicsPerMessage': 100,  # the args of one request are limited to 64 kb
                 },
                 'checksum': True,
             },
@@ -98,6 +102,27 @@ class okx(ccxt.async_support.okx):
         }
         return await self.watch(url, messageHash, request, messageHash)
 
+    async def subscribe_multiple(self, access, channels, symbols, params={}, keys=None):
+        # a subscription per channel and symbol, the requests are packed up to options['ws']['maxTopicsPerMessage'] args
+        url = self.urls['api']['ws'][access]
+        messageHashes = []
+        messages = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            messageHashes.append(channels[i] + ':' + market['id'])
+            firstArgument = {
+                'channel': channels[i],
+                'instId': market['id'],
+            }
+            request = {
+                'op': 'subscribe',
+                'args': [
+                    self.deep_extend(firstArgument, params),
+                ],
+            }
+            messages.append(request)
+        return await self.watch_multiple(url, messageHashes, messages, messageHashes, None, keys)
+
     async def watch_trades(self, symbol, since=None, limit=None, params={}):
         """
         get the list of most recent trades for a particular symbol
@@ -114,6 +139,26 @@ class okx(ccxt.async_support.okx):
             limit = trades.getLimit(symbol, limit)
         return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
 
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        """
+        get the list of most recent trades of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch trades for
+        :param int|None since: timestamp in ms of the earliest trade to fetch
+        :param int|None limit: the maximum amount of trades to fetch
+        :param dict params: extra parameters specific to the okx api endpoint
+        :returns [dict]: a list of the `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTradesForSymbols')
+        channels = []
+        for i in range(0, len(symbols)):
+            channels.append('trades')
+        trades = await self.subscribe_multiple('public', channels, symbols, params)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(self.safe_string(first, 'symbol'), limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
     def handle_trades(self, client, message):
         #
         #     {
@@ -156,6 +201,25 @@ class okx(ccxt.async_support.okx):
         """
         return await self.subscribe('public', 'tickers', symbol, params)
 
+    async def watch_tickers(self, symbols=None, params={}):
+        """
+        watches the price tickers of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch the tickers for
+        :param dict params: extra parameters specific to the okx api endpoint
+        :returns dict: the `ticker structure <https://docs.ccxt.com/#/?id=ticker-structure>` of the market that updated, indexed by its symbol
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTickers')
+        channels = []
+        for i in range(0, len(symbols)):
+            channels.append('tickers')
+        ticker = await self.subscribe_multiple('public', channels, symbols, params)
+        if self.newUpdates:
+            result = {}
+            result[ticker['symbol']] = ticker
+            return result
+        return self.filter_by_array(self.tickers, 'symbol', symbols)
+
     def handle_ticker(self, client, message):
         #
         #     {
@@ -213,6 +277,30 @@ class okx(ccxt.async_support.okx):
             limit = ohlcv.getLimit(symbol, limit)
         return self.filter_by_since_limit(ohlcv, since, limit, 0, True)
 
+    async def watch_ohlcv_for_symbols(self, symbolsAndTimeframes, since=None, limit=None, params={}):
+        """
+        watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+        :param [[str]] symbolsAndTimeframes: the [symbol, timeframe] pairs to watch
+        :param int|None since: timestamp in ms of the earliest candle to fetch
+        :param int|None limit: the maximum amount of candles to fetch
+        :param dict params: extra parameters specific to the okx api endpoint
+        :returns dict: the candles of the market and timeframe that updated, indexed by symbol and timeframe
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(self.symbols_of_pairs(symbolsAndTimeframes), 'watchOHLCVForSymbols')
+        channels = []
+        keys = []
+        for i in range(0, len(symbols)):
+            timeframe = symbolsAndTimeframes[i][1]
+            interval = self.safe_string(self.timeframes, timeframe, timeframe)
+            channels.append('candle' + interval)
+            keys.append([symbols[i], timeframe])
+        key, ohlcv = await self.subscribe_multiple('public', channels, symbols, params, keys)
+        if self.newUpdates:
+            limit = ohlcv.getLimit(key[0], limit)
+        filtered = self.filter_by_since_limit(ohlcv, since, limit, 0, True)
+        return self.create_ohlcv_object(key[0], key[1], filtered)
+
     def handle_ohlcv(self, client, message):
         #
         #     {
@@ -245,7 +333,7 @@ class okx(ccxt.async_support.okx):
             stored = self.safe_value(self.ohlcvs[symbol], timeframe)
             if stored is None:
                 limit = self.safe_integer(self.options, 'OHLCVLimit', 1000)
-                stored = ArrayCacheByTimestamp(limit)
+                stored = self.ohlcv_cache(limit)
                 self.ohlcvs[symbol][timeframe] = stored
             stored.append(parsed)
             messageHash = channel + ':' + marketId
@@ -289,6 +377,26 @@ class okx(ccxt.async_support.okx):
         orderbook = await self.subscribe('public', depth, symbol, params)
         return orderbook.limit()
 
+    async def watch_order_book_for_symbols(self, symbols, limit=None, params={}):
+        """
+        watches the order books of several markets, subscribed in as few requests as possible
+        :param [str] symbols: unified symbols of the markets to fetch the order books for
+        :param int|None limit: the maximum amount of order book entries to return
+        :param dict params: extra parameters specific to the okx api endpoint
+        :returns dict: the `order book structure <https://docs.ccxt.com/#/?id=order-book-structure>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchOrderBookForSymbols')
+        options = self.safe_value(self.options, 'watchOrderBook', {})
+        depth = self.safe_string(options, 'depth', 'books')
+        if (depth == 'books-l2-tbt') or (depth == 'books50-l2-tbt'):
+            await self.authenticate({'access': 'public'})
+        channels = []
+        for i in range(0, len(symbols)):
+            channels.append(depth)
+        orderbook = await self.subscribe_multiple('public', channels, symbols, params)
+        return orderbook.limit()
+
     def handle_delta(self, bookside, delta):
         #
         #     [
@@ -303,8 +411,7 @@ class okx(ccxt.async_support.okx):
         bookside.store(price, amount)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        bookside.applyLevels(deltas)
 
     def handle_order_book_message(self, client, message, orderbook, messageHash):
         #
@@ -331,22 +438,9 @@ class okx(ccxt.async_support.okx):
         self.handle_deltas(storedBids, bids)
         checksum = self.safe_value(self.options, 'checksum', True)
         if checksum:
-            asksLength = len(storedAsks)
-            bidsLength = len(storedBids)
-            payloadArray = []
-            for i in range(0, 25):
-                if i < bidsLength:
-                    payloadArray.append(self.number_to_string(storedBids[i][0]))
-                    payloadArray.append(self.number_to_string(storedBids[i][1]))
-                if i < asksLength:
-                    payloadArray.append(self.number_to_string(storedAsks[i][0]))
-                    payloadArray.append(self.number_to_string(storedAsks[i][1]))
-            payload = ':'.join(payloadArray)
             responseChecksum = self.safe_integer(message, 'checksum')
-            localChecksum = self.crc32(payload, True)
-            if responseChecksum != localChecksum:
-                error = InvalidNonce(self.id + ' invalid checksum')
-                client.reject(error, messageHash)
+            if not self.verify_order_book_checksum(client, orderbook, responseChecksum, messageHash):
+                return orderbook
         timestamp = self.safe_integer(message, 'ts')
         orderbook['timestamp'] = timestamp
         orderbook['datetime'] = self.iso8601(timestamp)
@@ -458,16 +552,21 @@ class okx(ccxt.async_support.okx):
             for i in range(0, len(data)):
                 update = data[i]
                 orderbook = self.order_book({}, limit)
+                orderbook.retainRaw()
                 self.orderbooks[symbol] = orderbook
                 orderbook['symbol'] = symbol
                 self.handle_order_book_message(client, update, orderbook, messageHash)
-                client.resolve(orderbook, messageHash)
+                if symbol in self.orderbooks:
+                    client.resolve(orderbook, messageHash)
         elif action == 'update':
-            if symbol in self.orderbooks:
+            for i in range(0, len(data)):
+                if symbol not in self.orderbooks:
+                    # dropped after a checksum mismatch, waiting for the next snapshot
+                    break
                 orderbook = self.orderbooks[symbol]
-                for i in range(0, len(data)):
-                    update = data[i]
-                    self.handle_order_book_message(client, update, orderbook, messageHash)
+                update = data[i]
+                self.handle_order_book_message(client, update, orderbook, messageHash)
+                if symbol in self.orderbooks:
                     client.resolve(orderbook, messageHash)
         elif (channel == 'books5') or (channel == 'bbo-tbt'):
             orderbook = self.safe_value(self.orderbooks, symbol)
@@ -482,6 +581,18 @@ class okx(ccxt.async_support.okx):
                 client.resolve(orderbook, messageHash)
         return message
 
+    async def resubscribe_order_book(self, client, symbol, messageHash):
+        # okx pushes a new snapshot once the channel is subscribed again
+        parts = messageHash.split(':')
+        args = [
+            {
+                'channel': parts[0],
+                'instId': parts[1],
+            },
+        ]
+        await client.send({'op': 'unsubscribe', 'args': args})
+        await client.send({'op': 'subscribe', 'args': args})
+
     def authenticate(self, params={}):
         self.check_required_credentials()
         access = self.safe_string(params, 'access', 'private')
@@ -686,7 +797,7 @@ class okx(ccxt.async_support.okx):
         if ordersLength > 0:
             limit = self.safe_integer(self.options, 'ordersLimit', 1000)
             if self.orders is None:
-                self.orders = ArrayCacheBySymbolById(limit)
+                self.orders = self.orders_cache(limit)
             stored = self.orders
             marketIds = []
             parsed = self.parse_orders(orders)
@@ -746,6 +857,36 @@ class okx(ccxt.async_support.okx):
                 return False
         return message
 
+    def message_routes(self):
+        return {
+            'event': {
+                'exact': {
+                    # 'info': self.handleSystemStatus,
+                    # 'book': 'handleOrderBook',
+                    'login': self.handle_authenticate,
+                    'subscribe': self.handle_subscription_status,
+                },
+            },
+            'channel': {
+                'exact': {
+                    'bbo-tbt': self.handle_order_book,  # newly added channel that sends tick-by-tick Level 1 data, all API users can subscribe, public depth channel, verification not required
+                    'books': self.handle_order_book,  # all API users can subscribe, public depth channel, verification not required
+                    'books5': self.handle_order_book,  # all API users can subscribe, public depth channel, verification not required, data feeds will be delivered every 100ms(vs. every 200ms now)
+                    'books50-l2-tbt': self.handle_order_book,  # only users who're VIP4 and above can subscribe, identity verification required before subscription
+                    'books-l2-tbt': self.handle_order_book,  # only users who're VIP5 and above can subscribe, identity verification required before subscription
+                    'tickers': self.handle_ticker,
+                    'trades': self.handle_trades,
+                    'account': self.handle_balance,
+                    # 'margin_account': self.handle_balance,
+                    'orders': self.handle_orders,
+                    'orders-algo': self.handle_orders,
+                },
+                'prefix': {
+                    'candle': self.handle_ohlcv,
+                },
+            },
+        }
+
     def handle_message(self, client, message):
         if not self.handle_error_message(client, message):
             return
@@ -794,38 +935,16 @@ class okx(ccxt.async_support.okx):
         # if table is None:
         event = self.safe_string(message, 'event')
         if event is not None:
-            methods = {
-                # 'info': self.handleSystemStatus,
-                # 'book': 'handleOrderBook',
-                'login': self.handle_authenticate,
-                'subscribe': self.handle_subscription_status,
-            }
-            method = self.safe_value(methods, event)
-            if method is None:
+            routed, result = self.route_message(client, message, event, 'event')
+            if not routed:
                 return message
             else:
-                return method(client, message)
+                return result
         else:
             arg = self.safe_value(message, 'arg', {})
             channel = self.safe_string(arg, 'channel')
-            methods = {
-                'bbo-tbt': self.handle_order_book,  # newly added channel that sends tick-by-tick Level 1 data, all API users can subscribe, public depth channel, verification not required
-                'books': self.handle_order_book,  # all API users can subscribe, public depth channel, verification not required
-                'books5': self.handle_order_book,  # all API users can subscribe, public depth channel, verification not required, data feeds will be delivered every 100ms(vs. every 200ms now)
-                'books50-l2-tbt': self.handle_order_book,  # only users who're VIP4 and above can subscribe, identity verification required before subscription
-                'books-l2-tbt': self.handle_order_book,  # only users who're VIP5 and above can subscribe, identity verification required before subscription
-                'tickers': self.handle_ticker,
-                'trades': self.handle_trades,
-                'account': self.handle_balance,
-                # 'margin_account': self.handle_balance,
-                'orders': self.handle_orders,
-                'orders-algo': self.handle_orders,
-            }
-            method = self.safe_value(methods, channel)
-            if method is None:
-                if channel.find('candle') == 0:
-                    self.handle_ohlcv(client, message)
-                else:
-                    return message
+            routed, result = self.route_message(client, message, channel, 'channel')
+            if not routed:
+                return message
             else:
-                return method(client, message)
+                return result
@@ -4,7 +4,7 @@
 # https://github.com/ccxt/ccxt/blob/master/CONTRIBUTING.md#how-to-contribute-code
 
 import ccxt.async_support
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp
 import hashlib
 from ccxt.base.precise import Precise
 
@@ -22,6 +22,9 @@ class phemex(ccxt.async_support.phemex):
                 'watchOrders': True,
                 'watchOrderBook': True,
                 'watchOHLCV': True,
+                'watchOrderBookForSymbols': True,
+                'watchTradesForSymbols': True,
+                'watchOHLCVForSymbols': True,
             },
             'urls': {
                 'test': {
@@ -34,6 +37,9 @@ class phemex(ccxt.async_support.phemex):
             'options': {
                 'tradesLimit': 1000,
                 'OHLCVLimit': 1000,
+                'ws': {
+                    'maxTopicsPerMessage': 1,  # a request subscribes one market, its params are not a list of topics
+                },
             },
             'streaming': {
                 'keepAlive': 20000,
@@ -68,6 +74,19 @@ class phemex(ccxt.async_support.phemex):
         self.options['requestId'] = requestId
         return requestId
 
+    def watch_multiple_methods(self, messageHashes, methods, paramsList, params={}, keys=None):
+        # a request per market, sent together on one connection
+        url = self.urls['api']['ws']
+        messages = []
+        for i in range(0, len(methods)):
+            subscribe = {
+                'method': methods[i],
+                'id': self.request_id(),
+                'params': paramsList[i],
+            }
+            messages.append(self.deep_extend(subscribe, params))
+        return self.watch_multiple(url, messageHashes, messages, messageHashes, None, keys)
+
     def parse_usdt_ticker(self, ticker, market=None):
         # [
         #     "BTCUSDT",
@@ -448,6 +467,35 @@ class phemex(ccxt.async_support.phemex):
             limit = trades.getLimit(symbol, limit)
         return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
 
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        """
+        get the list of most recent trades of several markets
+        :param [str] symbols: unified symbols of the markets to fetch trades for
+        :param int|None since: timestamp in ms of the earliest trade to fetch
+        :param int|None limit: the maximum amount of trades to fetch
+        :param dict params: extra parameters specific to the phemex api endpoint
+        :returns [dict]: a list of `trade structures <https://docs.ccxt.com/en/latest/manual.html?#public-trades>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTradesForSymbols')
+        messageHashes = []
+        methods = []
+        paramsList = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            quote = market['quote']
+            name = 'trade_p'
+            if quote.upper() != 'USDT':
+                name = 'trade'
+            messageHashes.append(name + ':' + market['symbol'])
+            methods.append(name + '.subscribe')
+            paramsList.append([market['id']])
+        trades = await self.watch_multiple_methods(messageHashes, methods, paramsList, params)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(self.safe_string(first, 'symbol'), limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
     async def watch_order_book(self, symbol, limit=None, params={}):
         """
         watches information on open orders with bid(buy) and ask(sell) prices, volumes and other data
@@ -478,6 +526,30 @@ class phemex(ccxt.async_support.phemex):
         orderbook = await self.watch(url, messageHash, request, messageHash)
         return orderbook.limit()
 
+    async def watch_order_book_for_symbols(self, symbols, limit=None, params={}):
+        """
+        watches the order books of several markets
+        :param [str] symbols: unified symbols of the markets to fetch the order books for
+        :param int|None limit: the maximum amount of order book entries to return
+        :param dict params: extra parameters specific to the phemex api endpoint
+        :returns dict: the `order book structure <https://docs.ccxt.com/#/?id=order-book-structure>` of the market that updated
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchOrderBookForSymbols')
+        messageHashes = []
+        methods = []
+        paramsList = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            name = 'book'
+            if market['settle'] == 'USDT':
+                name = 'orderbook_p'
+            messageHashes.append(name + ':' + market['symbol'])
+            methods.append(name + '.subscribe')
+            paramsList.append([market['id'], True])
+        orderbook = await self.watch_multiple_methods(messageHashes, methods, paramsList, params)
+        return orderbook.limit()
+
     async def watch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
         """
         watches historical candlestick data containing the open, high, low, and close price, and the volume of a market
@@ -512,13 +584,47 @@ class phemex(ccxt.async_support.phemex):
             limit = ohlcv.getLimit(symbol, limit)
         return self.filter_by_since_limit(ohlcv, since, limit, 0, True)
 
+    async def watch_ohlcv_for_symbols(self, symbolsAndTimeframes, since=None, limit=None, params={}):
+        """
+        watches historical candlestick data of several markets and timeframes
+        :param [[str]] symbolsAndTimeframes: the [symbol, timeframe] pairs to watch
+        :param int|None since: timestamp in ms of the earliest candle to fetch
+        :param int|None limit: the maximum amount of candles to fetch
+        :param dict params: extra parameters specific to the phemex api endpoint
+        :returns dict: the candles of the market and timeframe that updated, indexed by symbol and timeframe
+        """
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(self.symbols_of_pairs(symbolsAndTimeframes), 'watchOHLCVForSymbols')
+        messageHashes = []
+        methods = []
+        paramsList = []
+        keys = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            timeframe = symbolsAndTimeframes[i][1]
+            name = 'kline'
+            if market['settle'] == 'USDT':
+                name = 'kline_p'
+            messageHashes.append(name + ':' + timeframe + ':' + market['symbol'])
+            methods.append(name + '.subscribe')
+            paramsList.append([market['id'], self.safe_integer(self.timeframes, timeframe)])
+            keys.append([market['symbol'], timeframe])
+        key, ohlcv = await self.watch_multiple_methods(messageHashes, methods, paramsList, params, keys)
+        if self.newUpdates:
+            limit = ohlcv.getLimit(key[0], limit)
+        filtered = self.filter_by_since_limit(ohlcv, since, limit, 0, True)
+        return self.create_ohlcv_object(key[0], key[1], filtered)
+
     def handle_delta(self, bookside, delta, market=None):
         bidAsk = self.parse_bid_ask(delta, 0, 1, market)
         bookside.storeArray(bidAsk)
 
     def handle_deltas(self, bookside, deltas, market=None):
+        # prices and amounts are scaled per market, convert them first and apply the levels in one batch
+        bidasks = []
         for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i], market)
+            bidasks.append(self.parse_bid_ask(deltas[i], 0, 1, market))
+        bookside.applyLevels(bidasks)
 
     def handle_order_book(self, client, message):
         #
@@ -635,7 +741,7 @@ class phemex(ccxt.async_support.phemex):
         cachedTrades = self.myTrades
         if cachedTrades is None:
             limit = self.safe_integer(self.options, 'tradesLimit', 1000)
-            cachedTrades = ArrayCacheBySymbolById(limit)
+            cachedTrades = self.my_trades_cache(limit)
         marketIds = {}
         type = None
         for i in range(0, len(message)):
@@ -801,7 +907,7 @@ class phemex(ccxt.async_support.phemex):
         limit = self.safe_integer(self.options, 'ordersLimit', 1000)
         marketIds = {}
         if self.orders is None:
-            self.orders = ArrayCacheBySymbolById(limit)
+            self.orders = self.orders_cache(limit)
         type = None
         stored = self.orders
         for i in range(0, len(parsedOrders)):
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+# the throughput of ArrayCacheBySymbolById, amending an order does not depend on the number of orders
+#
+#     python bench_cache.py                   # 1k, 10k and 100k orders
+#     python bench_cache.py --amends 1000000
+
+from ccxt.async_support.base.ws.cache import ArrayCacheBySymbolById  # noqa: F402
+
+
+def amends_per_second(orders, amends):
+    rng = random.Random(orders)
+    cache = ArrayCacheBySymbolById(orders)
+    for i in range(0, orders):
+        cache.append({'symbol': 'BTC/USDT', 'id': str(i), 'status': 'open'})
+    updates = [{'symbol': 'BTC/USDT', 'id': str(rng.randrange(orders)), 'status': 'open'} for i in range(0, amends)]
+    start = time.perf_counter()
+    for update in updates:
+        cache.append(update)
+    return amends / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--amends', type=int, default=100000)
+    args = parser.parse_args()
+    for orders in (1000, 10000, 100000):
+        print('ArrayCacheBySymbolById {:>7} orders {:>10.0f} amends/s'.format(orders, amends_per_second(orders, args.amends)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import time
+import random
+import bisect
+import argparse
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+# replays a depth stream into the order book sides and reports the throughput
+#
+#     python bench_order_book_side.py                      # synthetic streams at 1k, 10k and 100k levels
+#     python bench_order_book_side.py --file depth.jsonl   # a recorded stream, one depthUpdate message per line
+#
+# recorded messages use the binance depthUpdate layout: {"b": [["price", "size"], ...], "a": [...]}
+# the first message is used as the snapshot
+
+from ccxt.async_support.base.ws.order_book_side import Asks, Bids  # noqa: F402
+
+
+class ListSide(list):
+    # the previous list-of-lists implementation, kept as the baseline
+    side = None
+
+    def __init__(self, deltas=[]):
+        super(ListSide, self).__init__()
+        self._index = []
+        for delta in deltas:
+            self.storeArray(list(delta))
+
+    def storeArray(self, delta):
+        price = delta[0]
+        size = delta[1]
+        index_price = -price if self.side else price
+        index = bisect.bisect_left(self._index, index_price)
+        if size:
+            if index < len(self._index) and self._index[index] == index_price:
+                self[index][1] = size
+            else:
+                self._index.insert(index, index_price)
+                self.insert(index, delta)
+        elif index < len(self._index) and self._index[index] == index_price:
+            del self._index[index]
+            del self[index]
+
+
+class ListAsks(ListSide): side = False                                      # noqa
+class ListBids(ListSide): side = True                                       # noqa
+
+
+def synthetic_stream(levels, messages, tick=0.5, mid=30000.0):
+    rng = random.Random(levels)
+    snapshot = {
+        'b': [[mid - tick * (i + 1), rng.randint(1, 100)] for i in range(levels)],
+        'a': [[mid + tick * (i + 1), rng.randint(1, 100)] for i in range(levels)],
+    }
+    stream = []
+    for _ in range(messages):
+        message = {'b': [], 'a': []}
+        for key, sign in (('b', -1), ('a', 1)):
+            for _ in range(10):
+                # most of the activity happens near the touch, with a long tail into the book
+                distance = int(rng.expovariate(1 / 50)) % levels
+                size = 0 if rng.random() < 0.3 else rng.randint(1, 100)
+                message[key].append([mid + sign * tick * (distance + 1), size])
+        stream.append(message)
+    return snapshot, stream
+
+
+def recorded_stream(path):
+    with open(path) as f:
+        messages = [json.loads(line) for line in f if line.strip()]
+    parsed = [{key: [[float(price), float(size)] for price, size in message.get(key, [])] for key in ('b', 'a')} for message in messages]
+    return parsed[0], parsed[1:]
+
+
+def replay(bids_class, asks_class, snapshot, stream, batched=False):
+    bids = bids_class(snapshot['b'])
+    asks = asks_class(snapshot['a'])
+    start = time.perf_counter()
+    for message in stream:
+        if batched:
+            bids.apply_levels(message['b'])
+            asks.apply_levels(message['a'])
+        else:
+            for delta in message['b']:
+                bids.storeArray(list(delta))
+            for delta in message['a']:
+                asks.storeArray(list(delta))
+    return time.perf_counter() - start
+
+
+def rebuild(side_class, levels):
+    start = time.perf_counter()
+    side_class(levels)
+    return time.perf_counter() - start
+
+
+def report(name, snapshot, stream):
+    deltas = sum(len(message['b']) + len(message['a']) for message in stream)
+    baseline = replay(ListBids, ListAsks, snapshot, stream)
+    chunked = replay(Bids, Asks, snapshot, stream)
+    batched = replay(Bids, Asks, snapshot, stream, True)
+    print('{:>14} {:>7} msgs  list {:7.3f} us/delta  chunked {:7.3f} us/delta  batched {:7.3f} us/delta'.format(
+        name, len(stream), baseline / deltas * 1e6, chunked / deltas * 1e6, batched / deltas * 1e6))
+    print('{:>14} snapshot  list {:7.3f} ms  chunked {:7.3f} ms'.format(
+        '', rebuild(ListAsks, snapshot['a']) * 1e3, rebuild(Asks, snapshot['a']) * 1e3))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--file', help='recorded depthUpdate messages, one json object per line')
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+    if args.file:
+        snapshot, stream = recorded_stream(args.file)
+        report(os.path.basename(args.file), snapshot, stream)
+    else:
+        for levels in (1000, 10000, 100000):
+            snapshot, stream = synthetic_stream(levels, args.messages)
+            report(str(levels) + ' levels', snapshot, stream)
+
+
+if __name__ == '__main__':
+    main()
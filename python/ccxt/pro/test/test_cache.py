@@ -11,7 +11,7 @@ sys.path.append(root)
 
 # ----------------------------------------------------------------------------
 
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp, ArrayCacheBySymbolById  # noqa: F402
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp, ArrayCacheBySymbolById, ArrayCacheBySymbolByIdPerSymbol  # noqa: F402
 
 
 def equals(a, b):
@@ -346,3 +346,57 @@ assert cache.getLimit(None, outsideLimit) == 2  # watch all orders
 cache.append({'symbol': symbol2, 'id': 'two', 'i': 3})  # update second order
 cache.append({'symbol': symbol2, 'id': 'three', 'i': 3})  # create third order
 assert cache.getLimit(None, outsideLimit) == 2  # watch all orders
+
+# ----------------------------------------------------------------------------
+# test ArrayCacheBySymbolById, the same id in two symbols
+
+cache = ArrayCacheBySymbolById(3)
+cache.append({'symbol': 'BTC/USDT', 'id': '1', 'i': 1})
+cache.append({'symbol': 'ETH/USDT', 'id': '1', 'i': 2})
+cache.append({'symbol': 'ETH/USDT', 'id': '2', 'i': 3})
+cache.append({'symbol': 'ETH/USDT', 'id': '1', 'i': 4})  # update moves it to the back
+assert(equals(cache, [
+    {'symbol': 'BTC/USDT', 'id': '1', 'i': 1},
+    {'symbol': 'ETH/USDT', 'id': '2', 'i': 3},
+    {'symbol': 'ETH/USDT', 'id': '1', 'i': 4},
+]))
+assert cache[0]['i'] == 1 and cache[-1]['i'] == 4 and cache[1]['i'] == 3
+assert [item['i'] for item in cache[1:]] == [3, 4]
+cache.append({'symbol': 'BTC/USDT', 'id': '3', 'i': 5})  # the oldest is evicted
+assert [item['i'] for item in cache] == [3, 4, 5]
+assert '1' not in cache.hashmap['BTC/USDT'] and '1' in cache.hashmap['ETH/USDT']
+assert cache.getLimit('ETH/USDT', None) == 2 and cache.getLimit(None, None) == 4
+
+# ----------------------------------------------------------------------------
+# test ArrayCacheBySymbolByIdPerSymbol, a busy symbol does not evict the orders of the others
+
+
+def is_open(order):
+    return order['status'] == 'open'
+
+
+cache = ArrayCacheBySymbolByIdPerSymbol(3, is_open)
+cache.append({'symbol': 'ETH/USDT', 'id': 'quiet', 'clientOrderId': 'mine', 'status': 'open'})
+cache.append({'symbol': 'BTC/USDT', 'id': 'resting', 'status': 'open'})
+for i in range(0, 10):
+    cache.append({'symbol': 'BTC/USDT', 'id': str(i), 'status': 'closed'})
+assert [order['id'] for order in cache] == ['quiet', 'resting', '8', '9']
+assert cache.get_by_client_order_id('mine')['id'] == 'quiet'
+assert cache.getLimit('BTC/USDT', None) == 11 and cache.getLimit(None, None) == 12
+# the open orders are kept beyond the limit, the latest update is always kept
+for i in range(10, 14):
+    cache.append({'symbol': 'BTC/USDT', 'id': str(i), 'status': 'open'})
+assert [order['id'] for order in cache if order['symbol'] == 'BTC/USDT'] == ['resting', '10', '11', '12', '13']
+cache.append({'symbol': 'BTC/USDT', 'id': 'filled', 'clientOrderId': 'gone', 'status': 'closed'})
+cache.append({'symbol': 'BTC/USDT', 'id': '10', 'status': 'canceled'})  # evictable from now on
+cache.append({'symbol': 'BTC/USDT', 'id': 'next', 'clientOrderId': 'next', 'status': 'closed'})
+assert [order['id'] for order in cache if order['symbol'] == 'BTC/USDT'] == ['resting', '11', '12', '13', 'next']
+assert cache.get_by_client_order_id('gone') is None and cache.get_by_client_order_id('next')['status'] == 'closed'
+assert 'filled' not in cache.hashmap['BTC/USDT'] and cache.hashmap['ETH/USDT']['quiet']['status'] == 'open'
+assert cache.getLimit('BTC/USDT', None) == 6
+# without retain every trade is evictable
+cache = ArrayCacheBySymbolByIdPerSymbol(2)
+for i in range(0, 5):
+    cache.append({'symbol': 'BTC/USDT', 'id': str(i)})
+    cache.append({'symbol': 'ETH/USDT', 'id': str(i)})
+assert [trade['id'] for trade in cache] == ['3', '3', '4', '4']
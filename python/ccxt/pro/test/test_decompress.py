@@ -0,0 +1,93 @@
+import os
+import sys
+import zlib
+import gzip
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from aiohttp import WSMessage, WSMsgType  # noqa: F402
+import ccxt.pro  # noqa: F402
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient  # noqa: F402
+from ccxt.async_support.base.ws.functions import gunzip_bytes, inflate_bytes, gunzip, inflate  # noqa: F402
+
+# ----------------------------------------------------------------------------
+# binary frames are decompressed to bytes and decoded once, see AiohttpClient.handle_message()
+
+payload = b'{"arg":{"channel":"books","instId":"BTC-USDT"},"data":[{"asks":[["41006.8","0.6","0","1"]]}]}'
+
+
+def deflate_raw(data):
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+assert inflate_bytes(deflate_raw(payload)) == payload
+assert gunzip_bytes(gzip.compress(payload)) == payload
+# every member of a multi-member frame, as GzipFile reads them
+members = gzip.compress(payload[0:40]) + gzip.compress(payload[40:]) + b'\x00' * 4
+assert gunzip_bytes(members) == payload == gzip.decompress(members)
+assert inflate(deflate_raw(payload)) == payload.decode() and gunzip(gzip.compress(payload)) == payload.decode()
+
+
+def frame(data):
+    return WSMessage(WSMsgType.BINARY, data, None)
+
+
+class Session:
+
+    def ws_connect(self, url, **kwargs):
+        return self
+
+    def __aenter__(self):
+        return None
+
+
+async def main():
+    received = []
+
+    def create(config):
+        return AiohttpClient('wss://example.com', lambda client, message: received.append(message), None, None, None, config)
+
+    # one compressed message per frame
+    create({'gunzip': True}).handle_message(frame(gzip.compress(payload)))
+    create({'inflate': True}).handle_message(frame(deflate_raw(payload)))
+    assert received == [received[0]] * 2 and received[0]['arg']['instId'] == 'BTC-USDT'
+    # a raw deflate stream over the whole connection, the later frames refer to the window of the earlier ones
+    client = create({'inflateStream': True})
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    del received[:]
+    sizes = []
+    for i in range(0, 3):
+        message = payload.replace(b'0.6', str(i).encode())
+        compressed = compressor.compress(message) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        sizes.append(len(compressed))
+        client.handle_message(frame(compressed))
+        assert received[-1]['data'][0]['asks'][0][1] == str(i)
+    # the later messages are smaller than the first, they only point back into the window
+    assert sizes[1] < sizes[0] and sizes[2] < sizes[0]
+    # a message split over several frames ends up whole
+    message = payload.replace(b'BTC-USDT', b'ETH-USDT')
+    compressed = compressor.compress(message) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    middle = len(compressed) // 2
+    parts = []
+    for chunk in [compressed[0:middle], compressed[middle:]]:
+        data = client.inflate_stream(chunk)
+        if data:
+            parts.append(data)
+    assert b''.join(parts) == message
+    # a new connection starts a new stream
+    client.create_connection(Session())
+    client.handle_message(frame(deflate_raw(payload)))
+    assert received[-1]['data'][0]['asks'][0][1] == '0.6'
+    # the exchanges turn it on with options['ws']['inflateStream']
+    exchange = ccxt.pro.okx({'options': {'ws': {'inflateStream': True}}})
+    assert exchange.client('wss://example.com').inflateStream and not ccxt.pro.okx().client('wss://example.com').inflateStream
+    await exchange.close()
+
+
+asyncio.run(main())
+print('decompress succeeded')
@@ -0,0 +1,227 @@
+import os
+import sys
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.pro  # noqa: F402
+from ccxt.async_support.base.ws.future import Future  # noqa: F402
+from ccxt.base.errors import ArgumentsRequired, BadRequest  # noqa: F402
+
+# ----------------------------------------------------------------------------
+# watch_*_for_symbols() subscribes a topic per symbol in packed requests, see Exchange.watch_multiple()
+# the future resolves with the first market that updates
+
+bases = ['B' + str(i) for i in range(0, 12)]
+# linear swaps, the handlers of this tree do not look up spot market ids
+
+
+def market(base, id, type='swap'):
+    spot = type == 'spot'
+    return {
+        'id': id, 'lowercaseId': id.lower(), 'symbol': base + '/USDT' + ('' if spot else ':USDT'), 'base': base, 'quote': 'USDT', 'settle': None if spot else 'USDT',
+        'type': type, 'spot': spot, 'margin': False, 'swap': not spot, 'future': False, 'option': False, 'contract': not spot, 'linear': None if spot else True, 'inverse': None if spot else False,
+        'precision': {'price': 0.01, 'amount': 0.001}, 'limits': {}, 'info': {},
+    }
+
+
+def create(exchange_class, markets):
+    exchange = exchange_class({'enableRateLimit': False})
+    exchange.set_markets(markets)
+    exchange.open()  # the clients run on the loop of the exchange
+    sent = []
+
+    def client(url):
+        # connected already, the frames are collected instead of sent
+        existing = exchange.clients and (url in exchange.clients)
+        result = type(exchange).client(exchange, url)
+        if not existing:
+            result.connected.resolve(url)
+
+            async def send(message):
+                sent.append(message)
+
+            result.send = send
+        return result
+
+    exchange.client = client
+    return exchange, sent
+
+
+async def test_race():
+    futures = [Future(), Future()]
+    race = Future.race(futures, ['a', 'b'])
+    futures[1].resolve(2)
+    assert await race == ['b', 2]
+    # the pending future lets go of the race
+    assert not futures[0]._callbacks
+    assert await Future.race([Future(), asyncio.ensure_future(asyncio.sleep(0, 3))]) == 3
+
+
+async def test_bybit():
+    exchange, sent = create(ccxt.pro.bybit, [market(base, base + 'USDT') for base in bases])
+    symbols = [base + '/USDT:USDT' for base in bases]
+    future = asyncio.ensure_future(exchange.watch_trades_for_symbols(symbols))
+    await asyncio.sleep(0.01)
+    # 12 topics in 2 requests, the subscriptions are recorded one by one
+    assert [len(message['args']) for message in sent] == [10, 2]
+    assert sent[0]['args'][0] == 'publicTrade.B0USDT' and sent[1]['args'][1] == 'publicTrade.B11USDT'
+    client = list(exchange.clients.values())[0]
+    assert len(client.subscriptions) == 12 and client.subscribe_messages['trade:B3/USDT:USDT']['args'] == ['publicTrade.B3USDT']
+    exchange.handle_message(client, {'topic': 'publicTrade.B5USDT', 'type': 'snapshot', 'ts': 1672304486868, 'data': [{'T': 1672304486865, 's': 'B5USDT', 'S': 'Buy', 'v': '0.001', 'p': '16578.50', 'i': '1', 'BT': False}]})
+    trades = await asyncio.wait_for(future, 1)
+    assert len(trades) == 1 and trades[0]['symbol'] == 'B5/USDT:USDT'
+    # a second call subscribes nothing again
+    future = asyncio.ensure_future(exchange.watch_trades_for_symbols(symbols[0:3]))
+    await asyncio.sleep(0.01)
+    assert len(sent) == 2
+    future.cancel()
+    try:
+        await exchange.watch_trades_for_symbols([])
+        assert False
+    except ArgumentsRequired:
+        pass
+    await exchange.close()
+
+
+async def test_mixed_types():
+    exchange, sent = create(ccxt.pro.bybit, [market('B0', 'B0USDT', 'spot'), market('B1', 'B1USDT')])
+    try:
+        await exchange.watch_trades_for_symbols(['B0/USDT', 'B1/USDT:USDT'])
+        assert False
+    except BadRequest:
+        pass
+    await exchange.close()
+
+
+async def test_binance():
+    exchange, sent = create(ccxt.pro.binance, [market(base, base + 'USDT') for base in bases[0:3]])
+    confirmed = []
+    exchange.handle_order_book_subscription = lambda client, message, subscription: confirmed.append(subscription['symbol'])
+    future = asyncio.ensure_future(exchange.watch_order_book_for_symbols(['B0/USDT:USDT', 'B1/USDT:USDT', 'B2/USDT:USDT']))
+    await asyncio.sleep(0.01)
+    assert len(sent) == 1 and sent[0]['params'] == ['b0usdt@depth@100ms', 'b1usdt@depth@100ms', 'b2usdt@depth@100ms']
+    # one response confirms every order book of the packed request
+    client = list(exchange.clients.values())[0]
+    exchange.handle_message(client, {'result': None, 'id': sent[0]['id']})
+    assert confirmed == ['B0/USDT:USDT', 'B1/USDT:USDT', 'B2/USDT:USDT']
+    future.cancel()
+    await exchange.close()
+
+
+async def test_ohlcv():
+    exchange, sent = create(ccxt.pro.okx, [market(base, base + '-USDT-SWAP') for base in bases[0:2]])
+    future = asyncio.ensure_future(exchange.watch_ohlcv_for_symbols([['B0/USDT:USDT', '1m'], ['B1/USDT:USDT', '1h']]))
+    await asyncio.sleep(0.01)
+    assert len(sent) == 1 and sent[0]['args'] == [{'channel': 'candle1m', 'instId': 'B0-USDT-SWAP'}, {'channel': 'candle1H', 'instId': 'B1-USDT-SWAP'}]
+    client = list(exchange.clients.values())[0]
+    exchange.handle_message(client, {'arg': {'channel': 'candle1H', 'instId': 'B1-USDT-SWAP'}, 'data': [['1672304400000', '1', '2', '0.5', '1.5', '10', '15', '15', '0']]})
+    result = await asyncio.wait_for(future, 1)
+    assert list(result.keys()) == ['B1/USDT:USDT'] and list(result['B1/USDT:USDT'].keys()) == ['1h']
+    assert result['B1/USDT:USDT']['1h'][0][0] == 1672304400000
+    await exchange.close()
+
+
+async def test_bitget():
+    exchange, sent = create(ccxt.pro.bitget, [market(base, base + 'USDT_UMCBL') for base in bases])
+    future = asyncio.ensure_future(exchange.watch_trades_for_symbols([base + '/USDT:USDT' for base in bases]))
+    await asyncio.sleep(0.01)
+    # the args go in requests of options['ws']['maxTopicsPerMessage'], without the suffix of the rest market id
+    assert [len(message['args']) for message in sent] == [10, 2]
+    assert sent[0]['args'][0] == {'instType': 'mc', 'channel': 'trade', 'instId': 'B0USDT'}
+    client = list(exchange.clients.values())[0]
+    exchange.handle_message(client, {'action': 'snapshot', 'arg': {'instType': 'mc', 'channel': 'trade', 'instId': 'B11USDT'}, 'data': [['1656411148032', '21047.78', '2.2294', 'buy']]})
+    trades = await asyncio.wait_for(future, 1)
+    assert len(trades) == 1 and trades[0]['symbol'] == 'B11/USDT:USDT'
+    await exchange.close()
+
+
+async def test_bitmex():
+    exchange, sent = create(ccxt.pro.bitmex, [market(base, base + 'USDT') for base in bases[0:3]])
+    future = asyncio.ensure_future(exchange.watch_trades_for_symbols(['B0/USDT:USDT', 'B1/USDT:USDT', 'B2/USDT:USDT']))
+    await asyncio.sleep(0.01)
+    assert len(sent) == 1 and sent[0]['args'] == ['trade:B0USDT', 'trade:B1USDT', 'trade:B2USDT']
+    client = list(exchange.clients.values())[0]
+    exchange.handle_message(client, {'table': 'trade', 'action': 'insert', 'data': [{'timestamp': '2022-12-29T09:00:00.000Z', 'symbol': 'B1USDT', 'side': 'Buy', 'size': 1, 'price': 2.5, 'trdMatchID': 'a1'}]})
+    trades = await asyncio.wait_for(future, 1)
+    assert len(trades) == 1 and trades[0]['symbol'] == 'B1/USDT:USDT'
+    await exchange.close()
+
+
+async def test_phemex():
+    markets = []
+    for base in bases[0:3]:
+        inverse = market(base, base + 'USD')
+        inverse.update({'symbol': base + '/USD:' + base, 'quote': 'USD', 'settle': base, 'linear': False, 'inverse': True})
+        markets.append(inverse)
+    exchange, sent = create(ccxt.pro.phemex, markets)
+    future = asyncio.ensure_future(exchange.watch_trades_for_symbols(['B0/USD:B0', 'B1/USD:B1', 'B2/USD:B2']))
+    await asyncio.sleep(0.01)
+    # options['ws']['maxTopicsPerMessage'] is 1, the params of a request are one market, never merged
+    assert [message['params'] for message in sent] == [['B0USD'], ['B1USD'], ['B2USD']]
+    assert [message['method'] for message in sent] == ['trade.subscribe'] * 3 and len(set(message['id'] for message in sent)) == 3
+    client = list(exchange.clients.values())[0]
+    exchange.handle_message(client, {'symbol': 'B2USD', 'trades': [[1592891002064516600, 'Buy', 964020000000, 1431000]], 'type': 'snapshot', 'sequence': 1})
+    trades = await asyncio.wait_for(future, 1)
+    assert len(trades) == 1 and trades[0]['symbol'] == 'B2/USD:B2'
+    await exchange.close()
+
+
+async def test_woo():
+    exchange, sent = create(ccxt.pro.woo, [market(base, 'PERP_' + base + '_USDT') for base in bases[0:3]])
+    exchange.uid = '1'
+    future = asyncio.ensure_future(exchange.watch_trades_for_symbols(['B0/USDT:USDT', 'B1/USDT:USDT', 'B2/USDT:USDT']))
+    await asyncio.sleep(0.01)
+    # a request per topic
+    assert [message['topic'] for message in sent] == ['PERP_B0_USDT@trade', 'PERP_B1_USDT@trade', 'PERP_B2_USDT@trade']
+    client = list(exchange.clients.values())[0]
+    exchange.handle_message(client, {'topic': 'PERP_B1_USDT@trade', 'ts': 1618820361552, 'data': {'symbol': 'PERP_B1_USDT', 'price': 1.2, 'size': 300, 'side': 'BUY', 'source': 0}})
+    trades = await asyncio.wait_for(future, 1)
+    assert len(trades) == 1 and trades[0]['symbol'] == 'B1/USDT:USDT'
+    await exchange.close()
+
+
+async def test_bingx():
+    exchange, sent = create(ccxt.pro.bingx, [market(base, base + '-USDT') for base in bases[0:3]])
+    future = asyncio.ensure_future(exchange.watch_order_book_for_symbols(['B0/USDT:USDT', 'B1/USDT:USDT', 'B2/USDT:USDT']))
+    await asyncio.sleep(0.01)
+    # a request per dataType
+    assert [message['dataType'] for message in sent] == ['market.depth.B0-USDT.step0.level100', 'market.depth.B1-USDT.step0.level100', 'market.depth.B2-USDT.step0.level100']
+    client = list(exchange.clients.values())[0]
+    exchange.handle_message(client, {'code': 0, 'dataType': 'market.depth.B2-USDT.step0.level100', 'data': {'asks': [{'price': '2.5', 'volume': '1'}], 'bids': [{'price': '2.4', 'volume': '3'}], 'latestTrade': {'rawTs': 1672304486865}}})
+    orderbook = await asyncio.wait_for(future, 1)
+    assert orderbook['symbol'] == 'B2/USDT:USDT' and orderbook['asks'][0] == [2.5, 1.0] and orderbook['bids'][0] == [2.4, 3.0]
+    await exchange.close()
+
+
+async def test_blofin():
+    exchange, sent = create(ccxt.pro.blofin, [market(base, base + '-USDT') for base in bases[0:3]])
+    future = asyncio.ensure_future(exchange.watch_trades_for_symbols(['B0/USDT:USDT', 'B1/USDT:USDT', 'B2/USDT:USDT']))
+    await asyncio.sleep(0.01)
+    assert len(sent) == 1 and sent[0]['args'] == [{'channel': 'trades', 'instId': 'B0-USDT'}, {'channel': 'trades', 'instId': 'B1-USDT'}, {'channel': 'trades', 'instId': 'B2-USDT'}]
+    client = list(exchange.clients.values())[0]
+    exchange.handle_message(client, {'arg': {'channel': 'trades', 'instId': 'B0-USDT'}, 'data': [{'instId': 'B0-USDT', 'tradeId': '1', 'px': '1.5', 'sz': '2', 'side': 'buy', 'ts': '1621446178316'}]})
+    trades = await asyncio.wait_for(future, 1)
+    assert len(trades) == 1 and trades[0]['symbol'] == 'B0/USDT:USDT'
+    await exchange.close()
+
+
+async def main():
+    await test_race()
+    await test_bybit()
+    await test_mixed_types()
+    await test_binance()
+    await test_ohlcv()
+    await test_bitget()
+    await test_bitmex()
+    await test_phemex()
+    await test_woo()
+    await test_bingx()
+    await test_blofin()
+
+
+asyncio.run(main())
+print('for symbols succeeded')
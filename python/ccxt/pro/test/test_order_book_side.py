@@ -0,0 +1,277 @@
+import os
+import sys
+import copy
+import json
+import random
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.base.ws.order_book_side import Asks, Bids, CountedAsks, CountedBids, IndexedBids, LOAD, MERGE_RATIO  # noqa: F402
+from ccxt.base.errors import NotSupported  # noqa: F402
+import ccxt.pro  # noqa: F402
+from ccxt.async_support.base.ws.order_book import OrderBook, OrderBookView  # noqa: F402
+from ccxt.base.exchange import Exchange  # noqa: F402
+
+
+def equals(a, b):
+    return a == b
+
+
+def reference(levels, descending):
+    return [[price, levels[price]] for price in sorted(levels, reverse=descending)]
+
+
+# ----------------------------------------------------------------------------
+# deep books span several chunks, every operation must match a plain sorted list
+
+random.seed(1)
+
+for side_class, descending in [(Asks, False), (Bids, True)]:
+    side = side_class()
+    levels = {}
+    for _ in range(LOAD * 12):
+        price = random.randint(1, LOAD * 6) / 10
+        size = random.choice([0, 0, 1, 2, 3.5])
+        side.store(price, size)
+        if size:
+            levels[price] = size
+        elif price in levels:
+            del levels[price]
+    target = reference(levels, descending)
+    assert len(side._keys) > 1
+    assert equals(len(side), len(target))
+    assert equals(side, target)
+    assert equals(side[0], target[0])
+    assert equals(side[-1], target[-1])
+    assert equals(side[LOAD + 3], target[LOAD + 3])
+    assert equals(side[LOAD - 5:LOAD * 3 + 7], target[LOAD - 5:LOAD * 3 + 7])
+    assert equals(side[::7], target[::7])
+    assert equals(list(reversed(side)), list(reversed(target)))
+    assert target[LOAD] in side
+    assert equals(copy.deepcopy(side), target)
+
+# ----------------------------------------------------------------------------
+# limit() trims the tail across chunk boundaries
+
+asks = Asks([[float(i), 1] for i in range(1, LOAD * 5)], LOAD + 1)
+asks.limit()
+assert equals(len(asks), LOAD + 1)
+assert equals(asks[-1], [float(LOAD + 1), 1])
+asks.store(0.5, 1)
+asks.limit()
+assert equals(asks[0], [0.5, 1])
+assert equals(asks[-1], [float(LOAD), 1])
+
+asks.clear()
+assert equals(asks, [])
+asks.store(1.0, 1)
+assert equals(asks, [[1.0, 1]])
+
+# ----------------------------------------------------------------------------
+# several orders resting at the same price are resolved by id
+
+bids = IndexedBids([[10.0, 1, 'a'], [10.0, 2, 'b'], [10.0, 3, 'c'], [9.0, 4, 'd']])
+bids.store(10.0, 5, 'b')
+assert equals(sorted(row[1] for row in bids[0:3]), [1, 3, 5])
+bids.store(10.0, 0, 'c')
+assert equals(len(bids), 3)
+assert 'c' not in bids._hashmap
+bids.store(8.0, 6, 'a')
+assert equals(bids[-1], [8.0, 6, 'a'])
+assert equals(bids[0], [10.0, 5, 'b'])
+
+# ----------------------------------------------------------------------------
+# views are not affected by deltas applied after they were taken
+
+book = OrderBook({
+    'bids': [[10.0, 1], [9.0, 2], [8.0, 3]],
+    'asks': [[11.0, 3], [12.0, 2], [13.0, 1]],
+    'nonce': 1,
+}, 2)
+view = book.view()
+assert equals(len(view['bids']), 2)
+assert equals(view['bids'], [[10.0, 1], [9.0, 2]])
+assert equals(view.top(1), {'bids': [[10.0, 1]], 'asks': [[11.0, 3]]})
+assert equals(view.best_bid(), [10.0, 1])
+assert equals(view.best_ask(), [11.0, 3])
+assert equals(view.mid(), 10.5)
+assert equals(view.microprice(), (10.0 * 3 + 11.0 * 1) / 4)
+assert equals(view.depth('bids', 9.0), 3)
+assert equals(view.depth('asks', 12.5), 5)
+
+book['bids'].store(10.0, 7)
+book['bids'].store(9.0, 0)
+book['asks'].store(10.5, 1)
+book['nonce'] = 2
+assert equals(view['bids'], [[10.0, 1], [9.0, 2]])
+assert equals(view['asks'], [[11.0, 3], [12.0, 2]])
+assert equals(view['nonce'], 1)
+assert equals(book['bids'], [[10.0, 7], [8.0, 3]])
+assert equals(book.view()['asks'], [[10.5, 1], [11.0, 3]])
+
+empty = OrderBook().view()
+assert empty.best_bid() is None
+assert empty.mid() is None
+
+# views serialize and compare as the rows they stand for
+assert equals(json.loads(json.dumps(view)), json.loads(json.dumps({'bids': [[10.0, 1], [9.0, 2]], 'asks': [[11.0, 3], [12.0, 2]], 'timestamp': None, 'datetime': None, 'nonce': 1, 'symbol': None})))
+assert equals(view['bids'].to_list(), [[10.0, 1], [9.0, 2]]) and type(view['bids'].to_list()) is list
+assert equals(repr(view['asks']), '[[11.0, 3], [12.0, 2]]') and equals(copy.deepcopy(view)['asks'], view['asks'])
+assert view['bids'] != [[10.0, 7]] and equals(view['bids'], view['bids'].to_list())
+
+# with options['watchOrderBook']['view'] the watchers get a view from limit()
+exchange = ccxt.pro.okx({'options': {'watchOrderBook': {'view': True}}})
+watched = exchange.order_book({'bids': [[1.0, 1.0], [0.5, 1.0]]}, 1)
+limited = watched.limit()
+assert isinstance(limited, OrderBookView) and equals(limited['bids'], [[1.0, 1.0]])
+watched['bids'].store(1.0, 0)
+assert equals(limited['bids'], [[1.0, 1.0]])
+assert ccxt.pro.okx().order_book().limit().__class__ is OrderBook
+
+# ----------------------------------------------------------------------------
+# batches of raw string levels, small ones are bisected and large ones merged
+
+for side_class, descending in [(Asks, False), (Bids, True)]:
+    side = side_class()
+    levels = {}
+    for batch_size in [LOAD * 4, 3, MERGE_RATIO + 1, LOAD, 5, LOAD * 2]:
+        view = side.view()
+        before = list(view)
+        prices = []
+        sizes = []
+        for _ in range(batch_size):
+            price = random.randint(1, LOAD * 4)
+            size = random.choice([0, 1, 2, 3])
+            prices.append(str(price / 10))
+            sizes.append(str(size))
+            if size:
+                levels[price / 10] = float(size)
+            elif price / 10 in levels:
+                del levels[price / 10]
+        side.apply_deltas(prices, sizes)
+        assert equals(side, reference(levels, descending))
+        assert equals(view, before)
+    side.apply_levels([[price, '0'] for price in list(levels)[0:LOAD]])
+    assert equals(len(side), len(levels) - LOAD)
+
+merged = Asks()
+merged.apply_deltas(['1.5', '1.5', '2.5', '2.5'] * MERGE_RATIO, ['1', '2', '3', '0'] * MERGE_RATIO)
+assert equals(merged, [[1.5, 2.0]])
+
+# ----------------------------------------------------------------------------
+# checksums are built from the raw strings and only the touched top levels are rebuilt
+
+book = OrderBook({}, 400).retain_raw()
+book['bids'].apply_levels([['3366.1', '7', '0', '3'], ['3366', '6', '3', '4'], ['3365.90', '0.10', '0', '1']])
+book['asks'].apply_levels([['3366.8', '9', '10', '3'], ['3368', '8', '3', '4']])
+payload = '3366.1:7:3366.8:9:3366:6:3368:8:3365.90:0.10'
+assert equals(book.checksum(), Exchange.crc32(payload, True))
+assert equals(OrderBook({'bids': [[1.5, 0.1]]}).checksum(), Exchange.crc32('1.5:0.1', True))
+
+deep = OrderBook({}).retain_raw()
+deep['bids'].apply_levels([[str(1000 - i), '1'] for i in range(LOAD * 3)])
+deep['asks'].apply_levels([[str(1001 + i), '1'] for i in range(LOAD * 3)])
+top = deep['bids'].checksum_levels(25)
+deep['bids'].apply_levels([['100', '2'], ['101', '0']])
+assert deep['bids'].checksum_levels(25) is top
+deep['bids'].apply_levels([['999', '3.0']])
+assert deep['bids'].checksum_levels(25) is not top
+assert equals(deep['bids'].checksum_levels(25)[1], '999:3.0')
+deep['asks'].apply_deltas(['1001'], ['0'])
+assert equals(deep['asks'].checksum_levels(25)[0], '1002:1')
+for _ in range(LOAD):
+    deep['asks'].pop()
+deep['asks'].limit()
+expected = ':'.join(level for pair in zip(deep['bids'].checksum_levels(25), deep['asks'].checksum_levels(25)) for level in pair)
+assert equals(deep.checksum(), Exchange.crc32(expected, True))
+assert equals(deep.checksum(), deep.checksum())
+
+# a level written as numbers replaces the raw string of its price, the stored numbers are formatted instead
+mixed = OrderBook({}).retain_raw()
+mixed['bids'].apply_levels([['3366.10', '7.0'], ['3366', '6'], ['3365.5', '1']])
+mixed['asks'].apply_levels([['3366.80', '9'], ['3368', '8']])
+mixed.checksum()
+mixed['bids'].storeArray([3366.1, 5.0])
+mixed['bids'].store(3366.0, 0)
+mixed['asks'].storeArray([3367.0, 2.0])
+mixed['asks'].apply_deltas([3368.0], [4.0])
+mixed['asks'].apply_levels([['3366.80', '9.5']])
+assert equals(mixed.checksum(), Exchange.crc32('3366.1:5:3366.80:9.5:3365.5:1:3367:2:3368:4', True))
+mixed['bids'].apply_levels([['3366.10', '0'], ['3365.5', '1.00']])
+mixed['bids'].storeArray([3366.1, 3.0])
+assert equals(mixed['bids'].checksum_levels(25), ['3366.1:3', '3365.5:1.00'])
+mixed['bids'].pop(0)
+mixed['bids'].storeArray([3366.1, 1.0])
+assert equals(mixed['bids'].checksum_levels(25), ['3366.1:1', '3365.5:1.00'])
+
+sampled = OrderBook()
+assert equals([sampled.checksum_due(3) for _ in range(6)], [False, False, True, False, False, True])
+assert sampled.checksum_due(1)
+
+# ----------------------------------------------------------------------------
+# the list methods read and write the chunks, not the unused list storage
+
+book = OrderBook({'bids': [[1.0, 2.0], [0.5, 1.0]], 'asks': [[2.0, 1.0]]})
+bids = book['bids']
+assert equals(bids.copy(), [[1.0, 2.0], [0.5, 1.0]]) and type(bids.copy()) is list
+assert equals(bids.count([1.0, 2.0]), 1)
+assert equals(bids.index([1.0, 2.0]), 0)
+assert equals(bids.index([0.5, 1.0], 1), 1)
+try:
+    bids.index([0.5, 1.0], 0, 1)
+    assert False
+except ValueError:
+    pass
+bids.append([9.0, 1.0])
+assert equals(bids, [[9.0, 1.0], [1.0, 2.0], [0.5, 1.0]])
+bids.extend([[0.7, 1.0], [9.0, 0]])
+bids += [[0.2, 1.0]]
+assert type(book['bids']) is Bids and equals(bids, [[1.0, 2.0], [0.7, 1.0], [0.5, 1.0], [0.2, 1.0]])
+bids.remove([0.7, 1.0])
+del bids[-1]
+assert equals(bids, [[1.0, 2.0], [0.5, 1.0]]) and equals(len(bids), 2)
+assert equals(bids * 2, [[1.0, 2.0], [0.5, 1.0]] * 2) and equals([[3.0, 1.0]] + bids, [[3.0, 1.0], [1.0, 2.0], [0.5, 1.0]])
+assert bids < [[2.0, 1.0]] and bids > [[1.0, 1.0]]
+bids.insert(0, [0.7, 1.0])
+bids[0] = [3.0, 1.0]
+assert equals(bids, [[3.0, 1.0], [0.7, 1.0], [0.5, 1.0]])
+bids[1:] = [[0.6, 1.0]]
+bids.sort()
+bids *= 1
+assert equals(bids, [[3.0, 1.0], [0.6, 1.0]])
+for method, args in [('sort', (None, True)), ('reverse', ())]:
+    try:
+        getattr(bids, method)(*args)
+        assert False
+    except ValueError:
+        pass
+bids *= 0
+assert equals(bids, []) and equals(len(bids), 0)
+bids.append([1.0, 1.0])
+bids.reverse()
+assert equals(bids, [[1.0, 1.0]])
+counted = CountedAsks()
+counted.append([1.0, 2.0, 3])
+assert equals(counted.copy(), [[1.0, 2.0, 3]])
+
+# ----------------------------------------------------------------------------
+# counted and indexed levels keep their third value, the keys are mapped and the numbers parsed
+
+counted = CountedBids()
+counted.apply_levels([{'p': '10.5', 's': '2', 'c': '3'}, {'p': '11', 's': '1', 'c': '1'}], 'p', 's', 'c')
+assert equals(counted, [[11.0, 1.0, 1.0], [10.5, 2.0, 3.0]])
+counted.apply_deltas(['11', '9'], ['0', '4'], ['0', '2'])
+assert equals(counted, [[10.5, 2.0, 3.0], [9.0, 4.0, 2.0]])
+indexed = IndexedBids()
+indexed.apply_levels([{'price': '10', 'size': '1', 'id': 'a'}, {'price': '10', 'size': '2', 'id': 'b'}], 'price', 'size', 'id')
+indexed.apply_deltas(['9'], ['3'], ['a'])
+assert equals(indexed, [[10.0, 2.0, 'b'], [9.0, 3.0, 'a']]) and equals(indexed._hashmap, {'a': -9.0, 'b': -10.0})
+for side in [counted, indexed]:
+    try:
+        side.apply_deltas(['1'], ['1'])
+        assert False
+    except NotSupported:
+        pass
@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from aiohttp import web  # noqa: F402
+import ccxt.pro  # noqa: F402
+from ccxt.async_support.base.exchange import Exchange  # noqa: F402
+from ccxt.base.errors import NetworkError  # noqa: F402
+
+# ----------------------------------------------------------------------------
+# a dropped connection with options['ws']['reconnect'] is reopened, the subscriptions are replayed
+# in packed messages and the pending futures resolve from the new connection
+
+
+class Venue(object):
+    # a websocket server that drops the first connection once it has received drop_after messages
+
+    def __init__(self, drop_after):
+        self.drop_after = drop_after
+        self.connections = []
+
+    async def handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        received = []
+        self.connections.append(received)
+        async for message in ws:
+            received.append(json.loads(message.data))
+            if len(self.connections) == 1 and len(received) == self.drop_after:
+                await ws.close()
+                break
+            if len(self.connections) > 1:
+                for topic in received[-1]['args']:
+                    await ws.send_str(json.dumps({'topic': topic, 'data': len(self.connections)}))
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return 'ws://127.0.0.1:' + str(port) + '/'
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class Streams(Exchange):
+    def handle_message(self, client, message):
+        client.resolve(message['data'], message['topic'])
+
+    def subscribe(self, url, topic):
+        return self.watch(url, topic, {'op': 'subscribe', 'args': [topic], 'id': topic}, topic)
+
+
+def create(reconnect=True, options={}):
+    exchange = Streams({'id': 'streams', 'rateLimit': 10, 'options': {'ws': dict({'reconnect': reconnect, 'reconnectDelay': 20, 'keepAlive': 0}, **options)}})
+    exchange.open()  # the clients run on the loop of the exchange
+    return exchange
+
+
+async def test_resume():
+    venue = Venue(3)
+    url = await venue.start()
+    exchange = create(True, {'maxTopicsPerMessage': 2})
+    futures = [exchange.subscribe(url, topic) for topic in ['a', 'b', 'c']]
+    results = await asyncio.wait_for(asyncio.gather(*futures), 5)
+    # the futures of the first connection resolve from the second one
+    assert results == [2, 2, 2]
+    assert len(venue.connections) == 2
+    assert venue.connections[1] == [{'op': 'subscribe', 'args': ['a', 'b'], 'id': 'a'}, {'op': 'subscribe', 'args': ['c'], 'id': 'c'}]
+    assert exchange.clients[url].isConnected and not exchange.clients[url].reconnecting
+    await exchange.close()
+    await venue.stop()
+
+
+async def test_logged_in():
+    # the subscriptions of a logged in connection are not replayed, the futures are rejected
+    venue = Venue(2)
+    url = await venue.start()
+    exchange = create()
+    client = exchange.client(url)
+    exchange.watch(url, 'authenticated', {'op': 'auth', 'args': ['key']})
+    future = exchange.subscribe(url, 'a')
+    try:
+        await asyncio.wait_for(future, 5)
+        assert False
+    except NetworkError:
+        pass
+    assert url not in exchange.clients and not client.resumable()
+    await exchange.close()
+    await venue.stop()
+
+
+async def test_give_up():
+    venue = Venue(1)
+    url = await venue.start()
+    exchange = create(True, {'maxReconnectAttempts': 2})
+    future = exchange.subscribe(url, 'a')
+    await venue.stop()  # nothing to reconnect to
+    try:
+        await asyncio.wait_for(future, 5)
+        assert False
+    except NetworkError:
+        pass
+    assert url not in exchange.clients
+    await exchange.close()
+
+
+async def test_delay():
+    exchange = create()
+    client = exchange.client('ws://127.0.0.1:1/')
+    delays = [exchange.reconnect_delay(client, attempt) for attempt in range(0, 12)]
+    assert 10 <= delays[0] <= 20 and 80 <= delays[3] <= 160
+    assert 15000 <= delays[-1] <= 30000  # maxReconnectDelay
+    await exchange.close()
+
+
+async def test_binance_replay():
+    # every order book is reloaded once after a reconnect, the responses to the replayed requests do not reload it again
+    exchange = ccxt.pro.binance({'enableRateLimit': False})
+    exchange.set_markets([{'id': base + 'USDT', 'lowercaseId': base.lower() + 'usdt', 'symbol': base + '/USDT:USDT', 'base': base, 'quote': 'USDT', 'settle': 'USDT', 'type': 'swap', 'spot': False, 'swap': True, 'contract': True, 'linear': True, 'inverse': False} for base in ['BTC', 'ETH', 'SOL']])
+    exchange.open()
+    url = exchange.urls['api']['ws']['future'] + '/' + exchange.stream('future', 'replay')
+    client = exchange.client(url)
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    client.send = send
+    loaded = []
+    exchange.handle_order_book_subscription = lambda client, message, subscription: loaded.append(subscription['symbol'])
+    for i, base in enumerate(['btc', 'eth', 'sol']):
+        messageHash = base + 'usdt@depth'
+        client.subscriptions[messageHash] = {'id': str(i + 1), 'symbol': base.upper() + '/USDT:USDT', 'method': exchange.handle_order_book_subscription}
+        client.subscribe_messages[messageHash] = {'method': 'SUBSCRIBE', 'params': [messageHash + '@100ms'], 'id': i + 1}
+    exchange.options['requestId'][url] = 3
+    await exchange.resubscribe(client)
+    assert sent == [{'method': 'SUBSCRIBE', 'params': ['btcusdt@depth@100ms', 'ethusdt@depth@100ms', 'solusdt@depth@100ms'], 'id': 4}]
+    assert loaded == ['BTC/USDT:USDT', 'ETH/USDT:USDT', 'SOL/USDT:USDT']
+    exchange.handle_message(client, {'result': None, 'id': 4})
+    assert len(loaded) == 3
+    await exchange.close()
+
+
+async def main():
+    await test_delay()
+    await test_resume()
+    await test_logged_in()
+    await test_give_up()
+
+
+asyncio.run(test_binance_replay())
+asyncio.run(main())
+print('reconnect succeeded')
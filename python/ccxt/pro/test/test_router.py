@@ -0,0 +1,54 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.base.ws.router import MessageRouter  # noqa: F402
+
+
+def equals(a, b):
+    return a == b
+
+
+calls = []
+
+
+def handler(name):
+    def handle(client, message):
+        calls.append(name)
+        return name
+    return handle
+
+
+# ----------------------------------------------------------------------------
+# exact routes win, then the longest prefix, then the first contained key
+
+router = MessageRouter(
+    exact={'books': handler('books'), 'tickers': handler('tickers')},
+    prefix={'candle': handler('candle'), 'candle1D': handler('daily')},
+    contains={'trade': handler('trade'), 'publicTrade': handler('public')},
+)
+assert equals(router.dispatch(None, {}, 'books'), (True, 'books'))
+assert equals(router.dispatch(None, {}, 'candle1m'), (True, 'candle'))
+assert equals(router.dispatch(None, {}, 'candle1Dutc'), (True, 'daily'))
+assert equals(router.dispatch(None, {}, 'user.trade.BTCUSDT'), (True, 'trade'))
+assert equals(router.dispatch(None, {}, 'publicTrade.BTCUSDT'), (True, 'public'))
+assert equals(router.dispatch(None, {}, 'books5'), (False, None))
+assert equals(router.dispatch(None, {}, None), (False, None))
+assert equals(router.dispatch(None, {}, 'candle1m'), (True, 'candle'))
+assert equals(calls, ['books', 'candle', 'daily', 'trade', 'public', 'candle'])
+assert equals(router.hits, {'books': 1, 'candle': 2, 'candle1D': 1, 'trade': 1, 'publicTrade': 1})
+assert 'books5' in router._resolved
+
+router.reset_hits()
+assert equals(router.hits, {})
+
+# ----------------------------------------------------------------------------
+# the key can be extracted from the message
+
+extracted = MessageRouter(exact={'ticker': handler('ticker')}, extractor=lambda message: message.get('arg', {}).get('channel'))
+assert equals(extracted.dispatch(None, {'arg': {'channel': 'ticker'}}), (True, 'ticker'))
+assert equals(extracted.dispatch(None, {'arg': {}}), (False, None))
@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from aiohttp import web  # noqa: F402
+from ccxt.async_support.base.exchange import Exchange  # noqa: F402
+from ccxt.async_support.base.ws.shards import ShardManager  # noqa: F402
+
+# ----------------------------------------------------------------------------
+# the subscriptions of a url are spread over several connections with options['ws']['maxTopicsPerConnection']
+# and options['ws']['maxMessagesPerSecond'], see ShardManager and Exchange.shard_url()
+
+
+def test_assign():
+    manager = ShardManager('wss://venue/ws', 2)
+    assert [manager.assign(topic) for topic in ['a', 'b', 'c', 'a', 'd', 'e']] == [0, 0, 1, 0, 1, 2]
+    assert manager.shard_url(0) == 'wss://venue/ws' and manager.shard_url(2) == 'wss://venue/ws#2'
+    # at the connection limit the least busy shard takes the rest
+    manager = ShardManager('wss://venue/ws', 1, None, 2)
+    assert [manager.assign(topic) for topic in ['a', 'b', 'c']] == [0, 1, 0]
+    assert manager.release('a') == 0 and manager.assign('d') == 0
+
+
+def test_rebalance():
+    manager = ShardManager('wss://venue/ws', None, 10)
+    for topic in ['a', 'b', 'c']:
+        manager.assign(topic)
+    # the hottest subscription moves to a new connection, it stays there alone even above the rate
+    assert manager.rebalance({'a': 50, 'b': 5, 'c': 5}) == [('a', 0, 1)]
+    assert manager.rates == [10, 50]
+    assert manager.rebalance({'a': 50, 'b': 8, 'c': 7}) == [('b', 0, 2)]
+    assert manager.shards == [set(['c']), set(['a']), set(['b'])]
+    assert manager.rebalance({'a': 50, 'b': 8, 'c': 7}) == []
+    # a subscription that cannot be unsubscribed is not moved
+    manager = ShardManager('wss://venue/ws', None, 10)
+    manager.assign('a')
+    manager.assign('b')
+    assert manager.rebalance({'a': 50, 'b': 5}, lambda subscribe_hash, index: False) == []
+
+
+class Venue(object):
+    # answers every subscribed topic with the number of the connection
+
+    def __init__(self):
+        self.connections = []
+
+    async def handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        received = []
+        self.connections.append(received)
+        number = len(self.connections)
+        async for message in ws:
+            message = json.loads(message.data)
+            received.append(message)
+            if message['op'] == 'subscribe':
+                for topic in message['args']:
+                    await ws.send_str(json.dumps({'topic': topic, 'data': number}))
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return 'ws://127.0.0.1:' + str(port) + '/'
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class Streams(Exchange):
+    def handle_message(self, client, message):
+        client.resolve(message['data'], message['topic'])
+        client.resolve(message['data'], 'hash:' + message['topic'])
+
+    def subscribe(self, url, topic):
+        return self.watch(url, topic, {'op': 'subscribe', 'args': [topic]}, topic)
+
+    def subscribe_hashed(self, url, topic):
+        # the message hash differs from the subscribe hash
+        return self.watch(url, 'hash:' + topic, {'op': 'subscribe', 'args': [topic]}, topic)
+
+
+def create(options):
+    exchange = Streams({'id': 'streams', 'rateLimit': 10, 'options': {'ws': dict({'keepAlive': 0}, **options)}})
+    exchange.open()  # the clients run on the loop of the exchange
+    return exchange
+
+
+async def test_url():
+    exchange = create({'maxTopicsPerConnection': 1})
+    url = 'wss://venue/ws'
+    assert exchange.shard_url(url, 'a') == url and exchange.shard_url(url, 'b') == url + '#1'
+    assert exchange.shard_url(url, None) == url
+    # the subscriptions of a logged in connection stay on it
+    exchange.client(url).subscriptions['authenticated'] = True
+    assert exchange.shard_url(url, 'c') == url and exchange.shard_url(url, 'b') == url + '#1'
+    client = exchange.client(url)
+    client.subscribe_messages = {'a': {'op': 'subscribe', 'args': ['a']}, 'b': {'method': 'SUBSCRIBE', 'params': ['b']}, 'c': {'reqType': 'sub'}}
+    assert exchange.unsubscribe_message(client, 'a') == {'op': 'unsubscribe', 'args': ['a']}
+    assert exchange.unsubscribe_message(client, 'b') == {'method': 'UNSUBSCRIBE', 'params': ['b']}
+    assert exchange.unsubscribe_message(client, 'c') is None
+    # without the options everything stays on one connection
+    single = create({})
+    assert single.shard_url(url, 'b') == url
+    await asyncio.gather(exchange.close(), single.close())
+
+
+async def test_connections():
+    venue = Venue()
+    url = await venue.start()
+    exchange = create({'maxTopicsPerConnection': 2, 'packSubscriptions': True})
+    topics = ['a', 'b', 'c', 'd', 'e']
+    results = await asyncio.wait_for(asyncio.gather(*[exchange.subscribe(url, topic) for topic in topics]), 5)
+    # three connections, each one subscribed in one message
+    assert sorted(sorted(connection[0]['args']) for connection in venue.connections) == [['a', 'b'], ['c', 'd'], ['e']]
+    assert all(len(connection) == 1 for connection in venue.connections)
+    assert results[0] == results[1] and results[2] == results[3] and len(set(results)) == 3
+    assert sorted(exchange.clients.keys()) == [url, url + '#1', url + '#2']
+    await exchange.close()
+    await venue.stop()
+
+
+async def test_move():
+    venue = Venue()
+    url = await venue.start()
+    exchange = create({'maxMessagesPerSecond': 10, 'rebalanceInterval': 60000})
+    assert await asyncio.wait_for(asyncio.gather(*[exchange.subscribe(url, topic) for topic in ['a', 'b', 'c']]), 5) == [1, 1, 1]
+    manager = exchange.shard_managers[url]
+    client = exchange.clients[url]
+    client.resolutions = {'a': 100, 'b': 1, 'c': 1}
+    manager.measured = exchange.milliseconds() - 1000
+    future = exchange.subscribe(url, 'a')
+    await exchange.rebalance_shards(manager)
+    # the pending watch() resolves from the new connection
+    assert await asyncio.wait_for(future, 5) == 2
+    assert venue.connections[0][-1] == {'op': 'unsubscribe', 'args': ['a']}
+    assert venue.connections[1] == [{'op': 'subscribe', 'args': ['a']}]
+    assert 'a' not in client.subscriptions and 'a' in exchange.clients[url + '#1'].subscriptions
+    await exchange.close()
+    await venue.stop()
+
+
+async def test_move_message_hashes():
+    # the rates and the pending futures follow the message hashes of a subscription
+    exchange = create({'maxMessagesPerSecond': 10, 'rebalanceInterval': 60000})
+    sent = {}
+    client = exchange.client
+
+    def offline(url):
+        # connected already, the frames are collected instead of sent
+        existing = url in exchange.clients
+        result = client(url)
+        if not existing:
+            result.connected.resolve(url)
+            frames = sent[url] = []
+
+            async def send(message):
+                frames.append(message)
+
+            result.send = send
+        return result
+
+    exchange.client = offline
+    url = 'wss://venue/ws'
+    futures = [exchange.subscribe_hashed(url, topic) for topic in ['a', 'b', 'c']]
+    await asyncio.sleep(0.01)
+    source = exchange.clients[url]
+    assert source.message_hashes == {'a': ['hash:a'], 'b': ['hash:b'], 'c': ['hash:c']}
+    source.resolutions = {'hash:a': 100, 'hash:b': 1, 'hash:c': 1}
+    manager = exchange.shard_managers[url]
+    manager.measured = exchange.milliseconds() - 1000
+    await exchange.rebalance_shards(manager)
+    target = exchange.clients[url + '#1']
+    assert sent[url][-1] == {'op': 'unsubscribe', 'args': ['a']} and sent[url + '#1'] == [{'op': 'subscribe', 'args': ['a']}]
+    assert 'hash:a' not in source.futures and target.message_hashes == {'a': ['hash:a']}
+    exchange.handle_message(target, {'topic': 'a', 'data': 2})
+    assert await asyncio.wait_for(futures[0], 1) == 2
+    assert not futures[1].done()
+    await exchange.close()
+
+
+async def main():
+    await test_url()
+    await test_move_message_hashes()
+    await test_connections()
+    await test_move()
+
+
+test_assign()
+test_rebalance()
+asyncio.run(main())
+print('shards succeeded')
@@ -4,7 +4,7 @@
 # https://github.com/ccxt/ccxt/blob/master/CONTRIBUTING.md#how-to-contribute-code
 
 import ccxt.async_support
-from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp
 import hashlib
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import AuthenticationError
@@ -25,6 +25,9 @@ class woo(ccxt.async_support.woo):
                 'watchTicker': True,
                 'watchTickers': True,
                 'watchTrades': True,
+                'watchOrderBookForSymbols': True,
+                'watchTradesForSymbols': True,
+                'watchOHLCVForSymbols': True,
             },
             'urls': {
                 'api': {
@@ -74,6 +77,24 @@ class woo(ccxt.async_support.woo):
         request = self.extend(subscribe, message)
         return await self.watch(url, messageHash, request, messageHash, subscribe, shouldThrottle)
 
+    async def watch_public_multiple(self, topics, params={}, keys=None):
+        # a request per topic, the protocol takes one topic string, sent together on one connection
+        self.check_required_uid()
+        url = self.urls['api']['ws']['public'] + '/' + 'OqdphuyCtYWxwzhxyLLjOWNdFP7sQt8RPWzmb5xY'
+        messages = []
+        subscriptions = []
+        for i in range(0, len(topics)):
+            subscribe = {
+                'id': self.request_id(url),
+            }
+            request = {
+                'event': 'subscribe',
+                'topic': topics[i],
+            }
+            messages.append(self.extend(subscribe, request, params))
+            subscriptions.append(subscribe)
+        return await self.watch_multiple(url, topics, messages, topics, subscriptions, keys)
+
     async def watch_order_book(self, symbol, limit=None, params={}):
         await self.load_markets()
         name = 'orderbook'
@@ -87,6 +108,16 @@ class woo(ccxt.async_support.woo):
         orderbook = await self.watch_public(topic, message, False)
         return orderbook.limit()
 
+    async def watch_order_book_for_symbols(self, symbols, limit=None, params={}):
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchOrderBookForSymbols')
+        topics = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            topics.append(market['id'] + '@orderbook')
+        orderbook = await self.watch_public_multiple(topics, params)
+        return orderbook.limit()
+
     def handle_order_book(self, client, message):
         #
         #     {
@@ -273,6 +304,25 @@ class woo(ccxt.async_support.woo):
             limit = ohlcv.getLimit(market['symbol'], limit)
         return self.filter_by_since_limit(ohlcv, since, limit, 0, True)
 
+    async def watch_ohlcv_for_symbols(self, symbolsAndTimeframes, since=None, limit=None, params={}):
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(self.symbols_of_pairs(symbolsAndTimeframes), 'watchOHLCVForSymbols')
+        topics = []
+        keys = []
+        for i in range(0, len(symbols)):
+            timeframe = symbolsAndTimeframes[i][1]
+            if (timeframe != '1m') and (timeframe != '5m') and (timeframe != '15m') and (timeframe != '30m') and (timeframe != '1h') and (timeframe != '1d') and (timeframe != '1w') and (timeframe != '1M'):
+                raise ExchangeError(self.id + ' watchOHLCVForSymbols timeframe argument must be 1m, 5m, 15m, 30m, 1h, 1d, 1w, 1M')
+            market = self.market(symbols[i])
+            interval = self.safe_string(self.timeframes, timeframe, timeframe)
+            topics.append(market['id'] + '@kline_' + interval)
+            keys.append([symbols[i], timeframe])
+        key, ohlcv = await self.watch_public_multiple(topics, params, keys)
+        if self.newUpdates:
+            limit = ohlcv.getLimit(key[0], limit)
+        filtered = self.filter_by_since_limit(ohlcv, since, limit, 0, True)
+        return self.create_ohlcv_object(key[0], key[1], filtered)
+
     def handle_ohlcv(self, client, message):
         #
         #     {
@@ -330,6 +380,19 @@ class woo(ccxt.async_support.woo):
             limit = trades.getLimit(market['symbol'], limit)
         return self.filter_by_symbol_since_limit(trades, symbol, since, limit, True)
 
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        await self.load_markets()
+        symbols = self.market_symbols_for_watch(symbols, 'watchTradesForSymbols')
+        topics = []
+        for i in range(0, len(symbols)):
+            market = self.market(symbols[i])
+            topics.append(market['id'] + '@trade')
+        trades = await self.watch_public_multiple(topics, params)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(self.safe_string(first, 'symbol'), limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
     def handle_trade(self, client, message):
         #
         # {
@@ -506,7 +569,7 @@ class woo(ccxt.async_support.woo):
         if symbol is not None:
             if self.orders is None:
                 limit = self.safe_integer(self.options, 'ordersLimit', 1000)
-                self.orders = ArrayCacheBySymbolById(limit)
+                self.orders = self.orders_cache(limit)
             cachedOrders = self.orders
             orders = self.safe_value(cachedOrders.hashmap, symbol, {})
             order = self.safe_value(orders, orderId)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import gc
+import time
+import argparse
+import tracemalloc
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+# construction time and memory of exchange instances, as in one instance per sub-account
+#
+#     python bench_exchange_startup.py                                  # binance, okx and bybit, 100 instances each
+#     python bench_exchange_startup.py --exchanges binance --instances 500 --async
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+
+def rss():
+    # resident memory of the process in bytes, None where /proc is not available
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+# what a request and the parsing of its response read, the api and exceptions are left out
+USED = ['options', 'urls', 'has', 'fees', 'commonCurrencies', 'precision', 'limits', 'timeframes', 'requiredCredentials']
+
+
+def construct(exchange_class, instances):
+    return [exchange_class({'apiKey': str(i), 'secret': str(i)}) for i in range(instances)]
+
+
+def report(name, exchange_class, instances):
+    gc.collect()
+    start = time.perf_counter()
+    first = exchange_class()
+    first_time = time.perf_counter() - start
+    rss_before = rss()
+    start = time.perf_counter()
+    fleet = construct(exchange_class, instances)
+    elapsed = time.perf_counter() - start
+    rss_after = rss()
+    del fleet
+    gc.collect()
+    # tracing slows the construction down, the allocations are measured separately
+    tracemalloc.start()
+    fleet = construct(exchange_class, min(instances, 20))
+    allocated = tracemalloc.get_traced_memory()[0] / len(fleet)
+    for exchange in fleet:
+        for key in USED:
+            getattr(exchange, key)
+    used = tracemalloc.get_traced_memory()[0] / len(fleet)
+    tracemalloc.stop()
+    line = '{:>12}  first {:8.2f} ms  next {:8.3f} ms each  {:8.1f} KB each  {:8.1f} KB in use'.format(
+        name, first_time * 1e3, elapsed / instances * 1e3, allocated / 1024, used / 1024)
+    if rss_before is not None:
+        line += '  rss +{:.1f} MB for {}'.format((rss_after - rss_before) / 1024 / 1024, instances)
+    print(line)
+    del first
+    del fleet
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--exchanges', default='binance,okx,bybit')
+    parser.add_argument('--instances', type=int, default=100)
+    parser.add_argument('--async', dest='asynchronous', action='store_true', help='construct the async_support classes')
+    args = parser.parse_args()
+    module = ccxt.async_support if args.asynchronous else ccxt
+    for name in args.exchanges.split(','):
+        report(name, getattr(module, name), args.instances)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import re
+import json
+import time
+import random
+import argparse
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+# decode throughput of the installed json decoders
+#
+#     python bench_json_decoder.py                          # payloads shaped like binance, okx and bybit messages
+#     python bench_json_decoder.py --file okx.jsonl         # recorded messages, one json document per line
+#
+# the REST responses are decoded with the quoted numbers of Exchange.quoteJsonNumbers, the default, which is
+# the stdlib 'quoted' line whatever decoder is installed, the 'prequoted' line puts the numbers in quotes
+# in the bytes before a faster decoder and shows why that is not done
+
+from ccxt.base.json_decoder import JSON_DECODERS, json_decoder, modules  # noqa: E402
+
+
+# the text before a number, strings included whole, and the number, a trailing 0 keeps the matches outside the strings
+NUMBER = re.compile(rb'((?:"(?:[^"\\]|\\.)*"|[^"\d-])*)(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)')
+
+
+def prequoted(loads):
+    def decode(data):
+        return loads(NUMBER.sub(rb'\1"\2"', data + b' 0')[0:-3])
+    return decode
+
+
+def levels(rng, count, mid):
+    return [['%.2f' % (mid + rng.randint(-500, 500) / 100), '%.6f' % rng.random()] for _ in range(count)]
+
+
+def synthetic_payloads(rng):
+    binance = {'e': 'depthUpdate', 'E': 1672515782136, 's': 'BTCUSDT', 'U': 157, 'u': 160, 'b': levels(rng, 20, 16800), 'a': levels(rng, 20, 16801)}
+    okx = {'arg': {'channel': 'books', 'instId': 'BTC-USDT'}, 'action': 'update', 'data': [{
+        'asks': [level + ['0', '3'] for level in levels(rng, 20, 16801)],
+        'bids': [level + ['0', '2'] for level in levels(rng, 20, 16800)],
+        'ts': '1672515782136',
+        'checksum': -1023440116,
+    }]}
+    bybit = {'topic': 'orderbook.50.BTCUSDT', 'type': 'delta', 'ts': 1672515782136, 'data': {'s': 'BTCUSDT', 'b': levels(rng, 20, 16800), 'a': levels(rng, 20, 16801), 'u': 18521288, 'seq': 7961638724}}
+    tickers = [{'symbol': 'SYM' + str(i) + 'USDT', 'lastPrice': 1.5 + i, 'volume': 1000.25 * i, 'count': i} for i in range(2000)]
+    return {
+        'binance depth': json.dumps(binance),
+        'okx books': json.dumps(okx),
+        'bybit orderbook': json.dumps(bybit),
+        'rest tickers': json.dumps(tickers),
+    }
+
+
+def recorded_payloads(path):
+    with open(path) as f:
+        lines = [line.strip() for line in f if line.strip()]
+    return {os.path.basename(path) + ' #' + str(i): line for i, line in enumerate(lines[0:10])}
+
+
+def measure(decode, data, seconds=0.2):
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0
+    while elapsed < seconds:
+        for _ in range(100):
+            decode(data)
+        count += 100
+        elapsed = time.perf_counter() - start
+    return elapsed / count
+
+
+def report(name, text):
+    data = text.encode()
+    baseline = measure(json.loads, text)
+    print('{:>20} {:>8} bytes  json {:8.2f} us'.format(name, len(data), baseline * 1e6))
+    quoted = json_decoder(None, True)
+    print('{:>20} {:>8}        quoted {:8.2f} us'.format('', '', measure(quoted, text) * 1e6))
+    for decoder in JSON_DECODERS:
+        if decoder == 'json' or modules[decoder] is None:
+            continue
+        decode = prequoted(modules[decoder].loads)
+        assert decode(data) == quoted(text)
+        print('{:>20} {:>8}        prequoted {:<6} {:8.2f} us'.format('', '', decoder, measure(decode, data) * 1e6))
+    for decoder in JSON_DECODERS:
+        if decoder == 'json' or modules[decoder] is None:
+            continue
+        decode = json_decoder(decoder)
+        text_time = measure(decode, text)
+        bytes_time = measure(decode, data)
+        print('{:>20} {:>8}        {:<6} {:8.2f} us  bytes {:8.2f} us  x{:.1f}'.format('', '', decoder, text_time * 1e6, bytes_time * 1e6, baseline / bytes_time))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--file', help='recorded messages, one json document per line')
+    args = parser.parse_args()
+    payloads = recorded_payloads(args.file) if args.file else synthetic_payloads(random.Random(1))
+    print('installed:', ', '.join(decoder for decoder in JSON_DECODERS if modules[decoder] is not None))
+    for name, text in payloads.items():
+        report(name, text)
+
+
+if __name__ == '__main__':
+    main()
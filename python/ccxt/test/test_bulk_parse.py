@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import random
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base import columnar  # noqa: E402
+
+# ------------------------------------------------------------------------------
+# the bulk parsers return what the row by row parsers return
+
+exchange = ccxt.bybit()
+exchange.set_markets([{'id': 'BTCUSDT', 'symbol': 'BTC/USDT:USDT', 'base': 'BTC', 'quote': 'USDT', 'settle': 'USDT', 'type': 'swap', 'spot': False, 'swap': True, 'linear': True, 'contract': True}])
+market = exchange.market('BTC/USDT:USDT')
+
+
+def random_ohlcvs(count, start):
+    ohlcvs = []
+    for i in range(0, count):
+        price = random.uniform(100, 200)
+        ohlcvs.append([str(start + i * 60000), '%.2f' % price, '%.2f' % (price + 1), '%.2f' % (price - 1), str(price), '%.4f' % random.random(), '0'])
+    return ohlcvs
+
+
+# newest first, the way bybit lists them
+ohlcvs = random_ohlcvs(200, 1700000000000)[::-1]
+for since, limit in [(None, None), (None, 50), (1700000000000 + 30 * 60000, None), (1700000000000 + 30 * 60000 + 1, 10), (None, 0), (1800000000000, None)]:
+    expected = exchange.parse_ohlcvs(ohlcvs, market, '1m', since, limit)
+    assert exchange.bulk_parse_ohlcvs(ohlcvs, market, '1m', since, limit) == expected, (since, limit)
+    columns = exchange.bulk_parse_ohlcvs(ohlcvs, market, '1m', since, limit, [0, 1, 2, 3, 4, 5], True)
+    assert columns.to_list() == expected
+    assert list(columns.column('close')) == [ohlcv[4] for ohlcv in expected]
+
+# a missing value is parsed row by row
+broken = [list(ohlcv) for ohlcv in ohlcvs]
+broken[3][2] = ''
+broken[5][5] = None
+assert exchange.bulk_parse_ohlcvs(broken, market) == exchange.parse_ohlcvs(broken, market)
+columns = exchange.bulk_parse_ohlcvs(broken, market, '1m', None, None, [0, 1, 2, 3, 4, 5], True)
+high = columns.column('high')
+assert len(high) == 200 and high[-4] != high[-4]
+
+# unsorted levels are sorted the way parse_order_book() sorts them
+bids = [['%.1f' % random.uniform(100, 200), '%.3f' % random.random(), '0', '1'] for i in range(300)] + [['150.0', '1'], ['150.0', '2']]
+asks = [['%.1f' % (200 + i * 0.5), '%.3f' % random.random()] for i in range(300)]
+orderbook = {'b': bids, 'a': asks}
+expected = exchange.parse_order_book(orderbook, 'BTC/USDT:USDT', 1700000000000, 'b', 'a')
+assert exchange.bulk_parse_order_book(orderbook, 'BTC/USDT:USDT', 1700000000000, 'b', 'a') == expected
+columns = exchange.bulk_parse_order_book(orderbook, 'BTC/USDT:USDT', 1700000000000, 'b', 'a', 0, 1, True)
+assert list(columns['bids']['price']) == [bid[0] for bid in expected['bids']]
+assert list(columns['asks']['amount']) == [ask[1] for ask in expected['asks']]
+exchange.number = str
+assert exchange.bulk_parse_order_book(orderbook, 'BTC/USDT:USDT', None, 'b', 'a') == exchange.parse_order_book(orderbook, 'BTC/USDT:USDT', None, 'b', 'a')
+exchange.number = float
+
+# the trades are unified by parse_trades(), the columns are parsed in bulk
+trades = [{'execId': str(i), 'symbol': 'BTCUSDT', 'price': '%.2f' % random.uniform(100, 200), 'size': '%.3f' % random.random(), 'side': random.choice(['Buy', 'Sell']), 'time': str(1700000000000 + (60 - i) * 1000)} for i in range(60)]
+keys = {'timestamp': 'time', 'price': 'price', 'amount': 'size', 'id': 'execId', 'side': 'side'}
+expected = exchange.parse_trades(trades, market, None, 20)
+assert exchange.bulk_parse_trades(trades, market, None, 20, {}, keys) == expected
+columns = exchange.bulk_parse_trades(trades, market, None, 20, {}, keys, None, True)
+assert columns['symbol'] == 'BTC/USDT:USDT'
+assert list(columns['timestamp']) == [trade['timestamp'] for trade in expected]
+assert list(columns['price']) == [trade['price'] for trade in expected]
+assert columns['id'] == [trade['id'] for trade in expected] and columns['side'] == [trade['side'] for trade in expected]
+binance = [{'a': i, 'p': '1.5', 'q': '2', 'T': 1700000000000 + i, 'm': i % 2 == 0} for i in range(4)]
+columns = exchange.bulk_parse_trades(binance, market, None, None, {}, {'timestamp': 'T', 'price': 'p', 'amount': 'q', 'id': 'a', 'side': 'm'}, {'true': 'sell', 'false': 'buy'}, True)
+assert columns['side'] == ['sell', 'buy', 'sell', 'buy'] and columns['id'] == ['0', '1', '2', '3']
+
+assert columnar.sorted_order([3, 1, 2, 1]) == [1, 3, 2, 0]
+assert columnar.sorted_order([1, 3, 2, 3], True) == [1, 3, 2, 0]
+assert columnar.sorted_order([3, 2, 2], True) is None
+
+print('bulk parse succeeded' + (' with numpy' if columnar.numpy is not None else ''))
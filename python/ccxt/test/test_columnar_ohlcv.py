@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import math
+import random
+import tracemalloc
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.columnar import OHLCV  # noqa: E402
+from ccxt.async_support.base.ws.cache import ArrayCacheByTimestamp  # noqa: E402
+
+# ------------------------------------------------------------------------------
+# the candles kept in typed arrays read the way the lists of candles read
+
+exchange = ccxt.Exchange()
+
+ohlcvs = OHLCV([[200, 5, 6, 4, 5.5, 10], [100, 1, 2, 0.5, 1.5, 3]])
+assert ohlcvs == [[100, 1, 2, 0.5, 1.5, 3], [200, 5, 6, 4, 5.5, 10]]
+ohlcvs.append([200, 5, 7, 4, 6.5, 12])
+assert ohlcvs[-1] == [200, 5, 7, 4, 6.5, 12] and len(ohlcvs) == 2
+ohlcvs.append([300, 6, 6, 6, 6, None])
+assert math.isnan(ohlcvs[2][5])
+assert ohlcvs[1:].to_list()[0] == [200, 5, 7, 4, 6.5, 12] and len(ohlcvs[1:]) == 2
+assert exchange.filter_by_since_limit(ohlcvs, 150, 1, 0, False) == [[200, 5, 7, 4, 6.5, 12]]
+assert exchange.filter_by_since_limit(ohlcvs, None, 1, 0, True)[0][0] == 300
+assert list(ohlcvs.column('timestamp')) == [100, 200, 300]
+assert list(ohlcvs.columns()['high']) == [2, 7, 6]
+
+# a stream of updates reads the way ArrayCacheByTimestamp reads
+random.seed(1)
+cache = ArrayCacheByTimestamp(50)
+stored = OHLCV(None, 50)
+timestamp = 0
+for i in range(2000):
+    if random.random() < 0.4:
+        timestamp += 60
+    ohlcv = [timestamp, float(i), float(i + 1), float(i - 1), float(i), float(random.randint(0, 9))]
+    cache.append(list(ohlcv))
+    stored.append(ohlcv)
+    if random.random() < 0.1:
+        limit = random.choice([None, 3, 10])
+        assert stored.getLimit(None, limit) == cache.getLimit(None, limit)
+    assert stored == list(cache), i
+assert exchange.filter_by_since_limit(stored, None, 5, 0, True) == exchange.filter_by_since_limit(cache, None, 5, 0, True)
+
+# the candles built from trades
+trades = [{'timestamp': 1700000000000 + 60000 * i // 3, 'price': float(i), 'amount': 1.0} for i in range(10)]
+assert exchange.build_ohlcvc(trades, '1m', None, None, True) == exchange.build_ohlcvc(trades, '1m')
+
+# a candle takes a few dozen bytes instead of a list of objects
+candles = [[str(1700000000000 + i * 60000), str(1.5 + i), str(2.5 + i), str(0.5 + i), str(2.0 + i), str(10.0 + i)] for i in range(10000)]
+tracemalloc.start()
+start = tracemalloc.get_traced_memory()[0]
+parsed = [exchange.parse_ohlcv(candle) for candle in candles]
+lists = tracemalloc.get_traced_memory()[0] - start
+start = tracemalloc.get_traced_memory()[0]
+columnar = OHLCV(exchange.parse_ohlcv(candle) for candle in candles)
+arrays = tracemalloc.get_traced_memory()[0] - start
+tracemalloc.stop()
+assert columnar == parsed
+assert arrays * 3 < lists, (arrays, lists)
+
+print('columnar ohlcv succeeded')
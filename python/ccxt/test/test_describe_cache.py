@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.describe_cache import freeze, thaw  # noqa: E402
+
+# ------------------------------------------------------------------------------
+# describe() is merged once per class, the instances copy the sections they use
+
+value = {'a': [1, {'b': 2}], 'c': {'d': [3]}, 'e': None}
+frozen = freeze(value)
+assert thaw(frozen) == value
+try:
+    frozen['c']['f'] = 1
+    assert False, 'the frozen sections are read-only'
+except TypeError:
+    pass
+
+first = ccxt.binance()
+second = ccxt.binance({'options': {'defaultType': 'future'}, 'apiKey': 'key'})
+
+# the instances do not share their sections
+first.options['fetchMarkets'].append('option')
+first.has['mutated'] = True
+third = ccxt.binance()
+assert 'option' not in third.options['fetchMarkets']
+assert 'mutated' not in third.has
+assert third.options['defaultType'] == 'spot'
+
+# the config is merged into the described sections
+assert second.options['defaultType'] == 'future'
+assert second.options['fetchMarkets'] == third.options['fetchMarkets']
+assert second.apiKey == 'key' and third.apiKey == ''
+
+# subclasses are described separately, with the class attributes left in place
+usdm = ccxt.binanceusdm()
+assert usdm.options['defaultSubType'] == 'linear' and third.options['defaultSubType'] is None
+assert ccxt.binance.has is ccxt.Exchange.has
+assert usdm.rateLimit == third.rateLimit == ccxt.binance.described['rateLimit']
+
+# an exchange instance only copies what it uses
+fresh = ccxt.binance()
+assert 'api' not in fresh.__dict__ and 'exceptions' not in fresh.__dict__
+assert fresh.exceptions['exact'] == third.exceptions['exact']
+assert 'exceptions' in fresh.__dict__
+
+print('describe cache succeeded')
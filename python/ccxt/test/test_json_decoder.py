@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.base.json_decoder import JSON_DECODERS, json_decoder, modules  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.errors import NotSupported  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+text = '{"symbol":"BTCUSDT","bids":[["0.10","1"]],"price":0.10,"qty":5,"id":9223372036854775807}'
+
+# every installed decoder returns the same document from str and bytes
+
+installed = [name for name in JSON_DECODERS if modules[name] is not None]
+for name in [None] + installed:
+    decode = json_decoder(name)
+    for data in [text, text.encode()]:
+        decoded = decode(data)
+        assert decoded['bids'] == [['0.10', '1']]
+        assert decoded['price'] == 0.1
+        assert decoded['qty'] == 5
+        assert decoded['id'] == 9223372036854775807
+
+# quoted numbers keep the exact strings whatever the decoder
+
+for data in [text, text.encode()]:
+    decoded = json_decoder('orjson', True)(data)
+    assert decoded['price'] == '0.10'
+    assert decoded['qty'] == '5'
+
+for name in ['yaml', 'missing']:
+    try:
+        json_decoder(name)
+        assert False
+    except NotSupported:
+        pass
+
+exchange = Exchange()
+assert exchange.parse_json(text)['price'] == '0.10'
+assert exchange.parse_json(text.encode())['price'] == '0.10'
+exchange.quoteJsonNumbers = False
+assert exchange.parse_json(text.encode())['price'] == 0.1
+assert exchange.parse_json('not json') is None
+assert exchange.parse_json(b'{"truncated":') is None
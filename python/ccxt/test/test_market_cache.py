@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import asyncio
+import tempfile
+import threading
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.base.market_cache import market_cache_schema, read_market_cache, write_market_cache  # noqa: E402
+
+# ------------------------------------------------------------------------------
+# the markets are kept on disk between restarts with marketsCache, see market_cache.py
+
+markets = [
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'type': 'spot', 'spot': True, 'swap': False, 'precision': {'amount': 6, 'price': 2}},
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT:USDT', 'base': 'BTC', 'quote': 'USDT', 'settle': 'USDT', 'type': 'swap', 'spot': False, 'swap': True, 'precision': {'amount': 3, 'price': 1}},
+]
+
+calls = []
+
+
+def count_calls(exchange):
+    def fetch_markets(params={}):
+        calls.append(exchange.id)
+        return markets
+    exchange.has['fetchCurrencies'] = False
+    exchange.fetch_markets = fetch_markets
+    return exchange
+
+
+async def fetch_markets_later(exchange, params={}):
+    await asyncio.sleep(0.01)
+    calls.append(exchange.id)
+    return markets
+
+
+def count_async_calls(exchange):
+    exchange.has['fetchCurrencies'] = False
+    exchange.fetch_markets = lambda params={}: fetch_markets_later(exchange, params)
+    return exchange
+
+
+def test_file(directory):
+    path = os.path.join(directory, 'file', 'binance.json.gz')
+    schema = market_cache_schema('binance', 1)
+    assert read_market_cache(path, schema) is None
+    write_market_cache(path, schema, 1000, markets)
+    cache = read_market_cache(path, schema)
+    assert cache['timestamp'] == 1000 and cache['markets'] == markets and cache['currencies'] is None
+    assert read_market_cache(path, market_cache_schema('binance', 2)) is None
+    assert os.listdir(os.path.dirname(path)) == ['binance.json.gz']
+    with open(path, 'wb') as f:
+        f.write(b'broken')
+    assert read_market_cache(path, schema) is None
+
+
+def test_sync(directory):
+    del calls[:]
+    first = count_calls(ccxt.binance({'marketsCache': directory}))
+    first.load_markets()
+    assert calls == ['binance'] and os.path.exists(first.markets_cache_path())
+    # a fresh cache is used without fetching
+    second = count_calls(ccxt.binance({'marketsCache': directory}))
+    second.load_markets()
+    assert calls == ['binance']
+    assert second.market('BTC/USDT:USDT')['precision']['amount'] == 3
+    assert second.markets_by_id['BTCUSDT'][0]['symbol'] == 'BTC/USDT:USDT'
+    # a stale cache is used at once and refreshed on a daemon thread, the next load_markets() sets the new markets
+    stale = ccxt.binance({'marketsCache': directory, 'marketsCacheTTL': -1})
+    stale.has['fetchCurrencies'] = False
+    refreshed = [dict(market, precision={'amount': 4, 'price': 1}) for market in markets]
+    started = threading.Event()
+
+    def fetch_markets_later(params={}):
+        started.wait(1)
+        calls.append(stale.id)
+        return refreshed
+
+    stale.fetch_markets = fetch_markets_later
+    assert stale.load_markets()['BTC/USDT:USDT']['precision']['amount'] == 3
+    assert len(calls) == 1 and stale.markets_refreshing.daemon
+    started.set()
+    stale.markets_refreshing.join(1)
+    assert len(calls) == 2 and stale.markets['BTC/USDT:USDT']['precision']['amount'] == 3
+    assert stale.load_markets()['BTC/USDT:USDT']['precision']['amount'] == 4 and stale.markets_refreshed is None
+    # the stale markets stay in use when the refresh fails
+    failing = ccxt.binance({'marketsCache': directory, 'marketsCacheTTL': -1})
+    failing.has['fetchCurrencies'] = False
+
+    def fetch_markets(params={}):
+        raise ccxt.NetworkError('timeout')
+
+    failing.fetch_markets = fetch_markets
+    assert failing.load_markets()['BTC/USDT:USDT']['precision']['amount'] == 4
+    failing.markets_refreshing.join(1)
+    assert failing.load_markets()['BTC/USDT:USDT']['precision']['amount'] == 4 and failing.markets_refreshed is None
+    # the sandbox and other options are cached separately
+    sandbox = count_calls(ccxt.binance({'marketsCache': directory}))
+    sandbox.set_sandbox_mode(True)
+    sandbox.load_markets()
+    other = count_calls(ccxt.binance({'marketsCache': directory, 'options': {'fetchMarkets': ['spot']}}))
+    other.load_markets()
+    assert len(calls) == 4 and other.markets_cache_path() != first.markets_cache_path()
+    # neither overwrites the cache of the other
+    count_calls(ccxt.binance({'marketsCache': directory, 'options': {'fetchMarkets': ['spot']}})).load_markets()
+    assert count_calls(ccxt.binance({'marketsCache': directory})).load_markets()['BTC/USDT:USDT']['precision']['amount'] == 4
+    assert len(calls) == 4
+    # without marketsCache nothing is read
+    count_calls(ccxt.binance()).load_markets()
+    assert len(calls) == 5
+
+
+async def test_async(directory):
+    del calls[:]
+    first = count_async_calls(ccxt.async_support.bybit({'marketsCache': directory}))
+    await first.load_markets()
+    second = count_async_calls(ccxt.async_support.bybit({'marketsCache': directory}))
+    await second.load_markets()
+    assert calls == ['bybit'] and second.markets['BTC/USDT']['spot']
+    stale = count_async_calls(ccxt.async_support.bybit({'marketsCache': directory, 'marketsCacheTTL': -1}))
+    await stale.load_markets()
+    assert calls == ['bybit'] and stale.markets_refreshing is not None
+    await stale.markets_refreshing
+    assert calls == ['bybit', 'bybit'] and stale.markets_refreshing is None
+    await asyncio.gather(*[exchange.close() for exchange in [first, second, stale]])
+
+
+with tempfile.TemporaryDirectory() as directory:
+    test_file(directory)
+    test_sync(directory)
+    asyncio.run(test_async(directory))
+print('market cache succeeded')
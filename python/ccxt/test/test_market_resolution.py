@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+# market() resolves every symbol once until the markets or the default type change
+
+markets = [
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'type': 'spot', 'spot': True, 'swap': False},
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT:USDT', 'base': 'BTC', 'quote': 'USDT', 'settle': 'USDT', 'type': 'swap', 'spot': False, 'swap': True},
+    {'id': 'ETHUSD', 'symbol': 'ETH/USD:BTC', 'base': 'ETH', 'quote': 'USD', 'settle': 'BTC', 'type': 'swap', 'spot': False, 'swap': True},
+]
+
+exchange = ccxt.bybit()
+exchange.set_markets(markets)
+resolutions = []
+resolve_market = exchange.resolve_market
+
+
+def count_resolutions(symbol):
+    resolutions.append(symbol)
+    return resolve_market(symbol)
+
+
+exchange.resolve_market = count_resolutions
+
+# the legacy symbols fall back to the settled markets
+assert exchange.market('BTC/USDT')['symbol'] == 'BTC/USDT'
+assert exchange.market('ETH/USD')['symbol'] == 'ETH/USD:BTC'
+assert exchange.market('ETH/USD')['symbol'] == 'ETH/USD:BTC'
+assert resolutions == ['BTC/USDT', 'ETH/USD']
+
+# unknown symbols are remembered too
+for i in range(2):
+    try:
+        exchange.market('DOGE/USDT')
+        assert False, 'DOGE/USDT is not listed'
+    except ccxt.BadSymbol:
+        pass
+assert resolutions.count('DOGE/USDT') == 1
+
+# the ids are resolved with the default type, spot markets are not indexed by id
+assert exchange.market('BTCUSDT')['symbol'] == 'BTC/USDT:USDT'
+exchange.options['defaultType'] = 'spot'
+assert exchange.market('BTCUSDT')['symbol'] == 'BTC/USDT:USDT'
+assert resolutions.count('BTCUSDT') == 2
+
+# new markets drop the resolutions
+exchange.set_markets(markets + [{'id': 'DOGEUSDT', 'symbol': 'DOGE/USDT', 'base': 'DOGE', 'quote': 'USDT', 'type': 'spot', 'spot': True, 'swap': False}])
+assert exchange.market('DOGE/USDT')['id'] == 'DOGEUSDT'
+assert resolutions.count('DOGE/USDT') == 2
+
+# the websocket handlers resolve the ids the way safe_market() does
+exchange.set_markets(markets + [
+    {'id': 'BTCUSD', 'symbol': 'BTC/USD:BTC', 'base': 'BTC', 'quote': 'USD', 'settle': 'BTC', 'type': 'swap', 'spot': False, 'swap': True, 'future': False, 'contract': True, 'inverse': True},
+    {'id': 'BTCUSD', 'symbol': 'BTC/USD:BTC-240628', 'base': 'BTC', 'quote': 'USD', 'settle': 'BTC', 'type': 'future', 'spot': False, 'swap': False, 'future': True, 'contract': True, 'inverse': True},
+])
+for marketId in ['BTCUSDT', 'ETHUSD', 'BTCUSD', 'XRPUSD', None]:
+    for marketType in ['spot', 'swap', 'future', 'inverse', 'contract']:
+        expected = exchange.safe_market(marketId, None, None, marketType)
+        assert exchange.safe_market_by_id(marketId, marketType) == expected, (marketId, marketType)
+assert exchange.safe_market_by_id('BTCUSD', 'future')['symbol'] == 'BTC/USD:BTC-240628'
+assert exchange.safe_market_by_id('XRPUSD')['symbol'] == 'XRPUSD'
+try:
+    exchange.safe_market_by_id('BTCUSD')
+    assert False, 'BTCUSD is ambiguous'
+except ccxt.ArgumentsRequired:
+    pass
+
+# blofin resolves dash-separated ids
+blofin = ccxt.blofin()
+blofin.set_markets([{'id': 'BTC-USDT', 'symbol': 'BTC-USDT', 'base': 'BTC', 'quote': 'USDT', 'type': 'swap', 'spot': False, 'swap': True}])
+assert blofin.market('BTC/USDT')['id'] == 'BTC-USDT'
+
+print('market resolution succeeded')
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.base.market_store import market_store  # noqa: E402
+
+# ------------------------------------------------------------------------------
+# instances of an exchange with shareMarkets load the markets once per process
+
+markets = [
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'type': 'spot', 'spot': True, 'swap': False, 'precision': {'amount': 6, 'price': 2}},
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT:USDT', 'base': 'BTC', 'quote': 'USDT', 'settle': 'USDT', 'type': 'swap', 'spot': False, 'swap': True, 'precision': {'amount': 3, 'price': 1}},
+    {'id': 'ETHUSDT', 'symbol': 'ETH/USDT:USDT', 'base': 'ETH', 'quote': 'USDT', 'settle': 'USDT', 'type': 'swap', 'spot': False, 'swap': True, 'precision': {'amount': 2, 'price': 2}},
+]
+
+calls = []
+
+
+def count_calls(exchange):
+    def fetch_markets(params={}):
+        calls.append(exchange.id)
+        return markets
+    exchange.has['fetchCurrencies'] = False
+    exchange.fetch_markets = fetch_markets
+    return exchange
+
+
+async def fetch_markets_later(exchange, params={}):
+    await asyncio.sleep(0.01)
+    calls.append(exchange.id)
+    return markets
+
+
+def count_async_calls(exchange):
+    exchange.has['fetchCurrencies'] = False
+    exchange.fetch_markets = lambda params={}: fetch_markets_later(exchange, params)
+    return exchange
+
+
+def test_set_markets():
+    exchange = ccxt.binance()
+    exchange.set_markets(markets)
+    assert exchange.symbols == ['BTC/USDT', 'BTC/USDT:USDT', 'ETH/USDT:USDT']
+    assert exchange.ids == ['BTCUSDT', 'ETHUSDT']
+    # spot markets are left out of markets_by_id
+    assert [market['type'] for market in exchange.markets_by_id['BTCUSDT']] == ['swap']
+    assert exchange.markets['BTC/USDT']['limits']['amount'] == {'min': None, 'max': None}
+    assert exchange.markets['BTC/USDT']['precision'] is not exchange.markets['BTC/USDT:USDT']['precision']
+
+
+def test_sync():
+    market_store.clear()
+    del calls[:]
+    first = count_calls(ccxt.binance({'shareMarkets': True}))
+    second = count_calls(ccxt.binance({'shareMarkets': True}))
+    sandbox = count_calls(ccxt.binance({'shareMarkets': True}))
+    sandbox.set_sandbox_mode(True)
+    alone = count_calls(ccxt.binance())
+    for exchange in [first, second, sandbox, alone]:
+        exchange.load_markets()
+    assert calls == ['binance', 'binance', 'binance'], calls
+    assert second.markets is first.markets and second.markets_by_id is first.markets_by_id
+    assert sandbox.markets is not first.markets and alone.markets is not first.markets
+    # a reload publishes a new table for the instances that load later
+    first.load_markets(True)
+    third = count_calls(ccxt.binance({'shareMarkets': True}))
+    third.load_markets()
+    assert third.markets is first.markets and second.markets is not first.markets
+    assert len(calls) == 4
+    # the instances with other options that shape the markets get their own table
+    swap = count_calls(ccxt.binance({'shareMarkets': True, 'options': {'defaultType': 'swap'}}))
+    spot = count_calls(ccxt.binance({'shareMarkets': True, 'options': {'fetchMarkets': ['spot']}}))
+    swap.load_markets()
+    spot.load_markets()
+    assert len(calls) == 6 and swap.markets is not first.markets and spot.markets is not swap.markets
+    assert len(set([first.market_store_key(), swap.market_store_key(), spot.market_store_key()])) == 3
+
+
+async def test_async():
+    market_store.clear()
+    del calls[:]
+    fleet = [count_async_calls(ccxt.async_support.binance({'shareMarkets': True})) for i in range(5)]
+    await asyncio.gather(*[exchange.load_markets() for exchange in fleet])
+    assert calls == ['binance'], calls
+    assert all(exchange.markets is fleet[0].markets for exchange in fleet)
+    assert fleet[3].market('BTC/USDT:USDT')['id'] == 'BTCUSDT'
+    await asyncio.gather(*[exchange.close() for exchange in fleet])
+
+
+test_set_markets()
+test_sync()
+asyncio.run(test_async())
+print('market store succeeded')
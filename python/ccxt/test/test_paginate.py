@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.base.errors import BadRequest, NetworkError  # noqa: E402
+
+# ------------------------------------------------------------------------------
+# history methods with paginate fetch every page of the range, see Exchange.fetch_paginated_call_*()
+
+now = 1699999980000
+markets = [
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'type': 'spot', 'spot': True, 'margin': False, 'swap': False, 'future': False, 'option': False, 'contract': False, 'linear': None, 'inverse': None},
+]
+requests = []
+
+
+def klines(request):
+    requests.append(request)
+    start = -(-request['startTime'] // 60000) * 60000
+    stop = min(start + request['limit'] * 60000, now)
+    return [[timestamp, '1.0', '2.0', '0.5', '1.5', '10.0'] for timestamp in range(start, stop, 60000)]
+
+
+def my_trades(request):
+    # ids from 1, a trade a second from now - 5000 seconds
+    requests.append(request)
+    first = request['fromId'] if ('fromId' in request) else (request['startTime'] - (now - 5000000)) // 1000 + 1
+    ids = range(max(first, 1), min(first + request['limit'], 5001))
+    return [{'symbol': 'BTCUSDT', 'id': id, 'orderId': id, 'price': '1.0', 'qty': '1.0', 'time': now - 5000000 + (id - 1) * 1000, 'isBuyer': True, 'isMaker': False} for id in ids]
+
+
+def create(exchange_class, options={}):
+    exchange = exchange_class({'options': options})
+    exchange.set_markets(markets)
+    exchange.milliseconds = lambda: now
+    del requests[:]
+    return exchange
+
+
+def test_merge():
+    exchange = ccxt.binance()
+    pages = [[{'id': '2', 'timestamp': 2, 'status': 'open'}, {'id': '3', 'timestamp': 3}], [{'id': '1', 'timestamp': 1}, {'id': '2', 'timestamp': 2, 'status': 'closed'}]]
+    merged = exchange.merge_paginated_results('fetchOrders', pages)
+    assert [order['id'] for order in merged] == ['1', '2', '3'] and merged[1]['status'] == 'closed'
+    assert [order['id'] for order in exchange.merge_paginated_results('fetchOrders', pages, None, 2)] == ['2', '3']
+    ohlcvs = exchange.merge_paginated_results('fetchOHLCV', [[[2, 1], [3, 1]], [[1, 1], [2, 1]]], 2)
+    assert ohlcvs == [[2, 1], [3, 1]]
+
+
+def test_deterministic():
+    exchange = create(ccxt.binance, {'fetchOHLCV': {'paginationCalls': 3}})
+    exchange.publicGetKlines = klines
+    since = now - 2500 * 60000
+    ohlcvs = exchange.fetch_ohlcv('BTC/USDT', '1m', since, None, {'paginate': True})
+    assert len(ohlcvs) == 2500 and ohlcvs[0][0] == since and ohlcvs[-1][0] == now - 60000
+    assert [request['startTime'] for request in requests] == [since, since + 60000000, since + 120000000]
+    assert all('paginate' not in request and 'paginationCalls' not in request for request in requests)
+    # without since the latest candles
+    del requests[:]
+    ohlcvs = exchange.fetch_ohlcv('BTC/USDT', '1m', None, 1500, {'paginate': True})
+    assert len(requests) == 2 and len(ohlcvs) == 1500 and ohlcvs[-1][0] == now - 60000
+    try:
+        exchange.fetch_ohlcv('BTC/USDT', '1m', now - 3001 * 60000, None, {'paginate': True})
+        assert False
+    except BadRequest:
+        pass
+    # with since and limit only the windows of the first limit candles are fetched
+    del requests[:]
+    ohlcvs = exchange.fetch_ohlcv('BTC/USDT', '1m', now - 30 * 1440 * 60000, 100, {'paginate': True})
+    assert len(requests) == 1 and len(ohlcvs) == 100 and ohlcvs[0][0] == now - 30 * 1440 * 60000
+    del requests[:]
+    ohlcvs = exchange.fetch_ohlcv('BTC/USDT', '1m', since, 1500, {'paginate': True})
+    assert len(requests) == 2 and len(ohlcvs) == 1500 and ohlcvs[-1][0] == since + 1499 * 60000
+    try:
+        exchange.fetch_ohlcv('BTC/USDT', '1m', now - 30 * 1440 * 60000, 5000, {'paginate': True})
+        assert False
+    except BadRequest:
+        pass
+    # a network error is retried
+    failures = []
+
+    def flaky(request):
+        if len(failures) < 2:
+            failures.append(request)
+            raise NetworkError('timeout')
+        return klines(request)
+
+    exchange.publicGetKlines = flaky
+    assert len(exchange.fetch_ohlcv('BTC/USDT', '1m', now - 10 * 60000, None, {'paginate': True})) == 10
+
+
+def test_cursor():
+    exchange = create(ccxt.binance)
+    exchange.privateGetMyTrades = my_trades
+    since = now - 5000000 + 100000
+    trades = exchange.fetch_my_trades('BTC/USDT', since, None, {'paginate': True})
+    assert [trade['id'] for trade in trades] == [str(id) for id in range(101, 5001)]
+    assert [trade['timestamp'] for trade in trades] == sorted(trade['timestamp'] for trade in trades)
+    # the first page from since, the next ones after the last id
+    assert requests[0]['startTime'] == since and 'fromId' not in requests[0]
+    assert [request['fromId'] for request in requests[1:]] == [1101, 2101, 3101, 4101]
+    assert all('startTime' not in request for request in requests[1:])
+    del requests[:]
+    assert len(exchange.fetch_my_trades('BTC/USDT', since, 10, {'paginate': True, 'paginationCalls': 2})) == 10
+    assert len(requests) == 2
+
+
+def test_backward_cursor():
+    # okx lists the fills newest first, after= the billId of the oldest one
+    exchange = ccxt.okx()
+    exchange.set_markets([dict(markets[0], id='BTC-USDT')])
+
+    def fills(request):
+        requests.append(request)
+        after = int(request.get('after', 251))
+        return {'code': '0', 'data': [{'instId': 'BTC-USDT', 'billId': str(id), 'tradeId': str(id), 'ordId': '1', 'fillPx': '1', 'fillSz': '1', 'side': 'buy', 'ts': str(id * 1000)} for id in range(after - 1, max(after - 1 - request['limit'], 0), -1)]}
+
+    del requests[:]
+    exchange.privateGetTradeFillsHistory = fills
+    trades = exchange.fetch_my_trades('BTC/USDT', 20000, None, {'paginate': True})
+    assert [trade['id'] for trade in trades] == [str(id) for id in range(20, 251)]
+    assert [request.get('after') for request in requests] == [None, '151', '51']
+
+
+async def test_async():
+    exchange = create(ccxt.async_support.binance, {'paginationCalls': 10})
+    running = []
+    concurrency = []
+
+    async def fetch_klines(request):
+        running.append(request)
+        concurrency.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(request)
+        return klines(request)
+
+    exchange.publicGetKlines = fetch_klines
+    since = now - 5000 * 60000
+    ohlcvs = await exchange.fetch_ohlcv('BTC/USDT', '1m', since, None, {'paginate': True})
+    assert len(ohlcvs) == 5000 and ohlcvs == sorted(ohlcvs)
+    # the windows are fetched at once
+    assert len(requests) == 5 and max(concurrency) == 5
+    await exchange.close()
+
+
+test_merge()
+test_deterministic()
+test_cursor()
+test_backward_cursor()
+asyncio.run(test_async())
+print('paginate succeeded')
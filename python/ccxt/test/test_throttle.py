@@ -7,12 +7,35 @@ sys.path.append(root)
 # ----------------------------------------------------------------------------
 
 import asyncio  # noqa: E402
-import time  # noqa: E402
+from multidict import CIMultiDict  # noqa: E402
 from ccxt.async_support.base.throttler import Throttler as Throttle  # noqa: E402
+from ccxt.async_support.binance import binance  # noqa: E402
+from ccxt.async_support.bybit import bybit  # noqa: E402
 # from ccxt.async_support.base.throttle import throttle as Throttle
 
+# ----------------------------------------------------------------------------
+# by default the cases run on a virtual clock that jumps to the next timer
+# instead of sleeping, pass --realtime to run them against the wall clock
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self):
+        super(VirtualClockEventLoop, self).__init__()
+        self.virtual_time = 0.0
+
+    def time(self):
+        return self.virtual_time
+
+    def _run_once(self):
+        if not self._ready:
+            timers = [handle.when() for handle in self._scheduled if not handle.cancelled()]
+            if timers:
+                self.virtual_time = max(self.virtual_time, min(timers))
+        super(VirtualClockEventLoop, self)._run_once()
 
-delta = 10
+
+realtime = '--realtime' in sys.argv
+delta = 10 if realtime else 0.001
 
 test_cases = [
     {
@@ -95,32 +118,132 @@ async def schedule(case):
         'tokens': case['tokens'],
         'refillRate': case['refillRate'],
     })
-    start = time.perf_counter_ns()
+    loop = asyncio.get_event_loop()
+    start = loop.time()
     for i in range(case['runs']):
         await throttle(case['cost'])
-    end = time.perf_counter_ns()
-    elapsed_ms = (end - start) / 1000000
+    end = loop.time()
+    elapsed_ms = (end - start) * 1000
     result = abs(case['expected'] - elapsed_ms) < delta
     print(f'case {case["number"]} {"succeeded" if result else "failed"} in {elapsed_ms}ms expected {case["expected"]}ms')
     assert result
 
 
-async def main():
-    await asyncio.wait([schedule(case) for case in test_cases], return_when=asyncio.ALL_COMPLETED)
+async def variable_costs():
+    # requests are granted in order, a cheap request does not overtake an expensive one
+    throttle = Throttle({
+        'tokens': 0,
+        'refillRate': 1 / 10,
+    })
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    granted = []
+
+    async def request(name, cost):
+        await throttle(cost)
+        granted.append((name, round((loop.time() - start) * 1000)))
+
+    await asyncio.gather(request('a', 3), request('b', 1), request('c', 2), request('d', 1))
+    expected = [('a', 0), ('b', 30), ('c', 40), ('d', 60)]
+    print('variable costs', 'succeeded' if granted == expected else 'failed', granted)
+    assert granted == expected
+
+
+async def named_buckets():
+    # a request waits for the rateLimit bucket and for every named bucket of its endpoint
+    exchange = binance({
+        'rateLimitBuckets': {
+            'orders10s': {'capacity': 2, 'interval': 1000},
+        },
+    })
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    granted = []
+
+    async def request():
+        await exchange.throttle_request(1, {'orders10s': 1})
+        granted.append(round((loop.time() - start) * 1000))
+
+    await asyncio.gather(*[request() for i in range(4)])
+    stats = exchange.rate_limiter_stats()
+    expected = [0, 50, 500, 1000]
+    result = granted == expected and stats['orders10s']['requests'] == 4 and stats['rateLimit']['requests'] == 4
+    print('named buckets', 'succeeded' if result else 'failed', granted, stats['orders10s'])
+    assert result
 
 
-asyncio.run(main())
+async def calibrated_buckets():
+    # the usage reported in the response headers lowers the tokens of the buckets of the api in the url
+    exchange = binance()
+    exchange.milliseconds = lambda: 1672515770000  # 10 seconds before the minute, at the start of a 10 seconds window
+    headers = CIMultiDict({
+        'x-mbx-used-weight-1m': '1200',  # nothing left until the minute resets in 10 seconds
+        'X-MBX-ORDER-COUNT-10S': '49',
+    })
+    exchange.calibrate_rate_limiter(headers, 'https://api.binance.com/api/v3/order', 'POST')
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    granted = []
+
+    async def request():
+        await exchange.throttle_request(1, {'orders10s': 1, 'weight': 1})
+        granted.append(round((loop.time() - start) * 1000))
+
+    await asyncio.gather(*[request() for i in range(2)])
+    stats = exchange.rate_limiter_stats()
+    expected = [10050, 10100]
+    result = granted == expected and stats['weight']['calibrated'] == 1 and stats['orders10s']['calibrated'] == 1 and stats['rateLimit']['calibrated'] == 0
+    # the weight of a futures response does not touch the spot bucket
+    exchange.calibrate_rate_limiter(CIMultiDict({'X-MBX-USED-WEIGHT-1M': '2000'}), 'https://fapi.binance.com/fapi/v1/order', 'POST')
+    stats = exchange.rate_limiter_stats()
+    result = result and stats['fapiWeight']['calibrated'] == 1 and stats['weight']['calibrated'] == 1 and stats['dapiWeight']['calibrated'] == 0
+    # and the endpoint weight is drawn from the bucket of its api
+    order = {'cost': 4, 'buckets': {'fapiOrders10s': 1, 'fapiOrders1m': 1}}
+    result = result and exchange.calculate_rate_limiter_buckets('fapiPrivate', 'POST', 'order', {}, order) == {'fapiOrders10s': 1, 'fapiOrders1m': 1, 'fapiWeight': 4}
+    depth = {'cost': 1, 'byLimit': [[100, 1], [500, 5], [1000, 10], [5000, 50]]}
+    result = result and exchange.calculate_rate_limiter_buckets('public', 'GET', 'depth', {'limit': 500}, depth) == {'weight': 5}
+    result = result and exchange.calculate_rate_limiter_buckets('sapi', 'GET', 'margin/asset', {}, {'cost': 1}) == {}
+    # the order endpoints of bybit are limited one by one
+    exchange = bybit()
+    exchange.calibrate_rate_limiter(CIMultiDict({'X-Bapi-Limit-Status': '0'}), 'https://api.bybit.com/v5/order/create', 'POST')
+    stats = exchange.rate_limiter_stats()
+    result = result and stats['v5OrderCreate']['calibrated'] == 1 and stats['v5OrderAmend']['calibrated'] == 0 and stats['v5OrderCancel']['calibrated'] == 0
+    print('calibrated buckets', 'succeeded' if result else 'failed', granted)
+    assert result
+
+
+async def main():
+    tasks = [asyncio.ensure_future(schedule(case)) for case in test_cases]
+    if not realtime:
+        tasks.append(asyncio.ensure_future(variable_costs()))
+        tasks.append(asyncio.ensure_future(named_buckets()))
+        tasks.append(asyncio.ensure_future(calibrated_buckets()))
+    await asyncio.gather(*tasks)
+
+
+if realtime:
+    asyncio.run(main())
+else:
+    loop = VirtualClockEventLoop()
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
 
 # output
 
 '''
-case 8 succeeded in 501.224333ms expected 500.0ms
-case 7 succeeded in 900.647542ms expected 900.0ms
-case 4 succeeded in 2000.706958ms expected 2000.0ms
-case 5 succeeded in 3001.669125ms expected 3000.0ms
-case 3 succeeded in 3001.736666ms expected 3000.0ms
-case 6 succeeded in 4001.392584ms expected 4000.0ms
-case 2 succeeded in 4001.503833ms expected 4000.0ms
-case 9 succeeded in 5001.487ms expected 5000.0ms
-case 1 succeeded in 5001.635042ms expected 5000.0ms
+variable costs succeeded [('a', 0), ('b', 30), ('c', 40), ('d', 60)]
+case 8 succeeded in 399.99999999999994ms expected 400.0ms
+case 7 succeeded in 799.9999999999999ms expected 800.0ms
+named buckets succeeded [0, 50, 500, 1000] {'tokens': 0.0, 'capacity': 2, 'queued': 0, 'requests': 4, 'cost': 4, 'waited': 1500.0, 'calibrated': 0}
+case 4 succeeded in 1980.0ms expected 1980.0ms
+case 5 succeeded in 2899.9999999999995ms expected 2900.0ms
+case 3 succeeded in 2949.9999999999995ms expected 2950.0ms
+case 6 succeeded in 3920.0ms expected 3920.0ms
+case 2 succeeded in 3949.9999999999995ms expected 3950.0ms
+case 9 succeeded in 4500.0ms expected 4500.0ms
+case 1 succeeded in 4950.0ms expected 4950.0ms
+case 10 succeeded in 4990.0ms expected 4990.0ms
+calibrated buckets succeeded [10050, 10100]
 '''
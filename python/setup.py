@@ -94,6 +94,9 @@ setup(
         'qa': [
             'flake8==3.7.9',
         ],
+        'columnar': [
+            'numpy',
+        ],
     },
     project_urls=project_urls,
 )
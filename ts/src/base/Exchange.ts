@@ -132,6 +132,8 @@ import {inflate, inflate64, gunzip} from './ws/functions.js'
     , NetworkError
     , ExchangeNotAvailable
     , ArgumentsRequired
+    , InvalidNonce
+    , BadRequest
     , RateLimitExceeded } from "./errors.js"
 
 
@@ -141,6 +143,8 @@ import { Precise } from './Precise.js'
 import WsClient from './ws/WsClient.js';
 import Future from './ws/Future.js';
 import { OrderBook as WsOrderBook, IndexedOrderBook, CountedOrderBook } from './ws/OrderBook.js';
+import { MessageRouter } from './ws/Router.js';
+import { ArrayCacheByTimestamp, ArrayCacheBySymbolById } from './ws/Cache.js';
 
 // ----------------------------------------------------------------------------
 //
@@ -234,6 +238,9 @@ export default class Exchange {
     requiredCredentials = undefined
     rateLimit = undefined
     tokenBucket = undefined
+    // the named token buckets of the limits on top of rateLimit, { name: { 'capacity', 'interval' }}
+    rateLimitBuckets = {}
+    throttles = {}
     throttle = undefined
     enableRateLimit = undefined
     enableWsRateLimit = undefined
@@ -243,6 +250,9 @@ export default class Exchange {
     limits = undefined
     fees = undefined
     markets_by_id = undefined
+    markets_by_id_and_type = undefined // see safeMarketById ()
+    resolvedMarkets = undefined // memoized by market (), see resolveMarket ()
+    resolvedMarketsLimit = 100000 // the resolutions kept before they are dropped
     symbols = undefined
     ids = undefined
     currencies = undefined
@@ -283,6 +293,7 @@ export default class Exchange {
     // WS/PRO options
     clients = {}
     newUpdates = true
+    messageRouters = undefined
     streaming = {}
 
     deepExtend = deepExtend
@@ -781,7 +792,41 @@ export default class Exchange {
             refillRate: (this.rateLimit > 0) ? 1 / this.rateLimit : Number.MAX_VALUE,
         }, this.tokenBucket);
         this.throttle = throttle (this.tokenBucket);
+        this.throttles = {};
+        const names = Object.keys (this.rateLimitBuckets);
+        for (let i = 0; i < names.length; i++) {
+            this.throttles[names[i]] = throttle (this.rateLimitBucket (this.rateLimitBuckets[names[i]]));
+        }
+    }
+
+    rateLimitBucket (bucket) {
+        // a named bucket starts full and cannot be overdrawn, unlike the rateLimit one
+        const capacity = bucket['capacity'];
+        const config = {
+            'capacity': capacity,
+            'tokens': capacity,
+            'borrow': false,
+            'delay': 0.001,
+            'maxCapacity': 1000,
+        };
+        if ('interval' in bucket) {
+            config['refillRate'] = capacity / bucket['interval'];
+        }
+        return this.extend (config, this.omit (bucket, 'interval'));
+    }
 
+    async throttleRequest (cost, buckets = {}) {
+        // waits for the rateLimit bucket and every named bucket of the endpoint at once
+        const names = Object.keys (buckets);
+        const promises = [ this.throttle (cost) ];
+        for (let i = 0; i < names.length; i++) {
+            const name = names[i];
+            if (!(name in this.throttles)) {
+                throw new NotSupported (this.id + ' rate limit bucket ' + name + ' is not defined in rateLimitBuckets');
+            }
+            promises.push (this.throttles[name] (buckets[name]));
+        }
+        await Promise.all (promises);
     }
 
     setSandboxMode (enabled) {
@@ -1193,8 +1238,55 @@ export default class Exchange {
         return new CountedOrderBook (snapshot, depth);
     }
 
+    ohlcvCache (limit = undefined) {
+        // the candles of a market and timeframe
+        // python keeps them in typed arrays with options['watchOHLCV']['columnar'], see python/ccxt/base/columnar.py
+        return new ArrayCacheByTimestamp (limit);
+    }
+
+    ordersCache (limit = undefined) {
+        // the orders of all symbols
+        // python keeps up to limit orders of each symbol and never evicts the open ones, see python/ccxt/async_support/base/ws/cache.py
+        return new ArrayCacheBySymbolById (limit);
+    }
+
+    myTradesCache (limit = undefined) {
+        // the trades of the user in all symbols
+        // python keeps up to limit trades of each symbol, see python/ccxt/async_support/base/ws/cache.py
+        return new ArrayCacheBySymbolById (limit);
+    }
+
     handleMessage (client, message) {} // stub to override
 
+    messageRoutes () {
+        // { name: { 'exact': {...}, 'prefix': {...}, 'contains': {...}, 'extractor': method } }
+        // exchanges declare the routes of handleMessage here, they are compiled on first use
+        return {};
+    }
+
+    routeMessage (client, message, key = undefined, name = 'channel') {
+        // returns a [ routed, result ] pair, see MessageRouter.dispatch ()
+        if (this.messageRouters === undefined) {
+            this.messageRouters = {};
+        }
+        let router = this.messageRouters[name];
+        if (router === undefined) {
+            const routes = this.safeValue (this.messageRoutes (), name, {});
+            router = this.messageRouters[name] = new MessageRouter (routes);
+        }
+        return router.dispatch (this, client, message, key);
+    }
+
+    messageRouterStats () {
+        // hits per route of every router used so far
+        const result = {};
+        const names = Object.keys (this.messageRouters || {});
+        for (let i = 0; i < names.length; i++) {
+            result[names[i]] = this.extend ({}, this.messageRouters[names[i]].hits);
+        }
+        return result;
+    }
+
     // ping (client) {} // stub to override
 
     client (url): WsClient {
@@ -1385,6 +1477,174 @@ export default class Exchange {
         return -1;
     }
 
+    verifyOrderBookChecksum (client, orderbook, checksum, messageHash, depth = 25) {
+        // compares every options['checksumInterval']-th message with the checksum sent by the exchange
+        if (checksum === undefined) {
+            return true;
+        }
+        const interval = this.safeInteger (this.options, 'checksumInterval', 1);
+        if (!orderbook.checksumDue (interval) || (orderbook.checksum (depth) === checksum)) {
+            return true;
+        }
+        this.resnapshotOrderBook (client, orderbook['symbol'], messageHash);
+        return false;
+    }
+
+    resnapshotOrderBook (client, symbol, messageHash) {
+        // the local book is out of sync, it is dropped and rebuilt from the next snapshot
+        if (symbol in this.orderbooks) {
+            delete this.orderbooks[symbol];
+        }
+        client.reject (new InvalidNonce (this.id + ' invalid checksum'), messageHash);
+        this.spawn (this.resubscribeOrderBook, client, symbol, messageHash);
+    }
+
+    async resubscribeOrderBook (client, symbol, messageHash) {
+        // the next watchOrderBook () call subscribes again
+        // exchanges that can resend a snapshot on the open connection override this
+        if (messageHash in client.subscriptions) {
+            delete client.subscriptions[messageHash];
+        }
+    }
+
+    watchMultiple (url, messageHashes, messages, subscribeHashes = undefined, subscriptions = undefined, keys = undefined) {
+        // watch () for several subscriptions at once, like the topics of the watch*ForSymbols () methods
+        // the future resolves with whichever message hash is resolved first, with keys as its [key, result] pair
+        // python sends the subscribe messages of one connection packed, see python/ccxt/async_support/base/exchange.py
+        subscribeHashes = (subscribeHashes === undefined) ? messageHashes : subscribeHashes;
+        const futures = [];
+        for (let i = 0; i < messageHashes.length; i++) {
+            const subscription = (subscriptions === undefined) ? undefined : subscriptions[i];
+            const future = this.watch (url, messageHashes[i], messages[i], subscribeHashes[i], subscription);
+            if (keys === undefined) {
+                futures.push (future);
+            } else {
+                const key = keys[i];
+                futures.push (future.then ((result) => [ key, result ]));
+            }
+        }
+        return Promise.race (futures);
+    }
+
+    marketSymbolsForWatch (symbols, method) {
+        // the unified symbols of a watch*ForSymbols () call, the markets of one call share a url
+        if ((symbols === undefined) || (symbols.length === 0)) {
+            throw new ArgumentsRequired (this.id + ' ' + method + '() requires a non-empty array of symbols');
+        }
+        symbols = this.marketSymbols (symbols);
+        const first = this.market (symbols[0]);
+        for (let i = 1; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            if ((market['type'] !== first['type']) || (market['linear'] !== first['linear'])) {
+                throw new BadRequest (this.id + ' ' + method + '() requires symbols of one market type');
+            }
+        }
+        return symbols;
+    }
+
+    createOhlcvObject (symbol, timeframe, data) {
+        // the result of watchOHLCVForSymbols (), the candles of the market that updated
+        const result = {};
+        result[symbol] = {};
+        result[symbol][timeframe] = data;
+        return result;
+    }
+
+    symbolsOfPairs (symbolsAndTimeframes) {
+        // the symbols of the [symbol, timeframe] pairs of watchOHLCVForSymbols ()
+        const symbols = [];
+        for (let i = 0; i < symbolsAndTimeframes.length; i++) {
+            symbols.push (symbolsAndTimeframes[i][0]);
+        }
+        return symbols;
+    }
+
+    // python reconnects a dropped connection with options['ws']['reconnect'] and replays its subscriptions
+    // these are the hooks of the exchanges, see python/ccxt/async_support/base/exchange.py
+
+    async resubscribe (client) {
+        const hashes = Object.keys (client.subscriptions);
+        await this.sendSubscribeMessages (client, this.packSubscribeMessages (client, this.subscribedMessages (client)), []);
+        for (let i = 0; i < hashes.length; i++) {
+            this.resyncSubscription (client, hashes[i], client.subscriptions[hashes[i]]);
+        }
+    }
+
+    subscribedMessages (client) {
+        // the subscribe messages of the subscriptions of a connection, in the order they were made
+        return [];
+    }
+
+    packSubscribeMessages (client, messages) {
+        return messages;
+    }
+
+    async sendSubscribeMessages (client, messages, futures) {
+        for (let i = 0; i < messages.length; i++) {
+            await client.send (messages[i]);
+        }
+    }
+
+    resyncSubscription (client, subscribeHash, subscription) {
+        // called for every subscription after a reconnect, the exchanges that build the order books from a rest snapshot fetch it again here
+    }
+
+    removeRepeatedElementsFromArray (input) {
+        // the entries with the same id, or timestamp when they have none, are kept once in their first position
+        // with the values of the last of them, the same order can come in a later page with a newer status
+        const result = new Map ();
+        for (let i = 0; i < input.length; i++) {
+            const entry = input[i];
+            let key = undefined;
+            if (Array.isArray (entry)) {
+                key = entry[0];
+            } else {
+                const id = this.safeString (entry, 'id');
+                const timestamp = this.safeInteger (entry, 'timestamp');
+                if (id !== undefined) {
+                    key = 'id:' + id;
+                } else if (timestamp !== undefined) {
+                    key = 'timestamp:' + timestamp.toString () + ':' + this.safeString (entry, 'symbol');
+                } else {
+                    key = 'index:' + i.toString ();
+                }
+            }
+            result.set (key, entry);
+        }
+        return Array.from (result.values ());
+    }
+
+    mergePaginatedResults (method, pages, since = undefined, limit = undefined) {
+        // the pages of a paginated call deduplicated and in the order of their timestamps
+        // without since the latest limit entries are kept
+        const key = (method === 'fetchOHLCV') ? 0 : 'timestamp';
+        let result = [];
+        for (let i = 0; i < pages.length; i++) {
+            result = this.arrayConcat (result, pages[i]);
+        }
+        result = this.removeRepeatedElementsFromArray (result);
+        result = this.sortBy (result, key);
+        return this.filterBySinceLimit (result, since, limit, key, since === undefined);
+    }
+
+    // the bulk parsers read a whole response one column at a time in python, see python/ccxt/base/columnar.py
+    // here they are the row by row parsers, the columns are python-only
+
+    // eslint-disable-next-line no-unused-vars
+    bulkParseOHLCVs (ohlcvs, market = undefined, timeframe = '1m', since = undefined, limit = undefined, keys = [ 0, 1, 2, 3, 4, 5 ], columnar = false) {
+        return this.parseOHLCVs (ohlcvs, market, timeframe, since, limit);
+    }
+
+    // eslint-disable-next-line no-unused-vars
+    bulkParseOrderBook (orderbook, symbol, timestamp = undefined, bidsKey = 'bids', asksKey = 'asks', priceKey = 0, amountKey = 1, columnar = false) {
+        return this.parseOrderBook (orderbook, symbol, timestamp, bidsKey, asksKey, priceKey, amountKey);
+    }
+
+    // eslint-disable-next-line no-unused-vars
+    bulkParseTrades (trades, market = undefined, since = undefined, limit = undefined, params = {}, keys = {}, sides = undefined, columnar = false) {
+        return this.parseTrades (trades, market, since, limit, params);
+    }
+
     /* eslint-enable */
     // ------------------------------------------------------------------------
 
@@ -1602,29 +1862,76 @@ export default class Exchange {
     }
 
     setMarkets (markets, currencies = undefined) {
-        const values = [];
-        this.markets_by_id = {};
+        // the symbol and id indexes are built in one pass over the markets
+        // the symbols resolved by market () are dropped with the markets they point to
+        this.resolvedMarkets = undefined;
         // handle marketId conflicts
         // we insert spot markets first
         const marketValues = this.sortBy (this.toArray (markets), 'spot', true);
+        // the defaults are merged once, each market is merged into them
+        const defaults = this.deepExtend (this.safeMarket (), {
+            'precision': this.precision,
+            'limits': this.limits,
+        }, this.fees['trading']);
+        const values = [];
+        const marketsBySymbol = {};
+        const idsInOrder = {};
+        // TEALSTREET markets_by_id does not list the spot markets
+        const marketsByIdNoSpot = {};
         for (let i = 0; i < marketValues.length; i++) {
             const value = marketValues[i];
-            if (value['id'] in this.markets_by_id) {
-                this.markets_by_id[value['id']].push (value);
-            } else {
-                this.markets_by_id[value['id']] = [ value ];
+            const id = value['id'];
+            idsInOrder[id] = true;
+            if (value['type'] !== 'spot') {
+                if (id in marketsByIdNoSpot) {
+                    marketsByIdNoSpot[id].push (value);
+                } else {
+                    marketsByIdNoSpot[id] = [ value ];
+                }
             }
-            const market = this.deepExtend (this.safeMarket (), {
-                'precision': this.precision,
-                'limits': this.limits,
-            }, this.fees['trading'], value);
+            const market = this.deepExtend (defaults, value);
             values.push (market);
+            const symbol = this.safeString (market, 'symbol');
+            if (symbol !== undefined) {
+                marketsBySymbol[symbol] = market;
+            }
+        }
+        this.markets = marketsBySymbol as any;
+        // in the order the ids were first seen, spot markets included
+        const ids = Object.keys (idsInOrder);
+        this.markets_by_id = {};
+        for (let i = 0; i < ids.length; i++) {
+            const id = ids[i];
+            if (id in marketsByIdNoSpot) {
+                this.markets_by_id[id] = marketsByIdNoSpot[id];
+            }
         }
-        this.markets = this.indexBy (values, 'symbol') as any;
-        const marketsSortedBySymbol = this.keysort (this.markets);
-        const marketsSortedById = this.keysort (this.markets_by_id);
-        this.symbols = Object.keys (marketsSortedBySymbol);
-        this.ids = Object.keys (marketsSortedById);
+        // resolved the way safeMarket () does, an id with one market is indexed by itself as the default
+        // and an id shared by several markets by each market type
+        this.markets_by_id_and_type = {};
+        const marketTypes = [ 'spot', 'margin', 'swap', 'future', 'option', 'contract', 'linear', 'inverse' ];
+        const marketIds = Object.keys (this.markets_by_id);
+        for (let i = 0; i < marketIds.length; i++) {
+            const marketId = marketIds[i];
+            const marketsWithId = this.markets_by_id[marketId];
+            const marketsByType = {};
+            if (marketsWithId.length === 1) {
+                marketsByType['default'] = marketsWithId[0];
+            } else {
+                for (let j = 0; j < marketTypes.length; j++) {
+                    const marketType = marketTypes[j];
+                    for (let k = 0; k < marketsWithId.length; k++) {
+                        if (this.safeValue (marketsWithId[k], marketType)) {
+                            marketsByType[marketType] = marketsWithId[k];
+                            break;
+                        }
+                    }
+                }
+            }
+            this.markets_by_id_and_type[marketId] = marketsByType;
+        }
+        this.symbols = Object.keys (this.keysort (marketsBySymbol));
+        this.ids = Object.keys (this.keysort (idsInOrder));
         if (currencies !== undefined) {
             this.currencies = this.deepExtend (this.currencies, currencies);
         } else {
@@ -1683,22 +1990,6 @@ export default class Exchange {
         this.currencies_by_id = this.indexBy (this.currencies, 'id');
         const currenciesSortedByCode = this.keysort (this.currencies);
         this.codes = Object.keys (currenciesSortedByCode);
-        // TEALSTREET
-        const markets_by_id_no_spot = {};
-        const market_symbols = Object.keys (this.markets_by_id);
-        for (let i = 0; i < market_symbols.length; i++) {
-            for (let j = 0; j < this.markets_by_id[market_symbols[i]].length; j++) {
-                if (this.markets_by_id[market_symbols[i]][j]['type'] !== 'spot') {
-                    if (market_symbols[i] in markets_by_id_no_spot) {
-                        markets_by_id_no_spot[market_symbols[i]].push (this.markets_by_id[market_symbols[i]][j]);
-                    } else {
-                        markets_by_id_no_spot[market_symbols[i]] = [ this.markets_by_id[market_symbols[i]][j] ];
-                    }
-                }
-            }
-        }
-        this.markets_by_id = markets_by_id_no_spot;
-        // TEALSTREET
         return this.markets;
     }
 
@@ -2794,7 +3085,8 @@ export default class Exchange {
     async fetch2 (path, api: any = 'public', method = 'GET', params = {}, headers: any = undefined, body: any = undefined, config = {}, context = {}) {
         if (this.enableRateLimit) {
             const cost = this.calculateRateLimiterCost (api, method, path, params, config, context);
-            await this.throttle (cost);
+            const buckets = this.calculateRateLimiterBuckets (api, method, path, params, config, context);
+            await this.throttleRequest (cost, buckets);
         }
         this.lastRestRequestTimestamp = this.milliseconds ();
         const request = this.sign (path, api, method, params, headers, body);
@@ -2976,6 +3268,22 @@ export default class Exchange {
         return result;
     }
 
+    safeMarketById (marketId, marketType = undefined) {
+        // the per-message market lookup of the websocket handlers
+        // only an unknown id or type falls back to safeMarket ()
+        const marketsByType = this.safeValue (this.markets_by_id_and_type, marketId);
+        if (marketsByType !== undefined) {
+            let market = this.safeValue (marketsByType, 'default');
+            if (market === undefined) {
+                market = this.safeValue (marketsByType, marketType);
+            }
+            if (market !== undefined) {
+                return market;
+            }
+        }
+        return this.safeMarket (marketId, undefined, undefined, marketType);
+    }
+
     checkRequiredCredentials (error = true) {
         const keys = Object.keys (this.requiredCredentials);
         for (let i = 0; i < keys.length; i++) {
@@ -3127,6 +3435,118 @@ export default class Exchange {
         return result;
     }
 
+    handleMaxEntriesPerRequestAndParams (method, maxEntriesPerRequest = undefined, params = {}) {
+        let newMaxEntriesPerRequest = undefined;
+        [ newMaxEntriesPerRequest, params ] = this.handleOptionAndParams (params, method, 'maxEntriesPerRequest');
+        if (newMaxEntriesPerRequest !== undefined) {
+            maxEntriesPerRequest = newMaxEntriesPerRequest;
+        }
+        if (maxEntriesPerRequest === undefined) {
+            maxEntriesPerRequest = 1000; // default to 1000
+        }
+        return [ maxEntriesPerRequest, params ];
+    }
+
+    async safeDeterministicCall (method, symbol = undefined, since = undefined, limit = undefined, timeframe = undefined, params = {}) {
+        // one page of a paginated call, retried on network errors, a rate limit error is raised right away
+        let maxRetries = undefined;
+        [ maxRetries, params ] = this.handleOptionAndParams (params, method, 'maxRetries', 3);
+        let errors = 0;
+        while (true) {
+            try {
+                if ((timeframe !== undefined) && (method !== 'fetchFundingRateHistory')) {
+                    return await this[method] (symbol, timeframe, since, limit, params);
+                } else {
+                    return await this[method] (symbol, since, limit, params);
+                }
+            } catch (e) {
+                if ((e instanceof RateLimitExceeded) || !(e instanceof NetworkError)) {
+                    throw e;
+                }
+                errors += 1;
+                if (errors > maxRetries) {
+                    throw e;
+                }
+            }
+        }
+    }
+
+    async fetchPaginatedCallDeterministic (method, symbol = undefined, since = undefined, limit = undefined, timeframe = undefined, params = {}, maxEntriesPerRequest = undefined): Promise<any> {
+        // the range from since to until (or now) is split in windows of maxEntriesPerRequest entries of the timeframe
+        // and the windows are fetched at once, the rate limiter spaces the requests
+        let maxCalls = undefined;
+        [ maxCalls, params ] = this.handleOptionAndParams (params, method, 'paginationCalls', 10);
+        [ maxEntriesPerRequest, params ] = this.handleMaxEntriesPerRequestAndParams (method, maxEntriesPerRequest, params);
+        params = this.extend (params, { 'paginate': false });
+        const step = this.parseTimeframe (timeframe) * 1000 * maxEntriesPerRequest;
+        const until = this.safeInteger2 (params, 'until', 'till'); // do not omit it from params here, the last window ends there
+        const end = (until === undefined) ? this.milliseconds () : until;
+        let calls = maxCalls;
+        if (since !== undefined) {
+            const duration = end - since;
+            calls = Math.ceil (duration / step);
+            if (limit !== undefined) {
+                // the first limit entries from since, the windows after them are not fetched
+                calls = Math.min (calls, Math.ceil (limit / maxEntriesPerRequest));
+            }
+            if (calls > maxCalls) {
+                throw new BadRequest (this.id + ' ' + method + ' () requires ' + calls.toString () + ' calls from since to until, more than the paginationCalls option allows (' + maxCalls.toString () + '), increase paginationCalls or reduce the range');
+            }
+        } else if (limit !== undefined) {
+            calls = Math.min (maxCalls, Math.ceil (limit / maxEntriesPerRequest));
+        }
+        const start = (since === undefined) ? (end - calls * step) : since;
+        const tasks = [];
+        for (let i = 0; i < calls; i++) {
+            tasks.push (this.safeDeterministicCall (method, symbol, this.sum (start, i * step), maxEntriesPerRequest, timeframe, params));
+        }
+        const pages = await Promise.all (tasks);
+        return this.mergePaginatedResults (method, pages, since, limit);
+    }
+
+    async fetchPaginatedCallCursor (method, symbol = undefined, since = undefined, limit = undefined, params = {}, cursorReceived = undefined, cursorSent = undefined, cursorIncrement = undefined, maxEntriesPerRequest = undefined): Promise<any> {
+        // the pages are fetched one after another, the cursor of the next page is the cursorReceived field of an entry
+        // with cursorIncrement the cursor is an id and the next page starts after the last entry,
+        // otherwise the next page goes back in time from the first entry, the way okx after= works
+        let maxCalls = undefined;
+        [ maxCalls, params ] = this.handleOptionAndParams (params, method, 'paginationCalls', 10);
+        [ maxEntriesPerRequest, params ] = this.handleMaxEntriesPerRequestAndParams (method, maxEntriesPerRequest, params);
+        params = this.extend (params, { 'paginate': false });
+        let cursorValue = undefined;
+        const pages = [];
+        for (let i = 0; i < maxCalls; i++) {
+            let pageSince = since;
+            let pageParams = params;
+            if (cursorValue !== undefined) {
+                if (cursorIncrement !== undefined) {
+                    // the since of the first page would conflict with the id
+                    cursorValue = this.sum (this.parseToInt (cursorValue), cursorIncrement);
+                    pageSince = undefined;
+                }
+                const cursorParams = {};
+                cursorParams[cursorSent] = cursorValue;
+                pageParams = this.extend (params, cursorParams);
+            }
+            const response = await this.safeDeterministicCall (method, symbol, pageSince, maxEntriesPerRequest, undefined, pageParams);
+            const responseLength = response.length;
+            if (responseLength === 0) {
+                break;
+            }
+            pages.push (response);
+            // the parsed page is in ascending order
+            const cursorEntry = (cursorIncrement !== undefined) ? response[responseLength - 1] : response[0];
+            cursorValue = this.safeValue (cursorEntry['info'], cursorReceived);
+            if ((cursorValue === undefined) || (responseLength < maxEntriesPerRequest)) {
+                break;
+            }
+            const cursorTimestamp = this.safeInteger (cursorEntry, 'timestamp');
+            if ((cursorIncrement === undefined) && (since !== undefined) && (cursorTimestamp !== undefined) && (cursorTimestamp <= since)) {
+                break;
+            }
+        }
+        return this.mergePaginatedResults (method, pages, since, limit);
+    }
+
     handleMarketTypeAndParams (methodName, market = undefined, params = {}): any {
         const defaultType = this.safeString2 (this.options, 'defaultType', 'type', 'spot');
         const methodOptions = this.safeValue (this.options, methodName);
@@ -3217,6 +3637,19 @@ export default class Exchange {
         return this.safeValue (config, 'cost', 1);
     }
 
+    calculateRateLimiterBuckets (api, method, path, params, config = {}, context = {}) {
+        // the named buckets consumed by an endpoint on top of calculateRateLimiterCost ()
+        return this.safeValue (config, 'buckets', {});
+    }
+
+    parseRateLimitHeaders (headers, url, method) {
+        // returns the usage reported by the exchange per bucket, 'rateLimit' or a name from rateLimitBuckets
+        // { 'rateLimit': { 'used': 420, 'limit': 1200, 'interval': 60000 }, 'orders10s': { 'remaining': 12, 'interval': 10000, 'reset': 1672515790000 }}
+        // counts are in cost units, the limit defaults to the capacity of a named bucket
+        // the window resets at 'reset' or at the next multiple of 'interval' milliseconds
+        return undefined;
+    }
+
     async fetchTicker (symbol: string, params = {}): Promise<Ticker> {
         if (this.has['fetchTickers']) {
             await this.loadMarkets ();
@@ -3372,14 +3805,8 @@ export default class Exchange {
         }
     }
 
-    market (symbol) {
+    resolveMarket (symbol) {
         // symbol = symbol + ':USDT';
-        if (this.markets === undefined) {
-            throw new ExchangeError (this.id + ' markets not loaded');
-        }
-        if (this.markets_by_id === undefined) {
-            throw new ExchangeError (this.id + ' markets not loaded');
-        }
         // TEALSTREET patch for backwards compatability
         // this.marketHelper (symbol.split (':')[0]);
         let foundMarket = this.marketHelper (symbol);
@@ -3398,11 +3825,47 @@ export default class Exchange {
         if (foundMarket) {
             return foundMarket;
         }
-        // eslint-disable-next-line no-console
-        // console.log (symbol);
-        // eslint-disable-next-line no-console
-        // console.log (this.markets);
-        throw new BadSymbol (this.id + ' does not have market symbol ' + symbol);
+        return undefined;
+    }
+
+    market (symbol) {
+        if (this.markets === undefined) {
+            throw new ExchangeError (this.id + ' markets not loaded');
+        }
+        if (this.markets_by_id === undefined) {
+            throw new ExchangeError (this.id + ' markets not loaded');
+        }
+        let foundMarket = undefined;
+        if (typeof symbol !== 'string') {
+            foundMarket = this.resolveMarket (symbol);
+        } else {
+            // every symbol, legacy symbol or id seen is resolved once, unknown ones included
+            // the resolutions hold until setMarkets () or the default type change
+            const defaultType = this.safeString (this.options, 'defaultType');
+            const defaultSubType = this.safeString (this.options, 'defaultSubType');
+            let resolved = this.resolvedMarkets;
+            if ((resolved === undefined) || (resolved['defaultType'] !== defaultType) || (resolved['defaultSubType'] !== defaultSubType) || (resolved['count'] >= this.resolvedMarketsLimit)) {
+                resolved = {
+                    'defaultType': defaultType,
+                    'defaultSubType': defaultSubType,
+                    'symbols': {},
+                    'count': 0,
+                };
+                this.resolvedMarkets = resolved;
+            }
+            const symbols = resolved['symbols'];
+            if (symbol in symbols) {
+                foundMarket = symbols[symbol];
+            } else {
+                foundMarket = this.resolveMarket (symbol);
+                symbols[symbol] = foundMarket;
+                resolved['count'] = resolved['count'] + 1;
+            }
+        }
+        if (foundMarket === undefined) {
+            throw new BadSymbol (this.id + ' does not have market symbol ' + symbol);
+        }
+        return foundMarket;
     }
 
     handleWithdrawTagAndParams (tag, params) {
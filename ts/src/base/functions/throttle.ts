@@ -13,6 +13,7 @@ class Throttle {
             'maxCapacity': 2000,
             'tokens': 0,
             'cost': 1.0,
+            'borrow': true, // whether a request can overdraw the bucket and make the next ones wait
         };
         Object.assign (this.config, config);
         this.queue = [];
@@ -23,7 +24,9 @@ class Throttle {
         let lastTimestamp = now ();
         while (this.running) {
             const { resolver, cost } = this.queue[0];
-            if (this.config['tokens'] >= 0) {
+            // without borrowing the tokens must cover the cost, a cost above the capacity waits for a full bucket
+            const required = this.config['borrow'] ? 0 : Math.min (cost, this.config['capacity']);
+            if (this.config['tokens'] >= required) {
                 this.config['tokens'] -= cost;
                 resolver ();
                 this.queue.shift ();
@@ -3,6 +3,7 @@
 
 import { iso8601 } from '../../base/functions/time.js';
 import { extend, deepExtend } from '../../base/functions/generic.js';
+import { crc32 } from '../../base/functions/crypto.js';
 
 import {
     Asks,
@@ -30,6 +31,12 @@ class OrderBook {
             writable: true,
         })
 
+        Object.defineProperty (this, 'checksumCount', {
+            __proto__: null, // make it invisible
+            value: 0,
+            writable: true,
+        })
+
         depth = depth || Number.MAX_SAFE_INTEGER
 
         const defaults = {
@@ -66,6 +73,36 @@ class OrderBook {
         return this
     }
 
+    // okx, bitget and blofin send a signed crc32 of the top levels interleaved as
+    // bidPrice:bidSize:askPrice:askSize:... built from the strings they publish
+
+    retainRaw () {
+        this.asks.retainRaw ()
+        this.bids.retainRaw ()
+        return this
+    }
+
+    checksum (depth = 25) {
+        const bids = this.bids.checksumLevels (depth)
+        const asks = this.asks.checksumLevels (depth)
+        const payload = []
+        for (let i = 0; i < Math.max (bids.length, asks.length); i++) {
+            if (i < bids.length) {
+                payload.push (bids[i])
+            }
+            if (i < asks.length) {
+                payload.push (asks[i])
+            }
+        }
+        return crc32 (payload.join (':'), true)
+    }
+
+    // counts the messages, a checksum is verified on every interval-th one
+    checksumDue (interval = 1) {
+        this.checksumCount++
+        return (interval <= 1) || ((this.checksumCount % interval) === 0)
+    }
+
     update (snapshot) {
         if ((snapshot.nonce !== undefined) &&
             (this.nonce !== undefined) &&
@@ -7,6 +7,8 @@
 // Email: carlo.revelli@berkeley.edu
 //
 
+import { numberToString } from '../functions/number.js';
+
 function bisectLeft(array, x) {
     let low = 0
     let high = array.length - 1
@@ -40,6 +42,11 @@ class OrderBookSide extends Array {
             value: new Map (),
             writable: true,
         })
+        Object.defineProperty (this, 'raw', {
+            __proto__: null, // make it invisible
+            value: undefined,
+            writable: true,
+        })
         // sort upon initiation
         this.length = 0
         for (let i = 0; i < deltas.length; i++) {
@@ -96,6 +103,49 @@ class OrderBookSide extends Array {
         this.storeArray ([ price, size ])
     }
 
+    // the levels of a message at once, strings or numbers as sent by the exchange
+    applyLevels (levels, priceKey = 0, sizeKey = 1) {
+        for (let i = 0; i < levels.length; i++) {
+            const level = levels[i]
+            const price = parseFloat (level[priceKey])
+            const size = parseFloat (level[sizeKey])
+            this.storeArray ([ price, size ])
+            if (this.raw !== undefined) {
+                const index_price = this.side ? -price : price
+                if (size && (typeof level[priceKey] === 'string') && (typeof level[sizeKey] === 'string')) {
+                    this.raw.set (index_price, [ level[priceKey] + ':' + level[sizeKey], size ])
+                } else {
+                    this.raw.delete (index_price)
+                }
+            }
+        }
+    }
+
+    // checksums are computed over the strings the exchange sent, '0.10' is not '0.1'
+    // so the raw levels of applyLevels () are kept next to the parsed ones once retainRaw () is called
+    retainRaw () {
+        if (this.raw === undefined) {
+            this.raw = new Map ()
+        }
+    }
+
+    // the top depth levels formatted as 'price:size', a raw string is used while its size is stored
+    checksumLevels (depth) {
+        const levels = []
+        const length = Math.min (this.length, depth)
+        for (let i = 0; i < length; i++) {
+            const price = this[i][0]
+            const size = this[i][1]
+            const raw = (this.raw === undefined) ? undefined : this.raw.get (this.side ? -price : price)
+            if ((raw !== undefined) && (raw[1] === size)) {
+                levels.push (raw[0])
+            } else {
+                levels.push (numberToString (price) + ':' + numberToString (size))
+            }
+        }
+        return levels
+    }
+
     // replace stored orders with new values
     limit (n = undefined) {
         if (n < this.length) {
@@ -135,6 +185,13 @@ class CountedOrderBookSide extends OrderBookSide {
         this.storeArray ([ price, size, count ])
     }
 
+    applyLevels (levels, priceKey = 0, sizeKey = 1, countKey = 2) {
+        for (let i = 0; i < levels.length; i++) {
+            const level = levels[i]
+            this.storeArray ([ parseFloat (level[priceKey]), parseFloat (level[sizeKey]), parseFloat (level[countKey]) ])
+        }
+    }
+
     storeArray (delta) {
         const price = delta[0]
         const size = delta[1]
@@ -222,6 +279,13 @@ class IndexedOrderBookSide extends Array  {
         this.storeArray([ price, size, id ])
     }
 
+    applyLevels (levels, priceKey = 0, sizeKey = 1, idKey = 2) {
+        for (let i = 0; i < levels.length; i++) {
+            const level = levels[i]
+            this.storeArray ([ parseFloat (level[priceKey]), parseFloat (level[sizeKey]), level[idKey] ])
+        }
+    }
+
     storeArray (delta) {
         const price = delta[0]
         const size = delta[1]
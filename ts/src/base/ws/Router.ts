@@ -0,0 +1,85 @@
+// @ts-nocheck
+// ----------------------------------------------------------------------------
+// routes incoming websocket messages to their handlers by a channel or topic key
+//
+//     exact     { 'tickers': handler }               the key equals the route
+//     prefix    { 'candle': handler }                the key starts with the route
+//     contains  { 'orderbook': handler }             the key contains the route, checked in order
+//
+// the routes are declared once per exchange instance, every key seen on the wire
+// is resolved once and then served from a map, unknown keys are cached as misses
+// hits are counted per route, see Exchange.messageRouterStats ()
+
+const MAX_RESOLVED = 4096
+
+class MessageRouter {
+
+    constructor (routes = {}) {
+        this.exact = routes['exact'] || {}
+        // the longest prefix wins
+        this.prefix = Object.entries (routes['prefix'] || {}).sort ((a, b) => b[0].length - a[0].length)
+        this.contains = Object.entries (routes['contains'] || {})
+        this.extractor = routes['extractor']
+        this.hits = {}
+        this.resolved = new Map ()
+    }
+
+    lookup (key) {
+        if (Object.prototype.hasOwnProperty.call (this.exact, key)) {
+            return [ key, this.exact[key] ]
+        }
+        for (let i = 0; i < this.prefix.length; i++) {
+            if (key.startsWith (this.prefix[i][0])) {
+                return this.prefix[i]
+            }
+        }
+        for (let i = 0; i < this.contains.length; i++) {
+            if (key.indexOf (this.contains[i][0]) >= 0) {
+                return this.contains[i]
+            }
+        }
+        return undefined
+    }
+
+    resolve (key) {
+        // returns the [ route, handler ] pair for a key or undefined
+        if (typeof key !== 'string') {
+            return undefined
+        }
+        if (this.resolved.has (key)) {
+            return this.resolved.get (key)
+        }
+        if (this.resolved.size >= MAX_RESOLVED) {
+            // keys carry symbols and intervals, bound the cache if they are unbounded
+            this.resolved.clear ()
+        }
+        const resolved = this.lookup (key)
+        this.resolved.set (key, resolved)
+        return resolved
+    }
+
+    dispatch (exchange, client, message, key = undefined) {
+        // calls the handler for the key, or for the key returned by the extractor
+        // returns a [ routed, result ] pair so that the caller can fall through
+        if ((key === undefined) && (this.extractor !== undefined)) {
+            key = this.extractor.call (exchange, message)
+        }
+        const resolved = this.resolve (key)
+        if (resolved === undefined) {
+            return [ false, undefined ]
+        }
+        const [ route, handler ] = resolved
+        this.hits[route] = (this.hits[route] || 0) + 1
+        return [ true, handler.call (exchange, client, message) ]
+    }
+
+    resetHits () {
+        this.hits = {}
+    }
+}
+
+// ----------------------------------------------------------------------------
+
+export {
+    MessageRouter,
+};
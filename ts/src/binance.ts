@@ -15,6 +15,19 @@ export default class binance extends Exchange {
             'name': 'Binance',
             'countries': [ 'JP', 'MT' ], // Japan, Malta
             'rateLimit': 50,
+            // order counts are limited separately from the request weight
+            // https://binance-docs.github.io/apidocs/spot/en/#limits
+            'rateLimitBuckets': {
+                // the request weight per minute of each api, see options['rateLimitWeights']
+                'weight': { 'capacity': 1200, 'interval': 60000 },
+                'fapiWeight': { 'capacity': 2400, 'interval': 60000 },
+                'dapiWeight': { 'capacity': 2400, 'interval': 60000 },
+                'orders10s': { 'capacity': 50, 'interval': 10000 },
+                'ordersDay': { 'capacity': 160000, 'interval': 86400000 },
+                'fapiOrders10s': { 'capacity': 300, 'interval': 10000 },
+                'fapiOrders1m': { 'capacity': 1200, 'interval': 60000 },
+                'dapiOrders1m': { 'capacity': 1200, 'interval': 60000 },
+            },
             'certified': true,
             'pro': true,
             // new metainfo interface
@@ -581,8 +594,8 @@ export default class binance extends Exchange {
                     },
                     'post': {
                         'positionSide/dual': 1,
-                        'order': 4,
-                        'batchOrders': 5,
+                        'order': { 'cost': 4, 'buckets': { 'dapiOrders1m': 1 } },
+                        'batchOrders': { 'cost': 5, 'buckets': { 'dapiOrders1m': 5 } },
                         'countdownCancelAll': 10,
                         'leverage': 1,
                         'marginType': 1,
@@ -591,8 +604,8 @@ export default class binance extends Exchange {
                     },
                     'put': {
                         'listenKey': 1,
-                        'order': 1,
-                        'batchOrders': 5,
+                        'order': { 'cost': 1, 'buckets': { 'dapiOrders1m': 1 } },
+                        'batchOrders': { 'cost': 5, 'buckets': { 'dapiOrders1m': 5 } },
                     },
                     'delete': {
                         'order': 1,
@@ -671,11 +684,11 @@ export default class binance extends Exchange {
                         'pmAccountInfo': 5,
                     },
                     'post': {
-                        'batchOrders': 5,
+                        'batchOrders': { 'cost': 5, 'buckets': { 'fapiOrders10s': 5, 'fapiOrders1m': 5 } },
                         'positionSide/dual': 1,
                         'positionMargin': 1,
                         'marginType': 1,
-                        'order': 4,
+                        'order': { 'cost': 4, 'buckets': { 'fapiOrders10s': 1, 'fapiOrders1m': 1 } },
                         'leverage': 1,
                         'listenKey': 1,
                         'countdownCancelAll': 10,
@@ -789,9 +802,9 @@ export default class binance extends Exchange {
                         'myPreventedMatches': 1,
                     },
                     'post': {
-                        'order/oco': 1,
-                        'order': 1,
-                        'order/cancelReplace': 1,
+                        'order/oco': { 'cost': 1, 'buckets': { 'orders10s': 2, 'ordersDay': 2 } },
+                        'order': { 'cost': 1, 'buckets': { 'orders10s': 1, 'ordersDay': 1 } },
+                        'order/cancelReplace': { 'cost': 1, 'buckets': { 'orders10s': 1, 'ordersDay': 1 } },
                         'order/test': 1,
                     },
                     'delete': {
@@ -889,6 +902,24 @@ export default class binance extends Exchange {
             // exchange-specific options
             'options': {
                 'sandboxMode': false,
+                // the usage headers are matched to the buckets by the api in the url
+                // the order counts are keyed by the interval in the header name
+                'rateLimitHeaders': {
+                    'api': { 'weight': 'weight', 'orders': { '10S': 'orders10s', '1D': 'ordersDay' }},
+                    'fapi': { 'weight': 'fapiWeight', 'orders': { '10S': 'fapiOrders10s', '1M': 'fapiOrders1m' }},
+                    'dapi': { 'weight': 'dapiWeight', 'orders': { '1M': 'dapiOrders1m' }},
+                },
+                // the endpoint cost is the request weight, it is drawn from the weight bucket of its api
+                'rateLimitWeights': {
+                    'public': 'weight',
+                    'private': 'weight',
+                    'fapiPublic': 'fapiWeight',
+                    'fapiPrivate': 'fapiWeight',
+                    'fapiPrivateV2': 'fapiWeight',
+                    'dapiPublic': 'dapiWeight',
+                    'dapiPrivate': 'dapiWeight',
+                    'dapiPrivateV2': 'dapiWeight',
+                },
                 'fetchMarkets': [
                     'spot', // allows CORS in browsers
                     'linear', // allows CORS in browsers
@@ -2586,10 +2617,13 @@ export default class binance extends Exchange {
          * @param {string} symbol unified symbol of the market to fetch the order book for
          * @param {int|undefined} limit the maximum amount of order book entries to return
          * @param {object} params extra parameters specific to the binance api endpoint
+         * @param {bool|undefined} params.columnar python only, true to return the prices and amounts of each side as columns
          * @returns {object} A dictionary of [order book structures]{@link https://docs.ccxt.com/#/?id=order-book-structure} indexed by market symbols
          */
         await this.loadMarkets ();
         const market = this.market (symbol);
+        let columnar = false;
+        [ columnar, params ] = this.handleOptionAndParams (params, 'fetchOrderBook', 'columnar', false);
         const request = {
             'symbol': market['id'],
         };
@@ -2642,7 +2676,7 @@ export default class binance extends Exchange {
         //     }
         //
         const timestamp = this.safeInteger (response, 'T');
-        const orderbook = this.parseOrderBook (response, symbol, timestamp);
+        const orderbook = this.bulkParseOrderBook (response, symbol, timestamp, 'bids', 'asks', 0, 1, columnar);
         orderbook['nonce'] = this.safeInteger2 (response, 'lastUpdateId', 'u');
         return orderbook;
     }
@@ -3050,12 +3084,21 @@ export default class binance extends Exchange {
          * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
          * @param {int|undefined} limit the maximum amount of candles to fetch
          * @param {object} params extra parameters specific to the binance api endpoint
+         * @param {bool|undefined} params.columnar python only, true to return the candles in an OHLCV, a typed array per column, see columnar.py
          * @param {string|undefined} params.price "mark" or "index" for mark price and index price candles
          * @param {int|undefined} params.until timestamp in ms of the latest candle to fetch
+         * @param {bool|undefined} params.paginate true to fetch the candles from since to until in windows of 1000 at once, see Exchange.fetchPaginatedCallDeterministic ()
          * @returns {[[int]]} A list of candles ordered as timestamp, open, high, low, close, volume
          */
         await this.loadMarkets ();
+        let paginate = false;
+        [ paginate, params ] = this.handleOptionAndParams (params, 'fetchOHLCV', 'paginate');
+        if (paginate) {
+            return await this.fetchPaginatedCallDeterministic ('fetchOHLCV', symbol, since, limit, timeframe, params, 1000);
+        }
         const market = this.market (symbol);
+        let columnar = false;
+        [ columnar, params ] = this.handleOptionAndParams (params, 'fetchOHLCV', 'columnar', false);
         // binance docs say that the default limit 500, max 1500 for futures, max 1000 for spot markets
         // the reality is that the time range wider than 500 candles won't work right
         const defaultLimit = 500;
@@ -3139,7 +3182,7 @@ export default class binance extends Exchange {
         //         }
         //     ]
         //
-        return this.parseOHLCVs (response, market, timeframe, since, limit);
+        return this.bulkParseOHLCVs (response, market, timeframe, since, limit, [ 0, 1, 2, 3, 4, 5 ], columnar);
     }
 
     parseTrade (trade, market = undefined) {
@@ -3355,10 +3398,13 @@ export default class binance extends Exchange {
          * @param {int|undefined} since timestamp in ms of the earliest trade to fetch
          * @param {int|undefined} limit the maximum amount of trades to fetch
          * @param {object} params extra parameters specific to the binance api endpoint
+         * @param {bool|undefined} params.columnar python only, true to return the timestamps, prices, amounts, ids and sides of the trades as columns
          * @returns {[object]} a list of [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades}
          */
         await this.loadMarkets ();
         const market = this.market (symbol);
+        let columnar = false;
+        [ columnar, params ] = this.handleOptionAndParams (params, 'fetchTrades', 'columnar', false);
         const request = {
             'symbol': market['id'],
             // 'fromId': 123,    // ID to get aggregate trades from INCLUSIVE.
@@ -3442,6 +3488,18 @@ export default class binance extends Exchange {
         //         },
         //     ]
         //
+        if (columnar) {
+            // the buyer is the maker of a sell
+            let keys = { 'timestamp': 'time', 'price': 'price', 'amount': 'qty', 'id': 'id', 'side': 'isBuyerMaker' };
+            let sides = { 'true': 'sell', 'false': 'buy' };
+            if (method.indexOf ('AggTrades') >= 0) {
+                keys = { 'timestamp': 'T', 'price': 'p', 'amount': 'q', 'id': 'a', 'side': 'm' };
+            } else if (market['option']) {
+                keys = { 'timestamp': 'time', 'price': 'price', 'amount': 'qty', 'id': 'id', 'side': 'side' };
+                sides = { '1': 'buy', '-1': 'sell' };
+            }
+            return this.bulkParseTrades (response, market, since, limit, {}, keys, sides, columnar);
+        }
         return this.parseTrades (response, market, since, limit);
     }
 
@@ -4138,10 +4196,16 @@ export default class binance extends Exchange {
          * @param {int|undefined} limit the maximum number of  orde structures to retrieve
          * @param {object} params extra parameters specific to the binance api endpoint
          * @param {string|undefined} params.marginMode 'cross' or 'isolated', for spot margin trading
+         * @param {bool|undefined} params.paginate true to fetch the orders from since page by page by orderId, see Exchange.fetchPaginatedCallCursor ()
          * @returns {[object]} a list of [order structures]{@link https://docs.ccxt.com/#/?id=order-structure}
          */
         this.checkRequiredSymbol ('fetchOrders', symbol);
         await this.loadMarkets ();
+        let paginate = false;
+        [ paginate, params ] = this.handleOptionAndParams (params, 'fetchOrders', 'paginate');
+        if (paginate) {
+            return await this.fetchPaginatedCallCursor ('fetchOrders', symbol, since, limit, params, 'orderId', 'orderId', 1, 1000);
+        }
         const market = this.market (symbol);
         const defaultType = this.safeString2 (this.options, 'fetchOrders', 'defaultType', 'spot');
         const type = this.safeString (params, 'type', defaultType);
@@ -4450,9 +4514,15 @@ export default class binance extends Exchange {
          * @param {int|undefined} since the earliest time in ms to fetch trades for
          * @param {int|undefined} limit the maximum number of trades structures to retrieve
          * @param {object} params extra parameters specific to the binance api endpoint
+         * @param {bool|undefined} params.paginate true to fetch the trades from since page by page by fromId, see Exchange.fetchPaginatedCallCursor ()
          * @returns {[object]} a list of [trade structures]{@link https://docs.ccxt.com/#/?id=trade-structure}
          */
         await this.loadMarkets ();
+        let paginate = false;
+        [ paginate, params ] = this.handleOptionAndParams (params, 'fetchMyTrades', 'paginate');
+        if (paginate) {
+            return await this.fetchPaginatedCallCursor ('fetchMyTrades', symbol, since, limit, params, 'id', 'fromId', 1, 1000);
+        }
         const request = {};
         let market = undefined;
         let type = undefined;
@@ -5996,9 +6066,15 @@ export default class binance extends Exchange {
          * @param {int|undefined} limit the maximum amount of [funding rate structures]{@link https://docs.ccxt.com/en/latest/manual.html?#funding-rate-history-structure} to fetch
          * @param {object} params extra parameters specific to the binance api endpoint
          * @param {int|undefined} params.until timestamp in ms of the latest funding rate
+         * @param {bool|undefined} params.paginate true to fetch the funding rates from since to until in windows of 1000 at once, see Exchange.fetchPaginatedCallDeterministic ()
          * @returns {[object]} a list of [funding rate structures]{@link https://docs.ccxt.com/en/latest/manual.html?#funding-rate-history-structure}
          */
         await this.loadMarkets ();
+        let paginate = false;
+        [ paginate, params ] = this.handleOptionAndParams (params, 'fetchFundingRateHistory', 'paginate');
+        if (paginate) {
+            return await this.fetchPaginatedCallDeterministic ('fetchFundingRateHistory', symbol, since, limit, '8h', params, 1000);
+        }
         const request = {};
         let method = undefined;
         const defaultType = this.safeString2 (this.options, 'fetchFundingRateHistory', 'defaultType', 'future');
@@ -7246,6 +7322,47 @@ export default class binance extends Exchange {
         return this.safeString (ledgerType, type, type);
     }
 
+    parseRateLimitHeaders (headers, url, method) {
+        //
+        //     X-MBX-USED-WEIGHT-1M: 420
+        //     X-MBX-ORDER-COUNT-10S: 3
+        //     X-MBX-ORDER-COUNT-1D: 17
+        //
+        const rateLimitHeaders = this.safeValue (this.options, 'rateLimitHeaders', {});
+        const apis = Object.keys (rateLimitHeaders);
+        let limits = undefined;
+        for (let i = 0; i < apis.length; i++) {
+            if (url.indexOf ('/' + apis[i] + '/') >= 0) {
+                limits = rateLimitHeaders[apis[i]];
+                break;
+            }
+        }
+        if (limits === undefined) {
+            return undefined;
+        }
+        const orders = this.safeValue (limits, 'orders', {});
+        const keys = Object.keys (headers);
+        const result = {};
+        for (let i = 0; i < keys.length; i++) {
+            const header = keys[i];
+            const name = header.toUpperCase ();
+            let bucket = undefined;
+            if (name === 'X-MBX-USED-WEIGHT-1M') {
+                bucket = limits['weight'];
+            } else if (name.indexOf ('X-MBX-ORDER-COUNT-') === 0) {
+                // the interval follows the prefix, 10S, 1M or 1D
+                bucket = this.safeString (orders, name.slice (18));
+            }
+            if (bucket !== undefined) {
+                result[bucket] = {
+                    'used': this.safeFloat (headers, header),
+                    'interval': this.rateLimitBuckets[bucket]['interval'],
+                };
+            }
+        }
+        return result;
+    }
+
     sign (path, api: any = 'public', method = 'GET', params = {}, headers: any = undefined, body: any = undefined) {
         if (!(api in this.urls['api'])) {
             throw new NotSupported (this.id + ' does not have a testnet/sandbox URL for ' + api + ' endpoints');
@@ -7398,6 +7515,19 @@ export default class binance extends Exchange {
         }
     }
 
+    calculateRateLimiterBuckets (api, method, path, params, config = {}, context = {}) {
+        // the weight of the endpoint is drawn from the bucket of its api as well as from the rateLimit one
+        const buckets = this.safeValue (config, 'buckets', {});
+        const rateLimitWeights = this.safeValue (this.options, 'rateLimitWeights', {});
+        const bucket = this.safeString (rateLimitWeights, api);
+        if (bucket === undefined) {
+            return buckets;
+        }
+        const weight = {};
+        weight[bucket] = this.calculateRateLimiterCost (api, method, path, params, config, context);
+        return this.extend (buckets, weight);
+    }
+
     calculateRateLimiterCost (api, method, path, params, config = {}, context = {}) {
         if (('noCoin' in config) && !('coin' in params)) {
             return config['noCoin'];
@@ -805,6 +805,8 @@ export default class bitget extends Exchange {
     }
 
     setSandboxMode (enabled) {
+        // the base market store key tells the sandbox markets apart by the sandboxMode option
+        this.options['sandboxMode'] = enabled;
         const currSubTypes = this.getSubTypes ();
         if (enabled) {
             this.options['subTypesBackup'] = currSubTypes;
@@ -30,6 +30,14 @@ export default class bybit extends Exchange {
             'version': 'v5',
             'userAgent': undefined,
             'rateLimit': 20,
+            // order placement is limited per endpoint group on top of the ip limit
+            // https://bybit-exchange.github.io/docs/v5/rate-limit
+            'rateLimitBuckets': {
+                // each order endpoint has its own limit
+                'v5OrderCreate': { 'capacity': 10, 'interval': 1000 },
+                'v5OrderAmend': { 'capacity': 10, 'interval': 1000 },
+                'v5OrderCancel': { 'capacity': 10, 'interval': 1000 },
+            },
             'hostname': 'bybit.com', // bybit.com, bytick.com
             'refCode': 'Tealstreet',
             'pro': true,
@@ -436,9 +444,9 @@ export default class bybit extends Exchange {
                         'fht/compliance/tax/v3/private/status': 50,
                         'fht/compliance/tax/v3/private/url': 50,
                         // v5
-                        'v5/order/create': 2.5,
-                        'v5/order/amend': 2.5,
-                        'v5/order/cancel': 2.5,
+                        'v5/order/create': { 'cost': 2.5, 'buckets': { 'v5OrderCreate': 1 } },
+                        'v5/order/amend': { 'cost': 2.5, 'buckets': { 'v5OrderAmend': 1 } },
+                        'v5/order/cancel': { 'cost': 2.5, 'buckets': { 'v5OrderCancel': 1 } },
                         'v5/order/cancel-all': 2.5,
                         'v5/order/create-batch': 2.5,
                         'v5/order/amend-batch': 2.5,
@@ -928,6 +936,12 @@ export default class bybit extends Exchange {
             },
             'precisionMode': TICK_SIZE,
             'options': {
+                // the usage headers are reported per endpoint, these are matched to the buckets they consume
+                'rateLimitHeaders': {
+                    'v5/order/create': 'v5OrderCreate',
+                    'v5/order/amend': 'v5OrderAmend',
+                    'v5/order/cancel': 'v5OrderCancel',
+                },
                 'enableUnifiedMargin': undefined,
                 'enableUnifiedAccount': undefined,
                 'enableUta2': undefined,
@@ -1775,11 +1789,20 @@ export default class bybit extends Exchange {
          * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
          * @param {int|undefined} limit the maximum amount of candles to fetch
          * @param {object} params extra parameters specific to the bybit api endpoint
+         * @param {bool|undefined} params.columnar python only, true to return the candles in an OHLCV, a typed array per column, see columnar.py
+         * @param {bool|undefined} params.paginate true to fetch the candles from since to until in windows of 1000 at once, see Exchange.fetchPaginatedCallDeterministic ()
          * @returns {[[int]]} A list of candles ordered as timestamp, open, high, low, close, volume
          */
         this.checkRequiredSymbol ('fetchOHLCV', symbol);
         await this.loadMarkets ();
+        let paginate = false;
+        [ paginate, params ] = this.handleOptionAndParams (params, 'fetchOHLCV', 'paginate');
+        if (paginate) {
+            return await this.fetchPaginatedCallDeterministic ('fetchOHLCV', symbol, since, limit, timeframe, params, 1000);
+        }
         const market = this.market (symbol);
+        let columnar = false;
+        [ columnar, params ] = this.handleOptionAndParams (params, 'fetchOHLCV', 'columnar', false);
         const request = {
             'symbol': market['id'],
         };
@@ -1858,7 +1881,7 @@ export default class bybit extends Exchange {
         //
         const result = this.safeValue (response, 'result', {});
         const ohlcvs = this.safeValue (result, 'list', []);
-        return this.parseOHLCVs (ohlcvs, market, timeframe, since, limit);
+        return this.bulkParseOHLCVs (ohlcvs, market, timeframe, since, limit, [ 0, 1, 2, 3, 4, 5 ], columnar);
     }
 
     parseFundingRate (ticker, market = undefined) {
@@ -2006,10 +2029,16 @@ export default class bybit extends Exchange {
          * @param {int|undefined} limit the maximum amount of [funding rate structures]{@link https://docs.ccxt.com/en/latest/manual.html?#funding-rate-history-structure} to fetch
          * @param {object} params extra parameters specific to the bybit api endpoint
          * @param {int|undefined} params.until timestamp in ms of the latest funding rate
+         * @param {bool|undefined} params.paginate true to fetch the funding rates from since to until in windows of 200 at once, see Exchange.fetchPaginatedCallDeterministic ()
          * @returns {[object]} a list of [funding rate structures]{@link https://docs.ccxt.com/en/latest/manual.html?#funding-rate-history-structure}
          */
         this.checkRequiredSymbol ('fetchFundingRateHistory', symbol);
         await this.loadMarkets ();
+        let paginate = false;
+        [ paginate, params ] = this.handleOptionAndParams (params, 'fetchFundingRateHistory', 'paginate');
+        if (paginate) {
+            return await this.fetchPaginatedCallDeterministic ('fetchFundingRateHistory', symbol, since, limit, '8h', params, 200);
+        }
         const request = {
             // 'category': '', // Product type. linear,inverse
             // 'symbol': '', // Symbol name
@@ -2243,11 +2272,14 @@ export default class bybit extends Exchange {
          * @param {int|undefined} since timestamp in ms of the earliest trade to fetch
          * @param {int|undefined} limit the maximum amount of trades to fetch
          * @param {object} params extra parameters specific to the bybit api endpoint
+         * @param {bool|undefined} params.columnar python only, true to return the timestamps, prices, amounts, ids and sides of the trades as columns
          * @returns {[object]} a list of [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades}
          */
         this.checkRequiredSymbol ('fetchTrades', symbol);
         await this.loadMarkets ();
         const market = this.market (symbol);
+        let columnar = false;
+        [ columnar, params ] = this.handleOptionAndParams (params, 'fetchTrades', 'columnar', false);
         const request = {
             'symbol': market['id'],
             // 'baseCoin': '', // Base coin. For option only. If not passed, return BTC data by default
@@ -2294,7 +2326,8 @@ export default class bybit extends Exchange {
         //
         const result = this.safeValue (response, 'result', {});
         const trades = this.safeValue (result, 'list', []);
-        return this.parseTrades (trades, market, since, limit);
+        const keys = { 'timestamp': 'time', 'price': 'price', 'amount': 'size', 'id': 'execId', 'side': 'side' };
+        return this.bulkParseTrades (trades, market, since, limit, {}, keys, undefined, columnar);
     }
 
     async fetchOrderBook (symbol, limit = undefined, params = {}) {
@@ -2306,11 +2339,14 @@ export default class bybit extends Exchange {
          * @param {string} symbol unified symbol of the market to fetch the order book for
          * @param {int|undefined} limit the maximum amount of order book entries to return
          * @param {object} params extra parameters specific to the bybit api endpoint
+         * @param {bool|undefined} params.columnar python only, true to return the prices and amounts of each side as columns
          * @returns {object} A dictionary of [order book structures]{@link https://docs.ccxt.com/#/?id=order-book-structure} indexed by market symbols
          */
         this.checkRequiredSymbol ('fetchOrderBook', symbol);
         await this.loadMarkets ();
         const market = this.market (symbol);
+        let columnar = false;
+        [ columnar, params ] = this.handleOptionAndParams (params, 'fetchOrderBook', 'columnar', false);
         const request = {
             'symbol': market['id'],
         };
@@ -2360,7 +2396,7 @@ export default class bybit extends Exchange {
         //
         const result = this.safeValue (response, 'result', []);
         const timestamp = this.safeInteger (result, 'ts');
-        return this.parseOrderBook (result, symbol, timestamp, 'b', 'a');
+        return this.bulkParseOrderBook (result, symbol, timestamp, 'b', 'a', 0, 1, columnar);
     }
 
     parseBalance (response) {
@@ -5431,6 +5467,36 @@ export default class bybit extends Exchange {
         return result;
     }
 
+    parseRateLimitHeaders (headers, url, method) {
+        //
+        //     X-Bapi-Limit-Status: 9
+        //     X-Bapi-Limit: 10
+        //     X-Bapi-Limit-Reset-Timestamp: 1672515790000
+        //
+        const remaining = this.safeFloat (headers, 'X-Bapi-Limit-Status');
+        if (remaining === undefined) {
+            return undefined;
+        }
+        const rateLimitHeaders = this.safeValue (this.options, 'rateLimitHeaders', {});
+        const parts = url.split ('?');
+        const path = parts[0];
+        const index = path.indexOf ('/v5/');
+        if (index < 0) {
+            return undefined;
+        }
+        const bucket = this.safeString (rateLimitHeaders, path.slice (index + 1));
+        if (bucket === undefined) {
+            return undefined;
+        }
+        const result = {};
+        result[bucket] = {
+            'remaining': remaining,
+            'interval': 1000, // the order endpoints are limited per second
+            'reset': this.safeInteger (headers, 'X-Bapi-Limit-Reset-Timestamp'),
+        };
+        return result;
+    }
+
     sign (path, api: any = 'public', method = 'GET', params = {}, headers: any = undefined, body: any = undefined) {
         let url = this.implodeHostname (this.urls['api'][api]) + '/' + path;
         if (api === 'public') {
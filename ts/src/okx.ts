@@ -1350,10 +1350,13 @@ export default class okx extends Exchange {
          * @param {string} symbol unified symbol of the market to fetch the order book for
          * @param {int|undefined} limit the maximum amount of order book entries to return
          * @param {object} params extra parameters specific to the okx api endpoint
+         * @param {bool|undefined} params.columnar python only, true to return the prices and amounts of each side as columns
          * @returns {object} A dictionary of [order book structures]{@link https://docs.ccxt.com/#/?id=order-book-structure} indexed by market symbols
          */
         await this.loadMarkets ();
         const market = this.market (symbol);
+        let columnar = false;
+        [ columnar, params ] = this.handleOptionAndParams (params, 'fetchOrderBook', 'columnar', false);
         const request = {
             'instId': market['id'],
         };
@@ -1386,7 +1389,7 @@ export default class okx extends Exchange {
         const data = this.safeValue (response, 'data', []);
         const first = this.safeValue (data, 0, {});
         const timestamp = this.safeInteger (first, 'ts');
-        return this.parseOrderBook (first, symbol, timestamp);
+        return this.bulkParseOrderBook (first, symbol, timestamp, 'bids', 'asks', 0, 1, columnar);
     }
 
     parseTicker (ticker, market = undefined) {
@@ -1641,10 +1644,13 @@ export default class okx extends Exchange {
          * @param {int|undefined} since timestamp in ms of the earliest trade to fetch
          * @param {int|undefined} limit the maximum amount of trades to fetch
          * @param {object} params extra parameters specific to the okx api endpoint
+         * @param {bool|undefined} params.columnar python only, true to return the timestamps, prices, amounts, ids and sides of the trades as columns
          * @returns {[object]} a list of [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades}
          */
         await this.loadMarkets ();
         const market = this.market (symbol);
+        let columnar = false;
+        [ columnar, params ] = this.handleOptionAndParams (params, 'fetchTrades', 'columnar', false);
         const request = {
             'instId': market['id'],
         };
@@ -1664,7 +1670,8 @@ export default class okx extends Exchange {
         //     }
         //
         const data = this.safeValue (response, 'data', []);
-        return this.parseTrades (data, market, since, limit);
+        const keys = { 'timestamp': 'ts', 'price': 'px', 'amount': 'sz', 'id': 'tradeId', 'side': 'side' };
+        return this.bulkParseTrades (data, market, since, limit, {}, keys, undefined, columnar);
     }
 
     parseOHLCV (ohlcv, market = undefined) {
@@ -1710,12 +1717,21 @@ export default class okx extends Exchange {
          * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
          * @param {int|undefined} limit the maximum amount of candles to fetch
          * @param {object} params extra parameters specific to the okx api endpoint
+         * @param {bool|undefined} params.columnar python only, true to return the candles in an OHLCV, a typed array per column, see columnar.py
          * @param {string|undefined} params.price "mark" or "index" for mark price and index price candles
          * @param {int|undefined} params.until timestamp in ms of the latest candle to fetch
+         * @param {bool|undefined} params.paginate true to fetch the candles from since to until in windows of 100 at once, see Exchange.fetchPaginatedCallDeterministic ()
          * @returns {[[int]]} A list of candles ordered as timestamp, open, high, low, close, volume
          */
         await this.loadMarkets ();
+        let paginate = false;
+        [ paginate, params ] = this.handleOptionAndParams (params, 'fetchOHLCV', 'paginate');
+        if (paginate) {
+            return await this.fetchPaginatedCallDeterministic ('fetchOHLCV', symbol, since, limit, timeframe, params, 100);
+        }
         const market = this.market (symbol);
+        let columnar = false;
+        [ columnar, params ] = this.handleOptionAndParams (params, 'fetchOHLCV', 'columnar', false);
         const price = this.safeString (params, 'price');
         params = this.omit (params, 'price');
         const options = this.safeValue (this.options, 'fetchOHLCV', {});
@@ -1774,7 +1790,10 @@ export default class okx extends Exchange {
         //     }
         //
         const data = this.safeValue (response, 'data', []);
-        return this.parseOHLCVs (data, market, timeframe, since, limit);
+        // the volume index of parseOHLCV ()
+        const res = this.handleMarketTypeAndParams ('fetchOHLCV', market, undefined);
+        const volumeIndex = (res[0] === 'spot') ? 5 : 6;
+        return this.bulkParseOHLCVs (data, market, timeframe, since, limit, [ 0, 1, 2, 3, 4, volumeIndex ], columnar);
     }
 
     async fetchFundingRateHistory (symbol: string = undefined, since: any = undefined, limit: any = undefined, params = {}) {
@@ -3265,9 +3284,15 @@ export default class okx extends Exchange {
          * @param {int|undefined} since the earliest time in ms to fetch trades for
          * @param {int|undefined} limit the maximum number of trades structures to retrieve
          * @param {object} params extra parameters specific to the okx api endpoint
+         * @param {bool|undefined} params.paginate true to fetch the trades back to since page by page by billId, see Exchange.fetchPaginatedCallCursor ()
          * @returns {[object]} a list of [trade structures]{@link https://docs.ccxt.com/#/?id=trade-structure}
          */
         await this.loadMarkets ();
+        let paginate = false;
+        [ paginate, params ] = this.handleOptionAndParams (params, 'fetchMyTrades', 'paginate');
+        if (paginate) {
+            return await this.fetchPaginatedCallCursor ('fetchMyTrades', symbol, since, limit, params, 'billId', 'after', undefined, 100);
+        }
         const request = {
             // 'instType': 'SPOT', // SPOT, MARGIN, SWAP, FUTURES, OPTION
             // 'uly': currency['id'],
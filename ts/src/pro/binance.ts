@@ -4,7 +4,7 @@
 import binanceRest from '../binance.js';
 import { Precise } from '../base/Precise.js';
 import { ExchangeError, ArgumentsRequired } from '../base/errors.js';
-import { ArrayCache, ArrayCacheByTimestamp, ArrayCacheBySymbolById } from '../base/ws/Cache.js';
+import { ArrayCache } from '../base/ws/Cache.js';
 
 // -----------------------------------------------------------------------------
 
@@ -17,10 +17,13 @@ export default class binance extends binanceRest {
                 'watchMyTrades': true,
                 'watchOHLCV': true,
                 'watchOrderBook': true,
+                'watchOrderBookForSymbols': true,
+                'watchOHLCVForSymbols': true,
                 'watchOrders': true,
                 'watchTicker': true,
                 'watchTickers': true,
                 'watchTrades': true,
+                'watchTradesForSymbols': true,
             },
             'urls': {
                 'test': {
@@ -80,6 +83,7 @@ export default class binance extends binanceRest {
                 'listenKeyRefreshRate': 1200000, // 20 mins
                 'ws': {
                     'cost': 5,
+                    'maxTopicsPerMessage': 200,
                 },
             },
         });
@@ -196,6 +200,49 @@ export default class binance extends binanceRest {
         return orderbook.limit ();
     }
 
+    async watchOrderBookForSymbols (symbols: string[], limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name binance#watchOrderBookForSymbols
+         * @description watches the order books of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch the order books for
+         * @param {int|undefined} limit the maximum amount of order book entries to return
+         * @param {object} params extra parameters specific to the binance api endpoint
+         * @returns {object} the [order book structure]{@link https://docs.ccxt.com/#/?id=order-book-structure} of the market that updated
+         */
+        if (limit !== undefined) {
+            if ((limit !== 5) && (limit !== 10) && (limit !== 20) && (limit !== 50) && (limit !== 100) && (limit !== 500) && (limit !== 1000)) {
+                throw new ExchangeError (this.id + ' watchOrderBookForSymbols limit argument must be undefined, 5, 10, 20, 50, 100, 500 or 1000');
+            }
+        }
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchOrderBookForSymbols');
+        const type = this.marketTypeForWatch (symbols[0]);
+        const name = 'depth';
+        const watchOrderBookRate = this.safeString (this.options, 'watchOrderBookRate', '100');
+        const messageHashes = [];
+        const topics = [];
+        const subscriptions = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            const messageHash = market['lowercaseId'] + '@' + name;
+            messageHashes.push (messageHash);
+            topics.push (messageHash + '@' + watchOrderBookRate + 'ms');
+            subscriptions.push ({
+                'messageHash': messageHash,
+                'name': name,
+                'symbol': market['symbol'],
+                'method': this.handleOrderBookSubscription,
+                'limit': limit,
+                'type': type,
+                'params': params,
+            });
+        }
+        // every order book is loaded from its own snapshot once the packed request is confirmed
+        const orderbook = await this.watchMultipleStreams (type, messageHashes, topics, params, subscriptions);
+        return orderbook.limit ();
+    }
+
     async fetchOrderBookSnapshot (client, message, subscription) {
         const messageHash = this.safeString (subscription, 'messageHash');
         const symbol = this.safeString (subscription, 'symbol');
@@ -256,9 +303,7 @@ export default class binance extends binanceRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        bookside.applyLevels (deltas);
     }
 
     handleOrderBookMessage (client, message, orderbook) {
@@ -294,7 +339,7 @@ export default class binance extends binanceRest {
         const index = client.url.indexOf ('/stream');
         const marketType = (index >= 0) ? 'spot' : 'contract';
         const marketId = this.safeString (message, 's');
-        const market = this.safeMarket (marketId, undefined, undefined, marketType);
+        const market = this.safeMarketById (marketId, marketType);
         const symbol = market['symbol'];
         const name = 'depth';
         const messageHash = market['lowercaseId'] + '@' + name;
@@ -387,15 +432,88 @@ export default class binance extends binanceRest {
         //     }
         //
         const id = this.safeString (message, 'id');
-        const subscriptionsById = this.indexBy (client.subscriptions, 'id');
-        const subscription = this.safeValue (subscriptionsById, id, {});
-        const method = this.safeValue (subscription, 'method');
-        if (method !== undefined) {
-            method.call (this, client, message, subscription);
+        // the subscriptions of a watch*ForSymbols() call share the id of their packed request
+        const subscriptions = Object.values (client.subscriptions);
+        for (let i = 0; i < subscriptions.length; i++) {
+            const subscription = subscriptions[i];
+            if ((typeof subscription === 'object') && (this.safeString (subscription, 'id') === id)) {
+                const method = this.safeValue (subscription, 'method');
+                if (method !== undefined) {
+                    method.call (this, client, message, subscription);
+                }
+            }
         }
         return message;
     }
 
+    watchMultipleStreams (type, messageHashes, topics, params = {}, subscriptions = undefined, keys = undefined) {
+        // one subscription per topic on one stream, the requests share an id and are packed
+        // up to options['ws']['maxTopicsPerMessage'] params
+        const url = this.urls['api']['ws'][type] + '/' + this.stream (type, messageHashes.join (','));
+        const requestId = this.requestId (url);
+        const messages = [];
+        for (let i = 0; i < topics.length; i++) {
+            const request = {
+                'method': 'SUBSCRIBE',
+                'params': [
+                    topics[i],
+                ],
+                'id': requestId,
+            };
+            messages.push (this.extend (request, params));
+        }
+        if (subscriptions === undefined) {
+            subscriptions = [];
+            for (let i = 0; i < topics.length; i++) {
+                subscriptions.push ({
+                    'id': requestId,
+                });
+            }
+        } else {
+            for (let i = 0; i < subscriptions.length; i++) {
+                subscriptions[i]['id'] = requestId.toString ();
+            }
+        }
+        return this.watchMultiple (url, messageHashes, messages, messageHashes, subscriptions, keys);
+    }
+
+    marketTypeForWatch (symbol) {
+        const market = this.market (symbol);
+        let type = market['type'];
+        if (market['contract']) {
+            type = market['linear'] ? 'future' : 'delivery';
+        }
+        return type;
+    }
+
+    async resubscribe (client) {
+        // the replayed requests get ids of their own, their responses match no subscription,
+        // so every order book is reloaded once, by resyncSubscription () and not again by the response
+        const hashes = Object.keys (client.subscriptions);
+        const packed = this.packSubscribeMessages (client, this.subscribedMessages (client));
+        const replayed = [];
+        for (let i = 0; i < packed.length; i++) {
+            replayed.push (this.extend (packed[i], { 'id': this.requestId (client.url) }));
+        }
+        await this.sendSubscribeMessages (client, replayed, []);
+        for (let i = 0; i < hashes.length; i++) {
+            const subscription = this.safeValue (client.subscriptions, hashes[i]);
+            if (subscription !== undefined) {
+                this.resyncSubscription (client, hashes[i], subscription);
+            }
+        }
+    }
+
+    resyncSubscription (client, subscribeHash, subscription) {
+        // after a reconnect the order books are rebuilt from a new snapshot, the way the subscription response does it
+        if (typeof subscription === 'object') {
+            const method = this.safeValue (subscription, 'method');
+            if (method !== undefined) {
+                method.call (this, client, undefined, subscription);
+            }
+        }
+    }
+
     async watchTrades (symbol, since: any = undefined, limit: any = undefined, params = {}) {
         /**
          * @method
@@ -436,6 +554,36 @@ export default class binance extends binanceRest {
         return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
     }
 
+    async watchTradesForSymbols (symbols: string[], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name binance#watchTradesForSymbols
+         * @description get the list of most recent trades of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch trades for
+         * @param {int|undefined} since timestamp in ms of the earliest trade to fetch
+         * @param {int|undefined} limit the maximum amount of trades to fetch
+         * @param {object} params extra parameters specific to the binance api endpoint
+         * @returns {[object]} a list of [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTradesForSymbols');
+        const options = this.safeValue (this.options, 'watchTrades', {});
+        const name = this.safeString (options, 'name', 'trade');
+        const type = this.marketTypeForWatch (symbols[0]);
+        const query = this.omit (params, 'type');
+        const messageHashes = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push (market['lowercaseId'] + '@' + name);
+        }
+        const trades = await this.watchMultipleStreams (type, messageHashes, messageHashes, query);
+        if (this.newUpdates) {
+            const first = this.safeValue (trades, 0);
+            limit = trades.getLimit (this.safeString (first, 'symbol'), limit);
+        }
+        return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
+    }
+
     parseTrade (trade, market = undefined) {
         //
         // public watchTrades
@@ -605,7 +753,7 @@ export default class binance extends binanceRest {
         const index = client.url.indexOf ('/stream');
         const marketType = (index >= 0) ? 'spot' : 'contract';
         const marketId = this.safeString (message, 's');
-        const market = this.safeMarket (marketId, undefined, undefined, marketType);
+        const market = this.safeMarketById (marketId, marketType);
         const symbol = market['symbol'];
         const lowerCaseId = this.safeStringLower (message, 's');
         const event = this.safeString (message, 'e');
@@ -669,6 +817,45 @@ export default class binance extends binanceRest {
         return this.filterBySinceLimit (ohlcv, since, limit, 0, true);
     }
 
+    async watchOHLCVForSymbols (symbolsAndTimeframes: string[][], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name binance#watchOHLCVForSymbols
+         * @description watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+         * @param {[[string]]} symbolsAndTimeframes the [symbol, timeframe] pairs to watch
+         * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
+         * @param {int|undefined} limit the maximum amount of candles to fetch
+         * @param {object} params extra parameters specific to the binance api endpoint
+         * @returns {object} the candles of the market and timeframe that updated, indexed by symbol and timeframe
+         */
+        await this.loadMarkets ();
+        const symbols = this.marketSymbolsForWatch (this.symbolsOfPairs (symbolsAndTimeframes), 'watchOHLCVForSymbols');
+        const options = this.safeValue (this.options, 'watchOHLCV', {});
+        const nameOption = this.safeString (options, 'name', 'kline');
+        const name = this.safeString (params, 'name', nameOption);
+        params = this.omit (params, 'name');
+        const type = this.marketTypeForWatch (symbols[0]);
+        const messageHashes = [];
+        const keys = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            let marketId = market['lowercaseId'];
+            if (name === 'indexPriceKline') {
+                marketId = marketId.replace ('_perp', '');
+            }
+            const timeframe = symbolsAndTimeframes[i][1];
+            const interval = this.safeString (this.timeframes, timeframe, timeframe);
+            messageHashes.push (marketId + '@' + name + '_' + interval);
+            keys.push ([ symbols[i], timeframe ]);
+        }
+        const [ key, ohlcv ] = await this.watchMultipleStreams (type, messageHashes, messageHashes, params, undefined, keys);
+        if (this.newUpdates) {
+            limit = ohlcv.getLimit (key[0], limit);
+        }
+        const filtered = this.filterBySinceLimit (ohlcv, since, limit, 0, true);
+        return this.createOhlcvObject (key[0], key[1], filtered);
+    }
+
     handleOHLCV (client, message) {
         //
         //     {
@@ -728,7 +915,7 @@ export default class binance extends binanceRest {
         let stored = this.safeValue (this.ohlcvs[symbol], timeframe);
         if (stored === undefined) {
             const limit = this.safeInteger (this.options, 'OHLCVLimit', 1000);
-            stored = new ArrayCacheByTimestamp (limit);
+            stored = this.ohlcvCache (limit);
             this.ohlcvs[symbol][timeframe] = stored;
         }
         stored.append (parsed);
@@ -788,7 +975,7 @@ export default class binance extends binanceRest {
         let type = undefined;
         [ type, params ] = this.handleMarketTypeAndParams ('watchTickers', market, params);
         if (marketIds !== undefined) {
-            market = this.safeMarket (marketIds[0], undefined, undefined, type);
+            market = this.safeMarketById (marketIds[0], type);
         }
         let subType = undefined;
         [ subType, params ] = this.handleSubTypeAndParams ('watchTickers', market, params);
@@ -1650,7 +1837,7 @@ export default class binance extends binanceRest {
             }
             if (this.myTrades === undefined) {
                 const limit = this.safeInteger (this.options, 'tradesLimit', 1000);
-                this.myTrades = new ArrayCacheBySymbolById (limit);
+                this.myTrades = this.myTradesCache (limit);
             }
             const myTrades = this.myTrades;
             myTrades.append (trade);
@@ -1668,7 +1855,7 @@ export default class binance extends binanceRest {
         if (symbol !== undefined) {
             if (this.orders === undefined) {
                 const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
-                this.orders = new ArrayCacheBySymbolById (limit);
+                this.orders = this.ordersCache (limit);
             }
             const cachedOrders = this.orders;
             const orders = this.safeValue (cachedOrders.hashmap, symbol, {});
@@ -3,7 +3,7 @@
 
 import bingxRest from '../bingx.js';
 import { AuthenticationError, ExchangeError, BadRequest } from '../base/errors.js';
-import { ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp } from '../base/ws/Cache.js';
+import { ArrayCache, ArrayCacheByTimestamp } from '../base/ws/Cache.js';
 
 //  ---------------------------------------------------------------------------
 
@@ -16,10 +16,12 @@ export default class bingx extends bingxRest {
                 'watchMyTrades': false,
                 'watchOHLCV': false,
                 'watchOrderBook': true,
+                'watchOrderBookForSymbols': true,
                 'watchOrders': true,
                 'watchTicker': true,
                 'watchTickers': false, // for now
                 'watchTrades': true,
+                'watchTradesForSymbols': true,
                 'watchPosition': undefined,
             },
             'urls': {
@@ -29,6 +31,9 @@ export default class bingx extends bingxRest {
                 },
             },
             'options': {
+                'ws': {
+                    'maxTopicsPerConnection': 200, // a connection takes up to 200 subscriptions
+                },
                 'wsTimeFrames': {
                     '1m': '1min',
                     '3m': '3min',
@@ -133,6 +138,37 @@ export default class bingx extends bingxRest {
         return orderbook;
     }
 
+    async watchOrderBookForSymbols (symbols: string[], limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name bingx#watchOrderBookForSymbols
+         * @description watches the order books of several markets
+         * @param {[string]} symbols unified symbols of the markets to fetch the order books for
+         * @param {int|undefined} limit the maximum amount of order book entries to return.
+         * @param {object} params extra parameters specific to the bingx api endpoint
+         * @returns {object} the [order book structure]{@link https://docs.ccxt.com/#/?id=order-book-structure} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchOrderBookForSymbols');
+        const url = this.urls['api']['ws'];
+        params = this.cleanParams (params);
+        if (limit === undefined) {
+            limit = 100;
+        } else {
+            if ((limit !== 5) && (limit !== 10) && (limit !== 20) && (limit !== 50) && (limit !== 100)) {
+                throw new BadRequest (this.id + ' watchOrderBookForSymbols() can only use limit 5, 10, 20, 50 and 100.');
+            }
+        }
+        const messageHashes = [];
+        const topics = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push ('orderbook' + ':' + market['symbol']);
+            topics.push ('market.depth.' + market['id'] + '.step0.level' + limit.toString ());
+        }
+        return await this.watchTopicsMultiple (url, messageHashes, topics, params);
+    }
+
     handleOrderBook (client, message) {
         const data = this.safeValue (message, 'data', {});
         const dataType = this.safeValue (message, 'dataType', '');
@@ -151,6 +187,7 @@ export default class bingx extends bingxRest {
         const bids = this.safeValue (data, 'bids', []);
         this.handleDeltas (orderbook['asks'], asks);
         this.handleDeltas (orderbook['bids'], bids);
+        orderbook['symbol'] = symbol;
         orderbook['timestamp'] = timestamp;
         orderbook['datetime'] = this.iso8601 (timestamp);
         const messageHash = 'orderbook' + ':' + symbol;
@@ -164,9 +201,7 @@ export default class bingx extends bingxRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        bookside.applyLevels (deltas, 'price', 'volume');
     }
 
     handleOHLCV (client, message) {
@@ -277,6 +312,40 @@ export default class bingx extends bingxRest {
         return newTrades;
     }
 
+    async watchTradesForSymbols (symbols: string[], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name bingx#watchTradesForSymbols
+         * @description watches the trades of several markets
+         * @param {[string]} symbols unified symbols of the markets the trades were made in
+         * @param {int|undefined} since the earliest time in ms to fetch trades for
+         * @param {int|undefined} limit the maximum number of trade structures to retrieve
+         * @param {object} params extra parameters specific to the bingx api endpoint
+         * @returns {[object]} a list of [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTradesForSymbols');
+        const url = this.urls['api']['ws'];
+        params = this.cleanParams (params);
+        const messageHashes = [];
+        const topics = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push ('trade:' + market['symbol']);
+            topics.push ('market.trade.detail.' + market['id']);
+        }
+        const trades = await this.watchTopicsMultiple (url, messageHashes, topics, params);
+        if (this.newUpdates) {
+            const first = this.safeValue (trades, 0);
+            limit = trades.getLimit (this.safeString (first, 'symbol'), limit);
+        }
+        // the trades are sent again with every update, see watchTrades ()
+        const tradesSince = this.safeInteger (this.options, 'tradesSince', since);
+        const newTrades = this.filterBySinceLimit (trades, tradesSince, limit, 'timestamp', true);
+        this.options = this.extend (this.options, { 'tradesSince': this.milliseconds () - 0 });
+        return newTrades;
+    }
+
     handleTrades (client, message) {
         //
         //     {
@@ -488,7 +557,7 @@ export default class bingx extends bingxRest {
         //
         if (this.orders === undefined) {
             const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
-            this.orders = new ArrayCacheBySymbolById (limit);
+            this.orders = this.ordersCache (limit);
         }
         const orders = this.orders;
         let rawOrders = [];
@@ -522,6 +591,20 @@ export default class bingx extends bingxRest {
         return await this.watch (url, messageHash, message, messageHash, shouldThrottle);
     }
 
+    async watchTopicsMultiple (url, messageHashes, topics = [], params = {}, keys = undefined) {
+        // a request per topic, the protocol takes one dataType, sent together on one connection
+        const messages = [];
+        for (let i = 0; i < topics.length; i++) {
+            const request = {
+                'id': '' + this.requestId ().toString (),
+                'reqType': 'sub',
+                'dataType': topics[i],
+            };
+            messages.push (this.extend (request, params));
+        }
+        return await this.watchMultiple (url, messageHashes, messages, messageHashes, undefined, keys);
+    }
+
     async authenticate (params = {}) {
         // this.checkRequiredCredentials ();
         // const messageHash = 'authenticated';
@@ -703,7 +786,8 @@ export default class bingx extends bingxRest {
     }
 
     ping (client) {
-        this.client (this.urls['api']['ws']).send ('Ping');
+        // every connection of a sharded url pings on its own
+        client.send ('Ping');
         return {
             'ping': this.uuid (),
             'time': this.iso8601 (this.milliseconds ()),
@@ -711,8 +795,8 @@ export default class bingx extends bingxRest {
     }
 
     sendPong (client, message) {
-        this.client (this.urls['api']['ws']).send ('Pong');
-        this.client (this.urls['api']['ws']).send (this.json ({
+        client.send ('Pong');
+        client.send (this.json ({
             'ping': this.uuid (),
             'time': this.iso8601 (this.milliseconds ()),
         }));
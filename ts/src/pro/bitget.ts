@@ -1,9 +1,9 @@
 //  ---------------------------------------------------------------------------
 
 import bitgetRest from '../bitget.js';
-import { AuthenticationError, BadRequest, ArgumentsRequired, NotSupported, InvalidNonce } from '../base/errors.js';
+import { AuthenticationError, BadRequest, ArgumentsRequired, NotSupported } from '../base/errors.js';
 import { Precise } from '../base/Precise.js';
-import { ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp } from '../base/ws/Cache.js';
+import { ArrayCache, ArrayCacheByTimestamp } from '../base/ws/Cache.js';
 
 //  ---------------------------------------------------------------------------
 
@@ -18,8 +18,11 @@ export default class bitget extends bitgetRest {
                 'watchOrderBook': true,
                 'watchOrders': true,
                 'watchTicker': true,
-                'watchTickers': false,
+                'watchTickers': true,
                 'watchTrades': true,
+                'watchOrderBookForSymbols': true,
+                'watchTradesForSymbols': true,
+                'watchOHLCVForSymbols': true,
             },
             'urls': {
                 'api': {
@@ -29,6 +32,10 @@ export default class bitget extends bitgetRest {
             'options': {
                 'tradesLimit': 1000,
                 'OHLCVLimit': 1000,
+                'ws': {
+                    'packSubscriptions': true, // the args of one loop iteration go in one subscribe request
+                    'maxTopicsPerConnection': 50, // bitget recommends less than 50 channels per connection
+                },
                 // WS timeframes differ from REST timeframes
                 'timeframes': {
                     '1m': '1m',
@@ -119,6 +126,37 @@ export default class bitget extends bitgetRest {
         return await this.watchPublic (messageHash, args, params);
     }
 
+    async watchTickers (symbols: string[] = undefined, params = {}) {
+        /**
+         * @method
+         * @name bitget#watchTickers
+         * @description watches the price tickers of several markets, subscribed in as few requests as possible
+         * @param {[str]} symbols unified symbols of the markets to fetch the tickers for
+         * @param {dict} params extra parameters specific to the bitget api endpoint
+         * @returns {dict} the [ticker structure]{@link https://docs.ccxt.com/en/latest/manual.html#ticker-structure} of the market that updated, indexed by its symbol
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTickers');
+        const messageHashes = [];
+        const argsList = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push ('ticker:' + market['symbol']);
+            argsList.push ({
+                'instType': market['spot'] ? 'sp' : 'mc',
+                'channel': 'ticker',
+                'instId': this.getWsMarketId (market),
+            });
+        }
+        const ticker = await this.watchPublicMultiple (messageHashes, argsList, params);
+        if (this.newUpdates) {
+            const result = {};
+            result[ticker['symbol']] = ticker;
+            return result;
+        }
+        return this.filterByArray (this.tickers, 'symbol', symbols);
+    }
+
     handleTicker (client, message) {
         //
         //   {
@@ -273,6 +311,43 @@ export default class bitget extends bitgetRest {
         return this.filterBySinceLimit (ohlcv, since, limit, 0, true);
     }
 
+    async watchOHLCVForSymbols (symbolsAndTimeframes: string[][], since = undefined, limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name bitget#watchOHLCVForSymbols
+         * @description watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+         * @param {[[str]]} symbolsAndTimeframes the [symbol, timeframe] pairs to watch
+         * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
+         * @param {int|undefined} limit the maximum amount of candles to fetch
+         * @param {dict} params extra parameters specific to the bitget api endpoint
+         * @returns {dict} the candles of the market and timeframe that updated, indexed by symbol and timeframe
+         */
+        await this.loadMarkets ();
+        const symbols = this.marketSymbolsForWatch (this.symbolsOfPairs (symbolsAndTimeframes), 'watchOHLCVForSymbols');
+        const timeframes = this.safeValue (this.options, 'timeframes');
+        const messageHashes = [];
+        const argsList = [];
+        const keys = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            const timeframe = symbolsAndTimeframes[i][1];
+            const interval = this.safeString (timeframes, timeframe);
+            messageHashes.push ('candles:' + timeframe + ':' + market['symbol']);
+            argsList.push ({
+                'instType': market['spot'] ? 'sp' : 'mc',
+                'channel': 'candle' + interval,
+                'instId': this.getWsMarketId (market),
+            });
+            keys.push ([ market['symbol'], timeframe ]);
+        }
+        const [ key, ohlcv ] = await this.watchPublicMultiple (messageHashes, argsList, params, keys);
+        if (this.newUpdates) {
+            limit = ohlcv.getLimit (key[0], limit);
+        }
+        const filtered = this.filterBySinceLimit (ohlcv, since, limit, 0, true);
+        return this.createOhlcvObject (key[0], key[1], filtered);
+    }
+
     handleOHLCV (client, message) {
         //
         //   {
@@ -381,6 +456,43 @@ export default class bitget extends bitgetRest {
         }
     }
 
+    async watchOrderBookForSymbols (symbols: string[], limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name bitget#watchOrderBookForSymbols
+         * @description watches the order books of several markets, subscribed in as few requests as possible
+         * @param {[str]} symbols unified symbols of the markets to fetch the order books for
+         * @param {int|undefined} limit the maximum amount of order book entries to return
+         * @param {dict} params extra parameters specific to the bitget api endpoint
+         * @returns {dict} the [order book structure]{@link https://docs.ccxt.com/en/latest/manual.html#order-book-structure} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchOrderBookForSymbols');
+        let channel = 'books';
+        let incrementalFeed = true;
+        if ((limit === 5) || (limit === 15)) {
+            channel += limit.toString ();
+            incrementalFeed = false;
+        }
+        const messageHashes = [];
+        const argsList = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push ('orderbook' + ':' + market['symbol']);
+            argsList.push ({
+                'instType': market['spot'] ? 'sp' : 'mc',
+                'channel': channel,
+                'instId': this.getWsMarketId (market),
+            });
+        }
+        const orderbook = await this.watchPublicMultiple (messageHashes, argsList, params);
+        if (incrementalFeed) {
+            return orderbook.limit ();
+        } else {
+            return orderbook;
+        }
+    }
+
     handleOrderBook (client, message) {
         //
         //   {
@@ -425,7 +537,14 @@ export default class bitget extends bitgetRest {
         if (incrementalBook) {
             storedOrderBook = this.safeValue (this.orderbooks, symbol);
             if (storedOrderBook === undefined) {
-                storedOrderBook = this.countedOrderBook ({});
+                const action = this.safeString (message, 'action');
+                if (action !== 'snapshot') {
+                    // dropped after a checksum mismatch, waiting for the next snapshot
+                    return;
+                }
+                storedOrderBook = this.orderBook ({});
+                storedOrderBook.retainRaw ();
+                storedOrderBook['symbol'] = symbol;
             }
             const asks = this.safeValue (rawOrderBook, 'asks', []);
             const bids = this.safeValue (rawOrderBook, 'bids', []);
@@ -435,27 +554,9 @@ export default class bitget extends bitgetRest {
             storedOrderBook['datetime'] = this.iso8601 (timestamp);
             const checksum = this.safeValue (this.options, 'checksum', true);
             if (checksum) {
-                const storedAsks = storedOrderBook['asks'];
-                const storedBids = storedOrderBook['bids'];
-                const asksLength = storedAsks.length;
-                const bidsLength = storedBids.length;
-                const payloadArray = [];
-                for (let i = 0; i < 25; i++) {
-                    if (i < bidsLength) {
-                        payloadArray.push (storedBids[i][2][0]);
-                        payloadArray.push (storedBids[i][2][1]);
-                    }
-                    if (i < asksLength) {
-                        payloadArray.push (storedAsks[i][2][0]);
-                        payloadArray.push (storedAsks[i][2][1]);
-                    }
-                }
-                const payload = payloadArray.join (':');
-                const calculatedChecksum = this.crc32 (payload, true);
                 const responseChecksum = this.safeInteger (rawOrderBook, 'checksum');
-                if (calculatedChecksum !== responseChecksum) {
-                    const error = new InvalidNonce (this.id + ' invalid checksum');
-                    client.reject (error, messageHash);
+                if (!this.verifyOrderBookChecksum (client, storedOrderBook, responseChecksum, messageHash)) {
+                    return;
                 }
             }
         } else {
@@ -467,16 +568,26 @@ export default class bitget extends bitgetRest {
 
     handleDelta (bookside, delta) {
         const bidAsk = this.parseBidAsk (delta, 0, 1);
-        // we store the string representations in the orderbook for checksum calculation
-        // this simplifies the code for generating checksums as we do not need to do any complex number transformations
-        bidAsk.push (delta);
         bookside.storeArray (bidAsk);
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        // the raw strings are kept by the book for checksum calculation
+        bookside.applyLevels (deltas);
+    }
+
+    async resubscribeOrderBook (client, symbol, messageHash) {
+        // bitget pushes a new snapshot once the channel is subscribed again
+        const market = this.market (symbol);
+        const args = [
+            {
+                'instType': market['spot'] ? 'sp' : 'mc',
+                'channel': 'books',
+                'instId': this.getWsMarketId (market),
+            },
+        ];
+        await client.send ({ 'op': 'unsubscribe', 'args': args });
+        await client.send ({ 'op': 'subscribe', 'args': args });
     }
 
     async watchTrades (symbol, since = undefined, limit = undefined, params = {}) {
@@ -507,6 +618,38 @@ export default class bitget extends bitgetRest {
         return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
     }
 
+    async watchTradesForSymbols (symbols: string[], since = undefined, limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name bitget#watchTradesForSymbols
+         * @description get the list of most recent trades of several markets, subscribed in as few requests as possible
+         * @param {[str]} symbols unified symbols of the markets to fetch trades for
+         * @param {int|undefined} since timestamp in ms of the earliest trade to fetch
+         * @param {int|undefined} limit the maximum amount of trades to fetch
+         * @param {dict} params extra parameters specific to the bitget api endpoint
+         * @returns {[dict]} a list of the [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTradesForSymbols');
+        const messageHashes = [];
+        const argsList = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push ('trade:' + market['symbol']);
+            argsList.push ({
+                'instType': market['spot'] ? 'sp' : 'mc',
+                'channel': 'trade',
+                'instId': this.getWsMarketId (market),
+            });
+        }
+        const trades = await this.watchPublicMultiple (messageHashes, argsList, params);
+        if (this.newUpdates) {
+            const first = this.safeValue (trades, 0);
+            limit = trades.getLimit (this.safeString (first, 'symbol'), limit);
+        }
+        return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
+    }
+
     handleTrades (client, message) {
         //
         //    {
@@ -652,7 +795,7 @@ export default class bitget extends bitgetRest {
         const data = this.safeValue (message, 'data', []);
         if (this.orders === undefined) {
             const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
-            this.orders = new ArrayCacheBySymbolById (limit);
+            this.orders = this.ordersCache (limit);
         }
         const stored = this.orders;
         const marketSymbols = {};
@@ -1027,6 +1170,20 @@ export default class bitget extends bitgetRest {
         return await this.watch (url, messageHash, message, messageHash, shouldThrottle);
     }
 
+    async watchPublicMultiple (messageHashes, argsList, params = {}, keys = undefined) {
+        // a subscription per args, the requests are packed up to options['ws']['maxTopicsPerMessage'] args
+        const url = this.urls['api']['ws'];
+        const messages = [];
+        for (let i = 0; i < argsList.length; i++) {
+            const request = {
+                'op': 'subscribe',
+                'args': [ argsList[i] ],
+            };
+            messages.push (this.extend (request, params));
+        }
+        return await this.watchMultiple (url, messageHashes, messages, messageHashes, undefined, keys);
+    }
+
     async authenticate (params = {}) {
         this.checkRequiredCredentials ();
         const url = this.urls['api']['ws'];
@@ -1094,6 +1251,23 @@ export default class bitget extends bitgetRest {
         return message;
     }
 
+    messageRoutes () {
+        return {
+            'channel': {
+                'exact': {
+                    'ticker': this.handleTicker,
+                    'trade': this.handleTrades,
+                    'orders': this.handleOrder,
+                    'account': this.handleBalance,
+                },
+                'contains': {
+                    'candle': this.handleOHLCV,
+                    'books': this.handleOrderBook,
+                },
+            },
+        };
+    }
+
     handleMessage (client, message) {
         //
         //   {
@@ -1150,24 +1324,9 @@ export default class bitget extends bitgetRest {
             this.handleSubscriptionStatus (client, message);
             return;
         }
-        const methods = {
-            'ticker': this.handleTicker,
-            'trade': this.handleTrades,
-            'orders': this.handleOrder,
-            'account': this.handleBalance,
-        };
         const arg = this.safeValue (message, 'arg', {});
         const topic = this.safeValue (arg, 'channel', '');
-        const method = this.safeValue (methods, topic);
-        if (method !== undefined) {
-            method.call (this, client, message);
-        }
-        if (topic.indexOf ('candle') >= 0) {
-            this.handleOHLCV (client, message);
-        }
-        if (topic.indexOf ('books') >= 0) {
-            this.handleOrderBook (client, message);
-        }
+        this.routeMessage (client, message, topic);
     }
 
     ping (client) {
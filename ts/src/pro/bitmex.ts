@@ -3,7 +3,7 @@
 
 import bitmexRest from '../bitmex.js';
 import { AuthenticationError, ExchangeError, RateLimitExceeded } from '../base/errors.js';
-import { ArrayCache, ArrayCacheByTimestamp, ArrayCacheBySymbolById } from '../base/ws/Cache.js';
+import { ArrayCache, ArrayCacheByTimestamp } from '../base/ws/Cache.js';
 
 //  ---------------------------------------------------------------------------
 
@@ -18,8 +18,11 @@ export default class bitmex extends bitmexRest {
                 'watchOrderBook': true,
                 'watchOrders': true,
                 'watchTicker': true,
-                'watchTickers': false,
+                'watchTickers': true,
                 'watchTrades': true,
+                'watchOrderBookForSymbols': true,
+                'watchTradesForSymbols': true,
+                'watchOHLCVForSymbols': true,
             },
             'urls': {
                 'test': {
@@ -33,6 +36,10 @@ export default class bitmex extends bitmexRest {
             //     'ws': '0.2.0',
             // },
             'options': {
+                'ws': {
+                    'packSubscriptions': true, // the args of one loop iteration go in one subscribe request
+                    'maxTopicsPerMessage': 100,
+                },
                 'watchOrderBookLevel': 'orderBookL2', // 'orderBookL2' = L2 full order book, 'orderBookL2_25' = L2 top 25, 'orderBook10' L3 top 10
                 'tradesLimit': 1000,
                 'OHLCVLimit': 1000,
@@ -72,6 +79,47 @@ export default class bitmex extends bitmexRest {
         return await this.watch (url, messageHash, this.extend (request, params), messageHash);
     }
 
+    async watchTickers (symbols: string[] = undefined, params = {}) {
+        /**
+         * @method
+         * @name bitmex#watchTickers
+         * @description watches the price tickers of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch the tickers for
+         * @param {object} params extra parameters specific to the bitmex api endpoint
+         * @returns {object} the [ticker structure]{@link https://docs.ccxt.com/#/?id=ticker-structure} of the market that updated, indexed by its symbol
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTickers');
+        const messageHashes = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push ('instrument:' + market['id']);
+        }
+        const ticker = await this.watchTables (messageHashes, params);
+        if (this.newUpdates) {
+            const result = {};
+            result[ticker['symbol']] = ticker;
+            return result;
+        }
+        return this.filterByArray (this.tickers, 'symbol', symbols);
+    }
+
+    async watchTables (messageHashes, params = {}, keys = undefined) {
+        // a subscription per table:symbol topic, the requests are packed up to options['ws']['maxTopicsPerMessage'] topics
+        const url = this.urls['api']['ws'];
+        const messages = [];
+        for (let i = 0; i < messageHashes.length; i++) {
+            const request = {
+                'op': 'subscribe',
+                'args': [
+                    messageHashes[i],
+                ],
+            };
+            messages.push (this.extend (request, params));
+        }
+        return await this.watchMultiple (url, messageHashes, messages, messageHashes, undefined, keys);
+    }
+
     handleTicker (client, message) {
         //
         //     {
@@ -304,7 +352,7 @@ export default class bitmex extends bitmexRest {
         for (let i = 0; i < data.length; i++) {
             const update = data[i];
             const marketId = this.safeValue (update, 'symbol');
-            const market = this.safeMarket (marketId);
+            const market = this.safeMarketById (marketId);
             const symbol = market['symbol'];
             const messageHash = table + ':' + marketId;
             let ticker = this.safeValue (this.tickers, symbol, {});
@@ -509,7 +557,7 @@ export default class bitmex extends bitmexRest {
         const marketIds = Object.keys (dataByMarketIds);
         for (let i = 0; i < marketIds.length; i++) {
             const marketId = marketIds[i];
-            const market = this.safeMarket (marketId);
+            const market = this.safeMarketById (marketId);
             const messageHash = table + ':' + marketId;
             const symbol = market['symbol'];
             const trades = this.parseTrades (dataByMarketIds[marketId], market);
@@ -556,6 +604,32 @@ export default class bitmex extends bitmexRest {
         return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
     }
 
+    async watchTradesForSymbols (symbols: string[], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name bitmex#watchTradesForSymbols
+         * @description get the list of most recent trades of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch trades for
+         * @param {int|undefined} since timestamp in ms of the earliest trade to fetch
+         * @param {int|undefined} limit the maximum amount of trades to fetch
+         * @param {object} params extra parameters specific to the bitmex api endpoint
+         * @returns {[object]} a list of the [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTradesForSymbols');
+        const messageHashes = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push ('trade:' + market['id']);
+        }
+        const trades = await this.watchTables (messageHashes, params);
+        if (this.newUpdates) {
+            const first = this.safeValue (trades, 0);
+            limit = trades.getLimit (this.safeString (first, 'symbol'), limit);
+        }
+        return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
+    }
+
     async authenticate (params = {}) {
         const url = this.urls['api']['ws'];
         const client = this.client (url);
@@ -794,7 +868,7 @@ export default class bitmex extends bitmexRest {
         if (dataLength > 0) {
             if (this.orders === undefined) {
                 const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
-                this.orders = new ArrayCacheBySymbolById (limit);
+                this.orders = this.ordersCache (limit);
             }
             const stored = this.orders;
             const symbols = {};
@@ -919,7 +993,7 @@ export default class bitmex extends bitmexRest {
         const trades = this.parseTrades (rawTrades);
         if (this.myTrades === undefined) {
             const limit = this.safeInteger (this.options, 'tradesLimit', 1000);
-            this.myTrades = new ArrayCacheBySymbolById (limit);
+            this.myTrades = this.myTradesCache (limit);
         }
         const stored = this.myTrades;
         const symbols = {};
@@ -949,16 +1023,7 @@ export default class bitmex extends bitmexRest {
          * @param {object} params extra parameters specific to the bitmex api endpoint
          * @returns {object} A dictionary of [order book structures]{@link https://docs.ccxt.com/#/?id=order-book-structure} indexed by market symbols
          */
-        let table = undefined;
-        if (limit === undefined) {
-            table = this.safeString (this.options, 'watchOrderBookLevel', 'orderBookL2');
-        } else if (limit === 25) {
-            table = 'orderBookL2_25';
-        } else if (limit === 10) {
-            table = 'orderBookL10';
-        } else {
-            throw new ExchangeError (this.id + ' watchOrderBook limit argument must be undefined (L2), 25 (L2) or 10 (L3)');
-        }
+        const table = this.orderBookTable (limit);
         await this.loadMarkets ();
         const market = this.market (symbol);
         const messageHash = table + ':' + market['id'];
@@ -973,6 +1038,40 @@ export default class bitmex extends bitmexRest {
         return orderbook.limit ();
     }
 
+    async watchOrderBookForSymbols (symbols: string[], limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name bitmex#watchOrderBookForSymbols
+         * @description watches the order books of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch the order books for
+         * @param {int|undefined} limit the maximum amount of order book entries to return
+         * @param {object} params extra parameters specific to the bitmex api endpoint
+         * @returns {object} the [order book structure]{@link https://docs.ccxt.com/#/?id=order-book-structure} of the market that updated
+         */
+        const table = this.orderBookTable (limit);
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchOrderBookForSymbols');
+        const messageHashes = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push (table + ':' + market['id']);
+        }
+        const orderbook = await this.watchTables (messageHashes, params);
+        return orderbook.limit ();
+    }
+
+    orderBookTable (limit = undefined) {
+        if (limit === undefined) {
+            return this.safeString (this.options, 'watchOrderBookLevel', 'orderBookL2');
+        } else if (limit === 25) {
+            return 'orderBookL2_25';
+        } else if (limit === 10) {
+            return 'orderBookL10';
+        } else {
+            throw new ExchangeError (this.id + ' watchOrderBook limit argument must be undefined (L2), 25 (L2) or 10 (L3)');
+        }
+    }
+
     async watchOHLCV (symbol, timeframe = '1m', since: any = undefined, limit: any = undefined, params = {}) {
         /**
          * @method
@@ -1004,6 +1103,36 @@ export default class bitmex extends bitmexRest {
         return this.filterBySinceLimit (ohlcv, since, limit, 0, true);
     }
 
+    async watchOHLCVForSymbols (symbolsAndTimeframes: string[][], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name bitmex#watchOHLCVForSymbols
+         * @description watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+         * @param {[[string]]} symbolsAndTimeframes the [symbol, timeframe] pairs to watch
+         * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
+         * @param {int|undefined} limit the maximum amount of candles to fetch
+         * @param {object} params extra parameters specific to the bitmex api endpoint
+         * @returns {object} the candles of the market and timeframe that updated, indexed by symbol and timeframe
+         */
+        await this.loadMarkets ();
+        const symbols = this.marketSymbolsForWatch (this.symbolsOfPairs (symbolsAndTimeframes), 'watchOHLCVForSymbols');
+        const messageHashes = [];
+        const keys = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            const timeframe = symbolsAndTimeframes[i][1];
+            const table = 'tradeBin' + this.safeString (this.timeframes, timeframe, timeframe);
+            messageHashes.push (table + ':' + market['id']);
+            keys.push ([ market['symbol'], timeframe ]);
+        }
+        const [ key, ohlcv ] = await this.watchTables (messageHashes, params, keys);
+        if (this.newUpdates) {
+            limit = ohlcv.getLimit (key[0], limit);
+        }
+        const filtered = this.filterBySinceLimit (ohlcv, since, limit, 0, true);
+        return this.createOhlcvObject (key[0], key[1], filtered);
+    }
+
     handleOHLCV (client, message) {
         //
         //     {
@@ -1079,7 +1208,7 @@ export default class bitmex extends bitmexRest {
         for (let i = 0; i < candles.length; i++) {
             const candle = candles[i];
             const marketId = this.safeString (candle, 'symbol');
-            const market = this.safeMarket (marketId);
+            const market = this.safeMarketById (marketId);
             const symbol = market['symbol'];
             const messageHash = table + ':' + market['id'];
             const result = [
@@ -1160,7 +1289,7 @@ export default class bitmex extends bitmexRest {
         if (action === 'partial') {
             const filter = this.safeValue (message, 'filter', {});
             const marketId = this.safeValue (filter, 'symbol');
-            const market = this.safeMarket (marketId);
+            const market = this.safeMarketById (marketId);
             const symbol = market['symbol'];
             if (table === 'orderBookL2') {
                 this.orderbooks[symbol] = this.indexedOrderBook ();
@@ -1189,7 +1318,7 @@ export default class bitmex extends bitmexRest {
                     numUpdatesByMarketId[marketId] = 0;
                 }
                 numUpdatesByMarketId[marketId] = this.sum (numUpdatesByMarketId, 1);
-                const market = this.safeMarket (marketId);
+                const market = this.safeMarketById (marketId);
                 const symbol = market['symbol'];
                 const orderbook = this.orderbooks[symbol];
                 const price = this.safeFloat (data[i], 'price');
@@ -1204,7 +1333,7 @@ export default class bitmex extends bitmexRest {
             for (let i = 0; i < marketIds.length; i++) {
                 const marketId = marketIds[i];
                 const messageHash = table + ':' + marketId;
-                const market = this.safeMarket (marketId);
+                const market = this.safeMarketById (marketId);
                 const symbol = market['symbol'];
                 const orderbook = this.orderbooks[symbol];
                 client.resolve (orderbook, messageHash);
@@ -2,7 +2,7 @@
 
 import blofinRest from '../blofin.js';
 import { AuthenticationError } from '../base/errors.js';
-import { ArrayCacheByTimestamp, ArrayCacheBySymbolById, ArrayCache } from '../base/ws/Cache.js';
+import { ArrayCacheByTimestamp, ArrayCache } from '../base/ws/Cache.js';
 
 // ----------------------------------------------------------------------------
 
@@ -19,6 +19,9 @@ export default class blofin extends blofinRest {
                 'watchTicker': true,
                 'watchTickers': true,
                 'watchTrades': true,
+                'watchOrderBookForSymbols': true,
+                'watchTradesForSymbols': true,
+                'watchOHLCVForSymbols': true,
             },
             'urls': {
                 'api': {
@@ -43,6 +46,9 @@ export default class blofin extends blofinRest {
                 'watchOrderBook': {
                     'depth': 'books',
                 },
+                'ws': {
+                    'packSubscriptions': true, // the args of one loop iteration go in one subscribe request
+                },
                 'tradesLimit': 1000,
                 'ordersLimit': 1000,
                 'requestId': {},
@@ -81,6 +87,28 @@ export default class blofin extends blofinRest {
         return await this.watch (url, messageHash, this.deepExtend (request, params), messageHash, shouldThrottle);
     }
 
+    async subscribeMultiple (access, channels, symbols, params = {}, keys = undefined) {
+        // a subscription per channel and symbol, the requests are packed up to options['ws']['maxTopicsPerMessage'] args
+        const url = this.urls['api']['ws'][access];
+        const messageHashes = [];
+        const messages = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push (channels[i] + ':' + market['id']);
+            const request = {
+                'op': 'subscribe',
+                'args': [
+                    {
+                        'channel': channels[i],
+                        'instId': market['id'],
+                    },
+                ],
+            };
+            messages.push (this.deepExtend (request, params));
+        }
+        return await this.watchMultiple (url, messageHashes, messages, messageHashes, undefined, keys);
+    }
+
     async watchTrades (symbol, since: any = undefined, limit: any = undefined, params = {}) {
         await this.loadMarkets ();
         symbol = this.symbol (symbol);
@@ -91,6 +119,31 @@ export default class blofin extends blofinRest {
         return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
     }
 
+    async watchTradesForSymbols (symbols: string[], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name blofin#watchTradesForSymbols
+         * @description get the list of most recent trades of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch trades for
+         * @param {int|undefined} since timestamp in ms of the earliest trade to fetch
+         * @param {int|undefined} limit the maximum amount of trades to fetch
+         * @param {object} params extra parameters specific to the blofin api endpoint
+         * @returns {[object]} a list of the [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTradesForSymbols');
+        const channels = [];
+        for (let i = 0; i < symbols.length; i++) {
+            channels.push ('trades');
+        }
+        const trades = await this.subscribeMultiple ('public', channels, symbols, params);
+        if (this.newUpdates) {
+            const first = this.safeValue (trades, 0);
+            limit = trades.getLimit (this.safeString (first, 'symbol'), limit);
+        }
+        return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
+    }
+
     handleTrades (client, message) {
         const arg = this.safeValue (message, 'arg', {});
         const channel = this.safeString (arg, 'channel');
@@ -124,6 +177,30 @@ export default class blofin extends blofinRest {
         return await this.subscribe ('public', 'tickers', symbol, params);
     }
 
+    async watchTickers (symbols: string[] = undefined, params = {}) {
+        /**
+         * @method
+         * @name blofin#watchTickers
+         * @description watches the price tickers of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch the tickers for
+         * @param {object} params extra parameters specific to the blofin api endpoint
+         * @returns {object} the [ticker structure]{@link https://docs.ccxt.com/#/?id=ticker-structure} of the market that updated, indexed by its symbol
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTickers');
+        const channels = [];
+        for (let i = 0; i < symbols.length; i++) {
+            channels.push ('tickers');
+        }
+        const ticker = await this.subscribeMultiple ('public', channels, symbols, params);
+        if (this.newUpdates) {
+            const result = {};
+            result[ticker['symbol']] = ticker;
+            return result;
+        }
+        return this.filterByArray (this.tickers, 'symbol', symbols);
+    }
+
     handleTicker (client, message) {
         const arg = this.safeValue (message, 'arg', {});
         const channel = this.safeString (arg, 'channel');
@@ -151,6 +228,35 @@ export default class blofin extends blofinRest {
         return this.filterBySinceLimit (ohlcv, since, limit, 0, true);
     }
 
+    async watchOHLCVForSymbols (symbolsAndTimeframes: string[][], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name blofin#watchOHLCVForSymbols
+         * @description watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+         * @param {[[string]]} symbolsAndTimeframes the [symbol, timeframe] pairs to watch
+         * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
+         * @param {int|undefined} limit the maximum amount of candles to fetch
+         * @param {object} params extra parameters specific to the blofin api endpoint
+         * @returns {object} the candles of the market and timeframe that updated, indexed by symbol and timeframe
+         */
+        await this.loadMarkets ();
+        const symbols = this.marketSymbolsForWatch (this.symbolsOfPairs (symbolsAndTimeframes), 'watchOHLCVForSymbols');
+        const channels = [];
+        const keys = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const timeframe = symbolsAndTimeframes[i][1];
+            const interval = this.safeString (this.timeframes, timeframe, timeframe);
+            channels.push ('candle' + interval);
+            keys.push ([ symbols[i], timeframe ]);
+        }
+        const [ key, ohlcv ] = await this.subscribeMultiple ('public', channels, symbols, params, keys);
+        if (this.newUpdates) {
+            limit = ohlcv.getLimit (key[0], limit);
+        }
+        const filtered = this.filterBySinceLimit (ohlcv, since, limit, 0, true);
+        return this.createOhlcvObject (key[0], key[1], filtered);
+    }
+
     handleOHLCV (client, message) {
         const arg = this.safeValue (message, 'arg', {});
         const channel = this.safeString (arg, 'channel');
@@ -187,6 +293,28 @@ export default class blofin extends blofinRest {
         return orderbook.limit (limit);
     }
 
+    async watchOrderBookForSymbols (symbols: string[], limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name blofin#watchOrderBookForSymbols
+         * @description watches the order books of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch the order books for
+         * @param {int|undefined} limit the maximum amount of order book entries to return
+         * @param {object} params extra parameters specific to the blofin api endpoint
+         * @returns {object} the [order book structure]{@link https://docs.ccxt.com/#/?id=order-book-structure} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchOrderBookForSymbols');
+        const options = this.safeValue (this.options, 'watchOrderBook', {});
+        const depth = this.safeString (options, 'depth', 'books-l2-tbt');
+        const channels = [];
+        for (let i = 0; i < symbols.length; i++) {
+            channels.push (depth);
+        }
+        const orderbook = await this.subscribeMultiple ('public', channels, symbols, params);
+        return orderbook.limit (limit);
+    }
+
     handleDelta (bookside, delta) {
         const price = this.safeFloat (delta, 0);
         const amount = this.safeFloat (delta, 1);
@@ -194,9 +322,7 @@ export default class blofin extends blofinRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        bookside.applyLevels (deltas);
     }
 
     handleOrderBookMessage (client, message, orderbook, messageHash) {
@@ -206,28 +332,13 @@ export default class blofin extends blofinRest {
         const storedBids = orderbook['bids'];
         this.handleDeltas (storedAsks, asks);
         this.handleDeltas (storedBids, bids);
-        const checksum = this.safeValue (this.options, 'checksum', true);
+        // verification is opt-in until the blofin checksum is confirmed to follow the okx layout
+        const checksum = this.safeValue (this.options, 'checksum', false);
         if (checksum) {
-            const asksLength = storedAsks.length;
-            const bidsLength = storedBids.length;
-            const payloadArray = [];
-            for (let i = 0; i < 25; i++) {
-                if (i < bidsLength) {
-                    payloadArray.push (this.numberToString (storedBids[i][0]));
-                    payloadArray.push (this.numberToString (storedBids[i][1]));
-                }
-                if (i < asksLength) {
-                    payloadArray.push (this.numberToString (storedAsks[i][0]));
-                    payloadArray.push (this.numberToString (storedAsks[i][1]));
-                }
+            const responseChecksum = this.safeInteger (message, 'checksum');
+            if (!this.verifyOrderBookChecksum (client, orderbook, responseChecksum, messageHash)) {
+                return orderbook;
             }
-            // const payload = payloadArray.join (':');
-            // const responseChecksum = this.safeInteger (message, 'checksum');
-            // const localChecksum = this.crc32 (payload, true);
-            // if (responseChecksum !== localChecksum) {
-            //     const error = new InvalidNonce (this.id + ' invalid checksum');
-            //     client.reject (error, messageHash);
-            // }
         }
         const timestamp = this.safeInteger (message, 'ts');
         orderbook['timestamp'] = timestamp;
@@ -255,16 +366,21 @@ export default class blofin extends blofinRest {
         if (action === 'snapshot') {
             const update = data;
             const orderbook = this.orderBook ({}, limit);
+            orderbook.retainRaw ();
             this.orderbooks[symbol] = orderbook;
             orderbook['symbol'] = symbol;
             this.handleOrderBookMessage (client, update, orderbook, messageHash);
-            client.resolve (orderbook, messageHash);
+            if (symbol in this.orderbooks) {
+                client.resolve (orderbook, messageHash);
+            }
         } else if (action === 'update') {
             if (symbol in this.orderbooks) {
                 const orderbook = this.orderbooks[symbol];
                 const update = data;
                 this.handleOrderBookMessage (client, update, orderbook, messageHash);
-                client.resolve (orderbook, messageHash);
+                if (symbol in this.orderbooks) {
+                    client.resolve (orderbook, messageHash);
+                }
             }
         }
         //  else if ((channel === 'books5') || (channel === 'bbo-tbt')) {
@@ -284,6 +400,19 @@ export default class blofin extends blofinRest {
         return message;
     }
 
+    async resubscribeOrderBook (client, symbol, messageHash) {
+        // blofin pushes a new snapshot once the channel is subscribed again
+        const parts = messageHash.split (':');
+        const args = [
+            {
+                'channel': parts[0],
+                'instId': parts[1],
+            },
+        ];
+        await client.send ({ 'op': 'unsubscribe', 'args': args });
+        await client.send ({ 'op': 'subscribe', 'args': args });
+    }
+
     checkRequiredUid () {
         // checkRequiredUid (error = true) {
         return true;
@@ -401,7 +530,7 @@ export default class blofin extends blofinRest {
         if (symbol !== undefined) {
             if (this.orders === undefined) {
                 const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
-                this.orders = new ArrayCacheBySymbolById (limit);
+                this.orders = this.ordersCache (limit);
             }
             const cachedOrders = this.orders;
             const orders = this.safeValue (cachedOrders.hashmap, symbol, {});
@@ -487,7 +616,7 @@ export default class blofin extends blofinRest {
         };
         const method = this.safeValue (methods, channel);
         if (method === undefined) {
-            if (channel?.indexOf ('candle') === 0) {
+            if ((channel !== undefined) && (channel.indexOf ('candle') === 0)) {
                 this.handleOHLCV (client, message);
             } else {
                 return message;
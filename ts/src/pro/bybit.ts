@@ -3,7 +3,7 @@
 
 import bybitRest from '../bybit.js';
 import { AuthenticationError, ExchangeError, BadRequest } from '../base/errors.js';
-import { ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp } from '../base/ws/Cache.js';
+import { ArrayCache } from '../base/ws/Cache.js';
 
 //  ---------------------------------------------------------------------------
 
@@ -18,8 +18,11 @@ export default class bybit extends bybitRest {
                 'watchOrderBook': true,
                 'watchOrders': true,
                 'watchTicker': true,
-                'watchTickers': false, // for now
+                'watchTickers': true,
                 'watchTrades': true,
+                'watchOrderBookForSymbols': true,
+                'watchTradesForSymbols': true,
+                'watchOHLCVForSymbols': true,
                 'watchPosition': undefined,
             },
             'urls': {
@@ -64,6 +67,10 @@ export default class bybit extends bybitRest {
                 'watchTicker': {
                     'name': 'tickers', // 'tickers' for 24hr statistical ticker or 'tickers_lt' for leverage token ticker
                 },
+                'ws': {
+                    'packSubscriptions': true, // the args of one loop iteration go in one subscribe request
+                    'maxTopicsPerMessage': 10, // spot takes up to 10 args per request
+                },
                 'spot': {
                     'timeframes': {
                         '1m': '1m',
@@ -185,6 +192,41 @@ export default class bybit extends bybitRest {
         return await this.watchTopics (url, messageHash, topics, params);
     }
 
+    async watchTickers (symbols: string[] = undefined, params = {}) {
+        /**
+         * @method
+         * @name bybit#watchTickers
+         * @description watches the price tickers of several markets, subscribed in as few requests as possible
+         * @see https://bybit-exchange.github.io/docs/v5/websocket/public/ticker
+         * @param {[string]} symbols unified symbols of the markets to fetch the tickers for, of one market type
+         * @param {object} params extra parameters specific to the bybit api endpoint
+         * @returns {object} the [ticker structure]{@link https://docs.ccxt.com/#/?id=ticker-structure} of the market that updated, indexed by its symbol
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTickers');
+        const url = this.getUrlByMarketType (symbols[0], false, params);
+        params = this.cleanParams (params);
+        const options = this.safeValue (this.options, 'watchTicker', {});
+        const name = this.safeString (options, 'name', 'tickers');
+        const messageHashes = [];
+        const topics = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            if (!market['spot'] && name !== 'tickers') {
+                throw new BadRequest (this.id + ' watchTickers() only supports name tickers for contract markets');
+            }
+            messageHashes.push ('ticker:' + market['symbol']);
+            topics.push (name + '.' + market['id']);
+        }
+        const ticker = await this.watchMultipleTopics (url, messageHashes, topics, params);
+        if (this.newUpdates) {
+            const result = {};
+            result[ticker['symbol']] = ticker;
+            return result;
+        }
+        return this.filterByArray (this.tickers, 'symbol', symbols);
+    }
+
     handleTicker (client, message) {
         //
         // linear
@@ -345,6 +387,41 @@ export default class bybit extends bybitRest {
         return this.filterBySinceLimit (ohlcv, since, limit, 0, true);
     }
 
+    async watchOHLCVForSymbols (symbolsAndTimeframes: string[][], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name bybit#watchOHLCVForSymbols
+         * @description watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+         * @see https://bybit-exchange.github.io/docs/v5/websocket/public/kline
+         * @param {[[string]]} symbolsAndTimeframes the [symbol, timeframe] pairs to watch, of one market type
+         * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
+         * @param {int|undefined} limit the maximum amount of candles to fetch
+         * @param {object} params extra parameters specific to the bybit api endpoint
+         * @returns {object} the candles of the market and timeframe that updated, indexed by symbol and timeframe
+         */
+        await this.loadMarkets ();
+        const symbols = this.marketSymbolsForWatch (this.symbolsOfPairs (symbolsAndTimeframes), 'watchOHLCVForSymbols');
+        const url = this.getUrlByMarketType (symbols[0], false, params);
+        params = this.cleanParams (params);
+        const messageHashes = [];
+        const topics = [];
+        const keys = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            const timeframe = symbolsAndTimeframes[i][1];
+            const timeframeId = this.safeString (this.timeframes, timeframe, timeframe);
+            messageHashes.push ('kline' + ':' + timeframeId + ':' + market['symbol']);
+            topics.push ('kline.' + timeframeId + '.' + market['id']);
+            keys.push ([ market['symbol'], timeframe ]);
+        }
+        const [ key, ohlcv ] = await this.watchMultipleTopics (url, messageHashes, topics, params, keys);
+        if (this.newUpdates) {
+            limit = ohlcv.getLimit (key[0], limit);
+        }
+        const filtered = this.filterBySinceLimit (ohlcv, since, limit, 0, true);
+        return this.createOhlcvObject (key[0], key[1], filtered);
+    }
+
     handleOHLCV (client, message) {
         //
         //     {
@@ -376,7 +453,7 @@ export default class bybit extends bybitRest {
         const marketId = this.safeString (topicParts, topicLength - 1);
         const isSpot = client.url.indexOf ('spot') > -1;
         const marketType = isSpot ? 'spot' : 'contract';
-        const market = this.safeMarket (marketId, undefined, undefined, marketType);
+        const market = this.safeMarketById (marketId, marketType);
         const symbol = market['symbol'];
         const ohlcvsByTimeframe = this.safeValue (this.ohlcvs, symbol);
         if (ohlcvsByTimeframe === undefined) {
@@ -385,7 +462,7 @@ export default class bybit extends bybitRest {
         let stored = this.safeValue (ohlcvsByTimeframe, timeframeId);
         if (stored === undefined) {
             const limit = this.safeInteger (this.options, 'OHLCVLimit', 1000);
-            stored = new ArrayCacheByTimestamp (limit);
+            stored = this.ohlcvCache (limit);
             this.ohlcvs[symbol][timeframeId] = stored;
         }
         for (let i = 0; i < data.length; i++) {
@@ -439,6 +516,40 @@ export default class bybit extends bybitRest {
         const url = this.getUrlByMarketType (symbol, false, params);
         params = this.cleanParams (params);
         const messageHash = 'orderbook' + ':' + symbol;
+        limit = this.orderBookTopicLimit (market, limit);
+        const topics = [ 'orderbook.' + limit.toString () + '.' + market['id'] ];
+        const orderbook = await this.watchTopics (url, messageHash, topics, params);
+        return orderbook.limit ();
+    }
+
+    async watchOrderBookForSymbols (symbols: string[], limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name bybit#watchOrderBookForSymbols
+         * @description watches the order books of several markets, subscribed in as few requests as possible
+         * @see https://bybit-exchange.github.io/docs/v5/websocket/public/orderbook
+         * @param {[string]} symbols unified symbols of the markets to fetch the order books for, of one market type
+         * @param {int|undefined} limit the maximum amount of order book entries to return.
+         * @param {object} params extra parameters specific to the bybit api endpoint
+         * @returns {object} the [order book structure]{@link https://docs.ccxt.com/#/?id=order-book-structure} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchOrderBookForSymbols');
+        const url = this.getUrlByMarketType (symbols[0], false, params);
+        params = this.cleanParams (params);
+        limit = this.orderBookTopicLimit (this.market (symbols[0]), limit);
+        const messageHashes = [];
+        const topics = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push ('orderbook' + ':' + market['symbol']);
+            topics.push ('orderbook.' + limit.toString () + '.' + market['id']);
+        }
+        const orderbook = await this.watchMultipleTopics (url, messageHashes, topics, params);
+        return orderbook.limit ();
+    }
+
+    orderBookTopicLimit (market, limit = undefined) {
         if (limit === undefined) {
             if (market['spot']) {
                 limit = 50;
@@ -453,9 +564,7 @@ export default class bybit extends bybitRest {
                 }
             }
         }
-        const topics = [ 'orderbook.' + limit.toString () + '.' + market['id'] ];
-        const orderbook = await this.watchTopics (url, messageHash, topics, params);
-        return orderbook.limit ();
+        return limit;
     }
 
     handleOrderBook (client, message) {
@@ -498,7 +607,7 @@ export default class bybit extends bybitRest {
         const data = this.safeValue (message, 'data', {});
         const marketId = this.safeString (data, 's');
         const marketType = isSpot ? 'spot' : 'contract';
-        const market = this.safeMarket (marketId, undefined, undefined, marketType);
+        const market = this.safeMarketById (marketId, marketType);
         const symbol = market['symbol'];
         const timestamp = this.safeInteger (message, 'ts');
         let orderbook = this.safeValue (this.orderbooks, symbol);
@@ -527,9 +636,7 @@ export default class bybit extends bybitRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        bookside.applyLevels (deltas);
     }
 
     async watchTrades (symbol, since: any = undefined, limit: any = undefined, params = {}) {
@@ -558,6 +665,37 @@ export default class bybit extends bybitRest {
         return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
     }
 
+    async watchTradesForSymbols (symbols: string[], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name bybit#watchTradesForSymbols
+         * @description watches the trades of several markets, subscribed in as few requests as possible
+         * @see https://bybit-exchange.github.io/docs/v5/websocket/public/trade
+         * @param {[string]} symbols unified symbols of the markets to fetch trades for, of one market type
+         * @param {int|undefined} since the earliest time in ms to fetch trades for
+         * @param {int|undefined} limit the maximum number of trade structures to retrieve
+         * @param {object} params extra parameters specific to the bybit api endpoint
+         * @returns {[object]} a list of the [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTradesForSymbols');
+        const url = this.getUrlByMarketType (symbols[0], false, params);
+        params = this.cleanParams (params);
+        const messageHashes = [];
+        const topics = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push ('trade:' + market['symbol']);
+            topics.push ('publicTrade.' + market['id']);
+        }
+        const trades = await this.watchMultipleTopics (url, messageHashes, topics, params);
+        if (this.newUpdates) {
+            const first = this.safeValue (trades, 0);
+            limit = trades.getLimit (this.safeString (first, 'symbol'), limit);
+        }
+        return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
+    }
+
     handleTrades (client, message) {
         //
         //     {
@@ -585,7 +723,7 @@ export default class bybit extends bybitRest {
         const isSpot = client.url.indexOf ('spot') >= 0;
         const marketType = (isSpot) ? 'spot' : 'contract';
         const marketId = this.safeString (parts, 1);
-        const market = this.safeMarket (marketId, undefined, undefined, marketType);
+        const market = this.safeMarketById (marketId, marketType);
         const symbol = market['symbol'];
         let stored = this.safeValue (this.trades, symbol);
         if (stored === undefined) {
@@ -788,7 +926,7 @@ export default class bybit extends bybitRest {
         }
         if (this.myTrades === undefined) {
             const limit = this.safeInteger (this.options, 'tradesLimit', 1000);
-            this.myTrades = new ArrayCacheBySymbolById (limit);
+            this.myTrades = this.myTradesCache (limit);
         }
         const trades = this.myTrades;
         const symbols = {};
@@ -931,7 +1069,7 @@ export default class bybit extends bybitRest {
         const type = this.safeString (message, 'type', '');
         if (this.orders === undefined) {
             const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
-            this.orders = new ArrayCacheBySymbolById (limit);
+            this.orders = this.ordersCache (limit);
         }
         const orders = this.orders;
         let rawOrders = [];
@@ -1354,6 +1492,21 @@ export default class bybit extends bybitRest {
         return await this.watch (url, messageHash, message, messageHash);
     }
 
+    async watchMultipleTopics (url, messageHashes, topics, params = {}, keys = undefined) {
+        // a subscription per topic, the requests are packed up to options['ws']['maxTopicsPerMessage'] topics
+        const requestId = this.requestId ();
+        const messages = [];
+        for (let i = 0; i < topics.length; i++) {
+            const request = {
+                'op': 'subscribe',
+                'req_id': requestId,
+                'args': [ topics[i] ],
+            };
+            messages.push (this.extend (request, params));
+        }
+        return await this.watchMultiple (url, messageHashes, messages, messageHashes, undefined, keys);
+    }
+
     authenticate (url, params = {}) {
         this.checkRequiredCredentials ();
         const messageHash = 'authenticated';
@@ -1464,6 +1617,18 @@ export default class bybit extends bybitRest {
             return;
         }
         const topic = this.safeString (message, 'topic', '');
+        const [ routed, result ] = this.routeMessage (client, message, topic, 'topic');
+        if (routed) {
+            return;
+        }
+        // unified auth acknowledgement
+        const type = this.safeString (message, 'type');
+        if ((op === 'auth') || (type === 'AUTH_RESP')) {
+            this.handleAuthenticate (client, message);
+        }
+    }
+
+    messageRoutes () {
         const methods = {
             'orderbook': this.handleOrderBook,
             'kline': this.handleOHLCV,
@@ -1479,25 +1644,13 @@ export default class bybit extends bybitRest {
             'ticketInfo': this.handleMyTrades,
             'user.openapi.perp.trade': this.handleMyTrades,
         };
-        const exacMethod = this.safeValue (methods, topic);
-        if (exacMethod !== undefined) {
-            exacMethod.call (this, client, message);
-            return;
-        }
-        const keys = Object.keys (methods);
-        for (let i = 0; i < keys.length; i++) {
-            const key = keys[i];
-            if (topic.indexOf (keys[i]) >= 0) {
-                const method = methods[key];
-                method.call (this, client, message);
-                return;
-            }
-        }
-        // unified auth acknowledgement
-        const type = this.safeString (message, 'type');
-        if ((op === 'auth') || (type === 'AUTH_RESP')) {
-            this.handleAuthenticate (client, message);
-        }
+        return {
+            // an exact topic first, then the first method key found in the topic
+            'topic': {
+                'exact': methods,
+                'contains': methods,
+            },
+        };
     }
 
     ping (client) {
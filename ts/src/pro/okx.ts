@@ -2,8 +2,8 @@
 //  ---------------------------------------------------------------------------
 
 import okxRest from '../okx.js';
-import { AuthenticationError, InvalidNonce } from '../base/errors.js';
-import { ArrayCache, ArrayCacheByTimestamp, ArrayCacheBySymbolById } from '../base/ws/Cache.js';
+import { AuthenticationError } from '../base/errors.js';
+import { ArrayCache } from '../base/ws/Cache.js';
 
 //  ---------------------------------------------------------------------------
 
@@ -13,9 +13,12 @@ export default class okx extends okxRest {
             'has': {
                 'ws': true,
                 'watchTicker': true,
-                // 'watchTickers': false, // for now
+                'watchTickers': true,
                 'watchOrderBook': true,
                 'watchTrades': true,
+                'watchOrderBookForSymbols': true,
+                'watchTradesForSymbols': true,
+                'watchOHLCVForSymbols': true,
                 'watchBalance': true,
                 'watchOHLCV': true,
                 'watchOrders': true,
@@ -64,6 +67,8 @@ export default class okx extends okxRest {
                 'watchBalance': 'spot', // margin, futures, swap
                 'ws': {
                     // 'inflate': true,
+                    'packSubscriptions': true, // the args of one loop iteration go in one subscribe request
+                    'maxTopicsPerMessage': 100, // the args of one request are limited to 64 kb
                 },
                 'checksum': true,
             },
@@ -97,6 +102,29 @@ export default class okx extends okxRest {
         return await this.watch (url, messageHash, request, messageHash);
     }
 
+    async subscribeMultiple (access, channels, symbols, params = {}, keys = undefined) {
+        // a subscription per channel and symbol, the requests are packed up to options['ws']['maxTopicsPerMessage'] args
+        const url = this.urls['api']['ws'][access];
+        const messageHashes = [];
+        const messages = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            messageHashes.push (channels[i] + ':' + market['id']);
+            const firstArgument = {
+                'channel': channels[i],
+                'instId': market['id'],
+            };
+            const request = {
+                'op': 'subscribe',
+                'args': [
+                    this.deepExtend (firstArgument, params),
+                ],
+            };
+            messages.push (request);
+        }
+        return await this.watchMultiple (url, messageHashes, messages, messageHashes, undefined, keys);
+    }
+
     async watchTrades (symbol, since: any = undefined, limit: any = undefined, params = {}) {
         /**
          * @method
@@ -117,6 +145,31 @@ export default class okx extends okxRest {
         return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
     }
 
+    async watchTradesForSymbols (symbols: string[], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name okx#watchTradesForSymbols
+         * @description get the list of most recent trades of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch trades for
+         * @param {int|undefined} since timestamp in ms of the earliest trade to fetch
+         * @param {int|undefined} limit the maximum amount of trades to fetch
+         * @param {object} params extra parameters specific to the okx api endpoint
+         * @returns {[object]} a list of the [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTradesForSymbols');
+        const channels = [];
+        for (let i = 0; i < symbols.length; i++) {
+            channels.push ('trades');
+        }
+        const trades = await this.subscribeMultiple ('public', channels, symbols, params);
+        if (this.newUpdates) {
+            const first = this.safeValue (trades, 0);
+            limit = trades.getLimit (this.safeString (first, 'symbol'), limit);
+        }
+        return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
+    }
+
     handleTrades (client, message) {
         //
         //     {
@@ -165,6 +218,30 @@ export default class okx extends okxRest {
         return await this.subscribe ('public', 'tickers', symbol, params);
     }
 
+    async watchTickers (symbols: string[] = undefined, params = {}) {
+        /**
+         * @method
+         * @name okx#watchTickers
+         * @description watches the price tickers of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch the tickers for
+         * @param {object} params extra parameters specific to the okx api endpoint
+         * @returns {object} the [ticker structure]{@link https://docs.ccxt.com/#/?id=ticker-structure} of the market that updated, indexed by its symbol
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTickers');
+        const channels = [];
+        for (let i = 0; i < symbols.length; i++) {
+            channels.push ('tickers');
+        }
+        const ticker = await this.subscribeMultiple ('public', channels, symbols, params);
+        if (this.newUpdates) {
+            const result = {};
+            result[ticker['symbol']] = ticker;
+            return result;
+        }
+        return this.filterByArray (this.tickers, 'symbol', symbols);
+    }
+
     handleTicker (client, message) {
         //
         //     {
@@ -228,6 +305,35 @@ export default class okx extends okxRest {
         return this.filterBySinceLimit (ohlcv, since, limit, 0, true);
     }
 
+    async watchOHLCVForSymbols (symbolsAndTimeframes: string[][], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name okx#watchOHLCVForSymbols
+         * @description watches historical candlestick data of several markets and timeframes, subscribed in as few requests as possible
+         * @param {[[string]]} symbolsAndTimeframes the [symbol, timeframe] pairs to watch
+         * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
+         * @param {int|undefined} limit the maximum amount of candles to fetch
+         * @param {object} params extra parameters specific to the okx api endpoint
+         * @returns {object} the candles of the market and timeframe that updated, indexed by symbol and timeframe
+         */
+        await this.loadMarkets ();
+        const symbols = this.marketSymbolsForWatch (this.symbolsOfPairs (symbolsAndTimeframes), 'watchOHLCVForSymbols');
+        const channels = [];
+        const keys = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const timeframe = symbolsAndTimeframes[i][1];
+            const interval = this.safeString (this.timeframes, timeframe, timeframe);
+            channels.push ('candle' + interval);
+            keys.push ([ symbols[i], timeframe ]);
+        }
+        const [ key, ohlcv ] = await this.subscribeMultiple ('public', channels, symbols, params, keys);
+        if (this.newUpdates) {
+            limit = ohlcv.getLimit (key[0], limit);
+        }
+        const filtered = this.filterBySinceLimit (ohlcv, since, limit, 0, true);
+        return this.createOhlcvObject (key[0], key[1], filtered);
+    }
+
     handleOHLCV (client, message) {
         //
         //     {
@@ -260,7 +366,7 @@ export default class okx extends okxRest {
             let stored = this.safeValue (this.ohlcvs[symbol], timeframe);
             if (stored === undefined) {
                 const limit = this.safeInteger (this.options, 'OHLCVLimit', 1000);
-                stored = new ArrayCacheByTimestamp (limit);
+                stored = this.ohlcvCache (limit);
                 this.ohlcvs[symbol][timeframe] = stored;
             }
             stored.append (parsed);
@@ -311,6 +417,31 @@ export default class okx extends okxRest {
         return orderbook.limit ();
     }
 
+    async watchOrderBookForSymbols (symbols: string[], limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name okx#watchOrderBookForSymbols
+         * @description watches the order books of several markets, subscribed in as few requests as possible
+         * @param {[string]} symbols unified symbols of the markets to fetch the order books for
+         * @param {int|undefined} limit the maximum amount of order book entries to return
+         * @param {object} params extra parameters specific to the okx api endpoint
+         * @returns {object} the [order book structure]{@link https://docs.ccxt.com/#/?id=order-book-structure} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchOrderBookForSymbols');
+        const options = this.safeValue (this.options, 'watchOrderBook', {});
+        const depth = this.safeString (options, 'depth', 'books');
+        if ((depth === 'books-l2-tbt') || (depth === 'books50-l2-tbt')) {
+            await this.authenticate ({ 'access': 'public' });
+        }
+        const channels = [];
+        for (let i = 0; i < symbols.length; i++) {
+            channels.push (depth);
+        }
+        const orderbook = await this.subscribeMultiple ('public', channels, symbols, params);
+        return orderbook.limit ();
+    }
+
     handleDelta (bookside, delta) {
         //
         //     [
@@ -326,9 +457,7 @@ export default class okx extends okxRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        bookside.applyLevels (deltas);
     }
 
     handleOrderBookMessage (client, message, orderbook, messageHash) {
@@ -356,25 +485,9 @@ export default class okx extends okxRest {
         this.handleDeltas (storedBids, bids);
         const checksum = this.safeValue (this.options, 'checksum', true);
         if (checksum) {
-            const asksLength = storedAsks.length;
-            const bidsLength = storedBids.length;
-            const payloadArray = [];
-            for (let i = 0; i < 25; i++) {
-                if (i < bidsLength) {
-                    payloadArray.push (this.numberToString (storedBids[i][0]));
-                    payloadArray.push (this.numberToString (storedBids[i][1]));
-                }
-                if (i < asksLength) {
-                    payloadArray.push (this.numberToString (storedAsks[i][0]));
-                    payloadArray.push (this.numberToString (storedAsks[i][1]));
-                }
-            }
-            const payload = payloadArray.join (':');
             const responseChecksum = this.safeInteger (message, 'checksum');
-            const localChecksum = this.crc32 (payload, true);
-            if (responseChecksum !== localChecksum) {
-                const error = new InvalidNonce (this.id + ' invalid checksum');
-                client.reject (error, messageHash);
+            if (!this.verifyOrderBookChecksum (client, orderbook, responseChecksum, messageHash)) {
+                return orderbook;
             }
         }
         const timestamp = this.safeInteger (message, 'ts');
@@ -489,17 +602,24 @@ export default class okx extends okxRest {
             for (let i = 0; i < data.length; i++) {
                 const update = data[i];
                 const orderbook = this.orderBook ({}, limit);
+                orderbook.retainRaw ();
                 this.orderbooks[symbol] = orderbook;
                 orderbook['symbol'] = symbol;
                 this.handleOrderBookMessage (client, update, orderbook, messageHash);
-                client.resolve (orderbook, messageHash);
+                if (symbol in this.orderbooks) {
+                    client.resolve (orderbook, messageHash);
+                }
             }
         } else if (action === 'update') {
-            if (symbol in this.orderbooks) {
+            for (let i = 0; i < data.length; i++) {
+                if (!(symbol in this.orderbooks)) {
+                    // dropped after a checksum mismatch, waiting for the next snapshot
+                    break;
+                }
                 const orderbook = this.orderbooks[symbol];
-                for (let i = 0; i < data.length; i++) {
-                    const update = data[i];
-                    this.handleOrderBookMessage (client, update, orderbook, messageHash);
+                const update = data[i];
+                this.handleOrderBookMessage (client, update, orderbook, messageHash);
+                if (symbol in this.orderbooks) {
                     client.resolve (orderbook, messageHash);
                 }
             }
@@ -520,6 +640,19 @@ export default class okx extends okxRest {
         return message;
     }
 
+    async resubscribeOrderBook (client, symbol, messageHash) {
+        // okx pushes a new snapshot once the channel is subscribed again
+        const parts = messageHash.split (':');
+        const args = [
+            {
+                'channel': parts[0],
+                'instId': parts[1],
+            },
+        ];
+        await client.send ({ 'op': 'unsubscribe', 'args': args });
+        await client.send ({ 'op': 'subscribe', 'args': args });
+    }
+
     authenticate (params = {}) {
         this.checkRequiredCredentials ();
         const access = this.safeString (params, 'access', 'private');
@@ -736,7 +869,7 @@ export default class okx extends okxRest {
         if (ordersLength > 0) {
             const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
             if (this.orders === undefined) {
-                this.orders = new ArrayCacheBySymbolById (limit);
+                this.orders = this.ordersCache (limit);
             }
             const stored = this.orders;
             const marketIds = [];
@@ -811,6 +944,37 @@ export default class okx extends okxRest {
         return message;
     }
 
+    messageRoutes () {
+        return {
+            'event': {
+                'exact': {
+                    // 'info': this.handleSystemStatus,
+                    // 'book': 'handleOrderBook',
+                    'login': this.handleAuthenticate,
+                    'subscribe': this.handleSubscriptionStatus,
+                },
+            },
+            'channel': {
+                'exact': {
+                    'bbo-tbt': this.handleOrderBook, // newly added channel that sends tick-by-tick Level 1 data, all API users can subscribe, public depth channel, verification not required
+                    'books': this.handleOrderBook, // all API users can subscribe, public depth channel, verification not required
+                    'books5': this.handleOrderBook, // all API users can subscribe, public depth channel, verification not required, data feeds will be delivered every 100ms (vs. every 200ms now)
+                    'books50-l2-tbt': this.handleOrderBook, // only users who're VIP4 and above can subscribe, identity verification required before subscription
+                    'books-l2-tbt': this.handleOrderBook, // only users who're VIP5 and above can subscribe, identity verification required before subscription
+                    'tickers': this.handleTicker,
+                    'trades': this.handleTrades,
+                    'account': this.handleBalance,
+                    // 'margin_account': this.handleBalance,
+                    'orders': this.handleOrders,
+                    'orders-algo': this.handleOrders,
+                },
+                'prefix': {
+                    'candle': this.handleOHLCV,
+                },
+            },
+        };
+    }
+
     handleMessage (client, message) {
         if (!this.handleErrorMessage (client, message)) {
             return;
@@ -861,43 +1025,20 @@ export default class okx extends okxRest {
         // if (table === undefined) {
         const event = this.safeString (message, 'event');
         if (event !== undefined) {
-            const methods = {
-                // 'info': this.handleSystemStatus,
-                // 'book': 'handleOrderBook',
-                'login': this.handleAuthenticate,
-                'subscribe': this.handleSubscriptionStatus,
-            };
-            const method = this.safeValue (methods, event);
-            if (method === undefined) {
+            const [ routed, result ] = this.routeMessage (client, message, event, 'event');
+            if (!routed) {
                 return message;
             } else {
-                return method.call (this, client, message);
+                return result;
             }
         } else {
             const arg = this.safeValue (message, 'arg', {});
             const channel = this.safeString (arg, 'channel');
-            const methods = {
-                'bbo-tbt': this.handleOrderBook, // newly added channel that sends tick-by-tick Level 1 data, all API users can subscribe, public depth channel, verification not required
-                'books': this.handleOrderBook, // all API users can subscribe, public depth channel, verification not required
-                'books5': this.handleOrderBook, // all API users can subscribe, public depth channel, verification not required, data feeds will be delivered every 100ms (vs. every 200ms now)
-                'books50-l2-tbt': this.handleOrderBook, // only users who're VIP4 and above can subscribe, identity verification required before subscription
-                'books-l2-tbt': this.handleOrderBook, // only users who're VIP5 and above can subscribe, identity verification required before subscription
-                'tickers': this.handleTicker,
-                'trades': this.handleTrades,
-                'account': this.handleBalance,
-                // 'margin_account': this.handleBalance,
-                'orders': this.handleOrders,
-                'orders-algo': this.handleOrders,
-            };
-            const method = this.safeValue (methods, channel);
-            if (method === undefined) {
-                if (channel.indexOf ('candle') === 0) {
-                    this.handleOHLCV (client, message);
-                } else {
-                    return message;
-                }
+            const [ routed, result ] = this.routeMessage (client, message, channel, 'channel');
+            if (!routed) {
+                return message;
             } else {
-                return method.call (this, client, message);
+                return result;
             }
         }
     }
@@ -2,7 +2,7 @@
 
 import phemexRest from '../phemex.js';
 import { Precise } from '../base/Precise.js';
-import { ArrayCache, ArrayCacheByTimestamp, ArrayCacheBySymbolById } from '../base/ws/Cache.js';
+import { ArrayCache, ArrayCacheByTimestamp } from '../base/ws/Cache.js';
 
 //  ---------------------------------------------------------------------------
 
@@ -18,6 +18,9 @@ export default class phemex extends phemexRest {
                 'watchOrders': true,
                 'watchOrderBook': true,
                 'watchOHLCV': true,
+                'watchOrderBookForSymbols': true,
+                'watchTradesForSymbols': true,
+                'watchOHLCVForSymbols': true,
             },
             'urls': {
                 'test': {
@@ -30,6 +33,9 @@ export default class phemex extends phemexRest {
             'options': {
                 'tradesLimit': 1000,
                 'OHLCVLimit': 1000,
+                'ws': {
+                    'maxTopicsPerMessage': 1, // a request subscribes one market, its params are not a list of topics
+                },
             },
             'streaming': {
                 'keepAlive': 20000,
@@ -74,6 +80,21 @@ export default class phemex extends phemexRest {
         return requestId;
     }
 
+    watchMultipleMethods (messageHashes, methods, paramsList, params = {}, keys = undefined) {
+        // a request per market, sent together on one connection
+        const url = this.urls['api']['ws'];
+        const messages = [];
+        for (let i = 0; i < methods.length; i++) {
+            const subscribe = {
+                'method': methods[i],
+                'id': this.requestId (),
+                'params': paramsList[i],
+            };
+            messages.push (this.deepExtend (subscribe, params));
+        }
+        return this.watchMultiple (url, messageHashes, messages, messageHashes, undefined, keys);
+    }
+
     parseUsdtTicker (ticker, market = undefined) {
         // [
         //     "BTCUSDT",
@@ -484,6 +505,41 @@ export default class phemex extends phemexRest {
         return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
     }
 
+    async watchTradesForSymbols (symbols: string[], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name phemex#watchTradesForSymbols
+         * @description get the list of most recent trades of several markets
+         * @param {[string]} symbols unified symbols of the markets to fetch trades for
+         * @param {int|undefined} since timestamp in ms of the earliest trade to fetch
+         * @param {int|undefined} limit the maximum amount of trades to fetch
+         * @param {object} params extra parameters specific to the phemex api endpoint
+         * @returns {[object]} a list of [trade structures]{@link https://docs.ccxt.com/en/latest/manual.html?#public-trades} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTradesForSymbols');
+        const messageHashes = [];
+        const methods = [];
+        const paramsList = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            const quote = market['quote'];
+            let name = 'trade_p';
+            if (quote.toUpperCase () !== 'USDT') {
+                name = 'trade';
+            }
+            messageHashes.push (name + ':' + market['symbol']);
+            methods.push (name + '.subscribe');
+            paramsList.push ([ market['id'] ]);
+        }
+        const trades = await this.watchMultipleMethods (messageHashes, methods, paramsList, params);
+        if (this.newUpdates) {
+            const first = this.safeValue (trades, 0);
+            limit = trades.getLimit (this.safeString (first, 'symbol'), limit);
+        }
+        return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
+    }
+
     async watchOrderBook (symbol, limit = undefined, params = {}) {
         /**
          * @method
@@ -518,6 +574,35 @@ export default class phemex extends phemexRest {
         return orderbook.limit ();
     }
 
+    async watchOrderBookForSymbols (symbols: string[], limit = undefined, params = {}) {
+        /**
+         * @method
+         * @name phemex#watchOrderBookForSymbols
+         * @description watches the order books of several markets
+         * @param {[string]} symbols unified symbols of the markets to fetch the order books for
+         * @param {int|undefined} limit the maximum amount of order book entries to return
+         * @param {object} params extra parameters specific to the phemex api endpoint
+         * @returns {object} the [order book structure]{@link https://docs.ccxt.com/#/?id=order-book-structure} of the market that updated
+         */
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchOrderBookForSymbols');
+        const messageHashes = [];
+        const methods = [];
+        const paramsList = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            let name = 'book';
+            if (market['settle'] === 'USDT') {
+                name = 'orderbook_p';
+            }
+            messageHashes.push (name + ':' + market['symbol']);
+            methods.push (name + '.subscribe');
+            paramsList.push ([ market['id'], true ]);
+        }
+        const orderbook = await this.watchMultipleMethods (messageHashes, methods, paramsList, params);
+        return orderbook.limit ();
+    }
+
     async watchOHLCV (symbol, timeframe = '1m', since: any = undefined, limit: any = undefined, params = {}) {
         /**
          * @method
@@ -557,15 +642,55 @@ export default class phemex extends phemexRest {
         return this.filterBySinceLimit (ohlcv, since, limit, 0, true);
     }
 
+    async watchOHLCVForSymbols (symbolsAndTimeframes: string[][], since: any = undefined, limit: any = undefined, params = {}) {
+        /**
+         * @method
+         * @name phemex#watchOHLCVForSymbols
+         * @description watches historical candlestick data of several markets and timeframes
+         * @param {[[string]]} symbolsAndTimeframes the [symbol, timeframe] pairs to watch
+         * @param {int|undefined} since timestamp in ms of the earliest candle to fetch
+         * @param {int|undefined} limit the maximum amount of candles to fetch
+         * @param {object} params extra parameters specific to the phemex api endpoint
+         * @returns {object} the candles of the market and timeframe that updated, indexed by symbol and timeframe
+         */
+        await this.loadMarkets ();
+        const symbols = this.marketSymbolsForWatch (this.symbolsOfPairs (symbolsAndTimeframes), 'watchOHLCVForSymbols');
+        const messageHashes = [];
+        const methods = [];
+        const paramsList = [];
+        const keys = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            const timeframe = symbolsAndTimeframes[i][1];
+            let name = 'kline';
+            if (market['settle'] === 'USDT') {
+                name = 'kline_p';
+            }
+            messageHashes.push (name + ':' + timeframe + ':' + market['symbol']);
+            methods.push (name + '.subscribe');
+            paramsList.push ([ market['id'], this.safeInteger (this.timeframes, timeframe) ]);
+            keys.push ([ market['symbol'], timeframe ]);
+        }
+        const [ key, ohlcv ] = await this.watchMultipleMethods (messageHashes, methods, paramsList, params, keys);
+        if (this.newUpdates) {
+            limit = ohlcv.getLimit (key[0], limit);
+        }
+        const filtered = this.filterBySinceLimit (ohlcv, since, limit, 0, true);
+        return this.createOhlcvObject (key[0], key[1], filtered);
+    }
+
     handleDelta (bookside, delta, market = undefined) {
         const bidAsk = this.parseBidAsk (delta, 0, 1, market);
         bookside.storeArray (bidAsk);
     }
 
     handleDeltas (bookside, deltas, market = undefined) {
+        // prices and amounts are scaled per market, convert them first and apply the levels in one batch
+        const bidasks = [];
         for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i], market);
+            bidasks.push (this.parseBidAsk (deltas[i], 0, 1, market));
         }
+        bookside.applyLevels (bidasks);
     }
 
     handleOrderBook (client, message) {
@@ -694,7 +819,7 @@ export default class phemex extends phemexRest {
         let cachedTrades = this.myTrades;
         if (cachedTrades === undefined) {
             const limit = this.safeInteger (this.options, 'tradesLimit', 1000);
-            cachedTrades = new ArrayCacheBySymbolById (limit);
+            cachedTrades = this.myTradesCache (limit);
         }
         const marketIds = {};
         let type = undefined;
@@ -876,7 +1001,7 @@ export default class phemex extends phemexRest {
         const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
         const marketIds = {};
         if (this.orders === undefined) {
-            this.orders = new ArrayCacheBySymbolById (limit);
+            this.orders = this.ordersCache (limit);
         }
         let type = undefined;
         const stored = this.orders;
@@ -2,7 +2,7 @@
 
 import wooRest from '../woo.js';
 import { ExchangeError, AuthenticationError } from '../base/errors.js';
-import { ArrayCacheByTimestamp, ArrayCacheBySymbolById, ArrayCache } from '../base/ws/Cache.js';
+import { ArrayCacheByTimestamp, ArrayCache } from '../base/ws/Cache.js';
 import { Precise } from '../base/Precise.js';
 
 // ----------------------------------------------------------------------------
@@ -20,6 +20,9 @@ export default class woo extends wooRest {
                 'watchTicker': true,
                 'watchTickers': true,
                 'watchTrades': true,
+                'watchOrderBookForSymbols': true,
+                'watchTradesForSymbols': true,
+                'watchOHLCVForSymbols': true,
             },
             'urls': {
                 'api': {
@@ -72,6 +75,26 @@ export default class woo extends wooRest {
         return await this.watch (url, messageHash, request, messageHash, subscribe, shouldThrottle);
     }
 
+    async watchPublicMultiple (topics, params = {}, keys = undefined) {
+        // a request per topic, the protocol takes one topic string, sent together on one connection
+        this.checkRequiredUid ();
+        const url = this.urls['api']['ws']['public'] + '/' + 'OqdphuyCtYWxwzhxyLLjOWNdFP7sQt8RPWzmb5xY';
+        const messages = [];
+        const subscriptions = [];
+        for (let i = 0; i < topics.length; i++) {
+            const subscribe = {
+                'id': this.requestId (url),
+            };
+            const request = {
+                'event': 'subscribe',
+                'topic': topics[i],
+            };
+            messages.push (this.extend (subscribe, request, params));
+            subscriptions.push (subscribe);
+        }
+        return await this.watchMultiple (url, topics, messages, topics, subscriptions, keys);
+    }
+
     async watchOrderBook (symbol, limit = undefined, params = {}) {
         await this.loadMarkets ();
         const name = 'orderbook';
@@ -86,6 +109,18 @@ export default class woo extends wooRest {
         return orderbook.limit ();
     }
 
+    async watchOrderBookForSymbols (symbols: string[], limit = undefined, params = {}) {
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchOrderBookForSymbols');
+        const topics = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            topics.push (market['id'] + '@orderbook');
+        }
+        const orderbook = await this.watchPublicMultiple (topics, params);
+        return orderbook.limit ();
+    }
+
     handleOrderBook (client, message) {
         //
         //     {
@@ -283,6 +318,29 @@ export default class woo extends wooRest {
         return this.filterBySinceLimit (ohlcv, since, limit, 0, true);
     }
 
+    async watchOHLCVForSymbols (symbolsAndTimeframes: string[][], since: any = undefined, limit: any = undefined, params = {}) {
+        await this.loadMarkets ();
+        const symbols = this.marketSymbolsForWatch (this.symbolsOfPairs (symbolsAndTimeframes), 'watchOHLCVForSymbols');
+        const topics = [];
+        const keys = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const timeframe = symbolsAndTimeframes[i][1];
+            if ((timeframe !== '1m') && (timeframe !== '5m') && (timeframe !== '15m') && (timeframe !== '30m') && (timeframe !== '1h') && (timeframe !== '1d') && (timeframe !== '1w') && (timeframe !== '1M')) {
+                throw new ExchangeError (this.id + ' watchOHLCVForSymbols timeframe argument must be 1m, 5m, 15m, 30m, 1h, 1d, 1w, 1M');
+            }
+            const market = this.market (symbols[i]);
+            const interval = this.safeString (this.timeframes, timeframe, timeframe);
+            topics.push (market['id'] + '@kline_' + interval);
+            keys.push ([ symbols[i], timeframe ]);
+        }
+        const [ key, ohlcv ] = await this.watchPublicMultiple (topics, params, keys);
+        if (this.newUpdates) {
+            limit = ohlcv.getLimit (key[0], limit);
+        }
+        const filtered = this.filterBySinceLimit (ohlcv, since, limit, 0, true);
+        return this.createOhlcvObject (key[0], key[1], filtered);
+    }
+
     handleOHLCV (client, message) {
         //
         //     {
@@ -344,6 +402,22 @@ export default class woo extends wooRest {
         return this.filterBySymbolSinceLimit (trades, symbol, since, limit, true);
     }
 
+    async watchTradesForSymbols (symbols: string[], since: any = undefined, limit: any = undefined, params = {}) {
+        await this.loadMarkets ();
+        symbols = this.marketSymbolsForWatch (symbols, 'watchTradesForSymbols');
+        const topics = [];
+        for (let i = 0; i < symbols.length; i++) {
+            const market = this.market (symbols[i]);
+            topics.push (market['id'] + '@trade');
+        }
+        const trades = await this.watchPublicMultiple (topics, params);
+        if (this.newUpdates) {
+            const first = this.safeValue (trades, 0);
+            limit = trades.getLimit (this.safeString (first, 'symbol'), limit);
+        }
+        return this.filterBySinceLimit (trades, since, limit, 'timestamp', true);
+    }
+
     handleTrade (client, message) {
         //
         // {
@@ -533,7 +607,7 @@ export default class woo extends wooRest {
         if (symbol !== undefined) {
             if (this.orders === undefined) {
                 const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
-                this.orders = new ArrayCacheBySymbolById (limit);
+                this.orders = this.ordersCache (limit);
             }
             const cachedOrders = this.orders;
             const orders = this.safeValue (cachedOrders.hashmap, symbol, {});
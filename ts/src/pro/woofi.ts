@@ -2,7 +2,7 @@
 
 import woofiRest from '../woofi.js';
 import { ExchangeError, AuthenticationError } from '../base/errors.js';
-import { ArrayCacheByTimestamp, ArrayCacheBySymbolById, ArrayCache } from '../base/ws/Cache.js';
+import { ArrayCacheByTimestamp, ArrayCache } from '../base/ws/Cache.js';
 import { Precise } from '../base/Precise.js';
 
 // ----------------------------------------------------------------------------
@@ -533,7 +533,7 @@ export default class woofi extends woofiRest {
         if (symbol !== undefined) {
             if (this.orders === undefined) {
                 const limit = this.safeInteger (this.options, 'ordersLimit', 1000);
-                this.orders = new ArrayCacheBySymbolById (limit);
+                this.orders = this.ordersCache (limit);
             }
             const cachedOrders = this.orders;
             const orders = this.safeValue (cachedOrders.hashmap, symbol, {});